@@ -0,0 +1,71 @@
+"""Compares the serial and parallel paths of get_folder_sha1
+
+Usage (from the cli folder, with medperf installed):
+    python benchmarks/hash_folder.py [--path FOLDER] [--files N] [--size KB] [--workers N ...]
+
+If no folder is given, a temporary folder with random files is generated.
+Every configuration hashes the same folder and must produce the same digest.
+"""
+import os
+import time
+import shutil
+import argparse
+import tempfile
+
+from medperf.utils import get_folder_sha1
+
+
+def generate_folder(n_files: int, size_kb: int) -> str:
+    path = tempfile.mkdtemp(prefix="medperf_hash_")
+    for idx in range(n_files):
+        subfolder = os.path.join(path, str(idx % 16))
+        os.makedirs(subfolder, exist_ok=True)
+        with open(os.path.join(subfolder, f"{idx}.bin"), "wb") as f:
+            f.write(os.urandom(size_kb * 1024))
+    return path
+
+
+def folder_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for file in files:
+            total += os.path.getsize(os.path.join(root, file))
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--path", help="Folder to hash")
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--size", type=int, default=512, help="File size in KB")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    generated = args.path is None
+    path = generate_folder(args.files, args.size) if generated else args.path
+    try:
+        mbytes = folder_size(path) / 1024 ** 2
+        # Warm up the page cache so that every configuration reads from memory
+        get_folder_sha1(path, workers=1)
+
+        digests = set()
+        for workers in [1] + args.workers:
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                digests.add(get_folder_sha1(path, workers=workers))
+                times.append(time.perf_counter() - start)
+            best = min(times)
+            label = "serial" if workers == 1 else f"{workers} workers"
+            print(f"{label:>12}: {best:.3f}s ({mbytes / best:.1f} MB/s)")
+
+        assert len(digests) == 1, "Digests differ between configurations"
+        print(f"Digest: {digests.pop()}")
+    finally:
+        if generated:
+            shutil.rmtree(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,20 @@
 import typer
 import logging
 import logging.handlers
+from typing import List
 from os.path import abspath, expanduser
 
 import medperf.config as config
-from medperf.ui.factory import UIFactory
 from medperf.decorators import clean_except
-from medperf.comms.factory import CommsFactory
+
+# Only the command line definition is imported at startup. Commands import
+# their implementation, and with it the heavier dependencies, when they run
 import medperf.commands.result.result as result
-from medperf.commands.result.create import BenchmarkExecution
-from medperf.commands.result.submit import ResultSubmission
 import medperf.commands.mlcube.mlcube as mlcube
 import medperf.commands.dataset.dataset as dataset
-from medperf.commands.auth import Login, PasswordChange
 import medperf.commands.benchmark.benchmark as benchmark
-from medperf.utils import init_storage, storage_path, cleanup
 import medperf.commands.association.association as association
-from medperf.commands.compatibility_test import CompatibilityTestExecution
+import medperf.commands.catalog.catalog as catalog
 
 
 app = typer.Typer()
@@ -27,6 +25,7 @@ app.add_typer(benchmark.app, name="benchmark", help="Manage benchmarks")
 app.add_typer(mlcube.app, name="mlcube", help="Manage mlcubes")
 app.add_typer(result.app, name="result", help="Manage results")
 app.add_typer(association.app, name="association", help="Manage associations")
+app.add_typer(catalog.app, name="catalog", help="Manage the local catalog")
 
 
 @app.command("login")
@@ -41,6 +40,8 @@ def login(
 ):
     """Login to the medperf server. Must be done only once.
     """
+    from medperf.commands.auth import Login
+
     Login.run(config.comms, config.ui, username=username, password=password)
     config.ui.print("✅ Done!")
 
@@ -50,6 +51,8 @@ def login(
 def passwd():
     """Set a new password. Must be logged in.
     """
+    from medperf.commands.auth import PasswordChange
+
     comms = config.comms
     ui = config.ui
     comms.authenticate()
@@ -63,22 +66,65 @@ def execute(
     benchmark_uid: int = typer.Option(
         ..., "--benchmark", "-b", help="UID of the desired benchmark"
     ),
-    data_uid: str = typer.Option(
-        ..., "--data_uid", "-d", help="Registered Dataset UID"
+    data_uids: List[str] = typer.Option(
+        ...,
+        "--data_uid",
+        "-d",
+        help="Registered Dataset UID. Can be passed multiple times to run on several datasets",
     ),
-    model_uid: int = typer.Option(
-        ..., "--model_uid", "-m", help="UID of model to execute"
+    model_uids: List[int] = typer.Option(
+        None,
+        "--model_uid",
+        "-m",
+        help="UID of model to execute. Can be passed multiple times to run several models",
+    ),
+    all_models: bool = typer.Option(
+        False, "--all-models", help="Execute every model associated with the benchmark"
     ),
     approval: bool = typer.Option(False, "-y", help="Skip approval step"),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Run inference even if cached predictions exist"
+    ),
+    force: bool = typer.Option(
+        False, "--force", help="Execute even if up-to-date results were submitted"
+    ),
 ):
-    """Runs the benchmark execution step for a given benchmark, prepared dataset and model
+    """Runs the benchmark execution step for a given benchmark, prepared datasets and models
     """
+    from medperf.commands.result.create import BenchmarkExecution
+    from medperf.commands.result.submit import ResultSubmission
+    from medperf.commands.result.batch import BatchBenchmarkExecution
+
     comms = config.comms
     ui = config.ui
-    BenchmarkExecution.run(benchmark_uid, data_uid, model_uid, comms, ui)
-    ResultSubmission.run(
-        benchmark_uid, data_uid, model_uid, comms, ui, approved=approval
-    )
+    model_uids = model_uids or []
+    if len(data_uids) == 1 and len(model_uids) == 1 and not all_models:
+        data_uid, model_uid = data_uids[0], model_uids[0]
+        executed = BenchmarkExecution.run(
+            benchmark_uid,
+            data_uid,
+            model_uid,
+            comms,
+            ui,
+            use_cache=not no_cache,
+            force=force,
+        )
+        if executed:
+            ResultSubmission.run(
+                benchmark_uid, data_uid, model_uid, comms, ui, approved=approval
+            )
+    else:
+        BatchBenchmarkExecution.run(
+            benchmark_uid,
+            data_uids,
+            model_uids,
+            comms,
+            ui,
+            all_models=all_models,
+            approved=approval,
+            use_cache=not no_cache,
+            force=force,
+        )
     ui.print("✅ Done!")
 
 
@@ -120,6 +166,9 @@ def test(
     Executes a compatibility test for a determined benchmark.
     Can test prepared datasets, remote and local models independently.
     """
+    from medperf.utils import cleanup
+    from medperf.commands.compatibility_test import CompatibilityTestExecution
+
     comms = config.comms
     ui = config.ui
     CompatibilityTestExecution.run(
@@ -131,6 +180,7 @@ def test(
 
 @app.callback()
 def main(
+    ctx: typer.Context,
     log: str = "INFO",
     log_file: str = None,
     comms: str = config.default_comms,
@@ -145,10 +195,35 @@ def main(
     platform: str = config.platform,
     cleanup: bool = True,
     certificate: str = config.certificate,
+    http_pool_connections: int = config.http_pool_connections,
+    http_pool_maxsize: int = config.http_pool_maxsize,
+    results_upload_batch_size: int = config.results_upload_batch_size,
+    download_workers: int = config.download_workers,
+    stream_extraction: bool = config.stream_extraction,
+    max_concurrent_tasks: int = config.max_concurrent_tasks,
+    task_cpus: float = config.task_cpus,
+    task_memory: int = typer.Option(
+        config.task_memory, help="Memory limit of each cube task, in GB"
+    ),
+    predictions_queue_size: int = config.predictions_queue_size,
+    hash_workers: int = config.hash_workers,
+    profile: bool = typer.Option(
+        False, help="Print the time and resources used by each stage of the command"
+    ),
+    save_profiles: bool = typer.Option(
+        config.save_profiles, help="Store a profiling report of every command"
+    ),
     local: bool = typer.Option(
         False, help="Run the CLI with local server configuration"
     ),
 ):
+    from medperf.catalog import Catalog
+    from medperf.profiling import Profiler
+    from medperf.ui.factory import UIFactory
+    from medperf.comms.factory import CommsFactory
+    from medperf.commands.catalog.rebuild import CatalogRebuild
+    from medperf.utils import init_storage, storage_path
+
     # Set configuration variables
     config.storage = abspath(expanduser(storage))
     config.prepare_timeout = prepare_timeout
@@ -158,6 +233,17 @@ def main(
     config.evaluate_timeout = evaluate_timeout
     config.platform = platform
     config.cleanup = cleanup
+    config.http_pool_connections = http_pool_connections
+    config.http_pool_maxsize = http_pool_maxsize
+    config.results_upload_batch_size = results_upload_batch_size
+    config.download_workers = download_workers
+    config.stream_extraction = stream_extraction
+    config.max_concurrent_tasks = max_concurrent_tasks
+    config.task_cpus = task_cpus
+    config.task_memory = task_memory
+    config.predictions_queue_size = predictions_queue_size
+    config.hash_workers = hash_workers
+    config.save_profiles = save_profiles
 
     if log_file is None:
         log_file = storage_path(config.log_file)
@@ -189,7 +275,23 @@ def main(
     logging.info(f"Running MedPerf v{config.version} on {log} logging level")
 
     config.ui = UIFactory.create_ui(ui)
+    if profile or save_profiles:
+        # Callbacks run in reverse order, so the report is written once
+        # everything else is closed
+        config.profiler = Profiler(ctx.invoked_subcommand)
+        summary_ui = config.ui if profile else None
+        profiles_path = storage_path(config.profiles_storage)
+        ctx.call_on_close(lambda: config.profiler.finish(profiles_path, summary_ui))
+
     config.comms = CommsFactory.create_comms(comms, config.ui, config.server)
+    # A single comms session is shared by the whole command. Release it on exit
+    ctx.call_on_close(config.comms.close)
+
+    config.catalog = Catalog(storage_path(config.catalog_filename))
+    ctx.call_on_close(config.catalog.close)
+    if config.catalog.is_new:
+        # Index whatever was stored before the catalog existed
+        CatalogRebuild.run(config.ui)
 
     config.ui.print(f"MedPerf {config.version}")
 
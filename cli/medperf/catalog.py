@@ -0,0 +1,301 @@
+import sqlite3
+import logging
+import threading
+from typing import List, Tuple
+
+
+class Catalog:
+    """
+    Local index of the entities stored in the user's machine
+
+    Looking up a local entity used to require walking its storage directory
+    and parsing the files of every entity found there. The catalog keeps a
+    SQLite index of the cubes, datasets and results present in the storage,
+    keyed by their server UID, generated UID and (benchmark, model, dataset),
+    so that entities can be found without touching the rest of the storage.
+
+    Entities update the catalog whenever they are written to disk. The catalog
+    can always be regenerated from the storage with `medperf catalog rebuild`.
+
+    The catalog also keeps the last response to server resources that rarely
+    change, together with its validators, so that they can be requested
+    conditionally. These are only a cache, and are dropped when rebuilding.
+    """
+
+    version = 3
+
+    def __init__(self, path: str):
+        """Opens the catalog at the given path, creating it if necessary
+
+        Args:
+            path (str): Location of the catalog database. ":memory:" can be
+                used for a catalog that is not persisted.
+        """
+        self.path = path
+        # Cubes may be retrieved from multiple threads
+        self.__lock = threading.Lock()
+        self.__conn = sqlite3.connect(path, check_same_thread=False)
+        self.is_new = self.__create_schema()
+
+    def __create_schema(self) -> bool:
+        """Creates the catalog tables if they don't exist yet
+
+        Returns:
+            bool: Wether the catalog was just created
+        """
+        with self.__lock, self.__conn:
+            version = self.__conn.execute("PRAGMA user_version").fetchone()[0]
+            if version == self.version:
+                return False
+            logging.info(f"Creating local catalog at {self.path}")
+            self.__conn.executescript(
+                """
+                DROP TABLE IF EXISTS cubes;
+                DROP TABLE IF EXISTS datasets;
+                DROP TABLE IF EXISTS results;
+                DROP TABLE IF EXISTS responses;
+                CREATE TABLE cubes (uid TEXT PRIMARY KEY);
+                CREATE TABLE datasets (generated_uid TEXT PRIMARY KEY, uid TEXT);
+                CREATE INDEX datasets_uid ON datasets (uid);
+                CREATE TABLE results (
+                    benchmark TEXT,
+                    model TEXT,
+                    dataset TEXT,
+                    uid TEXT,
+                    inputs TEXT,
+                    PRIMARY KEY (benchmark, model, dataset)
+                );
+                CREATE INDEX results_uid ON results (uid);
+                CREATE TABLE responses (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body TEXT
+                );
+                """
+            )
+            self.__conn.execute(f"PRAGMA user_version = {self.version}")
+        return True
+
+    def __execute(self, query: str, params: tuple = ()):
+        with self.__lock, self.__conn:
+            self.__conn.execute(query, params)
+
+    def __fetchall(self, query: str, params: tuple = ()) -> List[tuple]:
+        with self.__lock:
+            return self.__conn.execute(query, params).fetchall()
+
+    def close(self):
+        """Closes the connection to the catalog
+        """
+        self.__conn.close()
+
+    def clear(self):
+        """Removes every entry from the catalog
+        """
+        with self.__lock, self.__conn:
+            for table in ["cubes", "datasets", "results", "responses"]:
+                self.__conn.execute(f"DELETE FROM {table}")
+
+    def add_cube(self, uid: str):
+        """Adds a cube stored locally to the catalog
+
+        Args:
+            uid (str): UID of the cube
+        """
+        self.__execute("INSERT OR IGNORE INTO cubes VALUES (?)", (str(uid),))
+
+    def remove_cube(self, uid: str):
+        """Removes a cube from the catalog
+
+        Args:
+            uid (str): UID of the cube
+        """
+        self.__execute("DELETE FROM cubes WHERE uid = ?", (str(uid),))
+
+    def has_cube(self, uid: str) -> bool:
+        """Checks if a cube is stored locally
+
+        Args:
+            uid (str): UID of the cube
+
+        Returns:
+            bool: Wether the cube is in the catalog
+        """
+        query = "SELECT 1 FROM cubes WHERE uid = ?"
+        return len(self.__fetchall(query, (str(uid),))) > 0
+
+    def cubes(self) -> List[str]:
+        """Lists the cubes stored locally
+
+        Returns:
+            List[str]: UIDs of the local cubes
+        """
+        return [uid for uid, in self.__fetchall("SELECT uid FROM cubes ORDER BY uid")]
+
+    def add_dataset(self, generated_uid: str, uid: str = None):
+        """Adds or updates a dataset stored locally
+
+        Args:
+            generated_uid (str): Generated UID of the dataset
+            uid (str, optional): Server UID of the dataset. None if the dataset
+                is not registered. Defaults to None.
+        """
+        uid = None if uid is None else str(uid)
+        query = "INSERT OR REPLACE INTO datasets VALUES (?, ?)"
+        self.__execute(query, (str(generated_uid), uid))
+
+    def remove_dataset(self, generated_uid: str):
+        """Removes a dataset from the catalog
+
+        Args:
+            generated_uid (str): Generated UID of the dataset
+        """
+        query = "DELETE FROM datasets WHERE generated_uid = ?"
+        self.__execute(query, (str(generated_uid),))
+
+    def get_dataset(self, uid: str) -> str:
+        """Finds a local dataset by its server UID
+
+        Args:
+            uid (str): Server UID of the dataset
+
+        Returns:
+            str: Generated UID of the dataset. None if not found
+        """
+        query = "SELECT generated_uid FROM datasets WHERE uid = ?"
+        rows = self.__fetchall(query, (str(uid),))
+        if len(rows) == 0:
+            return None
+        return rows[0][0]
+
+    def find_datasets(self, prefix: str) -> List[str]:
+        """Finds the local datasets whose generated UID starts with a prefix
+
+        Args:
+            prefix (str): Initial portion of the generated UID
+
+        Returns:
+            List[str]: Generated UIDs that start with the prefix
+        """
+        # Range query instead of LIKE, which would treat "_" as a wildcard
+        query = """SELECT generated_uid FROM datasets
+            WHERE generated_uid >= ? AND generated_uid < ?
+            ORDER BY generated_uid"""
+        prefix = str(prefix)
+        rows = self.__fetchall(query, (prefix, prefix + "\U0010ffff"))
+        return [generated_uid for generated_uid, in rows]
+
+    def datasets(self) -> List[str]:
+        """Lists the datasets stored locally
+
+        Returns:
+            List[str]: Generated UIDs of the local datasets
+        """
+        query = "SELECT generated_uid FROM datasets ORDER BY generated_uid"
+        return [generated_uid for generated_uid, in self.__fetchall(query)]
+
+    def add_result(
+        self,
+        benchmark_uid: str,
+        model_uid: str,
+        dataset_uid: str,
+        uid: str = None,
+        inputs_hash: str = None,
+    ):
+        """Adds or updates a result stored locally
+
+        Args:
+            benchmark_uid (str): UID of the benchmark
+            model_uid (str): UID of the model
+            dataset_uid (str): UID of the dataset
+            uid (str, optional): Server UID of the result. None if the result
+                hasn't been submitted. Defaults to None.
+            inputs_hash (str, optional): Hash of the cubes and dataset used to
+                compute the result. If None, the stored hash is kept. Defaults to None.
+        """
+        uid = None if uid is None else str(uid)
+        ids = (str(benchmark_uid), str(model_uid), str(dataset_uid))
+        query = """INSERT INTO results VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (benchmark, model, dataset) DO UPDATE
+            SET uid = excluded.uid, inputs = COALESCE(excluded.inputs, inputs)"""
+        self.__execute(query, ids + (uid, inputs_hash))
+
+    def find_result(
+        self, benchmark_uid: str, model_uid: str, dataset_uid: str
+    ) -> Tuple[str, str]:
+        """Finds a local result by its benchmark, model and dataset
+
+        Args:
+            benchmark_uid (str): UID of the benchmark
+            model_uid (str): UID of the model
+            dataset_uid (str): UID of the dataset
+
+        Returns:
+            Tuple[str, str]: server UID and inputs hash of the result. None if not found
+        """
+        query = """SELECT uid, inputs FROM results
+            WHERE benchmark = ? AND model = ? AND dataset = ?"""
+        ids = (str(benchmark_uid), str(model_uid), str(dataset_uid))
+        rows = self.__fetchall(query, ids)
+        if len(rows) == 0:
+            return None
+        return rows[0]
+
+    def get_result(self, uid: str) -> Tuple[str, str, str]:
+        """Finds a local result by its server UID
+
+        Args:
+            uid (str): Server UID of the result
+
+        Returns:
+            Tuple[str, str, str]: benchmark, model and dataset UIDs of the result.
+                None if not found
+        """
+        query = "SELECT benchmark, model, dataset FROM results WHERE uid = ?"
+        rows = self.__fetchall(query, (str(uid),))
+        if len(rows) == 0:
+            return None
+        return rows[0]
+
+    def results(self, pending: bool = False) -> List[Tuple[str, str, str]]:
+        """Lists the results stored locally
+
+        Args:
+            pending (bool, optional): Only list results that haven't been submitted. Defaults to False.
+
+        Returns:
+            List[Tuple[str, str, str]]: benchmark, model and dataset UIDs of every result
+        """
+        where = "WHERE uid IS NULL" if pending else ""
+        query = f"""SELECT benchmark, model, dataset FROM results {where}
+            ORDER BY benchmark, model, dataset"""
+        return self.__fetchall(query)
+
+    def add_response(self, url: str, etag: str, last_modified: str, body: str):
+        """Stores the last response to a server resource
+
+        Args:
+            url (str): URL of the resource
+            etag (str): ETag header of the response. May be None
+            last_modified (str): Last-Modified header of the response. May be None
+            body (str): Body of the response
+        """
+        query = "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)"
+        self.__execute(query, (url, etag, last_modified, body))
+
+    def get_response(self, url: str) -> Tuple[str, str, str]:
+        """Finds the last response stored for a server resource
+
+        Args:
+            url (str): URL of the resource
+
+        Returns:
+            Tuple[str, str, str]: ETag, Last-Modified and body of the response.
+                None if not found
+        """
+        query = "SELECT etag, last_modified, body FROM responses WHERE url = ?"
+        rows = self.__fetchall(query, (url,))
+        if len(rows) == 0:
+            return None
+        return rows[0]
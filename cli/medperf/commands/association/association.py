@@ -3,8 +3,6 @@ from typing import Optional
 
 import medperf.config as config
 from medperf.decorators import clean_except
-from medperf.commands.association.list import ListAssociations
-from medperf.commands.association.approval import Approval
 from medperf.enums import Status
 
 app = typer.Typer()
@@ -19,6 +17,8 @@ def list(filter: Optional[str] = typer.Argument(None)):
         filter (str, optional): Filter associations by approval status.
             Defaults to displaying all user associations.
     """
+    from medperf.commands.association.list import ListAssociations
+
     comms = config.comms
     ui = config.ui
     ListAssociations.run(comms, ui, filter)
@@ -38,6 +38,8 @@ def approve(
         dataset_uid (int, optional): Dataset UID.
         mlcube_uid (int, optional): Model MLCube UID.
     """
+    from medperf.commands.association.approval import Approval
+
     comms = config.comms
     ui = config.ui
     Approval.run(benchmark_uid, Status.APPROVED, comms, ui, dataset_uid, mlcube_uid)
@@ -58,6 +60,8 @@ def reject(
         dataset_uid (int, optional): Dataset UID.
         mlcube_uid (int, optional): Model MLCube UID.
     """
+    from medperf.commands.association.approval import Approval
+
     comms = config.comms
     ui = config.ui
     Approval.run(benchmark_uid, Status.REJECTED, comms, ui, dataset_uid, mlcube_uid)
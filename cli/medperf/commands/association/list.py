@@ -13,7 +13,7 @@ class ListAssociations:
 
         # Might be worth seeing if creating an association class that encapsulates
         # most of the logic here is useful
-        assocs = dset_assocs + cube_assocs
+        assocs = list(dset_assocs) + list(cube_assocs)
         if filter:
             filter = filter.upper()
             assocs = [assoc for assoc in assocs if assoc["approval_status"] == filter]
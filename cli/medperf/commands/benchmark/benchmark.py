@@ -1,11 +1,8 @@
 import typer
+from typing import List
 
 import medperf.config as config
-from medperf.utils import cleanup
 from medperf.decorators import clean_except
-from medperf.commands.benchmark.list import BenchmarksList
-from medperf.commands.benchmark.submit import SubmitBenchmark
-from medperf.commands.benchmark.associate import AssociateBenchmark
 
 app = typer.Typer()
 
@@ -18,11 +15,42 @@ def list(
     """Lists all benchmarks created by the user
     If --all is used, displays all benchmarks in the platform
     """
+    from medperf.commands.benchmark.list import BenchmarksList
+
     ui = config.ui
     comms = config.comms
     BenchmarksList.run(comms, ui, all)
 
 
+@app.command("leaderboard")
+@clean_except
+def leaderboard(
+    benchmark_uid: int = typer.Option(
+        ..., "--benchmark_uid", "-b", help="UID of the benchmark"
+    ),
+    metrics: List[str] = typer.Option(
+        None,
+        "--metric",
+        "-m",
+        help="Metric to display. Can be used multiple times. The first one ranks the models",
+    ),
+    approval_status: str = typer.Option(
+        None, "--status", help="Only consider results with this approval status"
+    ),
+    ascending: bool = typer.Option(
+        False, "--ascending", help="Rank lower metric values first"
+    ),
+):
+    """Displays the aggregated results of each model in a benchmark"""
+    from medperf.commands.benchmark.leaderboard import BenchmarkLeaderboard
+
+    ui = config.ui
+    comms = config.comms
+    BenchmarkLeaderboard.run(
+        benchmark_uid, comms, ui, metrics, approval_status, ascending
+    )
+
+
 @app.command("submit")
 @clean_except
 def submit(
@@ -48,6 +76,9 @@ def submit(
     ),
 ):
     """Submits a new benchmark to the platform"""
+    from medperf.utils import cleanup
+    from medperf.commands.benchmark.submit import SubmitBenchmark
+
     comms = config.comms
     ui = config.ui
     benchmark_info = {
@@ -81,6 +112,8 @@ def associate(
 ):
     """Associates a benchmark with a given mlcube or dataset. Only one option at a time.
     """
+    from medperf.commands.benchmark.associate import AssociateBenchmark
+
     comms = config.comms
     ui = config.ui
     AssociateBenchmark.run(
@@ -0,0 +1,66 @@
+from typing import List
+from tabulate import tabulate
+
+from medperf.ui.interface import UI
+from medperf.comms.interface import Comms
+
+
+class BenchmarkLeaderboard:
+    @staticmethod
+    def run(
+        benchmark_uid: int,
+        comms: Comms,
+        ui: UI,
+        metrics: List[str] = None,
+        approval_status: str = None,
+        ascending: bool = False,
+    ):
+        """Displays the aggregated metrics of each model in a benchmark,
+        ranked by the mean of the first metric
+
+        Args:
+            benchmark_uid (int): UID of the benchmark
+            comms (Comms): Communications instance
+            ui (UI): UI instance
+            metrics (List[str], optional): Metrics to display. Defaults to all.
+            approval_status (str, optional): Only consider results with this status. Defaults to all.
+            ascending (bool, optional): Rank lower values first. Defaults to False.
+        """
+        if approval_status:
+            approval_status = approval_status.upper()
+        summaries = comms.get_benchmark_leaderboard(
+            benchmark_uid, metrics, approval_status
+        )
+
+        rows = {}
+        found_metrics = []
+        for summary in summaries:
+            key = (summary["model"], summary["approval_status"])
+            rows.setdefault(key, {})[summary["metric"]] = summary
+            if summary["metric"] not in found_metrics:
+                found_metrics.append(summary["metric"])
+        metrics = metrics or sorted(found_metrics)
+
+        def rank(item):
+            summary = item[1].get(metrics[0]) if metrics else None
+            if summary is None:
+                # Models without the ranking metric go last
+                return (1, 0)
+            mean = summary["mean"]
+            return (0, mean if ascending else -mean)
+
+        headers = ["MLCube UID", "Status", "Results"] + metrics
+        data = []
+        for (model, status), model_metrics in sorted(rows.items(), key=rank):
+            count = max(summary["count"] for summary in model_metrics.values())
+            values = [format_metric(model_metrics.get(metric)) for metric in metrics]
+            data.append([model, status, count] + values)
+
+        tab = tabulate(data, headers=headers)
+        ui.print(tab)
+
+
+def format_metric(summary: dict) -> str:
+    if summary is None:
+        return ""
+    return f"{summary['mean']:.4f} [{summary['min']:.4f}, {summary['max']:.4f}]"
@@ -6,7 +6,7 @@ from medperf.ui.interface import UI
 import medperf.config as config
 from medperf.comms.interface import Comms
 from medperf.entities.benchmark import Benchmark
-from medperf.utils import get_file_sha1, generate_tmp_uid, pretty_error
+from medperf.utils import generate_tmp_uid, pretty_error
 from medperf.commands.compatibility_test import CompatibilityTestExecution
 
 
@@ -109,8 +109,7 @@ class SubmitBenchmark:
         like hash, generated uid and test results
         """
         tmp_uid = self.demo_hash if self.demo_hash else generate_tmp_uid()
-        demo_dset_path = self.comms.get_benchmark_demo_dataset(self.demo_url, tmp_uid)
-        demo_hash = get_file_sha1(demo_dset_path)
+        _, demo_hash = self.comms.get_benchmark_demo_dataset(self.demo_url, tmp_uid)
         if self.demo_hash and demo_hash != self.demo_hash:
             logging.error(
                 f"Demo dataset hash mismatch: {demo_hash} != {self.demo_hash}"
@@ -0,0 +1,17 @@
+import typer
+
+import medperf.config as config
+from medperf.decorators import clean_except
+
+app = typer.Typer()
+
+
+@app.command("rebuild")
+@clean_except
+def rebuild():
+    """Regenerates the local catalog from the contents of the storage"""
+    from medperf.commands.catalog.rebuild import CatalogRebuild
+
+    ui = config.ui
+    CatalogRebuild.run(ui)
+    ui.print("✅ Done!")
@@ -0,0 +1,63 @@
+import os
+import yaml
+import logging
+
+import medperf.config as config
+from medperf.ui.interface import UI
+from medperf.utils import get_uids, results_ids, results_path, storage_path
+
+
+class CatalogRebuild:
+    @classmethod
+    def run(cls, ui: UI):
+        """Regenerates the local catalog from the entities found in the storage.
+
+        Args:
+            ui (UI): Instance of an UI implementation.
+        """
+        logging.info("Rebuilding the local catalog")
+        ui.text = "Rebuilding local catalog"
+        catalog = config.catalog
+        catalog.clear()
+        cls.add_cubes()
+        cls.add_datasets()
+        cls.add_results(ui)
+        logging.info(
+            f"Catalog contains {len(catalog.cubes())} cubes, "
+            f"{len(catalog.datasets())} datasets and {len(catalog.results())} results"
+        )
+
+    @staticmethod
+    def add_cubes():
+        cubes_storage = storage_path(config.cubes_storage)
+        for uid in get_uids(cubes_storage):
+            meta_file = os.path.join(cubes_storage, uid, config.cube_metadata_filename)
+            if os.path.exists(meta_file):
+                config.catalog.add_cube(uid)
+
+    @staticmethod
+    def add_datasets():
+        data_storage = storage_path(config.data_storage)
+        for generated_uid in get_uids(data_storage):
+            if generated_uid.startswith(config.tmp_prefix):
+                continue
+            reg_file = os.path.join(data_storage, generated_uid, config.reg_file)
+            if os.path.exists(reg_file):
+                with open(reg_file, "r") as f:
+                    registration = yaml.safe_load(f)
+                config.catalog.add_dataset(generated_uid, registration["uid"])
+
+    @staticmethod
+    def add_results(ui: UI):
+        for b_id, m_id, d_id in results_ids(ui):
+            path = results_path(b_id, m_id, d_id)
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    results = yaml.safe_load(f)
+                config.catalog.add_result(
+                    b_id,
+                    m_id,
+                    d_id,
+                    results.get("uid", None),
+                    results.get("inputs_hash", None),
+                )
@@ -13,7 +13,7 @@ from medperf.entities.dataset import Dataset
 from medperf.entities.benchmark import Benchmark
 from medperf.commands.dataset.create import DataPreparation
 from medperf.commands.result.create import BenchmarkExecution
-from medperf.utils import pretty_error, untar, get_file_sha1, storage_path
+from medperf.utils import pretty_error, untar, storage_path
 
 
 class CompatibilityTestExecution:
@@ -167,6 +167,7 @@ class CompatibilityTestExecution:
             cubes_storage = storage_path(config.cubes_storage)
             dst = os.path.join(cubes_storage, temp_uid)
             os.symlink(path, dst)
+            config.catalog.add_cube(temp_uid)
             logging.info(f"local cube will be linked to path: {dst}")
             cube_metadata_file = os.path.join(path, config.cube_metadata_filename)
             cube_hashes_filename = os.path.join(path, config.cube_hashes_filename)
@@ -220,10 +221,11 @@ class CompatibilityTestExecution:
         """
         dset_hash = self.demo_dataset_hash
         dset_url = self.demo_dataset_url
-        file_path = self.comms.get_benchmark_demo_dataset(dset_url, dset_hash)
+        file_path, file_hash = self.comms.get_benchmark_demo_dataset(
+            dset_url, dset_hash
+        )
 
         # Check demo dataset integrity
-        file_hash = get_file_sha1(file_path)
         # Alllow for empty datset hashes for benchmark registration purposes
         if dset_hash and file_hash != dset_hash:
             pretty_error("Demo dataset hash doesn't match expected hash", self.ui)
@@ -9,10 +9,12 @@ import medperf.config as config
 from medperf.comms.interface import Comms
 from medperf.entities.cube import Cube
 from medperf.entities.benchmark import Benchmark
+from medperf import profiling
 from medperf.utils import (
     check_cube_validity,
     generate_tmp_datapath,
     get_folder_sha1,
+    folder_manifest_path,
     get_stats,
     init_storage,
     pretty_error,
@@ -50,9 +52,11 @@ class DataPreparation:
         )
         preparation.validate()
         with preparation.ui.interactive():
-            preparation.get_prep_cube()
+            with profiling.span("get cubes"):
+                preparation.get_prep_cube()
             preparation.run_cube_tasks()
-        preparation.generate_uids()
+            with profiling.span("generate uids"):
+                preparation.generate_uids()
         preparation.to_permanent_path()
         preparation.write()
         return preparation.generated_uid
@@ -181,10 +185,14 @@ class DataPreparation:
             pretty_error("Data preparation failed", self.ui)
 
     def generate_uids(self):
-        """Auto-generates dataset UIDs for both input and output paths
+        """Auto-generates dataset UIDs for both input and output paths.
+        Only the input folder keeps a hash manifest, as the output is
+        always freshly generated
         """
-        self.in_uid = get_folder_sha1(self.data_path)
-        self.generated_uid = get_folder_sha1(self.out_datapath)
+        in_manifest = folder_manifest_path(self.data_path)
+        self.ui.text = "Generating dataset UIDs..."
+        self.in_uid = get_folder_sha1(self.data_path, in_manifest, self.ui)
+        self.generated_uid = get_folder_sha1(self.out_datapath, ui=self.ui)
         if self.run_test:
             self.in_uid = config.test_dset_prefix + self.in_uid
             self.generated_uid = config.test_dset_prefix + self.generated_uid
@@ -230,3 +238,4 @@ class DataPreparation:
         filepath = os.path.join(self.out_path, filename)
         with open(filepath, "w") as f:
             yaml.dump(data, f)
+        config.catalog.add_dataset(self.generated_uid)
@@ -2,10 +2,6 @@ import typer
 
 import medperf.config as config
 from medperf.decorators import clean_except
-from medperf.commands.dataset.list import DatasetsList
-from medperf.commands.dataset.create import DataPreparation
-from medperf.commands.dataset.submit import DatasetRegistration
-from medperf.commands.dataset.associate import AssociateDataset
 
 app = typer.Typer()
 
@@ -18,6 +14,8 @@ def datasets(
     """Lists all datasets from the user by default.
     Use all to get all datasets in the platform
     """
+    from medperf.commands.dataset.list import DatasetsList
+
     ui = config.ui
     comms = config.comms
     DatasetsList.run(comms, ui, all)
@@ -48,6 +46,8 @@ def create(
 ):
     """Runs the Data preparation step for a specified benchmark and raw dataset
     """
+    from medperf.commands.dataset.create import DataPreparation
+
     comms = config.comms
     ui = config.ui
     data_uid = DataPreparation.run(
@@ -77,6 +77,8 @@ def register(
 ):
     """Submits an unregistered Dataset instance to the backend
     """
+    from medperf.commands.dataset.submit import DatasetRegistration
+
     comms = config.comms
     ui = config.ui
     DatasetRegistration.run(data_uid, comms, ui, approved=approval)
@@ -100,6 +102,8 @@ def associate(
     """Associate a registered dataset with a specific benchmark.
     The dataset and benchmark must share the same data preparation cube.
     """
+    from medperf.commands.dataset.associate import AssociateDataset
+
     comms = config.comms
     ui = config.ui
     AssociateDataset.run(data_uid, benchmark_uid, comms, ui, approved=approval)
@@ -19,9 +19,9 @@ class DatasetsList:
         # Get local and remote datasets
         local_dsets = Dataset.all()
         if all:
-            remote_dsets = comms.get_datasets()
+            remote_dsets = list(comms.get_datasets())
         else:
-            remote_dsets = comms.get_user_datasets()
+            remote_dsets = list(comms.get_user_datasets())
 
         local_uids = set([dset.generated_uid for dset in local_dsets])
         remote_uids = set([dset["generated_uid"] for dset in remote_dsets])
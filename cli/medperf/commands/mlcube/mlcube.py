@@ -1,11 +1,7 @@
 import typer
 
 import medperf.config as config
-from medperf.utils import cleanup
 from medperf.decorators import clean_except
-from medperf.commands.mlcube.list import CubesList
-from medperf.commands.mlcube.submit import SubmitCube
-from medperf.commands.mlcube.associate import AssociateCube
 
 app = typer.Typer()
 
@@ -16,6 +12,8 @@ def list(all: bool = typer.Option(False, help="Display all mlcubes")):
     """List mlcubes registered by the user by default.
     Use "all" to display all mlcubes in the platform
     """
+    from medperf.commands.mlcube.list import CubesList
+
     comms = config.comms
     ui = config.ui
     CubesList.run(comms, ui, all)
@@ -46,6 +44,9 @@ def submit(
     image_hash: str = typer.Option("", "--image-hash", help="SHA1 of image file"),
 ):
     """Submits a new cube to the platform"""
+    from medperf.utils import cleanup
+    from medperf.commands.mlcube.submit import SubmitCube
+
     comms = config.comms
     ui = config.ui
     mlcube_info = {
@@ -70,6 +71,8 @@ def associate(
     approval: bool = typer.Option(False, "-y", help="Skip approval step"),
 ):
     """Associates an MLCube to a benchmark"""
+    from medperf.commands.mlcube.associate import AssociateCube
+
     comms = config.comms
     ui = config.ui
     AssociateCube.run(model_uid, benchmark_uid, comms, ui, approved=approval)
@@ -3,7 +3,7 @@ import validators
 from medperf.ui.interface import UI
 import medperf.config as config
 from medperf.comms.interface import Comms
-from medperf.utils import get_file_sha1, pretty_error
+from medperf.utils import pretty_error
 
 
 class SubmitCube:
@@ -95,15 +95,15 @@ class SubmitCube:
 
     def get_additional_hash(self):
         tmp_cube_uid = config.cube_submission_id
-        add_file_path = self.comms.get_cube_additional(
+        _, self.additional_hash = self.comms.get_cube_additional(
             self.additional_file, tmp_cube_uid
         )
-        self.additional_hash = get_file_sha1(add_file_path)
 
     def get_image_tarball_hash(self):
         tmp_cube_uid = "tmp_submission"
-        image_path = self.comms.get_cube_image(self.image_file, tmp_cube_uid)
-        self.image_tarball_hash = get_file_sha1(image_path)
+        _, self.image_tarball_hash = self.comms.get_cube_image(
+            self.image_file, tmp_cube_uid
+        )
 
     def todict(self):
         dict = {
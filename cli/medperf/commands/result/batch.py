@@ -0,0 +1,286 @@
+import queue
+import logging
+import threading
+from typing import List
+from tabulate import tabulate
+from concurrent.futures import ThreadPoolExecutor
+
+from medperf.ui.interface import UI
+from medperf.comms.interface import Comms
+from medperf.entities.cube import Cube
+from medperf.entities.result import Result
+from medperf.entities.dataset import Dataset
+from medperf.entities.benchmark import Benchmark
+from medperf.scheduler import TaskScheduler
+from medperf.commands.result.create import BenchmarkExecution
+from medperf.commands.result.submit import upload_results
+from medperf.utils import (
+    approval_prompt,
+    check_cube_validity,
+    init_storage,
+    pretty_error,
+)
+import medperf.config as config
+
+
+class BatchBenchmarkExecution:
+    @classmethod
+    def run(
+        cls,
+        benchmark_uid: int,
+        data_uids: List[str],
+        model_uids: List[int],
+        comms: Comms,
+        ui: UI,
+        all_models: bool = False,
+        approved: bool = False,
+        use_cache: bool = True,
+        force: bool = False,
+    ):
+        """Executes a benchmark for every combination of the given models and
+        datasets, and submits all the results at the end.
+
+        Args:
+            benchmark_uid (int): UID of the desired benchmark
+            data_uids (List[str]): Registered Dataset UIDs
+            model_uids (List[int]): UIDs of the models to execute
+            all_models (bool, optional): Execute every model associated with the benchmark. Defaults to False.
+            approved (bool, optional): Skip the results approval step. Defaults to False.
+            use_cache (bool, optional): Reuse cached model predictions. Defaults to True.
+            force (bool, optional): Execute even if up-to-date results were already submitted. Defaults to False.
+        """
+        batch = cls(
+            benchmark_uid, data_uids, model_uids, comms, ui, all_models, use_cache
+        )
+        batch.prepare()
+        batch.validate()
+        with batch.ui.interactive():
+            batch.get_cubes()
+            if not force:
+                batch.skip_cached()
+            if len(batch.executions) == 0:
+                batch.ui.print(
+                    "All the results are up to date. Use --force to execute again"
+                )
+                return
+            batch.run_executions()
+        batch.submit_results(approved)
+
+    def __init__(
+        self,
+        benchmark_uid: int,
+        data_uids: List[str],
+        model_uids: List[int],
+        comms: Comms,
+        ui: UI,
+        all_models: bool = False,
+        use_cache: bool = True,
+    ):
+        self.benchmark_uid = benchmark_uid
+        self.data_uids = data_uids
+        self.model_uids = model_uids or []
+        self.comms = comms
+        self.ui = ui
+        self.all_models = all_models
+        self.use_cache = use_cache
+        self.evaluator = None
+        self.model_cubes = {}
+        self.executions = []
+
+    def prepare(self):
+        init_storage()
+        # The benchmark is resolved once for the whole batch
+        self.benchmark = Benchmark.get(self.benchmark_uid, force_update=True)
+        self.ui.print(f"Benchmark Execution: {self.benchmark.name}")
+        if self.all_models:
+            self.model_uids = self.benchmark.models
+        # Remove duplicates while preserving the requested order
+        self.model_uids = list(dict.fromkeys(self.model_uids))
+        self.datasets = [Dataset(data_uid) for data_uid in self.data_uids]
+
+        for dataset in self.datasets:
+            for model_uid in self.model_uids:
+                execution = BenchmarkExecution(
+                    self.benchmark_uid,
+                    dataset.generated_uid,
+                    model_uid,
+                    self.comms,
+                    self.ui,
+                    use_cache=self.use_cache,
+                )
+                execution.benchmark = self.benchmark
+                execution.dataset = dataset
+                self.executions.append(execution)
+
+    def validate(self):
+        if len(self.model_uids) == 0:
+            pretty_error("No models were specified for execution.", self.ui)
+        for execution in self.executions:
+            execution.validate()
+
+    def get_cubes(self):
+        """Retrieves and validates the evaluator and every model cube once,
+        concurrently. All executions of the batch share these cubes.
+        """
+        self.ui.text = "Retrieving Evaluator and Model cubes"
+        evaluator_uid = self.benchmark.evaluator
+        with ThreadPoolExecutor(max_workers=config.download_workers) as pool:
+            evaluator = pool.submit(self.__get_cube, evaluator_uid, "Evaluator")
+            models = {
+                uid: pool.submit(self.__get_cube, uid, f"Model {uid}")
+                for uid in self.model_uids
+            }
+            self.evaluator = evaluator.result()
+            self.model_cubes = {uid: model.result() for uid, model in models.items()}
+
+        for execution in self.executions:
+            execution.evaluator = self.evaluator
+            execution.model_cube = self.model_cubes[execution.model_uid]
+
+    def __get_cube(self, uid: int, name: str) -> Cube:
+        cube = Cube.get(uid)
+        self.ui.print(f"> {name} cube download complete")
+        check_cube_validity(cube, self.ui)
+        return cube
+
+    def skip_cached(self):
+        """Removes from the batch the executions whose results were already
+        submitted and computed with the same cubes and dataset
+        """
+        # Only results of this benchmark can be cached
+        user_results = list(
+            self.comms.get_user_results(benchmark=self.benchmark_uid)
+        )
+        pending = []
+        for execution in self.executions:
+            if execution.is_cached(user_results):
+                self.ui.print(
+                    f"> Model {execution.model_uid} on dataset {execution.dataset.name}: "
+                    "up-to-date result already submitted"
+                )
+            else:
+                pending.append(execution)
+        self.executions = pending
+
+    def run_executions(self):
+        """Runs the executions of the batch as a two-stage pipeline. Models
+        infer concurrently, as many at a time as the task scheduler allows,
+        while a single evaluation stage evaluates their predictions. Finished
+        inferences are handed to the evaluation stage through a bounded queue;
+        when it is full, models wait before inferring on the next execution,
+        so predictions don't pile up faster than they are evaluated.
+        """
+        self.__completed = 0
+        self.__failed = []
+        self.__fatal = None
+        evaluations = queue.Queue(maxsize=config.predictions_queue_size)
+        scheduler = TaskScheduler(self.ui)
+        evaluation_stage = threading.Thread(
+            target=self.__evaluation_stage, args=(scheduler, evaluations)
+        )
+        evaluation_stage.start()
+        try:
+            with scheduler:
+                inferences = []
+                for execution in self.executions:
+                    name = f"infer_{self.__task_name(execution)}"
+                    logging.info(f"Scheduling {name}")
+                    inference = scheduler.submit(
+                        name, self.__infer, execution, evaluations
+                    )
+                    inferences.append(inference)
+                for inference in inferences:
+                    inference.result()
+        except BaseException as e:
+            # Let the evaluation stage drain the queue without evaluating
+            self.__fatal = e
+            raise
+        finally:
+            evaluations.put(None)
+            evaluation_stage.join()
+
+        if self.__fatal is not None:
+            raise self.__fatal
+        for execution, error in self.__failed:
+            execution.discard(error)
+        if len(self.__failed):
+            msg = f"{len(self.__failed)} benchmark executions failed"
+            pretty_error(msg, self.ui)
+
+    @staticmethod
+    def __infer(
+        ui: UI,
+        execution: BenchmarkExecution,
+        evaluations: queue.Queue,
+        log_file: str = None,
+    ):
+        error = None
+        try:
+            execution.run_inference(ui, log_file)
+        except RuntimeError as e:
+            error = e
+        # Blocks while the evaluation stage is behind
+        evaluations.put((execution, error))
+
+    def __evaluation_stage(self, scheduler: TaskScheduler, evaluations: queue.Queue):
+        # Keeps draining the queue until the end of the batch whatever happens,
+        # otherwise inferences would block forever on the bounded queue
+        while True:
+            item = evaluations.get()
+            if item is None:
+                return
+            execution, error = item
+            if self.__fatal is not None:
+                continue
+            try:
+                self.__evaluate(scheduler, execution, error)
+            except RuntimeError as e:
+                self.__failed.append((execution, e))
+            except BaseException as e:
+                self.__fatal = e
+
+    def __evaluate(
+        self, scheduler: TaskScheduler, execution: BenchmarkExecution, error=None
+    ):
+        if error is not None:
+            raise error
+        name = f"evaluate_{self.__task_name(execution)}"
+        scheduler.run(name, execution.run_evaluation)
+        execution.complete()
+        self.__completed += 1
+        self.ui.print(
+            f"[{self.__completed}/{len(self.executions)}] "
+            f"Model {execution.model_uid} on dataset {execution.dataset.name} complete"
+        )
+
+    @staticmethod
+    def __task_name(execution: BenchmarkExecution) -> str:
+        return f"model{execution.model_uid}_{execution.dataset.generated_uid}"
+
+    def submit_results(self, approved: bool = False):
+        """Submits the results of every execution after a single approval step
+
+        Args:
+            approved (bool, optional): Skip the approval step. Defaults to False.
+        """
+        results = [
+            Result(self.benchmark_uid, execution.dataset.uid, execution.model_uid)
+            for execution in self.executions
+        ]
+        headers = ["Benchmark UID", "Model UID", "Data UID", "Results"]
+        results_data = [
+            [result.benchmark_uid, result.model_uid, result.dataset_uid, result.results]
+            for result in results
+        ]
+        self.ui.print(tabulate(results_data, headers=headers))
+        self.ui.print("Above are the results generated by the models")
+
+        approved = approved or approval_prompt(
+            "Do you approve uploading all the presented results to the MLCommons comms? [Y/n]",
+            self.ui,
+        )
+        if not approved:
+            msg = "Results upload operation cancelled"
+            pretty_error(msg, self.ui, add_instructions=False)
+
+        upload_results(results, self.comms, self.ui)
@@ -1,11 +1,17 @@
 import os
+import hashlib
 import logging
+from typing import List
+from concurrent.futures import ThreadPoolExecutor
 
 from medperf.ui.interface import UI
 from medperf.comms.interface import Comms
 from medperf.entities.cube import Cube
 from medperf.entities.dataset import Dataset
 from medperf.entities.benchmark import Benchmark
+from medperf.entities.result import Result
+import medperf.predictions as predictions
+from medperf import profiling
 from medperf.utils import (
     check_cube_validity,
     init_storage,
@@ -27,6 +33,8 @@ class BenchmarkExecution:
         comms: Comms,
         ui: UI,
         run_test=False,
+        use_cache=True,
+        force=False,
     ):
         """Benchmark execution flow.
 
@@ -34,13 +42,33 @@ class BenchmarkExecution:
             benchmark_uid (int): UID of the desired benchmark
             data_uid (str): Registered Dataset UID
             model_uid (int): UID of model to execute
+            use_cache (bool, optional): Reuse cached predictions of the model on the dataset. Defaults to True.
+            force (bool, optional): Execute even if an up-to-date result was already submitted. Defaults to False.
+
+        Returns:
+            bool: Wether the benchmark was executed
         """
-        execution = cls(benchmark_uid, data_uid, model_uid, comms, ui, run_test)
+        execution = cls(
+            benchmark_uid, data_uid, model_uid, comms, ui, run_test, use_cache
+        )
         execution.prepare()
         execution.validate()
         with execution.ui.interactive():
-            execution.get_cubes()
+            with profiling.span("get cubes"):
+                execution.get_cubes()
+            if not run_test and not force:
+                with profiling.span("check results"):
+                    user_results = list(
+                        comms.get_user_results(benchmark=benchmark_uid, model=model_uid)
+                    )
+                if execution.is_cached(user_results):
+                    execution.ui.print(
+                        "> An up-to-date result was already submitted. "
+                        "Use --force to execute again"
+                    )
+                    return False
             execution.run_cubes()
+        return True
 
     def __init__(
         self,
@@ -50,6 +78,7 @@ class BenchmarkExecution:
         comms: Comms,
         ui: UI,
         run_test=False,
+        use_cache=True,
     ):
         self.benchmark_uid = benchmark_uid
         self.data_uid = data_uid
@@ -59,6 +88,8 @@ class BenchmarkExecution:
         self.evaluator = None
         self.model_cube = None
         self.run_test = run_test
+        self.use_cache = use_cache
+        self.__inputs_hash = None
 
     def prepare(self):
         init_storage()
@@ -88,54 +119,160 @@ class BenchmarkExecution:
 
     def get_cubes(self):
         evaluator_uid = self.benchmark.evaluator
-        self.evaluator = self.__get_cube(evaluator_uid, "Evaluator")
-        self.model_cube = self.__get_cube(self.model_uid, "Model")
+        self.ui.text = "Retrieving Evaluator and Model cubes"
+        # Both cubes are independent, so they are retrieved concurrently
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            evaluator = pool.submit(self.__get_cube, evaluator_uid, "Evaluator")
+            model_cube = pool.submit(self.__get_cube, self.model_uid, "Model")
+            self.evaluator = evaluator.result()
+            self.model_cube = model_cube.result()
 
     def __get_cube(self, uid: int, name: str) -> Cube:
-        self.ui.text = f"Retrieving {name} cube"
         cube = Cube.get(uid)
         self.ui.print(f"> {name} cube download complete")
         check_cube_validity(cube, self.ui)
         return cube
 
-    def run_cubes(self):
-        infer_timeout = config.infer_timeout
-        evaluate_timeout = config.evaluate_timeout
-        self.ui.text = "Running model inference on dataset"
+    @property
+    def preds_path(self) -> str:
         model_uid = str(self.model_cube.uid)
         data_uid = str(self.dataset.generated_uid)
         preds_path = os.path.join(config.predictions_storage, model_uid, data_uid)
-        preds_path = storage_path(preds_path)
-        data_path = self.dataset.data_path
-        labels_path = self.dataset.labels_path
+        return storage_path(preds_path)
+
+    @property
+    def result_data_uid(self) -> str:
         if not self.run_test:
-            out_path = results_path(
-                self.benchmark_uid, self.model_uid, self.dataset.uid
-            )
-        else:
-            out_path = results_path(
-                self.benchmark_uid, self.model_uid, self.dataset.generated_uid
-            )
+            return self.dataset.uid
+        return self.dataset.generated_uid
+
+    @property
+    def out_path(self) -> str:
+        return results_path(self.benchmark_uid, self.model_uid, self.result_data_uid)
+
+    def run_cubes(self):
+        self.ui.text = "Running model inference on dataset"
         try:
-            self.model_cube.run(
-                self.ui,
-                task="infer",
-                timeout=infer_timeout,
-                data_path=data_path,
-                output_path=preds_path,
-            )
+            self.run_inference(self.ui)
             self.ui.print("> Model execution complete")
 
             self.ui.text = "Evaluating results"
-            self.evaluator.run(
-                self.ui,
-                task="evaluate",
-                timeout=evaluate_timeout,
-                predictions=preds_path,
-                labels=labels_path,
-                output_path=out_path,
-            )
+            self.run_evaluation(self.ui)
         except RuntimeError as e:
-            logging.error(f"MLCube Execution failed: {e}")
-            cleanup([preds_path, out_path])
-            pretty_error("Benchmark execution failed", self.ui)
+            self.fail(e)
+        self.complete()
+
+    def run_inference(self, ui: UI, log_file: str = None):
+        """Runs the model cube on the dataset. If the predictions folder already
+        holds the output of the same model on the same dataset, inference is
+        skipped and those predictions are used instead.
+
+        Args:
+            ui (UI): UI used to display the progress of the cube
+            log_file (str, optional): file where the cube output is appended. Defaults to None.
+        """
+        preds_path = self.preds_path
+        key = predictions.prediction_key(
+            self.model_cube.fingerprint(), self.dataset.generated_uid
+        )
+        if self.use_cache and predictions.is_cached(preds_path, key):
+            logging.info(f"Using cached predictions at {preds_path}")
+            ui.print("> Using cached model predictions")
+            return
+
+        predictions.invalidate(preds_path)
+        self.model_cube.run(
+            ui,
+            task="infer",
+            timeout=config.infer_timeout,
+            log_file=log_file,
+            data_path=self.dataset.data_path,
+            output_path=preds_path,
+        )
+        predictions.save_manifest(preds_path, key)
+
+    def run_evaluation(self, ui: UI, log_file: str = None):
+        """Runs the evaluator cube on the predictions of the model
+
+        Args:
+            ui (UI): UI used to display the progress of the cube
+            log_file (str, optional): file where the cube output is appended. Defaults to None.
+        """
+        self.evaluator.run(
+            ui,
+            task="evaluate",
+            timeout=config.evaluate_timeout,
+            log_file=log_file,
+            predictions=self.preds_path,
+            labels=self.dataset.labels_path,
+            output_path=self.out_path,
+        )
+
+    def fail(self, error: Exception):
+        """Removes the outputs of a failed execution and stops the program
+
+        Args:
+            error (Exception): error raised by the failed cube
+        """
+        self.discard(error)
+        pretty_error("Benchmark execution failed", self.ui)
+
+    def discard(self, error: Exception):
+        """Removes the outputs of a failed execution
+
+        Args:
+            error (Exception): error raised by the failed cube
+        """
+        logging.error(f"MLCube Execution failed: {error}")
+        predictions.invalidate(self.preds_path)
+        cleanup([self.preds_path, self.out_path])
+
+    def complete(self):
+        """Stores the inputs hash next to the results of a successful execution
+        and registers them in the local catalog
+        """
+        result = Result(self.benchmark_uid, self.result_data_uid, self.model_uid)
+        result.set_inputs_hash(self.inputs_hash())
+
+    def inputs_hash(self) -> str:
+        """Computes a hash of everything the result depends on: the evaluator
+        and model cubes and the prepared dataset
+
+        Returns:
+            str: sha1 hash of the execution inputs
+        """
+        if self.__inputs_hash is None:
+            evaluator = self.evaluator.fingerprint()
+            model = self.model_cube.fingerprint()
+            data_uid = self.dataset.generated_uid
+            sha1 = hashlib.sha1()
+            sha1.update(f"{evaluator}\n{model}\n{data_uid}".encode("utf-8"))
+            self.__inputs_hash = sha1.hexdigest()
+        return self.__inputs_hash
+
+    def is_cached(self, user_results: List[dict]) -> bool:
+        """Checks if a result computed with the same inputs was already submitted,
+        either from this machine or found among the user results on the server
+
+        Args:
+            user_results (List[dict]): results registered by the user on the server
+
+        Returns:
+            bool: Wether the execution can be skipped
+        """
+        inputs_hash = self.inputs_hash()
+        ids = [str(self.benchmark_uid), str(self.model_uid), str(self.result_data_uid)]
+        local_entry = config.catalog.find_result(*ids)
+        if local_entry is not None:
+            uid, local_hash = local_entry
+            if uid is not None and local_hash == inputs_hash:
+                logging.info(f"Result {uid} is up to date")
+                return True
+
+        for result in user_results:
+            result_ids = [str(result[key]) for key in ["benchmark", "model", "dataset"]]
+            metadata = result.get("metadata") or {}
+            if result_ids == ids and metadata.get("inputs_hash") == inputs_hash:
+                logging.info(f"Result {result.get('id')} in the server is up to date")
+                return True
+        return False
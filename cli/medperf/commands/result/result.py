@@ -2,9 +2,6 @@ import typer
 
 import medperf.config as config
 from medperf.decorators import clean_except
-from medperf.commands.result.list import ResultsList
-from medperf.commands.result.create import BenchmarkExecution
-from medperf.commands.result.submit import ResultSubmission
 
 app = typer.Typer()
 
@@ -24,6 +21,8 @@ def create(
 ):
     """Runs the benchmark execution step for a given benchmark, prepared dataset and model
     """
+    from medperf.commands.result.create import BenchmarkExecution
+
     comms = config.comms
     ui = config.ui
     BenchmarkExecution.run(benchmark_uid, data_uid, model_uid, comms, ui)
@@ -34,22 +33,34 @@ def create(
 @clean_except
 def submit(
     benchmark_uid: int = typer.Option(
-        ..., "--benchmark", "-b", help="UID of the executed benchmark"
+        None, "--benchmark", "-b", help="UID of the executed benchmark"
     ),
     data_uid: str = typer.Option(
-        ..., "--data_uid", "-d", help="UID of the dataset used for results"
+        None, "--data_uid", "-d", help="UID of the dataset used for results"
     ),
     model_uid: int = typer.Option(
-        ..., "--model_uid", "-m", help="UID of the executed model"
+        None, "--model_uid", "-m", help="UID of the executed model"
+    ),
+    pending: bool = typer.Option(
+        False, "--pending", help="Submit every local result not submitted yet"
     ),
     approval: bool = typer.Option(False, "-y", help="Skip approval step"),
 ):
     """Submits already obtained results to the server"""
+    from medperf.utils import pretty_error
+    from medperf.commands.result.submit import ResultSubmission
+
     comms = config.comms
     ui = config.ui
-    ResultSubmission.run(
-        benchmark_uid, data_uid, model_uid, comms, ui, approved=approval
-    )
+    if pending:
+        ResultSubmission.run_pending(comms, ui, approved=approval)
+    elif None in [benchmark_uid, data_uid, model_uid]:
+        msg = "A benchmark, dataset and model must be given, unless using --pending"
+        pretty_error(msg, ui, add_instructions=False)
+    else:
+        ResultSubmission.run(
+            benchmark_uid, data_uid, model_uid, comms, ui, approved=approval
+        )
     ui.print("✅ Done!")
 
 
@@ -57,6 +68,8 @@ def submit(
 @clean_except
 def list():
     """List results stored locally and remotely from the user"""
+    from medperf.commands.result.list import ResultsList
+
     comms = config.comms
     ui = config.ui
     ResultsList.run(comms, ui)
@@ -1,9 +1,36 @@
+import logging
+from typing import List
+from tabulate import tabulate
+
 from medperf.utils import pretty_error, dict_pretty_print, approval_prompt
 from medperf.entities.result import Result
 from medperf.entities.dataset import Dataset
+from medperf.comms.interface import Comms
+from medperf.ui.interface import UI
 from medperf.enums import Status
 
 
+def upload_results(results: List[Result], comms: Comms, ui: UI):
+    """Uploads several results in batches, and reports the ones that the
+    server rejected once every batch has been submitted
+
+    Args:
+        results (List[Result]): results to upload
+        comms (Comms): Instance of the communications interface.
+        ui (UI): Instance of the UI interface.
+    """
+    failed = Result.upload_all(results, comms)
+    if not failed:
+        return
+    for result, errors in failed:
+        logging.error(f"Result {result.todict()['name']} was rejected: {errors}")
+        ui.print(
+            f"Results of model {result.model_uid} on dataset {result.dataset_uid}"
+            f" were rejected: {errors}"
+        )
+    pretty_error(f"{len(failed)} of {len(results)} results couldn't be uploaded", ui)
+
+
 class ResultSubmission:
     @classmethod
     def run(cls, benchmark_uid, data_uid, model_uid, comms, ui, approved=False):
@@ -11,6 +38,39 @@ class ResultSubmission:
         sub = cls(benchmark_uid, dset.uid, model_uid, comms, ui, approved=approved)
         sub.upload_results()
 
+    @classmethod
+    def run_pending(cls, comms: Comms, ui: UI, approved: bool = False):
+        """Submits every local result that hasn't been submitted yet, after
+        a single approval step
+
+        Args:
+            comms (Comms): Instance of the communications interface.
+            ui (UI): Instance of the UI interface.
+            approved (bool, optional): Skip the approval step. Defaults to False.
+        """
+        results = Result.all(pending=True)
+        if not results:
+            ui.print("There are no pending results to submit")
+            return
+
+        headers = ["Benchmark UID", "Model UID", "Data UID", "Results"]
+        results_data = [
+            [result.benchmark_uid, result.model_uid, result.dataset_uid, result.results]
+            for result in results
+        ]
+        ui.print(tabulate(results_data, headers=headers))
+        ui.print("Above are the results pending submission")
+
+        approved = approved or approval_prompt(
+            "Do you approve uploading all the presented results to the MLCommons comms? [Y/n]",
+            ui,
+        )
+        if not approved:
+            msg = "Results upload operation cancelled"
+            pretty_error(msg, ui, add_instructions=False)
+
+        upload_results(results, comms, ui)
+
     def __init__(self, benchmark_uid, data_uid, model_uid, comms, ui, approved=False):
         self.benchmark_uid = benchmark_uid
         self.data_uid = data_uid
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Iterator, List, Tuple
 from abc import ABC, abstractmethod
 
 from medperf.ui.interface import UI
@@ -16,6 +16,12 @@ class Comms(ABC):
             token (str, Optional): authentication token to be used throughout communication. Defaults to None.
         """
 
+    @abstractmethod
+    def close(self):
+        """Release any resource held by the communication instance,
+        like open connections. Called once when the CLI process finishes.
+        """
+
     @abstractmethod
     def login(self, ui: UI):
         """Authenticate the comms instance for further interactions
@@ -65,11 +71,11 @@ class Comms(ABC):
         """
 
     @abstractmethod
-    def get_benchmarks(self) -> List[dict]:
+    def get_benchmarks(self) -> Iterator[dict]:
         """Retrieves all benchmarks in the platform.
 
         Returns:
-            List[dict]: all benchmarks information.
+            Iterator[dict]: all benchmarks information.
         """
 
     @abstractmethod
@@ -95,30 +101,49 @@ class Comms(ABC):
         """
 
     @abstractmethod
-    def get_benchmark_demo_dataset(self, demo_data_url: str) -> str:
+    def get_benchmark_leaderboard(
+        self, benchmark_uid: int, metrics: List[str] = None, approval_status: str = None
+    ) -> Iterator[dict]:
+        """Retrieves the aggregated metrics of each model in a benchmark
+
+        Args:
+            benchmark_uid (int): UID of the desired benchmark
+            metrics (List[str], optional): Metrics to retrieve. Defaults to all.
+            approval_status (str, optional): Only retrieve results with this status. Defaults to all.
+
+        Returns:
+            Iterator[dict]: count, mean, min and max of a metric, per model and approval status
+        """
+
+    @abstractmethod
+    def get_benchmark_demo_dataset(
+        self, demo_data_url: str, uid: str = None
+    ) -> Tuple[str, str]:
         """Downloads the benchmark demo dataset and stores it in the user's machine
 
         Args:
             demo_data_url (str): location of demo data for download
+            uid (str, optional): UID to use for storing the demo dataset.
 
         Returns:
             str: path where the downloaded demo dataset can be found
+            str: SHA1 hash of the downloaded demo dataset
         """
 
     @abstractmethod
-    def get_user_benchmarks(self) -> List[dict]:
+    def get_user_benchmarks(self) -> Iterator[dict]:
         """Retrieves all benchmarks created by the user
 
         Returns:
-            List[dict]: Benchmarks data
+            Iterator[dict]: Benchmarks data
         """
 
     @abstractmethod
-    def get_cubes(self) -> List[dict]:
+    def get_cubes(self) -> Iterator[dict]:
         """Retrieves all MLCubes in the platform
 
         Returns:
-            List[dict]: List containing the data of all MLCubes
+            Iterator[dict]: data of all MLCubes
         """
 
     @abstractmethod
@@ -145,11 +170,11 @@ class Comms(ABC):
         """
 
     @abstractmethod
-    def get_user_cubes(self) -> List[dict]:
+    def get_user_cubes(self) -> Iterator[dict]:
         """Retrieves metadata from all cubes registered by the user
 
         Returns:
-            List[dict]: List of dictionaries containing the mlcubes registration information
+            Iterator[dict]: dictionaries containing the mlcubes registration information
         """
 
     @abstractmethod
@@ -165,7 +190,7 @@ class Comms(ABC):
         """
 
     @abstractmethod
-    def get_cube_additional(self, url: str, cube_uid: int) -> str:
+    def get_cube_additional(self, url: str, cube_uid: int) -> Tuple[str, str]:
         """Retrieves and stores the additional_files.tar.gz file from the server
 
         Args:
@@ -174,6 +199,7 @@ class Comms(ABC):
 
         Returns:
             str: Location where the additional_files.tar.gz file is stored locally.
+            str: SHA1 hash of the additional_files.tar.gz file.
         """
 
     @abstractmethod
@@ -188,7 +214,7 @@ class Comms(ABC):
         """
 
     @abstractmethod
-    def get_cube_image(self, url: str, cube_uid: int) -> str:
+    def get_cube_image(self, url: str, cube_uid: int) -> Tuple[str, str]:
         """Retrieves and stores the image file from the server
 
         Args:
@@ -197,6 +223,35 @@ class Comms(ABC):
 
         Returns:
             str: Location where the image file is stored locally.
+            str: SHA1 hash of the image file.
+        """
+
+    @abstractmethod
+    def extract_cube_additional(self, url: str, cube_uid: int) -> Tuple[str, str]:
+        """Retrieves the additional_files.tar.gz file from the server and extracts
+        it while it is being downloaded. The tarball itself is not stored.
+
+        Args:
+            url (str): URL where the additional_files.tar.gz file can be downloaded.
+            cube_uid (int): Cube UID.
+
+        Returns:
+            str: Location where the additional files are extracted.
+            str: SHA1 hash of the additional_files.tar.gz file.
+        """
+
+    @abstractmethod
+    def extract_cube_image(self, url: str, cube_uid: int) -> Tuple[str, str]:
+        """Retrieves the image file from the server and extracts it while it is
+        being downloaded. The image tarball itself is not stored.
+
+        Args:
+            url (str): URL where the image file can be downloaded.
+            cube_uid (int): Cube UID.
+
+        Returns:
+            str: Location where the image is extracted.
+            str: SHA1 hash of the image file.
         """
 
     @abstractmethod
@@ -211,11 +266,11 @@ class Comms(ABC):
         """
 
     @abstractmethod
-    def get_datasets(self) -> List[dict]:
+    def get_datasets(self) -> Iterator[dict]:
         """Retrieves all datasets in the platform
 
         Returns:
-            List[dict]: List of data from all datasets
+            Iterator[dict]: data from all datasets
         """
 
     @abstractmethod
@@ -230,11 +285,11 @@ class Comms(ABC):
         """
 
     @abstractmethod
-    def get_user_datasets(self) -> dict:
+    def get_user_datasets(self) -> Iterator[dict]:
         """Retrieves all datasets registered by the user
 
         Returns:
-            dict: dictionary with the contents of each dataset registration query
+            Iterator[dict]: dictionaries with the contents of each dataset registration query
         """
 
     @abstractmethod
@@ -260,11 +315,14 @@ class Comms(ABC):
         """
 
     @abstractmethod
-    def get_user_results(self) -> dict:
+    def get_user_results(self, **filters) -> Iterator[dict]:
         """Retrieves all results registered by the user
 
+        Args:
+            filters (dict): only retrieve results matching these fields, e.g. benchmark=1
+
         Returns:
-            dict: dictionary with the contents of each dataset registration query
+            Iterator[dict]: dictionaries with the contents of each result
         """
 
     @abstractmethod
@@ -278,6 +336,17 @@ class Comms(ABC):
             int: id of the generated results entry
         """
 
+    @abstractmethod
+    def upload_results_bulk(self, results: List[dict]) -> List[dict]:
+        """Uploads several results with a single request
+
+        Args:
+            results (List[dict]): Dictionaries containing results information.
+
+        Returns:
+            List[dict]: status of each result, with its id if it was created or the errors otherwise
+        """
+
     @abstractmethod
     def associate_dset(self, data_uid: int, benchmark_uid: int, metadata: dict = {}):
         """Create a Dataset Benchmark association
@@ -323,17 +392,17 @@ class Comms(ABC):
         """
 
     @abstractmethod
-    def get_datasets_associations(self) -> List[dict]:
+    def get_datasets_associations(self) -> Iterator[dict]:
         """Get all dataset associations related to the current user
 
         Returns:
-            List[dict]: List containing all associations information
+            Iterator[dict]: all associations information
         """
 
     @abstractmethod
-    def get_cubes_associations(self) -> List[dict]:
+    def get_cubes_associations(self) -> Iterator[dict]:
         """Get all cube associations related to the current user
 
         Returns:
-            List[dict]: List containing all associations information
+            Iterator[dict]: all associations information
         """
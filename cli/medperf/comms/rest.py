@@ -1,18 +1,27 @@
-from typing import List
+import json
+import hashlib
+import tarfile
+from typing import Iterator, List, Tuple
+import yaml
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 import os
 
+from medperf import profiling
 from medperf.enums import Role, Status
 import medperf.config as config
 from medperf.ui.interface import UI
 from medperf.comms.interface import Comms
+from medperf.comms.stream import ResponseStream
 from medperf.utils import (
     pretty_error,
     cube_path,
+    get_file_sha1,
     storage_path,
     generate_tmp_uid,
     sanitize_json,
+    extract_members,
 )
 
 
@@ -25,6 +34,31 @@ class REST(Comms):
         if self.cert is None:
             # No certificate provided, default to normal verification
             self.cert = True
+        self.session = self.__build_session()
+
+    def __build_session(self) -> requests.Session:
+        """Creates the session shared by every request issued by this instance.
+        Connections are kept alive and pooled per host, so consecutive calls
+        to the server or to file hosts reuse the same TCP+TLS connection.
+
+        Returns:
+            requests.Session: session with pooled adapters mounted
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=config.http_pool_connections,
+            pool_maxsize=config.http_pool_maxsize,
+            max_retries=config.http_max_retries,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self):
+        """Closes the underlying session and all of its pooled connections
+        """
+        logging.debug("Closing REST session")
+        self.session.close()
 
     def __parse_url(self, url):
         url_sections = url.split("://")
@@ -43,7 +77,9 @@ class REST(Comms):
             pwd (str): Password
         """
         body = {"username": user, "password": pwd}
-        res = self.__req(f"{self.server_url}/auth-token/", requests.post, json=body)
+        res = self.__req(
+            f"{self.server_url}/auth-token/", self.session.post, json=body
+        )
         if res.status_code != 200:
             pretty_error("Unable to authenticate user with provided credentials", ui)
         else:
@@ -77,26 +113,28 @@ class REST(Comms):
             )
 
     def __auth_get(self, url, **kwargs):
-        return self.__auth_req(url, requests.get, **kwargs)
+        return self.__auth_req(url, self.session.get, **kwargs)
 
     def __auth_post(self, url, **kwargs):
-        return self.__auth_req(url, requests.post, **kwargs)
+        return self.__auth_req(url, self.session.post, **kwargs)
 
     def __auth_put(self, url, **kwargs):
-        return self.__auth_req(url, requests.put, **kwargs)
+        return self.__auth_req(url, self.session.put, **kwargs)
 
     def __auth_req(self, url, req_func, **kwargs):
         if self.token is None:
             self.authenticate()
-        return self.__req(
-            url, req_func, headers={"Authorization": f"Token {self.token}"}, **kwargs
-        )
+        headers = {"Authorization": f"Token {self.token}", **kwargs.pop("headers", {})}
+        return self.__req(url, req_func, headers=headers, **kwargs)
 
     def __req(self, url, req_func, **kwargs):
         if "json" in kwargs:
             kwargs["json"] = sanitize_json(kwargs["json"])
         try:
-            return req_func(url, verify=self.cert, **kwargs)
+            with profiling.span("request", url=url) as span:
+                res = req_func(url, verify=self.cert, **kwargs)
+                span.add_bytes(int(res.headers.get("Content-Length", 0)))
+            return res
         except requests.exceptions.SSLError as e:
             logging.error(f"Couldn't connect to {self.server_url}: {e}")
             pretty_error(
@@ -105,6 +143,75 @@ class REST(Comms):
                 self.ui,
             )
 
+    def __get_list(self, url: str, error_msg: str, **params) -> Iterator[dict]:
+        """Retrieves the entries of a paginated list endpoint. The first page
+        is requested right away, so that errors are reported when calling this
+        method. The rest of the pages are requested as the entries are consumed.
+
+        Args:
+            url (str): URL of the list endpoint
+            error_msg (str): error to display if a page can't be retrieved
+            params (dict): filters to apply to the list
+
+        Returns:
+            Iterator[dict]: entries of the list
+        """
+        kwargs = {"params": params} if params else {}
+        page = self.__get_page(url, error_msg, **kwargs)
+        return self.__iter_pages(page, error_msg)
+
+    def __get_page(self, url: str, error_msg: str, **kwargs) -> dict:
+        res = self.__auth_get(url, **kwargs)
+        if res.status_code != 200:
+            logging.error(res.json())
+            pretty_error(error_msg, self.ui)
+        page = res.json()
+        # Servers without pagination return the whole list
+        if isinstance(page, list):
+            page = {"next": None, "results": page}
+        return page
+
+    def __iter_pages(self, page: dict, error_msg: str) -> Iterator[dict]:
+        while True:
+            yield from page["results"]
+            if not page["next"]:
+                return
+            page = self.__get_page(page["next"], error_msg)
+
+    def __get_resource(self, url: str, error_msg: str) -> dict:
+        """Retrieves a resource that rarely changes. The last response is kept
+        in the local catalog, and its validators are sent with the request so
+        that the server can answer 304 Not Modified if the resource didn't change.
+
+        Args:
+            url (str): URL of the resource
+            error_msg (str): error to display if the resource can't be retrieved
+
+        Returns:
+            dict: the resource
+        """
+        stored = config.catalog.get_response(url) if config.catalog else None
+        if stored is None:
+            res = self.__auth_get(url)
+        else:
+            etag, last_modified, body = stored
+            headers = {"If-None-Match": etag, "If-Modified-Since": last_modified}
+            headers = {key: value for key, value in headers.items() if value}
+            res = self.__auth_get(url, headers=headers)
+            if res.status_code == 304:
+                logging.debug(f"{url} not modified. Using stored response")
+                return json.loads(body)
+
+        if res.status_code != 200:
+            logging.error(res.json())
+            pretty_error(error_msg, self.ui)
+        resource = res.json()
+        etag = res.headers.get("ETag")
+        last_modified = res.headers.get("Last-Modified")
+        if config.catalog and (etag or last_modified):
+            config.catalog.add_response(url, etag, last_modified, json.dumps(resource))
+        return resource
+
     def __set_approval_status(self, url: str, status: str) -> requests.Response:
         """Sets the approval status of a resource
 
@@ -128,14 +235,10 @@ class REST(Comms):
         Returns:
             Role: the association type between current user and benchmark
         """
-        res = self.__auth_get(f"{self.server_url}/me/benchmarks")
-        if res.status_code != 200:
-            logging.error(res.json())
-            pretty_error(
-                "there was an error retrieving the current user's benchmarks", self.ui
-            )
-
-        benchmarks = res.json()
+        benchmarks = self.__get_list(
+            f"{self.server_url}/me/benchmarks",
+            "there was an error retrieving the current user's benchmarks",
+        )
         bm_dict = {bm["benchmark"]: bm for bm in benchmarks}
         rolename = None
         if benchmark_uid in bm_dict:
@@ -156,18 +259,15 @@ class REST(Comms):
         assoc_role = self.benchmark_association(benchmark_uid)
         return assoc_role.name == role
 
-    def get_benchmarks(self) -> List[dict]:
+    def get_benchmarks(self) -> Iterator[dict]:
         """Retrieves all benchmarks in the platform.
 
         Returns:
-            List[dict]: all benchmarks information.
+            Iterator[dict]: all benchmarks information.
         """
-        res = self.__auth_get(f"{self.server_url}/benchmarks/")
-        if res.status_code != 200:
-            logging.error(res.json())
-            pretty_error("couldn't retrieve benchmarks", self.ui)
-        benchmarks = res.json()
-        return benchmarks
+        return self.__get_list(
+            f"{self.server_url}/benchmarks/", "couldn't retrieve benchmarks"
+        )
 
     def get_benchmark(self, benchmark_uid: int) -> dict:
         """Retrieves the benchmark specification file from the server
@@ -178,12 +278,10 @@ class REST(Comms):
         Returns:
             dict: benchmark specification
         """
-        res = self.__auth_get(f"{self.server_url}/benchmarks/{benchmark_uid}")
-        if res.status_code != 200:
-            logging.error(res.json())
-            pretty_error("the specified benchmark doesn't exist", self.ui)
-        benchmark = res.json()
-        return benchmark
+        return self.__get_resource(
+            f"{self.server_url}/benchmarks/{benchmark_uid}",
+            "the specified benchmark doesn't exist",
+        )
 
     def get_benchmark_models(self, benchmark_uid: int) -> List[int]:
         """Retrieves all the models associated with a benchmark. reference model not included
@@ -194,19 +292,40 @@ class REST(Comms):
         Returns:
             list[int]: List of model UIDS
         """
-        res = self.__auth_get(f"{self.server_url}/benchmarks/{benchmark_uid}/models")
-        if res.status_code != 200:
-            logging.error(res.json())
-            pretty_error(
-                "couldn't retrieve models for the specified benchmark", self.ui
-            )
-        models = res.json()
+        models = self.__get_list(
+            f"{self.server_url}/benchmarks/{benchmark_uid}/models",
+            "couldn't retrieve models for the specified benchmark",
+        )
         model_uids = [model["id"] for model in models]
         return model_uids
 
+    def get_benchmark_leaderboard(
+        self, benchmark_uid: int, metrics: List[str] = None, approval_status: str = None
+    ) -> Iterator[dict]:
+        """Retrieves the aggregated metrics of each model in a benchmark
+
+        Args:
+            benchmark_uid (int): UID of the desired benchmark
+            metrics (List[str], optional): Metrics to retrieve. Defaults to all.
+            approval_status (str, optional): Only retrieve results with this status. Defaults to all.
+
+        Returns:
+            Iterator[dict]: count, mean, min and max of a metric, per model and approval status
+        """
+        filters = {}
+        if metrics:
+            filters["metrics"] = ",".join(metrics)
+        if approval_status:
+            filters["approval_status"] = approval_status
+        return self.__get_list(
+            f"{self.server_url}/benchmarks/{benchmark_uid}/leaderboard/",
+            "couldn't retrieve the leaderboard of the specified benchmark",
+            **filters,
+        )
+
     def get_benchmark_demo_dataset(
         self, demo_data_url: str, uid: str = generate_tmp_uid()
-    ) -> str:
+    ) -> Tuple[str, str]:
         """Downloads the benchmark demo dataset and stores it in the user's machine
 
         Args:
@@ -215,6 +334,7 @@ class REST(Comms):
 
         Returns:
             str: path where the downloaded demo dataset can be found
+            str: SHA1 hash of the downloaded demo dataset
         """
         tmp_dir = storage_path(config.demo_data_storage)
         demo_data_path = os.path.join(tmp_dir, uid)
@@ -223,41 +343,31 @@ class REST(Comms):
 
         # Don't re-download if something already exists with same uid
         if os.path.exists(filepath):
-            return filepath
-
-        res = requests.get(demo_data_url)
-        if res.status_code != 200:
-            logging.error(res.json())
-            pretty_error("couldn't download the demo dataset", self.ui)
-
-        os.makedirs(demo_data_path, exist_ok=True)
+            return filepath, get_file_sha1(filepath)
 
-        open(filepath, "wb+").write(res.content)
-        return filepath
+        return self.__download(demo_data_url, filepath)
 
-    def get_user_benchmarks(self) -> List[dict]:
+    def get_user_benchmarks(self) -> Iterator[dict]:
         """Retrieves all benchmarks created by the user
 
         Returns:
-            List[dict]: Benchmarks data
+            Iterator[dict]: Benchmarks data
         """
-        res = self.__auth_get(f"{self.server_url}/me/benchmarks/")
-        if res.status_code != 200:
-            logging.error(res.json())
-            pretty_error("wasn't able to retrieve user benchmarks", self.ui)
-        return res.json()
+        return self.__get_list(
+            f"{self.server_url}/me/benchmarks/",
+            "wasn't able to retrieve user benchmarks",
+        )
 
-    def get_cubes(self) -> List[dict]:
+    def get_cubes(self) -> Iterator[dict]:
         """Retrieves all MLCubes in the platform
 
         Returns:
-            List[dict]: List containing the data of all MLCubes
+            Iterator[dict]: data of all MLCubes
         """
-        res = self.__auth_get(f"{self.server_url}/mlcubes/")
-        if res.status_code != 200:
-            logging.error(res.json())
-            pretty_error("couldn't retrieve mlcubes from the platform", config.ui)
-        return res.json()
+        return self.__get_list(
+            f"{self.server_url}/mlcubes/",
+            "couldn't retrieve mlcubes from the platform",
+        )
 
     def get_cube_metadata(self, cube_uid: int) -> dict:
         """Retrieves metadata about the specified cube
@@ -268,12 +378,9 @@ class REST(Comms):
         Returns:
             dict: Dictionary containing url and hashes for the cube files
         """
-        res = self.__auth_get(f"{self.server_url}/mlcubes/{cube_uid}/")
-        if res.status_code != 200:
-            logging.error(res.json())
-            pretty_error("the specified cube doesn't exist", self.ui)
-        metadata = res.json()
-        return metadata
+        return self.__get_resource(
+            f"{self.server_url}/mlcubes/{cube_uid}/", "the specified cube doesn't exist"
+        )
 
     def get_cube(self, url: str, cube_uid: int) -> str:
         """Downloads and writes an mlcube.yaml file from the server
@@ -286,20 +393,19 @@ class REST(Comms):
             str: location where the mlcube.yaml file is stored locally.
         """
         cube_file = config.cube_filename
-        return self.__get_cube_file(url, cube_uid, "", cube_file)
+        filepath, _ = self.__get_cube_file(url, cube_uid, "", cube_file)
+        return filepath
 
-    def get_user_cubes(self) -> List[dict]:
+    def get_user_cubes(self) -> Iterator[dict]:
         """Retrieves metadata from all cubes registered by the user
 
         Returns:
-            List[dict]: List of dictionaries containing the mlcubes registration information
+            Iterator[dict]: dictionaries containing the mlcubes registration information
         """
-        res = self.__auth_get(f"{self.server_url}/me/mlcubes/")
-        if res.status_code != 200:
-            logging.error(res.json())
-            pretty_error("couldn't retrieve mlcubes created by the user", self.ui)
-        data = res.json()
-        return data
+        return self.__get_list(
+            f"{self.server_url}/me/mlcubes/",
+            "couldn't retrieve mlcubes created by the user",
+        )
 
     def get_cube_params(self, url: str, cube_uid: int) -> str:
         """Retrieves the cube parameters.yaml file from the server
@@ -313,9 +419,10 @@ class REST(Comms):
         """
         ws = config.workspace_path
         params_file = config.params_filename
-        return self.__get_cube_file(url, cube_uid, ws, params_file)
+        filepath, _ = self.__get_cube_file(url, cube_uid, ws, params_file)
+        return filepath
 
-    def get_cube_additional(self, url: str, cube_uid: int) -> str:
+    def get_cube_additional(self, url: str, cube_uid: int) -> Tuple[str, str]:
         """Retrieves and stores the additional_files.tar.gz file from the server
 
         Args:
@@ -324,12 +431,13 @@ class REST(Comms):
 
         Returns:
             str: Location where the additional_files.tar.gz file is stored locally.
+            str: SHA1 hash of the additional_files.tar.gz file.
         """
         add_path = config.additional_path
         tball_file = config.tarball_filename
         return self.__get_cube_file(url, cube_uid, add_path, tball_file)
 
-    def get_cube_image(self, url: str, cube_uid: int) -> str:
+    def get_cube_image(self, url: str, cube_uid: int) -> Tuple[str, str]:
         """Retrieves and stores the image file from the server
 
         Args:
@@ -338,27 +446,356 @@ class REST(Comms):
 
         Returns:
             str: Location where the image file is stored locally.
+            str: SHA1 hash of the image file.
         """
         image_path = config.image_path
         image_name = url.split("/")[-1]
         return self.__get_cube_file(url, cube_uid, image_path, image_name)
 
-    def __get_cube_file(self, url: str, cube_uid: int, path: str, filename: str):
-        res = requests.get(url)
+    def extract_cube_additional(self, url: str, cube_uid: int) -> Tuple[str, str]:
+        """Retrieves the additional_files.tar.gz file from the server and extracts
+        it while it is being downloaded. The tarball itself is not stored.
+
+        Args:
+            url (str): URL where the additional_files.tar.gz file can be downloaded.
+            cube_uid (int): Cube UID.
+
+        Returns:
+            str: Location where the additional files are extracted.
+            str: SHA1 hash of the additional_files.tar.gz file.
+        """
+        add_path = os.path.join(cube_path(cube_uid), config.additional_path)
+        return self.__download_and_extract(url, add_path)
+
+    def extract_cube_image(self, url: str, cube_uid: int) -> Tuple[str, str]:
+        """Retrieves the image file from the server and extracts it while it is
+        being downloaded. The image tarball itself is not stored.
+
+        Args:
+            url (str): URL where the image file can be downloaded.
+            cube_uid (int): Cube UID.
+
+        Returns:
+            str: Location where the image is extracted.
+            str: SHA1 hash of the image file.
+        """
+        image_path = os.path.join(cube_path(cube_uid), config.image_path)
+        return self.__download_and_extract(url, image_path)
+
+    def __get_cube_file(
+        self, url: str, cube_uid: int, path: str, filename: str
+    ) -> Tuple[str, str]:
+        c_path = cube_path(cube_uid)
+        filepath = os.path.join(c_path, path, filename)
+        return self.__download(url, filepath)
+
+    def __download(self, url: str, filepath: str) -> Tuple[str, str]:
+        """Streams the file at the given url to disk. The response is written
+        in chunks of config.download_chunk_size bytes to a temporary file, which
+        is renamed to the final location once the download is complete. This
+        keeps memory usage bounded regardless of the size of the file.
+
+        The SHA1 hash of the file is computed over the chunks as they arrive,
+        so callers don't need to read the file again to verify it.
+
+        Downloads are resumable. The temporary file is kept alongside a state
+        file recording the url, expected size and validator of the response.
+        Interrupted transfers are retried up to config.download_retries times,
+        and later invocations continue from where the previous one stopped
+        through HTTP Range requests. The whole file is only fetched again if the
+        server reports that it changed. Requests failing to connect or timing
+        out are retried as well.
+
+        Args:
+            url (str): URL of the file to download
+            filepath (str): Location where the downloaded file will be stored
+
+        Returns:
+            str: location of the downloaded file
+            str: SHA1 hash of the downloaded file
+        """
+        part_filepath = filepath + config.partial_download_suffix
+        state_filepath = part_filepath + config.download_state_suffix
+
+        sha1 = hashlib.sha1()
+        offset = 0
+        state = self.__load_download_state(url, state_filepath)
+        if state is not None and state["resumable"]:
+            offset = self.__checkpoint_partial_file(part_filepath, sha1)
+        complete = state is not None and offset == state["size"]
+
+        retries = 0
+        while not complete:
+            res = None
+            try:
+                res = self.__request_download(url, state, offset)
+                if res.status_code not in [200, 206]:
+                    logging.error(f"Retrieving file failed with: {res.status_code}")
+                    pretty_error(
+                        "There was a problem retrieving the specified file at " + url,
+                        self.ui,
+                    )
+                    return
+                partial = res.status_code == 206
+                if partial and not self.__continues_at(res, offset):
+                    logging.warning(f"Server returned an unexpected range for {url}")
+                    state = None
+                    offset = 0
+                else:
+                    if not partial:
+                        offset = 0
+                        sha1 = hashlib.sha1()
+                    state = self.__download_state(url, res, offset)
+                    self.__save_download_state(state_filepath, state)
+                    with profiling.span("download", url=url) as span:
+                        written = self.__write_chunks(res, part_filepath, offset, sha1)
+                        span.add_bytes(written - offset)
+                    offset = written
+                    complete = state["size"] is None or offset == state["size"]
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.Timeout,
+            ) as e:
+                logging.warning(f"Download of {url} interrupted: {e}")
+                if res is not None:
+                    # Nothing was written if the request itself failed
+                    offset = os.path.getsize(part_filepath)
+            finally:
+                if res is not None:
+                    res.close()
+
+            if not complete:
+                retries = self.__count_retry(url, offset, retries)
+
+        os.replace(part_filepath, filepath)
+        os.remove(state_filepath)
+        sha_val = sha1.hexdigest()
+        logging.debug(f"SHA1 hash for file {filepath}: {sha_val}")
+        return filepath, sha_val
+
+    def __count_retry(self, url: str, offset: int, retries: int) -> int:
+        """Counts a new attempt at an interrupted download, failing if there
+        are no retries left
+
+        Args:
+            url (str): URL of the file being downloaded
+            offset (int): Number of bytes already downloaded
+            retries (int): Number of retries made so far
+
+        Returns:
+            int: Number of retries made, including the new one
+        """
+        retries += 1
+        if retries > config.download_retries:
+            pretty_error(f"Couldn't download the file at {url}", self.ui)
+        logging.info(f"Resuming download of {url} at byte {offset}")
+        return retries
+
+    def __download_and_extract(self, url: str, path: str) -> Tuple[str, str]:
+        """Pipes the gzipped tarball at the given url through tarfile, so members
+        are extracted while the rest of the archive is still being transferred.
+        The compressed tarball never touches the disk, but its SHA1 hash is
+        computed over the transferred content.
+
+        Unlike regular downloads, interrupted transfers can't be resumed.
+
+        Args:
+            url (str): URL of the tarball to download
+            path (str): Location where the tarball contents will be extracted
+
+        Returns:
+            str: location of the extracted files
+            str: SHA1 hash of the tarball
+        """
+        res = self.session.get(url, stream=True)
         if res.status_code != 200:
-            logging.error(f"Retrieving cube file failed with: {res.status_code}")
-            logging.error(res.json())
+            res.close()
+            logging.error(f"Retrieving file failed with: {res.status_code}")
             pretty_error(
                 "There was a problem retrieving the specified file at " + url, self.ui
             )
-        else:
-            c_path = cube_path(cube_uid)
-            path = os.path.join(c_path, path)
-            if not os.path.isdir(path):
-                os.makedirs(path, exist_ok=True)
-            filepath = os.path.join(path, filename)
-            open(filepath, "wb+").write(res.content)
-            return filepath
+            return
+        logging.info(f"Extracting tar.gz from {url} at {path}")
+        stream = ResponseStream(res, config.download_chunk_size)
+        try:
+            os.makedirs(path, exist_ok=True)
+            with profiling.span("download", url=url, extract=True) as span:
+                with tarfile.open(fileobj=stream, mode="r|gz") as tar:
+                    extract_members(tar, path)
+                # Trailing padding is not read by tarfile, but is part of the hash
+                stream.drain()
+                span.add_bytes(stream.nbytes)
+        except (
+            tarfile.TarError,
+            requests.exceptions.ConnectionError,
+            requests.exceptions.ChunkedEncodingError,
+        ) as e:
+            logging.error(f"Extraction of {url} failed: {e}")
+            pretty_error(f"Couldn't extract the file at {url}", self.ui)
+            return
+        finally:
+            res.close()
+
+        sha_val = stream.hexdigest()
+        logging.debug(f"SHA1 hash for tarball at {url}: {sha_val}")
+        return path, sha_val
+
+    def __request_download(
+        self, url: str, state: dict, offset: int
+    ) -> requests.Response:
+        """Requests the contents of a file starting at the given offset. If the
+        download can't be resumed, the whole file is requested.
+
+        Args:
+            url (str): URL of the file to download
+            state (dict): State of the partial download. None if there is no partial download
+            offset (int): Number of bytes already downloaded
+
+        Returns:
+            requests.Response: streamed response for the requested contents
+        """
+        headers = {}
+        if state is not None and state["resumable"] and offset > 0:
+            headers["Range"] = f"bytes={offset}-"
+            # The server sends the whole file if it changed since the last request
+            headers["If-Range"] = state["validator"]
+
+        return self.session.get(url, stream=True, headers=headers)
+
+    def __continues_at(self, res: requests.Response, offset: int) -> bool:
+        """Checks that a partial response starts where the download stopped
+
+        Args:
+            res (requests.Response): Partial response
+            offset (int): Number of bytes already downloaded
+
+        Returns:
+            bool: Wether the response content starts at offset
+        """
+        content_range = res.headers.get("Content-Range", "")
+        return offset > 0 and content_range.startswith(f"bytes {offset}-")
+
+    def __write_chunks(
+        self, res: requests.Response, part_filepath: str, offset: int, sha1
+    ) -> int:
+        """Writes the response content to the partial file, updating the hash
+        with each chunk. Content is appended if offset is greater than zero.
+
+        Args:
+            res (requests.Response): Streamed response
+            part_filepath (str): Location of the partial file
+            offset (int): Number of bytes already present in the partial file
+            sha1 (hashlib._Hash): Hash object containing the downloaded bytes
+
+        Returns:
+            int: Number of bytes written to the partial file
+        """
+        mode = "ab" if offset > 0 else "wb"
+        chunk_size = config.download_chunk_size
+        with open(part_filepath, mode) as f:
+            for chunk in res.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+                sha1.update(chunk)
+                offset += len(chunk)
+        return offset
+
+    def __checkpoint_partial_file(self, part_filepath: str, sha1) -> int:
+        """Feeds the contents of an existing partial download into the hash
+        object, so the download can continue from the end of the file.
+
+        Args:
+            part_filepath (str): Location of the partial file
+            sha1 (hashlib._Hash): Hash object to update
+
+        Returns:
+            int: Size of the partial file
+        """
+        if not os.path.exists(part_filepath):
+            return 0
+        logging.info(f"Found partial download at {part_filepath}")
+        offset = 0
+        with open(part_filepath, "rb") as f:
+            while True:
+                data = f.read(config.download_chunk_size)
+                if not data:
+                    break
+                sha1.update(data)
+                offset += len(data)
+        return offset
+
+    def __load_download_state(self, url: str, state_filepath: str) -> dict:
+        """Retrieves the state of a previous download of the same url
+
+        Args:
+            url (str): URL of the file to download
+            state_filepath (str): Location of the download state file
+
+        Returns:
+            dict: download state. None if there's no state for the url
+        """
+        if not os.path.exists(state_filepath):
+            return None
+        with open(state_filepath, "r") as f:
+            state = yaml.safe_load(f)
+        if not state or state.get("url") != url:
+            logging.debug(f"Ignoring download state at {state_filepath}")
+            return None
+        return state
+
+    def __download_state(self, url: str, res: requests.Response, offset: int) -> dict:
+        """Builds the information needed to resume a download later on.
+        Downloads can only be resumed if the server accepts byte ranges and
+        provides a strong validator for the file. Sizes and ranges refer to the
+        encoded content, so they are not used if the content is encoded.
+
+        Args:
+            url (str): URL of the file being downloaded
+            res (requests.Response): Response of the current request
+            offset (int): Starting byte of the current response
+
+        Returns:
+            dict: download state
+        """
+        headers = res.headers
+        etag = headers.get("ETag")
+        if etag is not None and etag.startswith("W/"):
+            # If-Range requires a strong validator
+            etag = None
+        validator = etag or headers.get("Last-Modified")
+        partial = res.status_code == 206
+        accepts_ranges = partial or headers.get("Accept-Ranges") == "bytes"
+        encoded = headers.get("Content-Encoding", "identity") != "identity"
+
+        size = None
+        content_range = headers.get("Content-Range", "")
+        if partial and not content_range.endswith("/*"):
+            size = int(content_range.split("/")[-1])
+        elif "Content-Length" in headers:
+            size = offset + int(headers["Content-Length"])
+
+        if encoded:
+            size = None
+        return {
+            "url": url,
+            "size": size,
+            "validator": validator,
+            "resumable": bool(validator) and accepts_ranges and not encoded,
+        }
+
+    def __save_download_state(self, state_filepath: str, state: dict):
+        """Stores the download state next to the partial file.
+        Missing parent directories are created.
+
+        Args:
+            state_filepath (str): Location of the download state file
+            state (dict): download state
+        """
+        path = os.path.dirname(state_filepath)
+        if not os.path.isdir(path):
+            os.makedirs(path, exist_ok=True)
+        with open(state_filepath, "w") as f:
+            yaml.dump(state, f)
 
     def upload_benchmark(self, benchmark_dict: dict) -> int:
         """Uploads a new benchmark to the server.
@@ -390,17 +827,15 @@ class REST(Comms):
             pretty_error("Could not upload the mlcube", self.ui)
         return res.json()["id"]
 
-    def get_datasets(self) -> List[dict]:
+    def get_datasets(self) -> Iterator[dict]:
         """Retrieves all datasets in the platform
 
         Returns:
-            List[dict]: List of data from all datasets
+            Iterator[dict]: data from all datasets
         """
-        res = self.__auth_get(f"{self.server_url}/datasets/")
-        if res.status_code != 200:
-            logging.error(res.json())
-            pretty_error("could not retrieve datasets from server", self.ui)
-        return res.json()
+        return self.__get_list(
+            f"{self.server_url}/datasets/", "could not retrieve datasets from server"
+        )
 
     def get_dataset(self, dset_uid: str) -> dict:
         """Retrieves a specific dataset
@@ -419,17 +854,15 @@ class REST(Comms):
             )
         return res.json()
 
-    def get_user_datasets(self) -> dict:
+    def get_user_datasets(self) -> Iterator[dict]:
         """Retrieves all datasets registered by the user
 
         Returns:
-            dict: dictionary with the contents of each dataset registration query
+            Iterator[dict]: dictionaries with the contents of each dataset registration query
         """
-        res = self.__auth_get(f"{self.server_url}/me/datasets/")
-        if res.status_code != 200:
-            logging.error(res.json())
-            pretty_error("Could not retrieve datasets from server", self.ui)
-        return res.json()
+        return self.__get_list(
+            f"{self.server_url}/me/datasets/", "Could not retrieve datasets from server"
+        )
 
     def upload_dataset(self, reg_dict: dict) -> int:
         """Uploads registration data to the server, under the sha name of the file.
@@ -461,17 +894,20 @@ class REST(Comms):
             pretty_error("Could not retrieve the specified result", self.ui)
         return res.json()
 
-    def get_user_results(self) -> dict:
+    def get_user_results(self, **filters) -> Iterator[dict]:
         """Retrieves all results registered by the user
 
+        Args:
+            filters (dict): only retrieve results matching these fields, e.g. benchmark=1
+
         Returns:
-            dict: dictionary with the contents of each dataset registration query
+            Iterator[dict]: dictionaries with the contents of each result
         """
-        res = self.__auth_get(f"{self.server_url}/me/results/")
-        if res.status_code != 200:
-            logging.error(res.json())
-            pretty_error("Could not retrieve results from server", self.ui)
-        return res.json()
+        return self.__get_list(
+            f"{self.server_url}/me/results/",
+            "Could not retrieve results from server",
+            **filters,
+        )
 
     def upload_results(self, results_dict: dict) -> int:
         """Uploads results to the server.
@@ -488,6 +924,25 @@ class REST(Comms):
             pretty_error("Could not upload the results", self.ui)
         return res.json()["id"]
 
+    def upload_results_bulk(self, results: List[dict]) -> List[dict]:
+        """Uploads several results with a single request. Servers without
+        bulk uploads receive one request per result instead.
+
+        Args:
+            results (List[dict]): Dictionaries containing results information.
+
+        Returns:
+            List[dict]: status of each result, with its id if it was created or the errors otherwise
+        """
+        res = self.__auth_post(f"{self.server_url}/results/bulk/", json=results)
+        if res.status_code == 404:
+            logging.debug("Server doesn't support bulk uploads")
+            return [{"status": 201, "id": self.upload_results(result)} for result in results]
+        if res.status_code not in [201, 207]:
+            logging.error(res.json())
+            pretty_error("Could not upload the results", self.ui)
+        return res.json()
+
     def associate_dset(self, data_uid: int, benchmark_uid: int, metadata: dict = {}):
         """Create a Dataset Benchmark association
 
@@ -565,26 +1020,24 @@ class REST(Comms):
                 self.ui,
             )
 
-    def get_datasets_associations(self) -> List[dict]:
+    def get_datasets_associations(self) -> Iterator[dict]:
         """Get all dataset associations related to the current user
 
         Returns:
-            List[dict]: List containing all associations information
+            Iterator[dict]: all associations information
         """
-        res = self.__auth_get(f"{self.server_url}/me/datasets/associations/")
-        if res.status_code != 200:
-            logging.error(res.json())
-            pretty_error("Could not retrieve user datasets associations", self.ui)
-        return res.json()
+        return self.__get_list(
+            f"{self.server_url}/me/datasets/associations/",
+            "Could not retrieve user datasets associations",
+        )
 
-    def get_cubes_associations(self) -> List[dict]:
+    def get_cubes_associations(self) -> Iterator[dict]:
         """Get all cube associations related to the current user
 
         Returns:
-            List[dict]: List containing all associations information
+            Iterator[dict]: all associations information
         """
-        res = self.__auth_get(f"{self.server_url}/me/mlcubes/associations/")
-        if res.status_code != 200:
-            logging.error(res.json())
-            pretty_error("Could not retrieve user mlcubes associations", self.ui)
-        return res.json()
+        return self.__get_list(
+            f"{self.server_url}/me/mlcubes/associations/",
+            "Could not retrieve user mlcubes associations",
+        )
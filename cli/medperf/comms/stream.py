@@ -0,0 +1,66 @@
+import hashlib
+import requests
+
+
+class ResponseStream:
+    """Read-only file-like view over a streamed response, so it can be consumed
+    by libraries like tarfile without storing the content first. The SHA1 hash
+    of the content is computed as chunks are read from the network.
+    """
+
+    def __init__(self, res: requests.Response, chunk_size: int):
+        """Wraps a response requested with stream=True
+
+        Args:
+            res (requests.Response): streamed response
+            chunk_size (int): size of the chunks read from the network
+        """
+        self.__chunks = res.iter_content(chunk_size=chunk_size)
+        self.__chunk = memoryview(b"")
+        self.__pos = 0
+        self.sha1 = hashlib.sha1()
+        self.nbytes = 0
+
+    def read(self, size: int = -1) -> bytes:
+        """Reads up to size bytes from the response. Reads the whole remaining
+        content if size is negative.
+
+        Args:
+            size (int, optional): Number of bytes to read. Defaults to -1.
+
+        Returns:
+            bytes: content read. Empty when the response is exhausted
+        """
+        parts = []
+        while size != 0:
+            if self.__pos >= len(self.__chunk):
+                chunk = next(self.__chunks, None)
+                if chunk is None:
+                    break
+                self.sha1.update(chunk)
+                self.nbytes += len(chunk)
+                self.__chunk = memoryview(chunk)
+                self.__pos = 0
+            end = len(self.__chunk) if size < 0 else self.__pos + size
+            part = self.__chunk[self.__pos:end]
+            self.__pos += len(part)
+            if size > 0:
+                size -= len(part)
+            parts.append(part)
+        return b"".join(parts)
+
+    def drain(self):
+        """Consumes the rest of the response, so that the hash covers the
+        whole content even if the reader stopped early
+        """
+        for chunk in self.__chunks:
+            self.sha1.update(chunk)
+            self.nbytes += len(chunk)
+
+    def hexdigest(self) -> str:
+        """Returns the SHA1 hash of the content read so far
+
+        Returns:
+            str: SHA1 hash in hexadecimal format
+        """
+        return self.sha1.hexdigest()
@@ -20,6 +20,7 @@ statistics_filename = "tmp_statistics.yaml"
 results_filename = "result.yaml"
 benchmarks_storage = "benchmarks"
 benchmarks_filename = "benchmark.yaml"
+catalog_filename = "catalog.db"
 credentials_path = "credentials"
 workspace_path = "workspace"
 cleanup = True
@@ -31,12 +32,20 @@ tarball_filename = "tmp.tar.gz"
 image_path = "workspace/.image"
 reg_file = "registration-info.yaml"
 log_file = "logs/medperf.log"
+profiles_storage = "logs/profiles"
+# Store the profiling report of every command, not only of profiled ones
+save_profiles = False
+# Profiling reports kept in storage. Older reports are removed
+profiles_retention = 50
+task_logs_storage = "logs/tasks"
 test_cube_prefix = "test_"
 cube_submission_id = "tmp_submission"
 test_dset_prefix = "test_"
 demo_dset_paths_file = "paths.yaml"
 cube_metadata_filename = "mlcube-meta.yaml"
 cube_hashes_filename = "mlcube-hashes.yaml"
+predictions_manifest_suffix = ".manifest.yaml"
+hash_manifests_storage = "hash_manifests"
 
 default_comms = "REST"
 default_ui = "CLI"
@@ -44,6 +53,49 @@ platform = "docker"
 git_file_domain = "https://raw.githubusercontent.com"
 comms = None
 ui = None
+catalog = None
+profiler = None
+
+# Connection pooling for the comms session
+http_pool_connections = 10
+http_pool_maxsize = 10
+http_max_retries = 3
+# Results submitted to the server with a single request
+results_upload_batch_size = 100
+
+# Downloads are streamed to disk in chunks of this size (bytes)
+download_chunk_size = 1024 * 1024
+partial_download_suffix = ".part"
+download_state_suffix = ".yaml"
+download_retries = 3
+# Maximum number of artifacts downloaded concurrently
+download_workers = 4
+# Extract cube tarballs while they are downloaded, without storing them
+stream_extraction = False
+
+# Cube tasks executed concurrently and the resources given to each of them.
+# None means no limit. Limits are enforced by the docker platform
+max_concurrent_tasks = 1
+task_cpus = None
+task_memory = None  # in GB
+# Model predictions that may wait for evaluation during a multi-model run
+predictions_queue_size = 1
+
+# Files hashed concurrently and size of the chunks read from them (bytes)
+hash_workers = 4
+hash_chunk_size = 1024 * 1024
+# Minimum seconds between hashing progress updates
+hash_progress_interval = 0.5
+# Bytes read at a time from the output of cube processes
+proc_read_size = 4096
+# Minimum seconds between spinner updates with the output of cube processes
+proc_refresh_interval = 0.1
+# Lines of cube process output kept in memory for logging
+proc_output_tail = 100
+# Bounds of the storage summary logged after running a cube
+storage_summary_depth = 2
+storage_summary_max_entries = 10000
+storage_summary_max_folders = 20
 
 prepare_timeout = None
 sanity_check_timeout = None
@@ -2,7 +2,6 @@ import logging
 import functools
 from collections.abc import Callable
 
-from medperf.utils import pretty_error
 import medperf.config as config
 
 
@@ -23,6 +22,8 @@ def clean_except(func: Callable) -> Callable:
             logging.info(f"Running function '{func.__name__}'")
             func(*args, **kwargs)
         except Exception as e:
+            from medperf.utils import pretty_error
+
             logging.error("An unexpected error occured. Terminating.")
             logging.error(e)
             pretty_error("An unexpected error occured", config.ui)
@@ -1,19 +1,21 @@
 import os
 import yaml
+import hashlib
 import pexpect
 import logging
-from typing import List, Dict
+from typing import List, Dict, Callable, Tuple
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 from medperf.utils import (
     save_cube_metadata,
-    get_file_sha1,
-    pretty_error,
     untar,
     combine_proc_sp_text,
-    list_files,
+    storage_summary,
     storage_path,
+    get_file_sha1,
 )
+from medperf import profiling
 from medperf.entities.interface import Entity
 from medperf.comms.interface import Comms
 from medperf.ui.interface import UI
@@ -68,39 +70,51 @@ class Cube(Entity):
             List[Cube]: List containing all cubes found locally
         """
         logging.info("Retrieving all local cubes")
+        cubes = []
+        for uid in config.catalog.cubes():
+            cube = cls.__get_local(uid)
+            if cube is not None:
+                cubes.append(cube)
+
+        return cubes
+
+    @classmethod
+    def __get_local(cls, uid: str) -> "Cube":
+        """Loads a cube stored on the user's machine.
+
+        Args:
+            uid (str): UID of the cube.
+
+        Returns:
+            Cube: the local Cube instance. None if its files are missing.
+        """
         cubes_storage = storage_path(config.cubes_storage)
-        try:
-            uids = next(os.walk(cubes_storage))[1]
-        except StopIteration:
-            msg = "Couldn't iterate over cubes directory"
-            logging.warning(msg)
-            pretty_error(msg, config.ui)
+        uid = str(uid)
+        cube_path = os.path.join(cubes_storage, uid, config.cube_filename)
+        meta_file = os.path.join(cubes_storage, uid, config.cube_metadata_filename)
+        local_hashes_file = os.path.join(cubes_storage, uid, config.cube_hashes_filename)
+        if not os.path.exists(meta_file) or not os.path.exists(local_hashes_file):
+            # The cube was removed without updating the catalog
+            logging.warning(f"Cube {uid} is in the catalog but not in the storage")
+            config.catalog.remove_cube(uid)
+            return None
 
-        cubes = []
-        for uid in uids:
-            cube_path = os.path.join(cubes_storage, uid, config.cube_filename)
-            meta_file = os.path.join(cubes_storage, uid, config.cube_metadata_filename)
-            with open(meta_file, "r") as f:
-                meta = yaml.safe_load(f)
-
-            params_path = os.path.join(cubes_storage, uid, config.params_filename)
-            if not os.path.exists(params_path):
-                params_path = None
-
-            local_hashes_file = os.path.join(
-                cubes_storage, uid, config.cube_hashes_filename
-            )
-            with open(local_hashes_file, "r") as f:
-                local_hashes = yaml.safe_load(f)
-            additional_hash = local_hashes["additional_files_tarball_hash"]
-            image_tarball_hash = local_hashes["image_tarball_hash"]
+        with open(meta_file, "r") as f:
+            meta = yaml.safe_load(f)
 
-            cube = cls(
-                uid, meta, cube_path, params_path, additional_hash, image_tarball_hash
-            )
-            cubes.append(cube)
+        # Parameters are downloaded into the workspace of the cube
+        params_path = os.path.join(
+            cubes_storage, uid, config.workspace_path, config.params_filename
+        )
+        if not os.path.exists(params_path):
+            params_path = None
 
-        return cubes
+        with open(local_hashes_file, "r") as f:
+            local_hashes = yaml.safe_load(f)
+        additional_hash = local_hashes["additional_files_tarball_hash"]
+        image_tarball_hash = local_hashes["image_tarball_hash"]
+
+        return cls(uid, meta, cube_path, params_path, additional_hash, image_tarball_hash)
 
     @classmethod
     def get(cls, cube_uid: str) -> "Cube":
@@ -117,12 +131,11 @@ class Cube(Entity):
         logging.debug(f"Retrieving the cube {cube_uid}")
         comms = config.comms
         ui = config.ui
-        local_cube = list(
-            filter(lambda cube: str(cube.uid) == str(cube_uid), cls.all())
-        )
-        if len(local_cube) == 1:
-            logging.debug("Found cube locally")
-            return local_cube[0]
+        if config.catalog.has_cube(cube_uid):
+            local_cube = cls.__get_local(cube_uid)
+            if local_cube is not None:
+                logging.debug("Found cube locally")
+                return local_cube
 
         meta = comms.get_cube_metadata(cube_uid)
         # Backwards compatibility for cubes with
@@ -134,43 +147,94 @@ class Cube(Entity):
         if old_files in meta:
             meta[add_files] = meta[old_files]
             meta[add_hash] = meta[old_hash]
-        cube_path = comms.get_cube(meta["git_mlcube_url"], cube_uid)
-        params_path = None
-        additional_path = None
-        additional_hash = None
-        image_path = None
-        image_tarball_hash = None
-        if "git_parameters_url" in meta and meta["git_parameters_url"]:
-            url = meta["git_parameters_url"]
-            params_path = comms.get_cube_params(url, cube_uid)
-        if add_files in meta and meta[add_files]:
-            url = meta[add_files]
-            additional_path = comms.get_cube_additional(url, cube_uid)
-            additional_hash = get_file_sha1(additional_path)
-            untar(additional_path)
-        if "image_tarball_url" in meta and meta["image_tarball_url"]:
-            url = meta["image_tarball_url"]
-            image_path = comms.get_cube_image(url, cube_uid)
-            image_tarball_hash = get_file_sha1(image_path)
-            untar(image_path)
-        else:
+        cube_path, params_path, additional_hash, image_tarball_hash = cls.__get_artifacts(
+            meta, cube_uid
+        )
+
+        has_image = "image_tarball_url" in meta and meta["image_tarball_url"]
+        if not has_image:
             # Retrieve image from image registry
             logging.debug(f"Retrieving {cube_uid} image")
             cmd = f"mlcube configure --mlcube={cube_path}"
-            proc = pexpect.spawn(cmd)
-            proc_out = combine_proc_sp_text(proc, ui)
-            logging.debug(proc_out)
-            proc.close()
+            with profiling.span("mlcube configure", children=True, cube=cube_uid):
+                proc = pexpect.spawn(cmd)
+                proc_out = combine_proc_sp_text(proc, ui)
+                logging.debug(proc_out)
+                proc.close()
 
         local_hashes = {
             "additional_files_tarball_hash": additional_hash if additional_hash else "",
             "image_tarball_hash": image_tarball_hash if image_tarball_hash else "",
         }
         save_cube_metadata(meta, local_hashes)
+        config.catalog.add_cube(cube_uid)
         return cls(
             cube_uid, meta, cube_path, params_path, additional_hash, image_tarball_hash
         )
 
+    @classmethod
+    def __get_artifacts(cls, meta: dict, cube_uid: str) -> Tuple[str, str, str, str]:
+        """Retrieves the artifacts of a cube. Artifacts are independent of each
+        other, so they are retrieved concurrently. Tarballs are extracted as
+        soon as they arrive
+
+        Args:
+            meta (dict): metadata of the cube
+            cube_uid (str): UID of the cube
+
+        Returns:
+            Tuple[str, str, str, str]: location of the mlcube manifest and of the
+                parameters file, and hashes of the additional files and image
+                tarballs. Missing artifacts are None
+        """
+        comms = config.comms
+        with ThreadPoolExecutor(max_workers=config.download_workers) as pool:
+            cube = pool.submit(comms.get_cube, meta["git_mlcube_url"], cube_uid)
+            params = None
+            url = meta.get("git_parameters_url")
+            if url:
+                params = pool.submit(comms.get_cube_params, url, cube_uid)
+            additional = None
+            url = meta.get("additional_files_tarball_url")
+            if url:
+                download = comms.get_cube_additional
+                extract = comms.extract_cube_additional
+                additional = pool.submit(
+                    cls.__get_tarball, download, extract, url, cube_uid
+                )
+            image = None
+            url = meta.get("image_tarball_url")
+            if url:
+                download = comms.get_cube_image
+                extract = comms.extract_cube_image
+                image = pool.submit(cls.__get_tarball, download, extract, url, cube_uid)
+
+            futures = [cube, params, additional, image]
+            return tuple(None if f is None else f.result() for f in futures)
+
+    @staticmethod
+    def __get_tarball(
+        download: Callable, extract: Callable, url: str, cube_uid: str
+    ) -> str:
+        """Downloads and extracts a cube tarball. If config.stream_extraction is
+        set, the tarball is extracted while it is being downloaded instead.
+
+        Args:
+            download (Callable): comms method that retrieves the tarball
+            extract (Callable): comms method that extracts the tarball while retrieving it
+            url (str): URL where the tarball can be downloaded
+            cube_uid (str): UID of the cube
+
+        Returns:
+            str: SHA1 hash of the tarball
+        """
+        if config.stream_extraction:
+            _, tarball_hash = extract(url, cube_uid)
+            return tarball_hash
+        path, tarball_hash = download(url, cube_uid)
+        untar(path)
+        return tarball_hash
+
     def is_valid(self) -> bool:
         """Checks the validity of the cube and related files through hash checking.
 
@@ -193,30 +257,91 @@ class Cube(Entity):
             valid_image = True
         return valid_cube and valid_additional and valid_image
 
-    def run(self, ui: UI, task: str, timeout: int = None, **kwargs):
+    def fingerprint(self) -> str:
+        """Computes a hash that identifies the exact contents of the cube: its
+        manifest, its parameters and the hashes of its artifacts. Executions
+        of cubes with the same fingerprint on the same inputs are expected to
+        produce the same outputs.
+
+        Returns:
+            str: sha1 hash of the cube contents
+        """
+        parts = [get_file_sha1(self.cube_path)]
+        if self.params_path is not None:
+            parts.append(get_file_sha1(self.params_path))
+        else:
+            parts.append("")
+        parts.append(self.additional_hash or "")
+        parts.append(self.image_tarball_hash or "")
+        sha1 = hashlib.sha1()
+        sha1.update("\n".join(parts).encode("utf-8"))
+        return sha1.hexdigest()
+
+    def run(
+        self,
+        ui: UI,
+        task: str,
+        timeout: int = None,
+        log_file: str = None,
+        **kwargs,
+    ):
         """Executes a given task on the cube instance
 
         Args:
             ui (UI): an instance of an UI implementation
             task (str): task to run
             timeout (int, optional): timeout for the task in seconds. Defaults to None.
+            log_file (str, optional): file where the output of the task is streamed. Defaults to None.
             kwargs (dict): additional arguments that are passed directly to the mlcube command
         """
         cmd = f"mlcube run --mlcube={self.cube_path} --task={task} --platform={config.platform}"
+        resource_args = self.__resource_args()
+        if resource_args:
+            cmd = " ".join([cmd, resource_args])
         for k, v in kwargs.items():
             cmd_arg = f'{k}="{v}"'
             cmd = " ".join([cmd, cmd_arg])
         logging.info(f"Running MLCube command: {cmd}")
-        proc = pexpect.spawn(cmd, timeout=timeout)
-        proc_out = combine_proc_sp_text(proc, ui)
-        proc.close()
+        if log_file is not None:
+            with open(log_file, "a") as f:
+                f.write(f"$ {cmd}\n")
+        with profiling.span(f"mlcube {task}", children=True, cube=self.uid):
+            proc = pexpect.spawn(cmd, timeout=timeout)
+            proc_out = combine_proc_sp_text(proc, ui, log_file)
+            proc.close()
         logging.debug(proc_out)
         if proc.exitstatus != 0:
             raise RuntimeError("There was an error while executing the cube")
 
-        logging.debug(list_files(config.storage))
+        # The summary walks the storage, so it is only computed when logged
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(storage_summary(config.storage))
         return proc
 
+    @staticmethod
+    def __resource_args() -> str:
+        """Builds the mlcube arguments that limit the resources of a task,
+        according to the configured per-task CPU and memory limits
+
+        Returns:
+            str: mlcube platform arguments. Empty if there are no limits
+        """
+        limits = []
+        if config.task_cpus:
+            limits.append(f"--cpus={config.task_cpus}")
+        if config.task_memory:
+            limits.append(f"--memory={config.task_memory}g")
+        if not limits:
+            return ""
+        if config.platform != "docker":
+            logging.warning(
+                f"Resource limits are not supported on {config.platform}. "
+                "Only the number of concurrent tasks will be limited"
+            )
+            return ""
+        limits = " ".join(limits)
+        return f'-Pdocker.cpu_args="{limits}"'
+
     def get_default_output(self, task: str, out_key: str, param_key: str = None) -> str:
         """Returns the output parameter specified in the mlcube.yaml file
 
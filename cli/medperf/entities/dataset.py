@@ -5,7 +5,6 @@ import logging
 from typing import List
 
 from medperf.utils import (
-    get_uids,
     pretty_error,
     storage_path,
 )
@@ -93,21 +92,7 @@ class Dataset(Entity):
             List[Dataset]: a list of Dataset instances.
         """
         logging.info("Retrieving all datasets")
-        data_storage = storage_path(config.data_storage)
-        try:
-            generated_uids = next(os.walk(data_storage))[1]
-        except StopIteration:
-            logging.warning("Couldn't iterate over the dataset directory")
-            pretty_error("Couldn't iterate over the dataset directory", config.ui)
-        tmp_prefix = config.tmp_prefix
-        dsets = []
-        for generated_uid in generated_uids:
-            not_tmp = not generated_uid.startswith(tmp_prefix)
-            reg_path = os.path.join(data_storage, generated_uid, config.reg_file)
-            registered = os.path.exists(reg_path)
-            if not_tmp and registered:
-                dsets.append(cls(generated_uid))
-        return dsets
+        return [cls(generated_uid) for generated_uid in config.catalog.datasets()]
 
     @classmethod
     def get(cls, dset_uid: str) -> "Dataset":
@@ -122,12 +107,10 @@ class Dataset(Entity):
         """
         logging.debug(f"Retrieving dataset {dset_uid}")
         comms = config.comms
-        local_dset = list(
-            filter(lambda dset: str(dset.uid) == str(dset_uid), cls.all())
-        )
-        if len(local_dset) == 1:
+        generated_uid = config.catalog.get_dataset(dset_uid)
+        if generated_uid is not None:
             logging.debug("Found dataset locally")
-            return local_dset[0]
+            return cls(generated_uid)
 
         meta = comms.get_dataset(dset_uid)
         return cls(None, registration=meta)
@@ -145,9 +128,7 @@ class Dataset(Entity):
         Returns:
             str: the complete UID
         """
-        data_storage = storage_path(config.data_storage)
-        dsets = get_uids(data_storage)
-        match = [uid for uid in dsets if uid.startswith(str(uid_hint))]
+        match = config.catalog.find_datasets(uid_hint)
         if len(match) == 0:
             pretty_error(f"No dataset was found with uid hint {uid_hint}.", ui)
         elif len(match) > 1:
@@ -172,6 +153,7 @@ class Dataset(Entity):
         regfile = os.path.join(self.dataset_path, config.reg_file)
         with open(regfile, "w") as f:
             yaml.dump(self.registration, f)
+        config.catalog.add_dataset(self.generated_uid, self.uid)
 
     def todict(self):
         return self.registration
@@ -4,11 +4,7 @@ import yaml
 import logging
 from typing import List
 
-from medperf.utils import (
-    storage_path,
-    results_ids,
-    results_path,
-)
+from medperf.utils import results_path
 from medperf.entities.interface import Entity
 import medperf.config as config
 from medperf.comms.interface import Comms
@@ -46,16 +42,25 @@ class Result(Entity):
             self.results = {}
             self.get_results()
         self.uid = self.results.get("uid", None)
+        # Hash of the cubes and dataset that produced the result, if known
+        self.inputs_hash = self.results.get("inputs_hash", None)
+        if self.inputs_hash is None:
+            local_entry = config.catalog.find_result(
+                benchmark_uid, model_uid, dataset_uid
+            )
+            if local_entry is not None:
+                self.inputs_hash = local_entry[1]
 
     @classmethod
-    def all(cls) -> List["Result"]:
+    def all(cls, pending: bool = False) -> List["Result"]:
         """Gets and creates instances of all the user's results
+
+        Args:
+            pending (bool, optional): Only get results that haven't been submitted. Defaults to False.
         """
         logging.info("Retrieving all results")
-        results_ids_tuple = results_ids(config.ui)
-        storage_path(config.results_storage)
         results = []
-        for result_ids in results_ids_tuple:
+        for result_ids in config.catalog.results(pending=pending):
             b_id, m_id, d_id = result_ids
             results.append(cls(b_id, d_id, m_id))
 
@@ -75,12 +80,11 @@ class Result(Entity):
         """
         logging.debug(f"Retrieving result {result_uid}")
         comms = config.comms
-        local_result = list(
-            filter(lambda res: str(res.uid) == str(result_uid), cls.all())
-        )
-        if len(local_result) == 1:
+        result_ids = config.catalog.get_result(result_uid)
+        if result_ids is not None:
             logging.debug("Found result locally")
-            return local_result[0]
+            b_id, m_id, d_id = result_ids
+            return cls(b_id, d_id, m_id)
 
         meta = comms.get_result(result_uid)
         bmk_uid = meta["benchmark"]
@@ -91,10 +95,16 @@ class Result(Entity):
         return cls(bmk_uid, dset_uid, model_uid, result_data)
 
     def todict(self):
+        metadata = {}
+        if self.inputs_hash is not None:
+            metadata["inputs_hash"] = self.inputs_hash
+        results = {
+            key: value for key, value in self.results.items() if key != "inputs_hash"
+        }
         result_dict = {
             "name": f"{self.benchmark_uid}_{self.model_uid}_{self.dataset_uid}",
-            "results": self.results,
-            "metadata": {},
+            "results": results,
+            "metadata": metadata,
             "approval_status": self.status.value,
             "benchmark": self.benchmark_uid,
             "model": self.model_uid,
@@ -109,10 +119,53 @@ class Result(Entity):
             comms (Comms): Instance of the communications interface.
         """
         result_uid = comms.upload_results(self.todict())
+        self.mark_uploaded(result_uid)
+
+    @classmethod
+    def upload_all(cls, results: List["Result"], comms: Comms) -> List[tuple]:
+        """Uploads several results to the comms, in batches of
+        `config.results_upload_batch_size` results per request
+
+        Args:
+            results (List[Result]): results to upload
+            comms (Comms): Instance of the communications interface.
+
+        Returns:
+            List[tuple]: results that couldn't be uploaded, with the errors reported by the server
+        """
+        failed = []
+        batch_size = config.results_upload_batch_size
+        for start in range(0, len(results), batch_size):
+            batch = results[start:start + batch_size]
+            statuses = comms.upload_results_bulk([result.todict() for result in batch])
+            for result, status in zip(batch, statuses):
+                if status["status"] == 201:
+                    result.mark_uploaded(status["id"])
+                else:
+                    failed.append((result, status.get("errors")))
+        return failed
+
+    def mark_uploaded(self, result_uid: int):
+        """Stores the UID given by the comms to the uploaded results
+
+        Args:
+            result_uid (int): UID of the results entry in the comms
+        """
         self.uid = result_uid
         self.results["uid"] = result_uid
         self.set_results()
 
+    def set_inputs_hash(self, inputs_hash: str):
+        """Stores the hash of the inputs that produced the results along with
+        them, so that it can be recovered when the local catalog is rebuilt
+
+        Args:
+            inputs_hash (str): hash of the cubes and dataset used
+        """
+        self.inputs_hash = inputs_hash
+        self.results["inputs_hash"] = inputs_hash
+        self.set_results()
+
     def set_results(self):
         write_access = os.access(self.path, os.W_OK)
         logging.debug(f"file has write access? {write_access}")
@@ -121,6 +174,13 @@ class Result(Entity):
             os.remove(self.path)
         with open(self.path, "w") as f:
             yaml.dump(self.results, f)
+        config.catalog.add_result(
+            self.benchmark_uid,
+            self.model_uid,
+            self.dataset_uid,
+            self.uid,
+            self.inputs_hash,
+        )
 
     def get_results(self):
         with open(self.path, "r") as f:
@@ -0,0 +1,106 @@
+import os
+import yaml
+import hashlib
+import logging
+from typing import Dict
+
+from medperf.utils import get_file_sha1
+import medperf.config as config
+
+
+def manifest_path(preds_path: str) -> str:
+    """Location of the manifest of a predictions folder. The manifest is kept
+    next to the folder so that it is never seen by the evaluator.
+
+    Args:
+        preds_path (str): predictions folder
+
+    Returns:
+        str: path to the manifest file
+    """
+    return os.path.normpath(preds_path) + config.predictions_manifest_suffix
+
+
+def prediction_key(model_fingerprint: str, data_uid: str) -> str:
+    """Computes the key that identifies the predictions of a model on a dataset
+
+    Args:
+        model_fingerprint (str): fingerprint of the model cube, which covers
+            its manifest, inference parameters and artifacts
+        data_uid (str): generated UID of the prepared dataset
+
+    Returns:
+        str: prediction cache key
+    """
+    sha1 = hashlib.sha1()
+    sha1.update(f"{model_fingerprint}\n{data_uid}".encode("utf-8"))
+    return sha1.hexdigest()
+
+
+def hash_predictions(preds_path: str) -> Dict[str, str]:
+    """Hashes every file inside a predictions folder
+
+    Args:
+        preds_path (str): predictions folder
+
+    Returns:
+        Dict[str, str]: sha1 hash of each file, by path relative to the folder
+    """
+    hashes = {}
+    for root, _, files in os.walk(preds_path):
+        for file in files:
+            filepath = os.path.join(root, file)
+            relpath = os.path.relpath(filepath, preds_path)
+            hashes[relpath] = get_file_sha1(filepath)
+    return hashes
+
+
+def is_cached(preds_path: str, key: str) -> bool:
+    """Checks if a predictions folder holds valid predictions for the given key.
+    Predictions are valid if their manifest was generated with the same key and
+    every file of the folder matches the hashes in the manifest.
+
+    Args:
+        preds_path (str): predictions folder
+        key (str): expected prediction cache key
+
+    Returns:
+        bool: Wether the predictions can be reused
+    """
+    manifest_file = manifest_path(preds_path)
+    if not os.path.exists(manifest_file) or not os.path.isdir(preds_path):
+        return False
+
+    with open(manifest_file, "r") as f:
+        manifest = yaml.safe_load(f) or {}
+    if manifest.get("key") != key:
+        logging.info(f"Predictions at {preds_path} were generated with other inputs")
+        return False
+    if manifest.get("files") != hash_predictions(preds_path):
+        logging.warning(f"Predictions at {preds_path} don't match their manifest")
+        return False
+    return True
+
+
+def save_manifest(preds_path: str, key: str):
+    """Stores the manifest of a predictions folder
+
+    Args:
+        preds_path (str): predictions folder
+        key (str): prediction cache key used to generate the predictions
+    """
+    manifest = {"key": key, "files": hash_predictions(preds_path)}
+    with open(manifest_path(preds_path), "w") as f:
+        yaml.dump(manifest, f)
+
+
+def invalidate(preds_path: str):
+    """Removes the manifest of a predictions folder, so that its contents
+    are not reused
+
+    Args:
+        preds_path (str): predictions folder
+    """
+    manifest_file = manifest_path(preds_path)
+    if os.path.exists(manifest_file):
+        os.remove(manifest_file)
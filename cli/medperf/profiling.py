@@ -0,0 +1,233 @@
+import os
+import json
+import time
+import logging
+import resource
+import threading
+from datetime import datetime
+from tabulate import tabulate
+from contextlib import contextmanager
+
+from medperf.ui.interface import UI
+import medperf.config as config
+
+MB = 1024 ** 2
+
+
+class Span:
+    """Measurements of a single stage of a command: wall time, bytes
+    transferred or read, and the CPU time of host-side child processes
+    """
+
+    def __init__(self, name: str, parent: str = None, **attrs):
+        self.name = name
+        self.parent = parent
+        self.attrs = attrs
+        self.thread = threading.current_thread().name
+        self.start = None
+        self.wall_time = None
+        self.bytes = 0
+        self.children_cpu_time = None
+        self.__lock = threading.Lock()
+
+    def add_bytes(self, nbytes: int):
+        """Adds to the bytes handled by the stage. Safe to call from any thread
+
+        Args:
+            nbytes (int): number of bytes transferred or read
+        """
+        with self.__lock:
+            self.bytes += nbytes
+
+    def todict(self) -> dict:
+        return {
+            "name": self.name,
+            "parent": self.parent,
+            "attrs": self.attrs,
+            "thread": self.thread,
+            "start": self.start,
+            "wall_time": self.wall_time,
+            "bytes": self.bytes,
+            "children_cpu_time": self.children_cpu_time,
+        }
+
+
+def children_usage() -> resource.struct_rusage:
+    return resource.getrusage(resource.RUSAGE_CHILDREN)
+
+
+class Profiler:
+    """
+    Records the stages of a command
+
+    Stages are recorded through `span`, which can be nested and used from
+    several threads at once. Spans that run child processes can also record
+    the CPU time consumed by the host-side children that finished during the
+    span, such as the mlcube and docker CLI processes. Work done inside
+    containers runs under the docker daemon and is not measured.
+    """
+
+    def __init__(self, command: str = None):
+        self.command = command
+        self.started = datetime.now()
+        self.spans = []
+        self.__start = time.perf_counter()
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+
+    @contextmanager
+    def span(self, name: str, children: bool = False, **attrs):
+        """Measures the enclosed block as a stage of the command
+
+        Args:
+            name (str): name of the stage. Stages with the same name are aggregated in the summary
+            children (bool, optional): Wether to measure the CPU time of host-side child processes.
+                Defaults to False.
+            attrs (dict): additional information stored with the span
+
+        Yields:
+            Span: span being recorded
+        """
+        stack = getattr(self.__local, "stack", [])
+        self.__local.stack = stack
+        parent = stack[-1].name if stack else None
+        span = Span(name, parent, **attrs)
+        usage = children_usage() if children else None
+        start = time.perf_counter()
+        span.start = round(start - self.__start, 6)
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            stack.pop()
+            span.wall_time = round(time.perf_counter() - start, 6)
+            if usage is not None:
+                end_usage = children_usage()
+                cpu_time = end_usage.ru_utime + end_usage.ru_stime
+                cpu_time -= usage.ru_utime + usage.ru_stime
+                span.children_cpu_time = round(cpu_time, 6)
+            with self.__lock:
+                self.spans.append(span)
+            logging.debug(f"Stage {name} took {span.wall_time:.3f}s")
+
+    def report(self) -> dict:
+        """Builds the machine-readable report of the command
+
+        Returns:
+            dict: command information and every recorded span, in start order
+        """
+        with self.__lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+        return {
+            "command": self.command,
+            "version": config.version,
+            "started": self.started.isoformat(),
+            "wall_time": round(time.perf_counter() - self.__start, 6),
+            "spans": [span.todict() for span in spans],
+        }
+
+    def save(self, path: str):
+        """Writes the report as JSON
+
+        Args:
+            path (str): location of the report
+        """
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+    def finish(self, path: str, ui: UI = None, keep: int = None):
+        """Stores the report of the command inside the given folder, and
+        optionally prints its summary. Only the latest reports are kept.
+
+        Args:
+            path (str): folder where reports are stored
+            ui (UI, optional): UI where the summary is printed. Defaults to None.
+            keep (int, optional): Number of reports kept in the folder. Defaults to config.profiles_retention.
+        """
+        # The pid keeps reports of concurrent commands apart
+        filename = f"{self.started:%Y%m%d_%H%M%S_%f}_{os.getpid()}_{self.command}.json"
+        report_file = os.path.join(path, filename)
+        try:
+            os.makedirs(path, exist_ok=True)
+            self.save(report_file)
+            remove_old_reports(path, keep or config.profiles_retention)
+        except OSError as e:
+            logging.warning(f"Couldn't store the profiling report: {e}")
+            report_file = None
+        if ui is not None:
+            ui.print(self.summary())
+            if report_file is not None:
+                ui.print(f"Profiling report stored at {report_file}")
+
+    def summary(self) -> str:
+        """Summarizes the spans of the command, aggregated by name
+
+        Returns:
+            str: table with one row per stage
+        """
+        stages = {}
+        with self.__lock:
+            spans = list(self.spans)
+        for span in sorted(spans, key=lambda span: span.start):
+            stage = stages.setdefault(span.name, [0, 0, 0, None])
+            stage[0] += 1
+            stage[1] += span.wall_time
+            stage[2] += span.bytes
+            if span.children_cpu_time is not None:
+                stage[3] = (stage[3] or 0) + span.children_cpu_time
+
+        headers = [
+            "Stage",
+            "Count",
+            "Wall time (s)",
+            "Data (MB)",
+            "Host child CPU time (s)",
+        ]
+        rows = []
+        for name, (count, wall_time, nbytes, cpu_time) in stages.items():
+            rows.append(
+                [
+                    name,
+                    count,
+                    f"{wall_time:.2f}",
+                    f"{nbytes / MB:.1f}" if nbytes else "",
+                    "" if cpu_time is None else f"{cpu_time:.2f}",
+                ]
+            )
+        wall_time = time.perf_counter() - self.__start
+        rows.append(["Total", "", f"{wall_time:.2f}", "", ""])
+        return tabulate(rows, headers=headers)
+
+
+def remove_old_reports(path: str, keep: int):
+    """Removes the oldest reports of a folder, keeping the given number of them
+
+    Args:
+        path (str): folder where reports are stored
+        keep (int): number of reports kept
+    """
+    # Report names start with the time the command started
+    reports = sorted(file for file in os.listdir(path) if file.endswith(".json"))
+    for report in reports[:-keep]:
+        os.remove(os.path.join(path, report))
+
+
+@contextmanager
+def span(name: str, children: bool = False, **attrs):
+    """Measures the enclosed block with the profiler of the running command.
+    If there is none, the span is still usable but not recorded.
+
+    Args:
+        name (str): name of the stage
+        children (bool, optional): Wether to measure the CPU time of host-side child processes.
+            Defaults to False.
+        attrs (dict): additional information stored with the span
+
+    Yields:
+        Span: span being recorded
+    """
+    if config.profiler is None:
+        yield Span(name, **attrs)
+        return
+    with config.profiler.span(name, children, **attrs) as recorded_span:
+        yield recorded_span
@@ -0,0 +1,187 @@
+import os
+import logging
+import threading
+from typing import Callable
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from medperf.ui.interface import UI
+from medperf.utils import storage_path
+import medperf.config as config
+
+
+def system_memory() -> int:
+    """Retrieves the total physical memory of the machine
+
+    Returns:
+        int: memory in bytes. None if it can't be determined
+    """
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def task_slots() -> int:
+    """Computes how many tasks can run concurrently on this machine, given
+    the configured concurrency, per-task CPU and per-task memory limits
+
+    Returns:
+        int: number of concurrent tasks. Always at least one
+    """
+    slots = config.max_concurrent_tasks
+    if config.task_cpus:
+        cpus = os.cpu_count() or 1
+        slots = min(slots, int(cpus // config.task_cpus))
+    memory = system_memory()
+    if config.task_memory and memory:
+        task_memory = config.task_memory * 1024 ** 3
+        slots = min(slots, int(memory // task_memory))
+    return max(slots, 1)
+
+
+class TaskUI(UI):
+    """UI handed to a single scheduled task. Messages are prefixed with the task
+    name, and the spinner text is multiplexed with the rest of the running tasks
+    """
+
+    def __init__(self, scheduler: "TaskScheduler", name: str):
+        self.scheduler = scheduler
+        self.name = name
+        self.__text = f"[{name}]"
+
+    def print(self, msg: str = ""):
+        self.scheduler.ui.print(f"[{self.name}] {msg}")
+
+    def print_error(self, msg: str):
+        self.scheduler.ui.print_error(f"[{self.name}] {msg}")
+
+    def start_interactive(self):
+        pass
+
+    def stop_interactive(self):
+        pass
+
+    @contextmanager
+    def interactive(self):
+        yield self
+
+    @property
+    def text(self):
+        return self.__text
+
+    @text.setter
+    def text(self, msg: str = ""):
+        self.__text = msg
+        self.scheduler.update(self.name, msg)
+
+    def prompt(self, msg: str) -> str:
+        return self.scheduler.ui.prompt(msg)
+
+    def hidden_prompt(self, msg: str) -> str:
+        return self.scheduler.ui.hidden_prompt(msg)
+
+
+class TaskScheduler:
+    """
+    Runs cube tasks concurrently
+
+    Tasks are executed on a pool of worker threads, as many as `task_slots`
+    allows. Each task writes its output to its own log file inside the logs
+    storage, and the last line printed by every running task is shown
+    together on the spinner of the given UI.
+    """
+
+    def __init__(self, ui: UI, slots: int = None):
+        """Creates a scheduler
+
+        Args:
+            ui (UI): UI where the progress of the tasks is displayed
+            slots (int, optional): Maximum number of concurrent tasks.
+                Defaults to the result of `task_slots`.
+        """
+        self.ui = ui
+        self.slots = slots or task_slots()
+        self.logs_path = storage_path(config.task_logs_storage)
+        self.__lock = threading.Lock()
+        self.__progress = {}
+        self.__futures = []
+        self.__pool = ThreadPoolExecutor(max_workers=self.slots)
+        os.makedirs(self.logs_path, exist_ok=True)
+        logging.info(f"Running up to {self.slots} tasks concurrently")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            # Don't start tasks that are still waiting for a slot
+            for future in self.__futures:
+                future.cancel()
+        self.shutdown()
+
+    def log_file(self, name: str) -> str:
+        """Location of the log of a task
+
+        Args:
+            name (str): name of the task
+
+        Returns:
+            str: path to the log file
+        """
+        return os.path.join(self.logs_path, f"{name}.log")
+
+    def submit(self, name: str, fn: Callable, *args, **kwargs) -> Future:
+        """Schedules a task. The task is called as `fn(ui, *args, log_file=path, **kwargs)`,
+        which matches the signature of `Cube.run`.
+
+        Args:
+            name (str): unique name of the task, used for its log and progress
+            fn (Callable): function that executes the task
+
+        Returns:
+            Future: future holding the value returned by the task
+        """
+        future = self.__pool.submit(self.run, name, fn, *args, **kwargs)
+        self.__futures.append(future)
+        return future
+
+    def run(self, name: str, fn: Callable, *args, **kwargs):
+        """Executes a task on the calling thread, without waiting for a slot.
+        The task is logged and displayed like the scheduled ones.
+
+        Args:
+            name (str): unique name of the task, used for its log and progress
+            fn (Callable): function that executes the task
+
+        Returns:
+            Any: the value returned by the task
+        """
+        logging.info(f"Starting task {name}")
+        task_ui = TaskUI(self, name)
+        self.update(name, task_ui.text)
+        try:
+            return fn(task_ui, *args, log_file=self.log_file(name), **kwargs)
+        finally:
+            self.update(name, None)
+            logging.info(f"Finished task {name}")
+
+    def update(self, name: str, msg: str):
+        """Updates the progress shown for a task
+
+        Args:
+            name (str): name of the task
+            msg (str): latest progress message. None removes the task from the display
+        """
+        with self.__lock:
+            if msg is None:
+                self.__progress.pop(name, None)
+            else:
+                self.__progress[name] = msg
+            if self.__progress:
+                self.ui.text = " | ".join(self.__progress.values())
+
+    def shutdown(self):
+        """Waits for every scheduled task to finish and releases the workers
+        """
+        self.__pool.shutdown(wait=True)
@@ -0,0 +1,76 @@
+import pytest
+
+from medperf.commands.benchmark.leaderboard import BenchmarkLeaderboard
+
+PATCH_LEADERBOARD = "medperf.commands.benchmark.leaderboard.{}"
+
+
+def summary(model, metric, mean, status="APPROVED", count=2):
+    return {
+        "model": model,
+        "approval_status": status,
+        "metric": metric,
+        "count": count,
+        "mean": mean,
+        "min": mean - 0.1,
+        "max": mean + 0.1,
+    }
+
+
+@pytest.fixture
+def tabulate(mocker):
+    return mocker.patch(PATCH_LEADERBOARD.format("tabulate"))
+
+
+def test_retrieves_selected_metrics(mocker, comms, ui, tabulate):
+    # Arrange
+    spy = mocker.patch.object(comms, "get_benchmark_leaderboard", return_value=[])
+
+    # Act
+    BenchmarkLeaderboard.run(1, comms, ui, ["AUC"], "approved")
+
+    # Assert
+    spy.assert_called_once_with(1, ["AUC"], "APPROVED")
+
+
+def test_displays_one_row_per_model_and_status(mocker, comms, ui, tabulate):
+    # Arrange
+    summaries = [
+        summary(1, "AUC", 0.5),
+        summary(1, "F1", 0.4),
+        summary(1, "AUC", 0.3, status="PENDING"),
+        summary(2, "AUC", 0.6),
+    ]
+    mocker.patch.object(comms, "get_benchmark_leaderboard", return_value=summaries)
+
+    # Act
+    BenchmarkLeaderboard.run(1, comms, ui)
+
+    # Assert
+    data = tabulate.call_args[0][0]
+    headers = tabulate.call_args[1]["headers"]
+    assert headers == ["MLCube UID", "Status", "Results", "AUC", "F1"]
+    assert [row[:2] for row in data] == [[2, "APPROVED"], [1, "APPROVED"], [1, "PENDING"]]
+    assert data[0][3] == "0.6000 [0.5000, 0.7000]"
+    assert data[0][4] == ""
+
+
+@pytest.mark.parametrize("ascending", [False, True])
+def test_ranks_models_by_first_metric(mocker, comms, ui, tabulate, ascending):
+    # Arrange
+    summaries = [
+        summary(1, "AUC", 0.5),
+        summary(1, "F1", 0.9),
+        summary(2, "AUC", 0.7),
+        summary(2, "F1", 0.1),
+        summary(3, "AUC", 0.6),
+    ]
+    mocker.patch.object(comms, "get_benchmark_leaderboard", return_value=summaries)
+
+    # Act
+    BenchmarkLeaderboard.run(1, comms, ui, ["F1", "AUC"], ascending=ascending)
+
+    # Assert
+    models = [row[0] for row in tabulate.call_args[0][0]]
+    # Models without the ranking metric go last
+    assert models == ([2, 1, 3] if ascending else [1, 2, 3])
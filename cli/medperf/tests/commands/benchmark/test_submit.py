@@ -132,8 +132,9 @@ def test_get_extra_information_retrieves_expected_info(
         "evaluator_mlcube": "",
     }
     submission = SubmitBenchmark(benchmark_info, comms, ui)
-    mocker.patch.object(comms, "get_benchmark_demo_dataset", return_value="demo_path")
-    mocker.patch(PATCH_BENCHMARK.format("get_file_sha1"), return_value=demo_hash)
+    mocker.patch.object(
+        comms, "get_benchmark_demo_dataset", return_value=("demo_path", demo_hash)
+    )
     mocker.patch(
         PATCH_BENCHMARK.format("SubmitBenchmark.run_compatibility_test"),
         return_value=(demo_uid, results),
@@ -0,0 +1,162 @@
+import os
+import pytest
+from functools import partial
+from unittest.mock import mock_open
+
+import medperf.config as config
+from medperf.utils import storage_path
+from medperf.commands.catalog.rebuild import CatalogRebuild
+
+PATCH_REBUILD = "medperf.commands.catalog.rebuild.{}"
+
+
+def results_path(b_id, m_id, d_id):
+    return os.path.join("results", b_id, m_id, d_id)
+
+
+def open_file(path, mode):
+    f = mock_open()()
+    f.name = path
+    return f
+
+
+def stored_file(datasets, results, f):
+    """Returns the contents of the registration file of a dataset or result"""
+    data_storage = storage_path(config.data_storage)
+    for generated_uid, uid in datasets.items():
+        if f.name == os.path.join(data_storage, generated_uid, config.reg_file):
+            return {"uid": uid}
+    for ids, uid in results.items():
+        if f.name == results_path(*ids):
+            contents = {"inputs_hash": f"{'_'.join(ids)}_inputs"}
+            if uid is not None:
+                contents["uid"] = uid
+            return contents
+
+
+def is_stored(missing, path):
+    return not any(path.startswith(prefix) for prefix in missing)
+
+
+@pytest.fixture
+def storage(mocker):
+    """Mocks a storage with the given cubes, datasets and results.
+    Every entity has its files, unless listed in missing
+    """
+
+    def storage_gen(cubes=[], datasets={}, results={}, missing=[]):
+        uids = {
+            storage_path(config.cubes_storage): cubes,
+            storage_path(config.data_storage): list(datasets.keys()),
+        }
+        safe_load = partial(stored_file, datasets, results)
+        mocker.patch(PATCH_REBUILD.format("get_uids"), side_effect=uids.get)
+        mocker.patch(PATCH_REBUILD.format("results_ids"), return_value=list(results))
+        mocker.patch(PATCH_REBUILD.format("results_path"), side_effect=results_path)
+        mocker.patch("os.path.exists", side_effect=partial(is_stored, missing))
+        mocker.patch("builtins.open", side_effect=open_file)
+        mocker.patch(PATCH_REBUILD.format("yaml.safe_load"), side_effect=safe_load)
+
+    return storage_gen
+
+
+def test_run_clears_catalog(mocker, ui, catalog, storage):
+    # Arrange
+    storage()
+    catalog.add_cube(1)
+    catalog.add_dataset("abc", 1)
+    catalog.add_result(1, 2, 3)
+
+    # Act
+    CatalogRebuild.run(ui)
+
+    # Assert
+    assert catalog.cubes() == []
+    assert catalog.datasets() == []
+    assert catalog.results() == []
+
+
+@pytest.mark.parametrize("cubes", [["1"], ["1", "25", f"{config.test_cube_prefix}3"]])
+def test_run_adds_stored_cubes(mocker, ui, catalog, storage, cubes):
+    # Arrange
+    storage(cubes=cubes)
+
+    # Act
+    CatalogRebuild.run(ui)
+
+    # Assert
+    assert catalog.cubes() == sorted(cubes)
+
+
+def test_run_ignores_cubes_without_metadata(mocker, ui, catalog, storage):
+    # Arrange
+    cubes_storage = storage_path(config.cubes_storage)
+    storage(cubes=["1", "2"], missing=[os.path.join(cubes_storage, "2")])
+
+    # Act
+    CatalogRebuild.run(ui)
+
+    # Assert
+    assert catalog.cubes() == ["1"]
+
+
+def test_run_adds_stored_datasets(mocker, ui, catalog, storage):
+    # Arrange
+    storage(datasets={"abc": 1, "def": None})
+
+    # Act
+    CatalogRebuild.run(ui)
+
+    # Assert
+    assert catalog.datasets() == ["abc", "def"]
+    assert catalog.get_dataset(1) == "abc"
+
+
+def test_run_ignores_temporary_datasets(mocker, ui, catalog, storage):
+    # Arrange
+    tmp_dset = f"{config.tmp_prefix}def"
+    storage(datasets={"abc": 1, tmp_dset: None})
+
+    # Act
+    CatalogRebuild.run(ui)
+
+    # Assert
+    assert catalog.datasets() == ["abc"]
+
+
+def test_run_ignores_unregistered_datasets(mocker, ui, catalog, storage):
+    # Arrange
+    data_storage = storage_path(config.data_storage)
+    storage(
+        datasets={"abc": 1, "def": None}, missing=[os.path.join(data_storage, "def")]
+    )
+
+    # Act
+    CatalogRebuild.run(ui)
+
+    # Assert
+    assert catalog.datasets() == ["abc"]
+
+
+def test_run_adds_stored_results(mocker, ui, catalog, storage):
+    # Arrange
+    storage(results={("1", "2", "3"): 10, ("1", "2", "4"): None})
+
+    # Act
+    CatalogRebuild.run(ui)
+
+    # Assert
+    assert catalog.results() == [("1", "2", "3"), ("1", "2", "4")]
+    assert catalog.get_result(10) == ("1", "2", "3")
+
+
+def test_run_restores_inputs_hash_of_stored_results(mocker, ui, catalog, storage):
+    # Arrange
+    storage(results={("1", "2", "3"): 10, ("1", "2", "4"): None})
+
+    # Act
+    CatalogRebuild.run(ui)
+
+    # Assert
+    assert catalog.find_result("1", "2", "3") == ("10", "1_2_3_inputs")
+    assert catalog.find_result("1", "2", "4") == (None, "1_2_4_inputs")
@@ -264,7 +264,10 @@ class TestWithDefaultUID:
         self, mocker, in_path, out_path, preparation
     ):
         # Arrange
-        mocker.patch(PATCH_DATAPREP.format("get_folder_sha1"), side_effect=lambda x: x)
+        mocker.patch(
+            PATCH_DATAPREP.format("get_folder_sha1"),
+            side_effect=lambda path, *args, **kwargs: path,
+        )
         preparation.data_path = in_path
         preparation.out_datapath = out_path
 
@@ -275,6 +278,24 @@ class TestWithDefaultUID:
         assert preparation.in_uid == in_path
         assert preparation.generated_uid == out_path
 
+    def test_generate_uids_uses_input_hash_manifest(self, mocker, preparation):
+        # Arrange
+        spy = mocker.patch(PATCH_DATAPREP.format("get_folder_sha1"), return_value="")
+        mocker.patch(
+            PATCH_DATAPREP.format("folder_manifest_path"), return_value="in_manifest"
+        )
+
+        # Act
+        preparation.generate_uids()
+
+        # Assert
+        spy.assert_has_calls(
+            [
+                call(preparation.data_path, "in_manifest", preparation.ui),
+                call(preparation.out_datapath, ui=preparation.ui),
+            ]
+        )
+
     def test_todict_calls_get_stats(self, mocker, preparation):
         # Arrange
         spy = mocker.patch(PATCH_DATAPREP.format("get_stats"))
@@ -354,6 +375,19 @@ class TestWithDefaultUID:
         # Assert
         open_spy.assert_called_once_with(filepath, "w")
 
+    def test_write_adds_dataset_to_catalog(self, mocker, preparation, catalog):
+        # Arrange
+        mocker.patch("builtins.open", MagicMock())
+        mocker.patch("yaml.dump", MagicMock())
+        mocker.patch(PATCH_DATAPREP.format("DataPreparation.todict"), return_value={})
+        preparation.generated_uid = "generated_uid"
+
+        # Act
+        preparation.write()
+
+        # Assert
+        assert catalog.datasets() == ["generated_uid"]
+
 
 @pytest.mark.parametrize("uid", ["574", "1059", "1901"])
 def test_run_returns_generated_uid(mocker, comms, ui, preparation, uid):
@@ -67,8 +67,7 @@ def test_get_additional_files_tarball_hash_gets_additional_file(
     }
     submission = SubmitCube(submit_info, comms, ui)
     submission.additional_file = add_file
-    spy = mocker.patch.object(comms, "get_cube_additional", return_value="")
-    mocker.patch(PATCH_MLCUBE.format("get_file_sha1"), return_value="")
+    spy = mocker.patch.object(comms, "get_cube_additional", return_value=("", ""))
 
     # Act
     submission.get_additional_hash()
@@ -90,8 +89,9 @@ def test_get_image_tarball_hash_gets_image_tarball_url(mocker, comms, ui, img_fi
         "image_tarball_hash": "",
     }
     submission = SubmitCube(submit_info, comms, ui)
-    spy = mocker.patch.object(comms, "get_cube_image", return_value="/path/to/img")
-    mocker.patch(PATCH_MLCUBE.format("get_file_sha1"), return_value="hash")
+    spy = mocker.patch.object(
+        comms, "get_cube_image", return_value=("/path/to/img", "hash")
+    )
 
     # Act
     submission.get_image_tarball_hash()
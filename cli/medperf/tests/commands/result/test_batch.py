@@ -0,0 +1,509 @@
+import pytest
+import threading
+
+from medperf.entities.cube import Cube
+from medperf.entities.result import Result
+from medperf.entities.dataset import Dataset
+from medperf.entities.benchmark import Benchmark
+from medperf.commands.result.batch import BatchBenchmarkExecution
+from medperf.commands.result.create import BenchmarkExecution
+from medperf import config
+
+PATCH_BATCH = "medperf.commands.result.batch.{}"
+
+
+@pytest.fixture
+def benchmark(mocker):
+    bmk = mocker.create_autospec(spec=Benchmark)
+    bmk.name = "benchmark"
+    bmk.evaluator = 10
+    bmk.models = [1, 2, 3]
+    bmk.data_preparation = "prep_cube"
+    mocker.patch(PATCH_BATCH.format("Benchmark.get"), return_value=bmk)
+    return bmk
+
+
+@pytest.fixture
+def datasets(mocker):
+    def dataset_gen(generated_uid):
+        dset = mocker.create_autospec(spec=Dataset)
+        dset.generated_uid = generated_uid
+        dset.uid = f"server_{generated_uid}"
+        dset.name = f"name_{generated_uid}"
+        dset.preparation_cube_uid = "prep_cube"
+        return dset
+
+    mocker.patch(PATCH_BATCH.format("Dataset"), side_effect=dataset_gen)
+
+
+@pytest.fixture
+def cubes(mocker):
+    def cube_gen(uid):
+        cube = mocker.create_autospec(spec=Cube)
+        cube.uid = uid
+        return cube
+
+    mocker.patch(PATCH_BATCH.format("check_cube_validity"))
+    return mocker.patch(PATCH_BATCH.format("Cube.get"), side_effect=cube_gen)
+
+
+@pytest.fixture
+def batch(mocker, comms, ui, benchmark, datasets):
+    mocker.patch(PATCH_BATCH.format("init_storage"))
+
+    def batch_gen(data_uids=["a"], model_uids=[1], all_models=False):
+        batch = BatchBenchmarkExecution(
+            1, data_uids, model_uids, comms, ui, all_models=all_models
+        )
+        batch.prepare()
+        return batch
+
+    return batch_gen
+
+
+def test_prepare_retrieves_benchmark_once(mocker, batch, benchmark):
+    # Act
+    batch(data_uids=["a", "b"], model_uids=[1, 2])
+
+    # Assert
+    Benchmark.get.assert_called_once_with(1, force_update=True)
+
+
+@pytest.mark.parametrize(
+    "data_uids,model_uids",
+    [(["a"], [1, 2]), (["a", "b"], [1]), (["a", "b", "c"], [3, 1])],
+)
+def test_prepare_schedules_every_model_and_dataset(
+    mocker, batch, data_uids, model_uids
+):
+    # Act
+    batch = batch(data_uids=data_uids, model_uids=model_uids)
+
+    # Assert
+    scheduled = [
+        (execution.dataset.generated_uid, execution.model_uid)
+        for execution in batch.executions
+    ]
+    expected = [(data_uid, uid) for data_uid in data_uids for uid in model_uids]
+    assert scheduled == expected
+
+
+def test_prepare_schedules_all_benchmark_models(mocker, batch, benchmark):
+    # Act
+    batch = batch(model_uids=None, all_models=True)
+
+    # Assert
+    assert [execution.model_uid for execution in batch.executions] == [1, 2, 3]
+
+
+def test_prepare_ignores_repeated_models(mocker, batch):
+    # Act
+    batch = batch(model_uids=[2, 1, 2])
+
+    # Assert
+    assert batch.model_uids == [2, 1]
+
+
+def test_prepare_shares_benchmark_across_executions(mocker, batch, benchmark):
+    # Act
+    batch = batch(data_uids=["a", "b"], model_uids=[1, 2])
+
+    # Assert
+    assert all(execution.benchmark is benchmark for execution in batch.executions)
+
+
+def test_validate_fails_without_models(mocker, batch):
+    # Arrange
+    batch = batch(model_uids=[])
+    spy = mocker.patch(
+        PATCH_BATCH.format("pretty_error"),
+        side_effect=lambda *args, **kwargs: exit(),
+    )
+
+    # Act
+    with pytest.raises(SystemExit):
+        batch.validate()
+
+    # Assert
+    spy.assert_called_once()
+
+
+def test_validate_validates_every_execution(mocker, batch):
+    # Arrange
+    batch = batch(data_uids=["a", "b"], model_uids=[1, 2])
+    spy = mocker.patch(PATCH_BATCH.format("BenchmarkExecution.validate"))
+
+    # Act
+    batch.validate()
+
+    # Assert
+    assert spy.call_count == 4
+
+
+def test_get_cubes_retrieves_each_cube_once(mocker, batch, cubes):
+    # Arrange
+    batch = batch(data_uids=["a", "b", "c"], model_uids=[1, 2])
+
+    # Act
+    batch.get_cubes()
+
+    # Assert
+    retrieved = sorted(args[0] for args, _ in cubes.call_args_list)
+    assert retrieved == [1, 2, 10]
+
+
+def test_get_cubes_assigns_cubes_to_executions(mocker, batch, cubes):
+    # Arrange
+    batch = batch(data_uids=["a", "b"], model_uids=[1, 2])
+
+    # Act
+    batch.get_cubes()
+
+    # Assert
+    for execution in batch.executions:
+        assert execution.evaluator.uid == 10
+        assert execution.model_cube.uid == execution.model_uid
+
+
+@pytest.fixture
+def stages(mocker):
+    mocker.patch("os.makedirs")
+    mocker.patch.object(config, "max_concurrent_tasks", 1)
+    mocker.patch.object(config, "predictions_queue_size", 1)
+    names = ["run_inference", "run_evaluation", "discard", "complete"]
+    stages = {
+        name: mocker.patch(PATCH_BATCH.format(f"BenchmarkExecution.{name}"))
+        for name in names
+    }
+    stages["pretty_error"] = mocker.patch(PATCH_BATCH.format("pretty_error"))
+    return stages
+
+
+def test_run_executions_runs_every_execution(mocker, batch, stages):
+    # Arrange
+    batch = batch(data_uids=["a", "b"], model_uids=[1, 2, 3])
+
+    # Act
+    batch.run_executions()
+
+    # Assert
+    assert stages["run_inference"].call_count == 6
+    assert stages["run_evaluation"].call_count == 6
+    assert stages["complete"].call_count == 6
+    stages["discard"].assert_not_called()
+    stages["pretty_error"].assert_not_called()
+
+
+def test_run_executions_logs_each_task_separately(mocker, batch, stages):
+    # Arrange
+    batch = batch(data_uids=["a", "b"], model_uids=[1])
+
+    # Act
+    batch.run_executions()
+
+    # Assert
+    calls = stages["run_inference"].call_args_list
+    calls += stages["run_evaluation"].call_args_list
+    log_files = [call[1].get("log_file", call[0][-1]) for call in calls]
+    assert len(set(log_files)) == 4
+    assert all(log_file.endswith(".log") for log_file in log_files)
+
+
+@pytest.mark.parametrize("stage", ["run_inference", "run_evaluation"])
+def test_run_executions_discards_failed_executions(mocker, batch, stages, stage):
+    # Arrange
+    batch = batch(data_uids=["a"], model_uids=[1, 2, 3])
+    failed = batch.executions[1]
+
+    def run_stage(execution, ui, log_file):
+        if execution is failed:
+            raise RuntimeError()
+
+    mocker.patch.object(BenchmarkExecution, stage, run_stage)
+
+    # Act
+    batch.run_executions()
+
+    # Assert
+    stages["discard"].assert_called_once()
+    assert stages["complete"].call_count == 2
+    stages["pretty_error"].assert_called_once()
+
+
+def test_run_executions_evaluates_while_next_model_infers(mocker, batch, stages):
+    # Arrange
+    batch = batch(data_uids=["a"], model_uids=[1, 2])
+    first, second = batch.executions
+    barrier = threading.Barrier(2, timeout=5)
+
+    def run_inference(execution, ui, log_file):
+        if execution is second:
+            barrier.wait()
+
+    def run_evaluation(execution, ui, log_file):
+        if execution is first:
+            barrier.wait()
+
+    mocker.patch.object(BenchmarkExecution, "run_inference", run_inference)
+    mocker.patch.object(BenchmarkExecution, "run_evaluation", run_evaluation)
+
+    # Act
+    batch.run_executions()
+
+    # Assert
+    assert stages["complete"].call_count == 2
+
+
+def test_run_executions_runs_inferences_concurrently(mocker, batch, stages):
+    # Arrange
+    mocker.patch.object(config, "max_concurrent_tasks", 2)
+    batch = batch(data_uids=["a"], model_uids=[1, 2])
+    barrier = threading.Barrier(2, timeout=5)
+
+    def run_inference(execution, ui, log_file):
+        barrier.wait()
+
+    mocker.patch.object(BenchmarkExecution, "run_inference", run_inference)
+
+    # Act
+    batch.run_executions()
+
+    # Assert
+    stages["discard"].assert_not_called()
+    assert stages["complete"].call_count == 2
+
+
+@pytest.mark.parametrize("queue_size", [1, 2])
+@pytest.mark.parametrize("slots", [1, 3])
+def test_run_executions_bounds_pending_predictions(
+    mocker, batch, stages, queue_size, slots
+):
+    # Arrange
+    mocker.patch.object(config, "max_concurrent_tasks", slots)
+    mocker.patch.object(config, "predictions_queue_size", queue_size)
+    batch = batch(data_uids=["a", "b"], model_uids=[1, 2, 3, 4])
+    lock = threading.Lock()
+    pending = []
+    max_pending = []
+
+    def run_inference(execution, ui, log_file):
+        with lock:
+            pending.append(execution)
+            max_pending.append(len(pending))
+
+    def run_evaluation(execution, ui, log_file):
+        threading.Event().wait(0.01)
+        with lock:
+            pending.remove(execution)
+
+    mocker.patch.object(BenchmarkExecution, "run_inference", run_inference)
+    mocker.patch.object(BenchmarkExecution, "run_evaluation", run_evaluation)
+
+    # Act
+    batch.run_executions()
+
+    # Assert
+    # Blocked models, queued predictions and the one being evaluated
+    assert max(max_pending) <= slots + queue_size + 1
+    assert stages["complete"].call_count == 8
+
+
+def test_run_executions_discards_executions_failing_to_complete(
+    mocker, batch, stages
+):
+    # Arrange
+    batch = batch(data_uids=["a"], model_uids=[1, 2, 3])
+    stages["complete"].side_effect = [None, RuntimeError(), None]
+
+    # Act
+    batch.run_executions()
+
+    # Assert
+    stages["discard"].assert_called_once()
+    stages["pretty_error"].assert_called_once()
+
+
+def test_run_executions_fails_on_unexpected_evaluation_errors(mocker, batch, stages):
+    # Arrange
+    mocker.patch.object(config, "predictions_queue_size", 1)
+    batch = batch(data_uids=["a"], model_uids=[1, 2, 3, 4])
+    stages["complete"].side_effect = OSError
+
+    # Act & Assert
+    with pytest.raises(OSError):
+        batch.run_executions()
+    assert stages["run_inference"].call_count == 4
+    stages["complete"].assert_called_once()
+
+
+def test_run_executions_stops_on_unexpected_errors(mocker, batch, stages):
+    # Arrange
+    batch = batch(data_uids=["a"], model_uids=[1, 2, 3])
+    stages["run_inference"].side_effect = SystemExit
+
+    # Act & Assert
+    with pytest.raises(SystemExit):
+        batch.run_executions()
+    stages["run_evaluation"].assert_not_called()
+
+
+@pytest.fixture
+def results(mocker):
+    created = []
+
+    def result_gen(benchmark_uid, dataset_uid, model_uid):
+        result = mocker.create_autospec(spec=Result)
+        result.benchmark_uid = benchmark_uid
+        result.dataset_uid = dataset_uid
+        result.model_uid = model_uid
+        result.results = {}
+        created.append(result)
+        return result
+
+    mocker.patch(PATCH_BATCH.format("Result"), side_effect=result_gen)
+    return created
+
+
+def test_submit_results_requests_approval_once(mocker, batch, results):
+    # Arrange
+    batch = batch(data_uids=["a", "b"], model_uids=[1, 2])
+    spy = mocker.patch(PATCH_BATCH.format("approval_prompt"), return_value=True)
+
+    # Act
+    batch.submit_results()
+
+    # Assert
+    spy.assert_called_once()
+
+
+def test_submit_results_uploads_every_result(mocker, batch, results, comms, ui):
+    # Arrange
+    batch = batch(data_uids=["a", "b"], model_uids=[1, 2])
+    spy = mocker.patch(PATCH_BATCH.format("upload_results"))
+
+    # Act
+    batch.submit_results(approved=True)
+
+    # Assert
+    uploaded = [(result.dataset_uid, result.model_uid) for result in results]
+    assert uploaded == [
+        ("server_a", 1),
+        ("server_a", 2),
+        ("server_b", 1),
+        ("server_b", 2),
+    ]
+    spy.assert_called_once_with(results, comms, ui)
+
+
+def test_submit_results_fails_if_not_approved(mocker, batch, results):
+    # Arrange
+    batch = batch()
+    mocker.patch(PATCH_BATCH.format("approval_prompt"), return_value=False)
+    spy = mocker.patch(
+        PATCH_BATCH.format("pretty_error"),
+        side_effect=lambda *args, **kwargs: exit(),
+    )
+
+    # Act
+    with pytest.raises(SystemExit):
+        batch.submit_results()
+
+    # Assert
+    spy.assert_called_once()
+
+
+def test_run_executes_expected_flow(mocker, comms, ui, benchmark, datasets):
+    # Arrange
+    mocker.patch(PATCH_BATCH.format("init_storage"))
+    spies = {
+        name: mocker.patch(PATCH_BATCH.format(f"BatchBenchmarkExecution.{name}"))
+        for name in [
+            "validate",
+            "get_cubes",
+            "skip_cached",
+            "run_executions",
+            "submit_results",
+        ]
+    }
+
+    # Act
+    BatchBenchmarkExecution.run(1, ["a"], [1], comms, ui, approved=True)
+
+    # Assert
+    for spy in spies.values():
+        spy.assert_called_once()
+    spies["submit_results"].assert_called_once_with(True)
+
+
+def test_run_doesnt_skip_cached_if_forced(mocker, comms, ui, benchmark, datasets):
+    # Arrange
+    mocker.patch(PATCH_BATCH.format("init_storage"))
+    spies = {
+        name: mocker.patch(PATCH_BATCH.format(f"BatchBenchmarkExecution.{name}"))
+        for name in ["validate", "get_cubes", "skip_cached", "run_executions"]
+    }
+    mocker.patch(PATCH_BATCH.format("BatchBenchmarkExecution.submit_results"))
+
+    # Act
+    BatchBenchmarkExecution.run(1, ["a"], [1], comms, ui, force=True)
+
+    # Assert
+    spies["skip_cached"].assert_not_called()
+    spies["run_executions"].assert_called_once()
+
+
+def test_run_stops_if_every_result_is_cached(mocker, comms, ui, benchmark, datasets):
+    # Arrange
+    mocker.patch(PATCH_BATCH.format("init_storage"))
+    mocker.patch(PATCH_BATCH.format("BatchBenchmarkExecution.validate"))
+    mocker.patch(PATCH_BATCH.format("BatchBenchmarkExecution.get_cubes"))
+    mocker.patch.object(comms, "get_user_results", return_value=[])
+    mocker.patch(
+        PATCH_BATCH.format("BenchmarkExecution.is_cached"), return_value=True
+    )
+    run_spy = mocker.patch(PATCH_BATCH.format("BatchBenchmarkExecution.run_executions"))
+    submit_spy = mocker.patch(
+        PATCH_BATCH.format("BatchBenchmarkExecution.submit_results")
+    )
+
+    # Act
+    BatchBenchmarkExecution.run(1, ["a", "b"], [1], comms, ui)
+
+    # Assert
+    run_spy.assert_not_called()
+    submit_spy.assert_not_called()
+
+
+def test_skip_cached_retrieves_results_of_benchmark(mocker, batch, comms):
+    # Arrange
+    batch = batch(data_uids=["a"], model_uids=[1])
+    spy = mocker.patch.object(comms, "get_user_results", return_value=[])
+    mocker.patch.object(BenchmarkExecution, "is_cached", return_value=False)
+
+    # Act
+    batch.skip_cached()
+
+    # Assert
+    spy.assert_called_once_with(benchmark=batch.benchmark_uid)
+
+
+def test_skip_cached_removes_cached_executions(mocker, batch, comms):
+    # Arrange
+    batch = batch(data_uids=["a", "b"], model_uids=[1, 2])
+    cached = batch.executions[1:3]
+    user_results = [{"id": 1}]
+    mocker.patch.object(comms, "get_user_results", return_value=user_results)
+
+    def is_cached(execution, results):
+        assert results == user_results
+        return execution in cached
+
+    mocker.patch.object(BenchmarkExecution, "is_cached", is_cached)
+    expected = [batch.executions[0], batch.executions[3]]
+
+    # Act
+    batch.skip_cached()
+
+    # Assert
+    assert batch.executions == expected
+    comms.get_user_results.assert_called_once()
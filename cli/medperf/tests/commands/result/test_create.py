@@ -1,5 +1,6 @@
 import pytest
-from unittest.mock import call
+import threading
+from unittest.mock import ANY, call, mock_open
 
 from medperf.entities.cube import Cube
 from medperf.entities.dataset import Dataset
@@ -26,11 +27,14 @@ def execution(mocker, comms, ui, cube):
     mocker.patch(PATCH_EXECUTION.format("init_storage"))
     mocker.patch(PATCH_EXECUTION.format("Dataset"), side_effect=mock_dset)
     mocker.patch(PATCH_EXECUTION.format("Benchmark"), side_effect=mock_bmark)
+    preds = mocker.patch(PATCH_EXECUTION.format("predictions"))
+    preds.is_cached.return_value = False
     exec = BenchmarkExecution(0, 0, 0, comms, ui)
     exec.prepare()
     exec.dataset.uid = 1
     exec.dataset.generated_uid = "data_uid"
     exec.dataset.preparation_cube_uid = "prep_cube"
+    exec.dataset.data_path = "data_path"
     exec.dataset.labels_path = "labels_path"
     exec.benchmark.data_preparation = "prep_cube"
     exec.benchmark.models = [0]
@@ -39,6 +43,15 @@ def execution(mocker, comms, ui, cube):
     return exec
 
 
+@pytest.fixture
+def results_file(mocker):
+    """Mocks the results file written by the evaluator"""
+    mocker.patch("builtins.open", mock_open())
+    mocker.patch("os.access", return_value=True)
+    mocker.patch("yaml.safe_load", return_value={"metric": 1})
+    return mocker.patch("yaml.dump")
+
+
 def test_validate_fails_if_preparation_cube_mismatch(mocker, execution):
     # Arrange
     execution.dataset.preparation_cube_uid = "dset_prep_cube"
@@ -119,7 +132,30 @@ def test_get_cubes_retrieves_expected_cubes(
     execution.get_cubes()
 
     # Assert
-    spy.assert_has_calls(calls)
+    spy.assert_has_calls(calls, any_order=True)
+
+
+def test_get_cubes_retrieves_cubes_concurrently(mocker, execution, cube):
+    # Arrange
+    # Each cube waits for the other, so a serial retrieval would time out
+    barrier = threading.Barrier(2, timeout=5)
+    cubes = {"Evaluator": cube(), "Model": cube()}
+
+    def get_cube(uid, name):
+        barrier.wait()
+        return cubes[name]
+
+    mocker.patch(
+        PATCH_EXECUTION.format("BenchmarkExecution._BenchmarkExecution__get_cube"),
+        side_effect=get_cube,
+    )
+
+    # Act
+    execution.get_cubes()
+
+    # Assert
+    assert execution.evaluator is cubes["Evaluator"]
+    assert execution.model_cube is cubes["Model"]
 
 
 @pytest.mark.parametrize("cube_uid", [3889, 4669])
@@ -149,7 +185,7 @@ def test__get_cube_checks_cube_validity(mocker, execution, cube):
     spy.assert_called_once_with(cube, ui)
 
 
-def test_run_cubes_executes_expected_cube_tasks(mocker, execution):
+def test_run_cubes_executes_expected_cube_tasks(mocker, execution, results_file):
     # Arrange
     execution.dataset.data_path = "data_path"
     execution.model_cube.cube_path = "cube_path"
@@ -170,23 +206,90 @@ def test_run_cubes_executes_expected_cube_tasks(mocker, execution):
     assert eval_spy.call_args_list[0][1]["task"] == "evaluate"
 
 
+@pytest.mark.parametrize("run_test", [False, True])
+def test_run_cubes_adds_result_to_catalog(
+    mocker, execution, catalog, results_file, run_test
+):
+    # Arrange
+    execution.run_test = run_test
+    execution.benchmark_uid = 2
+    execution.model_uid = 3
+    execution.dataset.data_path = "data_path"
+    mocker.patch.object(execution.model_cube, "run")
+    mocker.patch.object(execution.evaluator, "run")
+    mocker.patch(PATCH_EXECUTION.format("results_path"), return_value="")
+    mocker.patch(PATCH_EXECUTION.format("storage_path"), return_value="")
+    data_uid = "data_uid" if run_test else "1"
+
+    # Act
+    execution.run_cubes()
+
+    # Assert
+    assert catalog.results() == [("2", "3", data_uid)]
+
+
 def test_run_executes_expected_flow(mocker, comms, ui, execution):
     # Arrange
     val_spy = mocker.patch(PATCH_EXECUTION.format("BenchmarkExecution.validate"))
     get_spy = mocker.patch(PATCH_EXECUTION.format("BenchmarkExecution.get_cubes"))
     run_spy = mocker.patch(PATCH_EXECUTION.format("BenchmarkExecution.run_cubes"))
+    mocker.patch(
+        PATCH_EXECUTION.format("BenchmarkExecution.is_cached"), return_value=False
+    )
 
     # Act
-    BenchmarkExecution.run(1, 1, 1, comms, ui)
+    executed = BenchmarkExecution.run(1, 1, 1, comms, ui)
 
     # Assert
     val_spy.assert_called_once()
     get_spy.assert_called_once()
     run_spy.assert_called_once()
+    assert executed
+
+
+def test_run_skips_execution_if_result_is_cached(mocker, comms, ui, execution):
+    # Arrange
+    mocker.patch(PATCH_EXECUTION.format("BenchmarkExecution.validate"))
+    mocker.patch(PATCH_EXECUTION.format("BenchmarkExecution.get_cubes"))
+    run_spy = mocker.patch(PATCH_EXECUTION.format("BenchmarkExecution.run_cubes"))
+    cached_spy = mocker.patch(
+        PATCH_EXECUTION.format("BenchmarkExecution.is_cached"), return_value=True
+    )
+    user_results = [{"id": 1}]
+    mocker.patch.object(comms, "get_user_results", return_value=user_results)
+
+    # Act
+    executed = BenchmarkExecution.run(1, 1, 1, comms, ui)
+
+    # Assert
+    cached_spy.assert_called_once_with(user_results)
+    run_spy.assert_not_called()
+    assert not executed
+
+
+@pytest.mark.parametrize("run_test,force", [(True, False), (False, True)])
+def test_run_doesnt_check_cache_if_forced_or_testing(
+    mocker, comms, ui, execution, run_test, force
+):
+    # Arrange
+    mocker.patch(PATCH_EXECUTION.format("BenchmarkExecution.validate"))
+    mocker.patch(PATCH_EXECUTION.format("BenchmarkExecution.get_cubes"))
+    run_spy = mocker.patch(PATCH_EXECUTION.format("BenchmarkExecution.run_cubes"))
+    cached_spy = mocker.patch(
+        PATCH_EXECUTION.format("BenchmarkExecution.is_cached"), return_value=True
+    )
+
+    # Act
+    BenchmarkExecution.run(1, 1, 1, comms, ui, run_test=run_test, force=force)
+
+    # Assert
+    cached_spy.assert_not_called()
+    comms.get_user_results.assert_not_called()
+    run_spy.assert_called_once()
 
 
 @pytest.mark.parametrize("mlcube", ["model", "eval"])
-def test_run_deletes_output_path_on_failure(mocker, execution, mlcube):
+def test_run_deletes_output_path_on_failure(mocker, execution, results_file, mlcube):
     # Arrange
     execution.dataset.data_path = "data_path"
     execution.model_cube.cube_path = "cube_path"
@@ -216,3 +319,173 @@ def test_run_deletes_output_path_on_failure(mocker, execution, mlcube):
     # Assert
     spy_clean.assert_called_once_with(exp_outpaths)
     spy_error.assert_called_once()
+
+
+def test_run_inference_skips_model_if_predictions_are_cached(mocker, execution):
+    # Arrange
+    mocker.patch(PATCH_EXECUTION.format("storage_path"), return_value="preds_path")
+    preds = mocker.patch(PATCH_EXECUTION.format("predictions"))
+    preds.is_cached.return_value = True
+    spy = mocker.patch.object(execution.model_cube, "run")
+
+    # Act
+    execution.run_inference(execution.ui)
+
+    # Assert
+    spy.assert_not_called()
+    preds.is_cached.assert_called_once_with("preds_path", preds.prediction_key())
+    preds.save_manifest.assert_not_called()
+
+
+def test_run_inference_runs_model_if_predictions_not_cached(mocker, execution):
+    # Arrange
+    mocker.patch(PATCH_EXECUTION.format("storage_path"), return_value="preds_path")
+    preds = mocker.patch(PATCH_EXECUTION.format("predictions"))
+    preds.is_cached.return_value = False
+    spy = mocker.patch.object(execution.model_cube, "run")
+
+    # Act
+    execution.run_inference(execution.ui)
+
+    # Assert
+    spy.assert_called_once()
+    preds.invalidate.assert_called_once_with("preds_path")
+    preds.save_manifest.assert_called_once_with("preds_path", preds.prediction_key())
+
+
+def test_run_inference_ignores_cache_if_disabled(mocker, execution):
+    # Arrange
+    execution.use_cache = False
+    mocker.patch(PATCH_EXECUTION.format("storage_path"), return_value="preds_path")
+    preds = mocker.patch(PATCH_EXECUTION.format("predictions"))
+    preds.is_cached.return_value = True
+    spy = mocker.patch.object(execution.model_cube, "run")
+
+    # Act
+    execution.run_inference(execution.ui)
+
+    # Assert
+    spy.assert_called_once()
+    preds.save_manifest.assert_called_once()
+
+
+def test_run_inference_keys_cache_by_model_and_dataset(mocker, execution):
+    # Arrange
+    preds = mocker.patch(PATCH_EXECUTION.format("predictions"))
+    mocker.patch(PATCH_EXECUTION.format("storage_path"), return_value="preds_path")
+    mocker.patch.object(execution.model_cube, "run")
+    mocker.patch.object(execution.model_cube, "fingerprint", return_value="model")
+
+    # Act
+    execution.run_inference(execution.ui)
+
+    # Assert
+    preds.prediction_key.assert_called_once_with("model", "data_uid")
+
+
+def test_discard_invalidates_cached_predictions(mocker, execution):
+    # Arrange
+    mocker.patch(PATCH_EXECUTION.format("storage_path"), return_value="preds_path")
+    mocker.patch(PATCH_EXECUTION.format("results_path"), return_value="out_path")
+    mocker.patch(PATCH_EXECUTION.format("cleanup"))
+    preds = mocker.patch(PATCH_EXECUTION.format("predictions"))
+
+    # Act
+    execution.discard(RuntimeError())
+
+    # Assert
+    preds.invalidate.assert_called_once_with("preds_path")
+
+
+@pytest.fixture
+def hashed_execution(mocker, execution):
+    mocker.patch.object(execution.evaluator, "fingerprint", return_value="eval")
+    mocker.patch.object(execution.model_cube, "fingerprint", return_value="model")
+    execution.benchmark_uid = 1
+    execution.model_uid = 2
+    return execution
+
+
+def test_inputs_hash_depends_on_cubes_and_dataset(mocker, hashed_execution):
+    # Arrange
+    base_hash = hashed_execution.inputs_hash()
+    execution = BenchmarkExecution(0, 0, 0, None, None)
+    execution.evaluator = hashed_execution.evaluator
+    execution.model_cube = hashed_execution.model_cube
+    execution.dataset = hashed_execution.dataset
+    execution.dataset.generated_uid = "other_data"
+
+    # Act
+    inputs_hash = execution.inputs_hash()
+
+    # Assert
+    assert inputs_hash != base_hash
+
+
+@pytest.mark.parametrize(
+    "uid,inputs,cached",
+    [("10", "same", True), (None, "same", False), ("10", "other", False)],
+)
+def test_is_cached_checks_local_results(
+    mocker, hashed_execution, catalog, uid, inputs, cached
+):
+    # Arrange
+    inputs_hash = hashed_execution.inputs_hash()
+    inputs = inputs_hash if inputs == "same" else inputs
+    catalog.add_result(1, 2, 1, uid, inputs)
+
+    # Act & Assert
+    assert hashed_execution.is_cached([]) == cached
+
+
+@pytest.mark.parametrize(
+    "ids,inputs,cached",
+    [
+        ((1, 2, 1), "same", True),
+        ((1, 2, 1), "other", False),
+        ((1, 2, 1), None, False),
+        ((3, 2, 1), "same", False),
+        ((1, 3, 1), "same", False),
+        ((1, 2, 3), "same", False),
+    ],
+)
+def test_is_cached_checks_server_results(
+    mocker, hashed_execution, ids, inputs, cached
+):
+    # Arrange
+    inputs_hash = hashed_execution.inputs_hash()
+    metadata = {}
+    if inputs is not None:
+        metadata["inputs_hash"] = inputs_hash if inputs == "same" else inputs
+    benchmark, model, dataset = ids
+    user_results = [
+        {"id": 5, "benchmark": benchmark, "model": model, "dataset": dataset, "metadata": metadata}
+    ]
+
+    # Act & Assert
+    assert hashed_execution.is_cached(user_results) == cached
+
+
+def test_complete_stores_inputs_hash(mocker, hashed_execution, catalog, results_file):
+    # Arrange
+    mocker.patch(PATCH_EXECUTION.format("results_path"), return_value="")
+
+    # Act
+    hashed_execution.complete()
+
+    # Assert
+    assert catalog.find_result(1, 2, 1) == (None, hashed_execution.inputs_hash())
+
+
+def test_complete_stores_inputs_hash_with_results(
+    mocker, hashed_execution, results_file
+):
+    # Arrange
+    mocker.patch(PATCH_EXECUTION.format("results_path"), return_value="")
+    exp_results = {"metric": 1, "inputs_hash": hashed_execution.inputs_hash()}
+
+    # Act
+    hashed_execution.complete()
+
+    # Assert
+    results_file.assert_called_once_with(exp_results, ANY)
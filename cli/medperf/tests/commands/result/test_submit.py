@@ -2,7 +2,7 @@ import pytest
 
 from medperf.entities.result import Result
 from medperf.entities.dataset import Dataset
-from medperf.commands.result.submit import ResultSubmission
+from medperf.commands.result.submit import ResultSubmission, upload_results
 from medperf.enums import Status
 
 PATCH_SUBMISSION = "medperf.commands.result.submit.{}"
@@ -98,3 +98,100 @@ def test_run_executes_upload_procedure(mocker, comms, ui, submission):
 
     # Assert
     spy.assert_called_once()
+
+
+@pytest.fixture
+def pending(mocker, result):
+    result.benchmark_uid = 1
+    result.model_uid = 1
+    result.dataset_uid = 1
+    result.results = {}
+    spy = mocker.patch.object(Result, "all", return_value=[result])
+    return spy
+
+
+def test_run_pending_gets_pending_results(mocker, comms, ui, pending):
+    # Arrange
+    mocker.patch(PATCH_SUBMISSION.format("upload_results"))
+
+    # Act
+    ResultSubmission.run_pending(comms, ui, approved=True)
+
+    # Assert
+    pending.assert_called_once_with(pending=True)
+
+
+def test_run_pending_uploads_results_together(mocker, comms, ui, pending, result):
+    # Arrange
+    spy = mocker.patch(PATCH_SUBMISSION.format("upload_results"))
+    approval = mocker.patch(
+        PATCH_SUBMISSION.format("approval_prompt"), return_value=True
+    )
+
+    # Act
+    ResultSubmission.run_pending(comms, ui)
+
+    # Assert
+    approval.assert_called_once()
+    spy.assert_called_once_with([result], comms, ui)
+
+
+def test_run_pending_fails_if_not_approved(mocker, comms, ui, pending):
+    # Arrange
+    mocker.patch(PATCH_SUBMISSION.format("approval_prompt"), return_value=False)
+    spy = mocker.patch(PATCH_SUBMISSION.format("upload_results"))
+    mocker.patch(
+        PATCH_SUBMISSION.format("pretty_error"),
+        side_effect=lambda *args, **kwargs: exit(),
+    )
+
+    # Act
+    with pytest.raises(SystemExit):
+        ResultSubmission.run_pending(comms, ui)
+
+    # Assert
+    spy.assert_not_called()
+
+
+def test_run_pending_does_nothing_without_pending_results(mocker, comms, ui):
+    # Arrange
+    mocker.patch.object(Result, "all", return_value=[])
+    spy = mocker.patch(PATCH_SUBMISSION.format("upload_results"))
+
+    # Act
+    ResultSubmission.run_pending(comms, ui)
+
+    # Assert
+    spy.assert_not_called()
+
+
+def test_upload_results_uploads_all_results(mocker, comms, ui, result):
+    # Arrange
+    spy = mocker.patch.object(Result, "upload_all", return_value=[])
+    error_spy = mocker.patch(PATCH_SUBMISSION.format("pretty_error"))
+
+    # Act
+    upload_results([result], comms, ui)
+
+    # Assert
+    spy.assert_called_once_with([result], comms)
+    error_spy.assert_not_called()
+
+
+def test_upload_results_fails_if_results_rejected(mocker, comms, ui, result):
+    # Arrange
+    result.model_uid = 1
+    result.dataset_uid = 1
+    result.todict.return_value = {"name": "result"}
+    mocker.patch.object(Result, "upload_all", return_value=[(result, "errors")])
+    spy = mocker.patch(
+        PATCH_SUBMISSION.format("pretty_error"),
+        side_effect=lambda *args, **kwargs: exit(),
+    )
+
+    # Act
+    with pytest.raises(SystemExit):
+        upload_results([result], comms, ui)
+
+    # Assert
+    spy.assert_called_once()
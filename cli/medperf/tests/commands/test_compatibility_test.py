@@ -353,8 +353,9 @@ def test_download_demo_data_fails_if_incorrect_hash(mocker, benchmark, comms, ha
     bmk.demo_dataset_url = "url"
     bmk.demo_dataset_hash = hash
     mocker.patch(PATCH_TEST.format("Benchmark.get"), return_value=bmk)
-    mocker.patch.object(comms, "get_benchmark_demo_dataset", return_value=("", ""))
-    mocker.patch(PATCH_TEST.format("get_file_sha1"), return_value="hash")
+    mocker.patch.object(
+        comms, "get_benchmark_demo_dataset", return_value=("", "hash")
+    )
     exec = CompatibilityTestExecution(uid, data, prep, model, eval, comms, ui)
     spy = mocker.patch(
         PATCH_TEST.format("pretty_error"), side_effect=lambda *args, **kwargs: exit(),
@@ -385,8 +386,9 @@ def test_download_demo_data_extracts_expected_paths(
     bmk.demo_dataset_url = "url"
     bmk.demo_dataset_hash = "hash"
     mocker.patch(PATCH_TEST.format("Benchmark.get"), return_value=bmk)
-    mocker.patch.object(comms, "get_benchmark_demo_dataset", return_value=("", ""))
-    mocker.patch(PATCH_TEST.format("get_file_sha1"), return_value="hash")
+    mocker.patch.object(
+        comms, "get_benchmark_demo_dataset", return_value=("", "hash")
+    )
 
     untar_path = "untar/path"
     paths_dict = {"data_path": paths[0], "labels_path": paths[1]}
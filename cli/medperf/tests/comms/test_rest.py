@@ -1,5 +1,9 @@
+import io
 import os
 import pytest
+import tarfile
+import hashlib
+import tracemalloc
 import requests
 from unittest.mock import mock_open, ANY
 
@@ -7,6 +11,8 @@ from medperf import config
 from medperf.enums import Role, Status
 from medperf.ui.interface import UI
 from medperf.comms.rest import REST
+from medperf.profiling import Profiler
+from medperf.utils import storage_path
 from medperf.tests.mocks import MockResponse
 
 url = "https://mock.url"
@@ -25,6 +31,51 @@ def server(mocker, ui):
     return server
 
 
+@pytest.mark.parametrize("pool_connections", [1, 10])
+@pytest.mark.parametrize("pool_maxsize", [4, 32])
+def test_session_uses_configured_connection_pool(
+    mocker, ui, pool_connections, pool_maxsize
+):
+    # Arrange
+    mocker.patch.object(config, "http_pool_connections", pool_connections)
+    mocker.patch.object(config, "http_pool_maxsize", pool_maxsize)
+
+    # Act
+    server = REST(url, ui)
+
+    # Assert
+    adapter = server.session.get_adapter(url)
+    assert adapter._pool_connections == pool_connections
+    assert adapter._pool_maxsize == pool_maxsize
+
+
+def test_requests_reuse_the_same_session(mocker, server):
+    # Arrange
+    res = MockResponse({}, 200)
+    spy = mocker.patch("requests.Session.get", return_value=res)
+    server.token = "token"
+    session = server.session
+
+    # Act
+    server.get_benchmark(1)
+    server.get_cube_metadata(1)
+
+    # Assert
+    assert spy.call_count == 2
+    assert server.session is session
+
+
+def test_close_closes_session(mocker, server):
+    # Arrange
+    spy = mocker.patch("requests.Session.close")
+
+    # Act
+    server.close()
+
+    # Assert
+    spy.assert_called_once()
+
+
 @pytest.mark.parametrize(
     "method_params",
     [
@@ -142,8 +193,8 @@ def test_methods_exit_if_status_not_200(mocker, server, status, method_params):
     # Arrange
     method, args, body = method_params
     res = MockResponse(body, status)
-    mocker.patch("requests.get", return_value=res)
-    mocker.patch("requests.post", return_value=res)
+    mocker.patch("requests.Session.get", return_value=res)
+    mocker.patch("requests.Session.post", return_value=res)
     mocker.patch(patch_server.format("REST._REST__auth_req"), return_value=res)
     spy = mocker.patch(patch_server.format("pretty_error"))
     method = getattr(server, method)
@@ -160,7 +211,7 @@ def test_methods_exit_if_status_not_200(mocker, server, status, method_params):
 def test_login_with_user_and_pwd(mocker, server, ui, uname, pwd):
     # Arrange
     res = MockResponse({"token": ""}, 200)
-    spy = mocker.patch("requests.post", return_value=res)
+    spy = mocker.patch("requests.Session.post", return_value=res)
     exp_body = {"username": uname, "password": pwd}
     exp_path = f"{url}/auth-token/"
     cert_verify = config.certificate or True
@@ -176,7 +227,7 @@ def test_login_with_user_and_pwd(mocker, server, ui, uname, pwd):
 def test_login_stores_token(mocker, ui, server, token):
     # Arrange
     res = MockResponse({"token": token}, 200)
-    mocker.patch("requests.post", return_value=res)
+    mocker.patch("requests.Session.post", return_value=res)
 
     # Act
     server.login(ui, "testuser", "testpwd")
@@ -187,35 +238,35 @@ def test_login_stores_token(mocker, ui, server, token):
 
 def test_auth_get_calls_authorized_request(mocker, server):
     # Arrange
-    mocker.patch("requests.get")
+    mocker.patch("requests.Session.get")
     spy = mocker.patch(patch_server.format("REST._REST__auth_req"))
 
     # Act
     server._REST__auth_get(url)
 
     # Assert
-    spy.called_once_with(url, requests.get)
+    spy.called_once_with(url, server.session.get)
 
 
 def test_auth_post_calls_authorized_request(mocker, server):
     # Arrange
-    mocker.patch("requests.post")
+    mocker.patch("requests.Session.post")
     spy = mocker.patch(patch_server.format("REST._REST__auth_req"))
 
     # Act
     server._REST__auth_post(url)
 
     # Assert
-    spy.called_once_with(url, requests.post)
+    spy.called_once_with(url, server.session.post)
 
 
 def test_auth_req_authenticates_if_token_missing(mocker, server):
     # Arrange
-    mocker.patch("requests.post")
+    mocker.patch("requests.Session.post")
     spy = mocker.patch(patch_server.format("REST.authenticate"))
 
     # Act
-    server._REST__auth_req(url, requests.post)
+    server._REST__auth_req(url, server.session.post)
 
     # Assert
     spy.assert_called()
@@ -228,11 +279,11 @@ def test_auth_get_adds_token_to_request(mocker, server, token, req_type):
     server.token = token
 
     if req_type == "get":
-        spy = mocker.patch("requests.get")
-        func = requests.get
+        spy = mocker.patch("requests.Session.get")
+        func = server.session.get
     else:
-        spy = mocker.patch("requests.post")
-        func = requests.post
+        spy = mocker.patch("requests.Session.post")
+        func = server.session.post
 
     exp_headers = {"Authorization": f"Token {token}"}
     cert_verify = config.certificate or True
@@ -248,8 +299,8 @@ def test__req_sanitizes_json(mocker, server):
     # Arrange
     body = {}
     spy = mocker.patch(patch_server.format("sanitize_json"))
-    mocker.patch("requests.post")
-    func = requests.post
+    mocker.patch("requests.Session.post")
+    func = server.session.post
 
     # Act
     server._REST__req(url, func, json=body)
@@ -258,6 +309,22 @@ def test__req_sanitizes_json(mocker, server):
     spy.assert_called_once_with(body)
 
 
+def test__req_profiles_request(mocker, server):
+    # Arrange
+    profiler = Profiler()
+    mocker.patch.object(config, "profiler", profiler)
+    res = MockResponse({}, 200)
+    res.headers = {"Content-Length": "128"}
+    mocker.patch("requests.Session.get", return_value=res)
+
+    # Act
+    server._REST__req(url, server.session.get)
+
+    # Assert
+    span = profiler.spans[0]
+    assert (span.name, span.attrs, span.bytes) == ("request", {"url": url}, 128)
+
+
 @pytest.mark.parametrize("exp_role", ["BenchmarkOwner", "DataOwner", "ModelOwner"])
 def test_benchmark_association_returns_expected_role(mocker, server, exp_role):
     # Arrange
@@ -333,7 +400,67 @@ def test_get_benchmarks_calls_benchmarks_path(mocker, server, body):
 
     # Assert
     spy.assert_called_once_with(f"{url}/benchmarks/")
-    assert bmarks == [body]
+    assert list(bmarks) == [body]
+
+
+def test_get_benchmarks_follows_pages(mocker, server):
+    # Arrange
+    pages = [
+        {"next": f"{url}/benchmarks/?cursor=a", "results": [{"id": 1}, {"id": 2}]},
+        {"next": f"{url}/benchmarks/?cursor=b", "results": [{"id": 3}]},
+        {"next": None, "results": [{"id": 4}]},
+    ]
+    res = [MockResponse(page, 200) for page in pages]
+    spy = mocker.patch(patch_server.format("REST._REST__auth_get"), side_effect=res)
+
+    # Act
+    bmarks = list(server.get_benchmarks())
+
+    # Assert
+    assert bmarks == [{"id": 1}, {"id": 2}, {"id": 3}, {"id": 4}]
+    spy.assert_has_calls(
+        [
+            mocker.call(f"{url}/benchmarks/"),
+            mocker.call(f"{url}/benchmarks/?cursor=a"),
+            mocker.call(f"{url}/benchmarks/?cursor=b"),
+        ]
+    )
+
+
+def test_get_benchmarks_requests_pages_lazily(mocker, server):
+    # Arrange
+    pages = [
+        {"next": f"{url}/benchmarks/?cursor=a", "results": [{"id": 1}]},
+        {"next": None, "results": [{"id": 2}]},
+    ]
+    res = [MockResponse(page, 200) for page in pages]
+    spy = mocker.patch(patch_server.format("REST._REST__auth_get"), side_effect=res)
+
+    # Act
+    bmarks = server.get_benchmarks()
+    first = next(bmarks)
+
+    # Assert
+    assert first == {"id": 1}
+    spy.assert_called_once()
+
+
+def test_get_benchmarks_fails_if_a_page_fails(mocker, server):
+    # Arrange
+    pages = [
+        MockResponse({"next": f"{url}/benchmarks/?cursor=a", "results": []}, 200),
+        MockResponse({}, 500),
+    ]
+    mocker.patch(patch_server.format("REST._REST__auth_get"), side_effect=pages)
+    spy = mocker.patch(patch_server.format("pretty_error"), side_effect=SystemExit)
+    bmarks = server.get_benchmarks()
+
+    # Act
+    with pytest.raises(SystemExit):
+        list(bmarks)
+
+    # Assert
+    spy.assert_called_once()
 
 
 @pytest.mark.parametrize("body", [{"benchmark": 1}, {}, {"test": "test"}])
@@ -349,6 +476,80 @@ def test_get_benchmark_returns_benchmark_body(mocker, server, body):
     assert benchmark_body == body
 
 
+def test_get_benchmark_stores_response_with_validators(mocker, server, catalog):
+    # Arrange
+    res = MockResponse({"id": 1}, 200)
+    res.headers = {"ETag": '"etag"', "Last-Modified": "date"}
+    mocker.patch(patch_server.format("REST._REST__auth_get"), return_value=res)
+
+    # Act
+    server.get_benchmark(1)
+
+    # Assert
+    stored = catalog.get_response(f"{url}/benchmarks/1")
+    assert stored == ('"etag"', "date", '{"id": 1}')
+
+
+def test_get_benchmark_doesnt_store_response_without_validators(
+    mocker, server, catalog
+):
+    # Arrange
+    res = MockResponse({"id": 1}, 200)
+    mocker.patch(patch_server.format("REST._REST__auth_get"), return_value=res)
+
+    # Act
+    server.get_benchmark(1)
+
+    # Assert
+    assert catalog.get_response(f"{url}/benchmarks/1") is None
+
+
+def test_get_benchmark_sends_stored_validators(mocker, server, catalog):
+    # Arrange
+    catalog.add_response(f"{url}/benchmarks/1", '"etag"', None, '{"id": 1}')
+    res = MockResponse({"id": 1}, 200)
+    spy = mocker.patch(patch_server.format("REST._REST__auth_get"), return_value=res)
+
+    # Act
+    server.get_benchmark(1)
+
+    # Assert
+    spy.assert_called_once_with(
+        f"{url}/benchmarks/1", headers={"If-None-Match": '"etag"'}
+    )
+
+
+def test_get_benchmark_uses_stored_response_if_not_modified(mocker, server, catalog):
+    # Arrange
+    catalog.add_response(f"{url}/benchmarks/1", '"etag"', "date", '{"id": 1}')
+    res = MockResponse(None, 304)
+    mocker.patch(patch_server.format("REST._REST__auth_get"), return_value=res)
+
+    # Act
+    benchmark = server.get_benchmark(1)
+
+    # Assert
+    assert benchmark == {"id": 1}
+
+
+def test_get_cube_metadata_replaces_stored_response_if_modified(
+    mocker, server, catalog
+):
+    # Arrange
+    cube_url = f"{url}/mlcubes/1/"
+    catalog.add_response(cube_url, '"etag"', None, '{"id": 1}')
+    res = MockResponse({"id": 1, "name": "new"}, 200)
+    res.headers = {"ETag": '"new_etag"'}
+    mocker.patch(patch_server.format("REST._REST__auth_get"), return_value=res)
+
+    # Act
+    metadata = server.get_cube_metadata(1)
+
+    # Assert
+    assert metadata == {"id": 1, "name": "new"}
+    assert catalog.get_response(cube_url)[0] == '"new_etag"'
+
+
 @pytest.mark.parametrize("exp_uids", [[142, 437, 196], [303, 27, 24], [40, 19, 399]])
 def test_get_benchmark_models_return_uids(mocker, server, exp_uids):
     # Arrange
@@ -392,7 +593,7 @@ def test_get_user_benchmarks_returns_benchmarks(mocker, server):
     retrieved_benchmarks = server.get_user_benchmarks()
 
     # Assert
-    assert benchmarks == retrieved_benchmarks
+    assert benchmarks == list(retrieved_benchmarks)
 
 
 @pytest.mark.parametrize("body", [{"mlcube": 1}, {}, {"test": "test"}])
@@ -406,7 +607,7 @@ def test_get_mlcubes_calls_mlcubes_path(mocker, server, body):
 
     # Assert
     spy.assert_called_once_with(f"{url}/mlcubes/")
-    assert cubes == [body]
+    assert list(cubes) == [body]
 
 
 @pytest.mark.parametrize("exp_body", [{"test": "test"}, {}, {"cube": "body"}])
@@ -428,7 +629,7 @@ def test_get_cube_metadata_returns_retrieved_body(mocker, server, exp_body):
 def test_get_cube_methods_run_get_cube_file(mocker, server, method):
     # Arrange
     spy = mocker.patch(
-        patch_server.format("REST._REST__get_cube_file"), return_value=""
+        patch_server.format("REST._REST__get_cube_file"), return_value=("", "")
     )
     method = getattr(server, method)
 
@@ -445,7 +646,7 @@ def test_get_cube_methods_run_get_cube_file(mocker, server, method):
 def test_get_cube_image_uses_correct_name(mocker, server, url):
     # Arrange
     spy = mocker.patch(
-        patch_server.format("REST._REST__get_cube_file"), return_value=""
+        patch_server.format("REST._REST__get_cube_file"), return_value=("", "")
     )
     exp_filename = url.split("/")[-1]
 
@@ -472,23 +673,397 @@ def test_get_user_cubes_calls_auth_get_for_expected_path(mocker, server):
     spy.assert_called_once_with(f"{url}/me/mlcubes/")
 
 
-def test_get_cube_file_writes_to_file(mocker, server):
+@pytest.fixture
+def download_fs(mocker):
+    """Mocks the filesystem operations performed by a download without
+    any previous partial download"""
+    mocker.patch(
+        patch_server.format("REST._REST__load_download_state"), return_value=None
+    )
+    mocker.patch("os.path.isdir", return_value=True)
+    mocker.patch("os.replace")
+    mocker.patch("os.remove")
+    return mocker.patch("builtins.open", mock_open())
+
+
+class ChunkedResponse:
+    """Response that generates a new chunk for every iteration, as a real
+    streamed download would"""
+
+    def __init__(self, size, status_code=200, headers={}, fail_at=None):
+        self.size = size
+        self.status_code = status_code
+        self.headers = headers
+        self.fail_at = fail_at
+        self.chunk_sizes = []
+
+    def iter_content(self, chunk_size=1):
+        sent = 0
+        while sent < self.size:
+            if self.fail_at is not None and sent >= self.fail_at:
+                raise requests.exceptions.ChunkedEncodingError("connection lost")
+            chunk = bytes(min(chunk_size, self.size - sent))
+            sent += len(chunk)
+            self.chunk_sizes.append(len(chunk))
+            yield chunk
+
+    def close(self):
+        pass
+
+
+class NullFile:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def write(self, data):
+        pass
+
+
+def test_get_cube_file_writes_to_file(mocker, server, download_fs):
     # Arrange
     cube_uid = 1
     path = "path"
     filename = "filename"
     res = MockResponse({}, 200)
-    mocker.patch("requests.get", return_value=res)
+    mocker.patch("requests.Session.get", return_value=res)
     mocker.patch(patch_server.format("cube_path"), return_value="")
-    mocker.patch("os.path.isdir", return_value=True)
     filepath = os.path.join(path, filename)
-    spy = mocker.patch("builtins.open", mock_open())
+    tmp_filepath = filepath + config.partial_download_suffix
 
     # Act
     server._REST__get_cube_file(url, cube_uid, path, filename)
 
     # Assert
-    spy.assert_called_once_with(filepath, "wb+")
+    download_fs.assert_any_call(tmp_filepath, "wb")
+
+
+def test_download_streams_response(mocker, server, download_fs):
+    # Arrange
+    res = MockResponse({}, 200)
+    spy = mocker.patch("requests.Session.get", return_value=res)
+
+    # Act
+    server._REST__download(url, "filepath")
+
+    # Assert
+    spy.assert_called_once_with(url, stream=True, headers={})
+
+
+def test_download_profiles_transferred_bytes(mocker, server, download_fs):
+    # Arrange
+    profiler = Profiler()
+    mocker.patch.object(config, "profiler", profiler)
+    res = ChunkedResponse(1000)
+    mocker.patch("requests.Session.get", return_value=res)
+
+    # Act
+    server._REST__download(url, "filepath")
+
+    # Assert
+    span = profiler.spans[0]
+    assert (span.name, span.bytes) == ("download", 1000)
+
+
+def test_download_moves_complete_file_to_destination(mocker, server, download_fs):
+    # Arrange
+    filepath = "filepath"
+    res = MockResponse({}, 200)
+    mocker.patch("requests.Session.get", return_value=res)
+    spy = mocker.patch("os.replace")
+
+    # Act
+    path, _ = server._REST__download(url, filepath)
+
+    # Assert
+    spy.assert_called_once_with(filepath + config.partial_download_suffix, filepath)
+    assert path == filepath
+
+
+def test_download_removes_state_file_when_complete(mocker, server, download_fs):
+    # Arrange
+    filepath = "filepath"
+    res = MockResponse({}, 200)
+    mocker.patch("requests.Session.get", return_value=res)
+    spy = mocker.patch("os.remove")
+    state_file = filepath + config.partial_download_suffix
+    state_file += config.download_state_suffix
+
+    # Act
+    server._REST__download(url, filepath)
+
+    # Assert
+    spy.assert_called_once_with(state_file)
+
+
+@pytest.mark.parametrize(
+    "file_io",
+    [
+        (b"test file\n", "0181d93fee60b818e3f92e470ea97a2aff4ca56a"),
+        (b"file\nwith\nmultilines\n", "a69ce122f95a94dc02485764d463b10545a558c8"),
+    ],
+)
+@pytest.mark.parametrize("chunk_size", [1, 4, 1024])
+def test_download_returns_hash_of_streamed_content(
+    mocker, server, download_fs, file_io, chunk_size
+):
+    # Arrange
+    content, exp_hash = file_io
+    res = MockResponse({}, 200)
+    mocker.patch.object(res, "iter_content", return_value=[content])
+    mocker.patch.object(config, "download_chunk_size", chunk_size)
+    mocker.patch("requests.Session.get", return_value=res)
+
+    # Act
+    _, hash = server._REST__download(url, "filepath")
+
+    # Assert
+    assert hash == exp_hash
+
+
+def test_get_benchmark_demo_dataset_hashes_existing_file(mocker, server):
+    # Arrange
+    mocker.patch("os.path.exists", return_value=True)
+    spy = mocker.patch(patch_server.format("get_file_sha1"), return_value="hash")
+    dl_spy = mocker.patch(patch_server.format("REST._REST__download"))
+
+    # Act
+    path, hash = server.get_benchmark_demo_dataset(url, "uid")
+
+    # Assert
+    spy.assert_called_once_with(path)
+    dl_spy.assert_not_called()
+    assert hash == "hash"
+
+
+@pytest.mark.parametrize("chunk_size", [1024, 65536])
+def test_download_writes_in_bounded_chunks(mocker, server, download_fs, chunk_size):
+    # Arrange
+    size = 10 * chunk_size + 1
+    res = ChunkedResponse(size)
+    mocker.patch.object(config, "download_chunk_size", chunk_size)
+    mocker.patch("requests.Session.get", return_value=res)
+    mocker.patch("builtins.open", return_value=NullFile())
+
+    # Act
+    server._REST__download(url, "filepath")
+
+    # Assert
+    assert sum(res.chunk_sizes) == size
+    assert max(res.chunk_sizes) <= chunk_size
+
+
+@pytest.mark.parametrize("size_mb", [1, 16, 64])
+def test_download_peak_memory_does_not_grow_with_file_size(
+    mocker, server, download_fs, size_mb
+):
+    # Arrange
+    chunk_size = 64 * 1024
+    res = ChunkedResponse(size_mb * 1024 * 1024)
+    mocker.patch.object(config, "download_chunk_size", chunk_size)
+    mocker.patch("requests.Session.get", return_value=res)
+    mocker.patch("builtins.open", return_value=NullFile())
+    tracemalloc.start()
+
+    # Act
+    server._REST__download(url, "filepath")
+
+    # Assert
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < 4 * chunk_size
+
+
+@pytest.mark.parametrize("offset", [1, 300])
+@pytest.mark.parametrize("validator", ['"etag"', "Wed, 21 Oct 2015 07:28:00 GMT"])
+def test_download_resumes_partial_download(
+    mocker, server, download_fs, offset, validator
+):
+    # Arrange
+    size = 1000
+    state = {"url": url, "size": size, "validator": validator, "resumable": True}
+    headers = {"Content-Range": f"bytes {offset}-{size - 1}/{size}"}
+    res = ChunkedResponse(size - offset, 206, headers)
+    mocker.patch(
+        patch_server.format("REST._REST__load_download_state"), return_value=state
+    )
+    mocker.patch(
+        patch_server.format("REST._REST__checkpoint_partial_file"), return_value=offset
+    )
+    spy = mocker.patch("requests.Session.get", return_value=res)
+    exp_headers = {"Range": f"bytes={offset}-", "If-Range": validator}
+
+    # Act
+    server._REST__download(url, "filepath")
+
+    # Assert
+    spy.assert_called_once_with(url, stream=True, headers=exp_headers)
+    download_fs.assert_any_call("filepath" + config.partial_download_suffix, "ab")
+
+
+def test_download_restarts_if_file_changed(mocker, server, download_fs):
+    # Arrange
+    size = 1000
+    state = {"url": url, "size": size, "validator": '"old"', "resumable": True}
+    res = ChunkedResponse(size, 200, {"Content-Length": str(size)})
+    mocker.patch(
+        patch_server.format("REST._REST__load_download_state"), return_value=state
+    )
+    mocker.patch(
+        patch_server.format("REST._REST__checkpoint_partial_file"), return_value=500
+    )
+    mocker.patch("requests.Session.get", return_value=res)
+
+    # Act
+    _, hash = server._REST__download(url, "filepath")
+
+    # Assert
+    download_fs.assert_any_call("filepath" + config.partial_download_suffix, "wb")
+    assert hash == hashlib.sha1(bytes(size)).hexdigest()
+
+
+def test_download_skips_request_if_partial_file_is_complete(
+    mocker, server, download_fs
+):
+    # Arrange
+    size = 1000
+    state = {"url": url, "size": size, "validator": '"etag"', "resumable": True}
+    mocker.patch(
+        patch_server.format("REST._REST__load_download_state"), return_value=state
+    )
+    mocker.patch(
+        patch_server.format("REST._REST__checkpoint_partial_file"), return_value=size
+    )
+    spy = mocker.patch("requests.Session.get")
+    replace_spy = mocker.patch("os.replace")
+
+    # Act
+    server._REST__download(url, "filepath")
+
+    # Assert
+    spy.assert_not_called()
+    replace_spy.assert_called_once()
+
+
+def test_download_resumes_after_connection_is_lost(mocker, server, download_fs):
+    # Arrange
+    size = 1000
+    fail_at = 400
+    headers = {
+        "Content-Length": str(size),
+        "Accept-Ranges": "bytes",
+        "ETag": '"etag"',
+    }
+    first_res = ChunkedResponse(size, 200, headers, fail_at=fail_at)
+    range_headers = {"Content-Range": f"bytes {fail_at}-{size - 1}/{size}"}
+    second_res = ChunkedResponse(size - fail_at, 206, range_headers)
+    mocker.patch.object(config, "download_chunk_size", 100)
+    spy = mocker.patch("requests.Session.get", side_effect=[first_res, second_res])
+    mocker.patch("os.path.getsize", return_value=fail_at)
+    exp_headers = {"Range": f"bytes={fail_at}-", "If-Range": '"etag"'}
+
+    # Act
+    _, hash = server._REST__download(url, "filepath")
+
+    # Assert
+    spy.assert_called_with(url, stream=True, headers=exp_headers)
+    assert hash == hashlib.sha1(bytes(size)).hexdigest()
+
+
+@pytest.mark.parametrize(
+    "error",
+    [requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout],
+)
+def test_download_retries_failed_requests(mocker, server, download_fs, error):
+    # Arrange
+    size = 1000
+    res = ChunkedResponse(size, 200, {"Content-Length": str(size)})
+    spy = mocker.patch("requests.Session.get", side_effect=[error(), res])
+    getsize_spy = mocker.patch("os.path.getsize")
+
+    # Act
+    _, hash = server._REST__download(url, "filepath")
+
+    # Assert
+    assert spy.call_count == 2
+    getsize_spy.assert_not_called()
+    assert hash == hashlib.sha1(bytes(size)).hexdigest()
+
+
+def test_download_fails_after_max_retries_of_failed_requests(
+    mocker, server, download_fs
+):
+    # Arrange
+    spy = mocker.patch(
+        "requests.Session.get", side_effect=requests.exceptions.ConnectionError()
+    )
+    mocker.patch(
+        patch_server.format("pretty_error"), side_effect=lambda *args: exit()
+    )
+
+    # Act
+    with pytest.raises(SystemExit):
+        server._REST__download(url, "filepath")
+
+    # Assert
+    assert spy.call_count == config.download_retries + 1
+
+
+def test_download_fails_after_max_retries(mocker, server, download_fs):
+    # Arrange
+    size = 1000
+    headers = {"Content-Length": str(size)}
+    res = ChunkedResponse(size, 200, headers, fail_at=0)
+    mocker.patch("requests.Session.get", return_value=res)
+    mocker.patch("os.path.getsize", return_value=0)
+    spy = mocker.patch(
+        patch_server.format("pretty_error"), side_effect=lambda *args: exit()
+    )
+
+    # Act
+    with pytest.raises(SystemExit):
+        server._REST__download(url, "filepath")
+
+    # Assert
+    spy.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "headers,exp_size,exp_resumable",
+    [
+        ({}, None, False),
+        ({"Content-Length": "10"}, 10, False),
+        ({"Content-Length": "10", "ETag": '"a"'}, 10, False),
+        ({"Content-Length": "10", "ETag": '"a"', "Accept-Ranges": "bytes"}, 10, True),
+        ({"ETag": 'W/"a"', "Accept-Ranges": "bytes"}, None, False),
+        ({"Last-Modified": "date", "Accept-Ranges": "bytes"}, None, True),
+        (
+            {
+                "Content-Length": "10",
+                "Content-Encoding": "gzip",
+                "ETag": '"a"',
+                "Accept-Ranges": "bytes",
+            },
+            None,
+            False,
+        ),
+    ],
+)
+def test_download_state_records_size_and_resumability(
+    server, headers, exp_size, exp_resumable
+):
+    # Arrange
+    res = ChunkedResponse(0, 200, headers)
+
+    # Act
+    state = server._REST__download_state(url, res, 0)
+
+    # Assert
+    assert state["url"] == url
+    assert state["size"] == exp_size
+    assert state["resumable"] == exp_resumable
 
 
 @pytest.mark.parametrize("body", [{"dset": 1}, {}, {"test": "test"}])
@@ -502,7 +1077,7 @@ def test_get_datasets_calls_datasets_path(mocker, server, body):
 
     # Assert
     spy.assert_called_once_with(f"{url}/datasets/")
-    assert dsets == [body]
+    assert list(dsets) == [body]
 
 
 @pytest.mark.parametrize("uid", [475, 28, 293])
@@ -578,6 +1153,52 @@ def test_upload_results_returns_result_uid(mocker, server, exp_id):
     assert id == exp_id
 
 
+@pytest.mark.parametrize("status", [201, 207])
+def test_upload_results_bulk_returns_statuses(mocker, server, status):
+    # Arrange
+    statuses = [{"status": 201, "id": 1}, {"status": 400, "errors": {}}]
+    res = MockResponse(statuses, status)
+    spy = mocker.patch(patch_server.format("REST._REST__auth_post"), return_value=res)
+
+    # Act
+    uploaded = server.upload_results_bulk([{}, {}])
+
+    # Assert
+    spy.assert_called_once_with(f"{url}/results/bulk/", json=[{}, {}])
+    assert uploaded == statuses
+
+
+def test_upload_results_bulk_falls_back_to_single_uploads(mocker, server):
+    # Arrange
+    res = MockResponse({}, 404)
+    mocker.patch(patch_server.format("REST._REST__auth_post"), return_value=res)
+    spy = mocker.patch(patch_server.format("REST.upload_results"), side_effect=[1, 2])
+
+    # Act
+    uploaded = server.upload_results_bulk([{"a": 1}, {"a": 2}])
+
+    # Assert
+    assert spy.call_count == 2
+    assert uploaded == [{"status": 201, "id": 1}, {"status": 201, "id": 2}]
+
+
+def test_upload_results_bulk_fails_on_error(mocker, server):
+    # Arrange
+    res = MockResponse({}, 400)
+    mocker.patch(patch_server.format("REST._REST__auth_post"), return_value=res)
+    spy = mocker.patch(
+        patch_server.format("pretty_error"),
+        side_effect=lambda *args, **kwargs: exit(),
+    )
+
+    # Act
+    with pytest.raises(SystemExit):
+        server.upload_results_bulk([{}])
+
+    # Assert
+    spy.assert_called_once()
+
+
 @pytest.mark.parametrize("cube_uid", [2156, 915])
 @pytest.mark.parametrize("benchmark_uid", [1206, 3741])
 def test_associate_cube_posts_association_data(mocker, server, cube_uid, benchmark_uid):
@@ -639,6 +1260,44 @@ def test_set_mlcube_association_approval_sets_approval(
     spy.assert_called_once_with(exp_url, status)
 
 
+@pytest.mark.parametrize(
+    "metrics,status,exp_params",
+    [
+        (None, None, {}),
+        (["AUC", "F1"], None, {"metrics": "AUC,F1"}),
+        (None, "APPROVED", {"approval_status": "APPROVED"}),
+    ],
+)
+def test_get_benchmark_leaderboard_sends_filters_as_params(
+    mocker, server, metrics, status, exp_params
+):
+    # Arrange
+    res = MockResponse({"next": None, "results": [{"metric": "AUC"}]}, 200)
+    spy = mocker.patch(patch_server.format("REST._REST__auth_get"), return_value=res)
+    exp_kwargs = {"params": exp_params} if exp_params else {}
+
+    # Act
+    summaries = list(server.get_benchmark_leaderboard(1, metrics, status))
+
+    # Assert
+    spy.assert_called_once_with(f"{url}/benchmarks/1/leaderboard/", **exp_kwargs)
+    assert summaries == [{"metric": "AUC"}]
+
+
+def test_get_user_results_sends_filters_as_params(mocker, server):
+    # Arrange
+    res = MockResponse({"next": None, "results": []}, 200)
+    spy = mocker.patch(patch_server.format("REST._REST__auth_get"), return_value=res)
+
+    # Act
+    server.get_user_results(benchmark=1, model=2)
+
+    # Assert
+    spy.assert_called_once_with(
+        f"{url}/me/results/", params={"benchmark": 1, "model": 2}
+    )
+
+
 def test_get_datasets_associations_gets_associations(mocker, server):
     # Arrange
     res = MockResponse([], 200)
@@ -679,3 +1338,138 @@ def test_get_result_calls_specified_path(mocker, server, uid, body):
     # Assert
     spy.assert_called_once_with(exp_path)
     assert result == body
+
+
+def tarball_content(members):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name in members:
+            data = name.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+class ContentResponse:
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+        self.headers = {}
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def extract_fs(mocker):
+    mocker.patch("os.makedirs")
+    return mocker.patch("tarfile.TarFile.extract")
+
+
+@pytest.mark.parametrize(
+    "method,path",
+    [
+        ("extract_cube_additional", config.additional_path),
+        ("extract_cube_image", config.image_path),
+    ],
+)
+@pytest.mark.parametrize("uid", [1, 35])
+def test_extract_cube_tarball_extracts_into_cube_folder(
+    mocker, server, extract_fs, method, path, uid
+):
+    # Arrange
+    res = ContentResponse(tarball_content(["mlcube.yaml"]))
+    mocker.patch("requests.Session.get", return_value=res)
+    spy = mocker.patch(patch_server.format("extract_members"))
+    exp_path = os.path.join(storage_path(config.cubes_storage), str(uid), path)
+
+    # Act
+    extract_path, _ = getattr(server, method)("url", uid)
+
+    # Assert
+    spy.assert_called_once_with(ANY, exp_path)
+    assert extract_path == exp_path
+
+
+def test_extract_cube_tarball_streams_response(mocker, server, extract_fs):
+    # Arrange
+    res = ContentResponse(tarball_content(["mlcube.yaml"]))
+    spy = mocker.patch("requests.Session.get", return_value=res)
+
+    # Act
+    server.extract_cube_additional("url", 1)
+
+    # Assert
+    spy.assert_called_once_with("url", stream=True)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 100, 1024 * 1024])
+def test_extract_cube_tarball_extracts_members_while_reading(
+    mocker, server, extract_fs, chunk_size
+):
+    # Arrange
+    members = ["mlcube.yaml", "._mlcube.yaml", "workspace/parameters.yaml"]
+    res = ContentResponse(tarball_content(members))
+    mocker.patch("requests.Session.get", return_value=res)
+    mocker.patch.object(config, "download_chunk_size", chunk_size)
+
+    # Act
+    server.extract_cube_additional("url", 1)
+
+    # Assert
+    extracted = [args[0].name for args, _ in extract_fs.call_args_list]
+    assert extracted == ["mlcube.yaml", "workspace/parameters.yaml"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 100, 1024 * 1024])
+def test_extract_cube_tarball_returns_hash_of_whole_tarball(
+    mocker, server, extract_fs, chunk_size
+):
+    # Arrange
+    content = tarball_content(["mlcube.yaml", "workspace/parameters.yaml"])
+    res = ContentResponse(content)
+    mocker.patch("requests.Session.get", return_value=res)
+    mocker.patch.object(config, "download_chunk_size", chunk_size)
+    exp_hash = hashlib.sha1(content).hexdigest()
+
+    # Act
+    _, tarball_hash = server.extract_cube_image("url", 1)
+
+    # Assert
+    assert tarball_hash == exp_hash
+
+
+@pytest.mark.parametrize("status", [400, 404, 500])
+def test_extract_cube_tarball_fails_if_status_not_200(
+    mocker, server, extract_fs, status
+):
+    # Arrange
+    res = ContentResponse(b"", status)
+    mocker.patch("requests.Session.get", return_value=res)
+    spy = mocker.patch(patch_server.format("pretty_error"))
+
+    # Act
+    server.extract_cube_additional("url", 1)
+
+    # Assert
+    spy.assert_called_once()
+    extract_fs.assert_not_called()
+
+
+def test_extract_cube_tarball_fails_on_corrupted_tarball(mocker, server, extract_fs):
+    # Arrange
+    content = tarball_content(["mlcube.yaml"])
+    res = ContentResponse(content[: len(content) // 2])
+    mocker.patch("requests.Session.get", return_value=res)
+    spy = mocker.patch(patch_server.format("pretty_error"))
+
+    # Act
+    server.extract_cube_additional("url", 1)
+
+    # Assert
+    spy.assert_called_once()
@@ -0,0 +1,75 @@
+import pytest
+import hashlib
+
+from medperf.comms.stream import ResponseStream
+from medperf.tests.mocks import MockResponse
+
+content = bytes(range(256)) * 4
+
+
+class ContentResponse(MockResponse):
+    def __init__(self, content):
+        super().__init__({}, 200)
+        self._content = content
+
+    @property
+    def content(self):
+        return self._content
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 256, 4096])
+@pytest.mark.parametrize("read_size", [1, 10, 512, 2048])
+def test_read_returns_content_in_order(chunk_size, read_size):
+    # Arrange
+    stream = ResponseStream(ContentResponse(content), chunk_size)
+    parts = []
+
+    # Act
+    part = stream.read(read_size)
+    while part:
+        assert len(part) <= read_size
+        parts.append(part)
+        part = stream.read(read_size)
+
+    # Assert
+    assert b"".join(parts) == content
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_read_without_size_returns_remaining_content(chunk_size):
+    # Arrange
+    stream = ResponseStream(ContentResponse(content), chunk_size)
+    head = stream.read(10)
+
+    # Act
+    rest = stream.read()
+
+    # Assert
+    assert head + rest == content
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_hexdigest_returns_hash_of_read_content(chunk_size):
+    # Arrange
+    stream = ResponseStream(ContentResponse(content), chunk_size)
+    exp_hash = hashlib.sha1(content).hexdigest()
+
+    # Act
+    stream.read()
+
+    # Assert
+    assert stream.hexdigest() == exp_hash
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_drain_hashes_unread_content(chunk_size):
+    # Arrange
+    stream = ResponseStream(ContentResponse(content), chunk_size)
+    exp_hash = hashlib.sha1(content).hexdigest()
+    stream.read(100)
+
+    # Act
+    stream.drain()
+
+    # Assert
+    assert stream.hexdigest() == exp_hash
@@ -3,6 +3,8 @@ import requests
 import builtins
 import os
 
+import medperf.config as config
+from medperf.catalog import Catalog
 from medperf.ui.interface import UI
 from medperf.comms.interface import Comms
 
@@ -15,8 +17,14 @@ def disable_network_calls(monkeypatch):
     def stunted_post():
         raise Exception("There was an attempt at executing a post request")
 
+    def stunted_request():
+        raise Exception("There was an attempt at executing a session request")
+
     monkeypatch.setattr(requests, "get", lambda *args, **kwargs: stunted_get())
     monkeypatch.setattr(requests, "post", lambda *args, **kwargs: stunted_post())
+    monkeypatch.setattr(
+        requests.Session, "request", lambda *args, **kwargs: stunted_request()
+    )
 
 
 @pytest.fixture(autouse=True)
@@ -62,6 +70,14 @@ def disable_fs_IO_operations(monkeypatch):
     monkeypatch.setattr(builtins, "open", lambda *args, **kwargs: stunted_open())
 
 
+@pytest.fixture(autouse=True)
+def catalog(monkeypatch):
+    catalog = Catalog(":memory:")
+    monkeypatch.setattr(config, "catalog", catalog)
+    yield catalog
+    catalog.close()
+
+
 @pytest.fixture
 def ui(mocker):
     ui = mocker.create_autospec(spec=UI)
@@ -1,15 +1,19 @@
+import logging
 import os
 import pytest
+import threading
 from unittest.mock import MagicMock, mock_open, ANY, call
 
 import medperf
 from medperf.ui.interface import UI
 import medperf.config as config
 from medperf.comms.interface import Comms
+from medperf.comms.rest import REST
 from medperf.entities.cube import Cube
 from medperf.utils import storage_path
 from medperf.tests.utils import cube_local_hashes_generator
 from medperf.tests.mocks.pexpect import MockPexpect
+from medperf.profiling import Profiler
 from medperf.tests.mocks.requests import cube_metadata_generator
 
 PATCH_SERVER = "medperf.entities.benchmark.Comms.{}"
@@ -39,9 +43,10 @@ def comms(mocker):
     comms = mocker.create_autospec(spec=Comms)
     mocker.patch.object(comms, "get_cube", return_value=CUBE_PATH)
     mocker.patch.object(comms, "get_cube_params", return_value=PARAMS_PATH)
-    mocker.patch.object(comms, "get_cube_additional", return_value=TARBALL_PATH)
-    mocker.patch(PATCH_CUBE.format("get_file_sha1"), return_value=TARBALL_HASH)
-    mocker.patch.object(comms, "get_cube_image", return_value=IMG_PATH)
+    mocker.patch.object(
+        comms, "get_cube_additional", return_value=(TARBALL_PATH, TARBALL_HASH)
+    )
+    mocker.patch.object(comms, "get_cube_image", return_value=(IMG_PATH, IMG_HASH))
     mocker.patch(PATCH_CUBE.format("untar"))
     mocker.patch(PATCH_CUBE.format("save_cube_metadata"))
     config.comms = comms
@@ -78,7 +83,6 @@ def params_body(mocker, comms):
 
 @pytest.fixture
 def tar_body(mocker, comms):
-    mocker.patch(PATCH_CUBE.format("get_file_sha1"), return_value=TARBALL_HASH)
     body_gen = cube_metadata_generator(with_tarball=True)
     mocker.patch.object(comms, "get_cube_metadata", side_effect=body_gen)
     mpexpect = MockPexpect(0)
@@ -89,32 +93,29 @@ def tar_body(mocker, comms):
 
 @pytest.fixture
 def img_body(mocker, comms):
-    mocker.patch(PATCH_CUBE.format("get_file_sha1"), return_value=IMG_HASH)
     body_gen = cube_metadata_generator(with_image=True)
     mocker.patch.object(comms, "get_cube_metadata", side_effect=body_gen)
     return body_gen
 
 
-def test_all_looks_for_cubes_in_correct_path(mocker):
+def test_all_looks_for_cubes_in_catalog(mocker, catalog):
     # Arrange
-    cubes_path = storage_path(config.cubes_storage)
-    fs = iter([(".", (), ())])
-    spy = mocker.patch("os.walk", return_value=fs)
+    spy = mocker.spy(catalog, "cubes")
 
     # Act
     Cube.all()
 
     # Assert
-    spy.assert_called_once_with(cubes_path)
+    spy.assert_called_once()
 
 
 @pytest.mark.parametrize("cube_uid", [40, 426, 418])
-def test_all_reads_local_cube_metadata(mocker, cube_uid):
+def test_all_reads_local_cube_metadata(mocker, catalog, cube_uid):
     # Arrange
     cube_uid = str(cube_uid)
     cubes_path = storage_path(config.cubes_storage)
-    fs = iter([(".", (cube_uid,), ())])
-    mocker.patch("os.walk", return_value=fs)
+    catalog.add_cube(cube_uid)
+    mocker.patch("os.path.exists", return_value=True)
     spy = mocker.patch("builtins.open", return_value=mock_open().return_value)
     cube_meta = cube_metadata_generator()(cube_uid)
     mocker.patch("yaml.safe_load", return_value=cube_meta)
@@ -132,22 +133,30 @@ def test_all_reads_local_cube_metadata(mocker, cube_uid):
 
 @pytest.mark.parametrize("cube_uid", [387, 1, 6])
 @pytest.mark.parametrize("with_params", [True, False])
-def test_all_creates_cube_with_expected_content(mocker, cube_uid, with_params):
+def test_all_creates_cube_with_expected_content(
+    mocker, catalog, cube_uid, with_params
+):
     # Arrange
     cube_uid = str(cube_uid)
     cubes_path = storage_path(config.cubes_storage)
-    fs = iter([(".", (cube_uid,), ())])
-    mocker.patch("os.walk", return_value=fs)
+    catalog.add_cube(cube_uid)
     mocker.patch("builtins.open", mock_open())
     cube_meta = cube_metadata_generator()(cube_uid)
     cube_local_hashes = cube_local_hashes_generator()
     mocker.patch("yaml.safe_load", side_effect=[cube_meta, cube_local_hashes])
-    mocker.patch("os.path.exists", return_value=with_params)
+    mocker.patch(
+        "os.path.exists",
+        side_effect=lambda path: with_params
+        if path.endswith(config.params_filename)
+        else True,
+    )
     spy = mocker.spy(Cube, "__init__")
 
     cube_path = os.path.join(cubes_path, cube_uid, config.cube_filename)
     if with_params:
-        params_path = os.path.join(cubes_path, cube_uid, config.params_filename)
+        params_path = os.path.join(
+            cubes_path, cube_uid, config.workspace_path, config.params_filename
+        )
     else:
         params_path = None
 
@@ -248,18 +257,15 @@ def test_get_cube_with_tarball_retrieves_tarball(mocker, comms, tar_body, no_loc
     spy.assert_called_once_with(body["additional_files_tarball_url"], uid)
 
 
-def test_get_cube_with_tarball_generates_tarball_hash(
+def test_get_cube_with_tarball_uses_downloaded_tarball_hash(
     mocker, comms, tar_body, no_local
 ):
-    # Arrange
-    spy = mocker.spy(medperf.entities.cube, "get_file_sha1")
-
     # Act
     uid = 1
-    Cube.get(uid)
+    cube = Cube.get(uid)
 
     # Assert
-    spy.assert_called_once_with(TARBALL_PATH)
+    assert cube.additional_hash == TARBALL_HASH
 
 
 def test_get_cube_with_tarball_untars_files(mocker, comms, tar_body, no_local):
@@ -274,25 +280,27 @@ def test_get_cube_with_tarball_untars_files(mocker, comms, tar_body, no_local):
     spy.assert_called_once_with(TARBALL_PATH)
 
 
-def test_get_cube_calls_all(mocker, comms, basic_body):
+def test_get_cube_looks_for_cube_in_catalog(mocker, comms, catalog, basic_body):
     # Arrange
-    spy = mocker.patch(PATCH_CUBE.format("Cube.all"), return_value=[])
+    spy = mocker.spy(catalog, "has_cube")
 
     # Act
     uid = 1
     Cube.get(uid)
 
     # Assert
-    spy.assert_called_once()
+    spy.assert_called_once_with(uid)
 
 
 @pytest.mark.parametrize("local_cubes", [[32, 87, 9]])
-def test_get_cube_return_local_first(mocker, comms, local_cubes):
+def test_get_cube_return_local_first(mocker, comms, catalog, local_cubes):
     # Arrange
     cube = mocker.create_autospec(spec=Cube)
     uid = local_cubes[0]
     cube.uid = uid
-    spy = mocker.patch.object(Cube, "all", return_value=[cube])
+    for local_uid in local_cubes:
+        catalog.add_cube(local_uid)
+    spy = mocker.patch.object(Cube, "_Cube__get_local", return_value=cube)
     metadata_spy = mocker.patch.object(comms, "get_cube_metadata")
 
     # Act
@@ -300,25 +308,51 @@ def test_get_cube_return_local_first(mocker, comms, local_cubes):
 
     # Assert
     assert cube.uid == uid
-    spy.assert_called_once()
+    spy.assert_called_once_with(uid)
     metadata_spy.assert_not_called()
 
 
-def test_get_cube_requests_server_if_not_local(mocker, comms, basic_body):
+def test_get_cube_requests_server_if_not_local(mocker, comms, catalog, basic_body):
     # Arrange
-    cube = mocker.create_autospec(spec=Cube)
-    cube.uid = "2"
-    mocker.patch.object(Cube, "all", return_value=[cube])
+    catalog.add_cube("2")
     metadata_spy = mocker.patch.object(comms, "get_cube_metadata")
 
     # Act
     uid = 1
-    cube = Cube.get(uid)
+    Cube.get(uid)
 
     # Assert
     metadata_spy.assert_called_once()
 
 
+def test_get_cube_ignores_catalog_entry_without_files(
+    mocker, comms, catalog, basic_body
+):
+    # Arrange
+    catalog.add_cube(1)
+    mocker.patch("os.path.exists", return_value=False)
+    metadata_spy = mocker.spy(comms, "get_cube_metadata")
+    remove_spy = mocker.spy(catalog, "remove_cube")
+
+    # Act
+    Cube.get(1)
+
+    # Assert
+    remove_spy.assert_called_once_with("1")
+    metadata_spy.assert_called_once_with(1)
+
+
+@pytest.mark.parametrize("cube_uid", [1, 27])
+def test_get_cube_adds_retrieved_cube_to_catalog(
+    mocker, comms, catalog, basic_body, no_local, cube_uid
+):
+    # Act
+    Cube.get(cube_uid)
+
+    # Assert
+    assert catalog.has_cube(cube_uid)
+
+
 def test_get_cube_with_image_retrieves_image(mocker, comms, img_body, no_local):
     # Arrange
     spy = mocker.spy(comms, "get_cube_image")
@@ -332,18 +366,15 @@ def test_get_cube_with_image_retrieves_image(mocker, comms, img_body, no_local):
     spy.assert_called_once_with(body["image_tarball_url"], uid)
 
 
-def test_get_cube_with_image_generates_image_tarball_hash(
+def test_get_cube_with_image_uses_downloaded_image_tarball_hash(
     mocker, comms, img_body, no_local
 ):
-    # Arrange
-    spy = mocker.spy(medperf.entities.cube, "get_file_sha1")
-
     # Act
     uid = 1
-    Cube.get(uid)
+    cube = Cube.get(uid)
 
     # Assert
-    spy.assert_called_once_with(IMG_PATH)
+    assert cube.image_tarball_hash == IMG_HASH
 
 
 def test_get_cube_with_image_untars_image(mocker, comms, img_body, no_local):
@@ -358,6 +389,85 @@ def test_get_cube_with_image_untars_image(mocker, comms, img_body, no_local):
     spy.assert_called_once_with(IMG_PATH)
 
 
+def test_get_cube_retrieves_artifacts_concurrently(mocker, comms, no_local):
+    # Arrange
+    body_gen = cube_metadata_generator(
+        with_params=True, with_tarball=True, with_image=True
+    )
+    mocker.patch.object(comms, "get_cube_metadata", side_effect=body_gen)
+    # Every artifact waits for the others, so a serial fetch would time out
+    barrier = threading.Barrier(4, timeout=5)
+
+    def wait_and_return(value):
+        def download(*args):
+            barrier.wait()
+            return value
+
+        return download
+
+    comms.get_cube.side_effect = wait_and_return(CUBE_PATH)
+    comms.get_cube_params.side_effect = wait_and_return(PARAMS_PATH)
+    comms.get_cube_additional.side_effect = wait_and_return(
+        (TARBALL_PATH, TARBALL_HASH)
+    )
+    comms.get_cube_image.side_effect = wait_and_return((IMG_PATH, IMG_HASH))
+
+    # Act
+    cube = Cube.get(1)
+
+    # Assert
+    assert cube.cube_path == CUBE_PATH
+    assert cube.params_path == PARAMS_PATH
+    assert cube.additional_hash == TARBALL_HASH
+    assert cube.image_tarball_hash == IMG_HASH
+
+
+def test_get_cube_limits_concurrent_downloads(mocker, comms, no_local):
+    # Arrange
+    body_gen = cube_metadata_generator(
+        with_params=True, with_tarball=True, with_image=True
+    )
+    mocker.patch.object(comms, "get_cube_metadata", side_effect=body_gen)
+    spy = mocker.spy(medperf.entities.cube, "ThreadPoolExecutor")
+    mocker.patch.object(config, "download_workers", 2)
+
+    # Act
+    Cube.get(1)
+
+    # Assert
+    spy.assert_called_once_with(max_workers=2)
+
+
+@pytest.mark.parametrize("stream_extraction", [False, True])
+def test_get_cube_extracts_tarballs_according_to_config(
+    mocker, comms, no_local, stream_extraction
+):
+    # Arrange
+    body_gen = cube_metadata_generator(with_tarball=True, with_image=True)
+    mocker.patch.object(comms, "get_cube_metadata", side_effect=body_gen)
+    mocker.patch.object(config, "stream_extraction", stream_extraction)
+    mocker.patch.object(
+        comms, "extract_cube_additional", return_value=("path", TARBALL_HASH)
+    )
+    mocker.patch.object(comms, "extract_cube_image", return_value=("path", IMG_HASH))
+    untar_spy = mocker.spy(medperf.entities.cube, "untar")
+
+    # Act
+    cube = Cube.get(1)
+
+    # Assert
+    assert cube.additional_hash == TARBALL_HASH
+    assert cube.image_tarball_hash == IMG_HASH
+    if stream_extraction:
+        comms.get_cube_additional.assert_not_called()
+        comms.get_cube_image.assert_not_called()
+        untar_spy.assert_not_called()
+    else:
+        comms.extract_cube_additional.assert_not_called()
+        comms.extract_cube_image.assert_not_called()
+        assert untar_spy.call_count == 2
+
+
 def test_get_cube_without_image_configures_mlcube(mocker, comms, basic_body, no_local):
     # Arrange
     spy = mocker.spy(medperf.entities.cube.pexpect, "spawn")
@@ -426,7 +536,9 @@ def test_cube_is_invalid_with_incorrect_tarball_hash(
     mocker, ui, comms, tar_body, no_local
 ):
     # Arrange
-    mocker.patch(PATCH_CUBE.format("get_file_sha1"), return_value="incorrect_hash")
+    mocker.patch.object(
+        comms, "get_cube_additional", return_value=(TARBALL_PATH, "incorrect_hash")
+    )
 
     # Act
     uid = 1
@@ -440,7 +552,9 @@ def test_cube_is_invalid_with_incorrect_image_tarball_hash(
     mocker, comms, img_body, no_local
 ):
     # Arrange
-    mocker.patch(PATCH_CUBE.format("get_file_sha1"), return_value="incorrect_hash")
+    mocker.patch.object(
+        comms, "get_cube_image", return_value=(IMG_PATH, "incorrect_hash")
+    )
 
     # Act
     uid = 1
@@ -457,7 +571,7 @@ def test_cube_runs_command_with_pexpect(
     # Arrange
     mpexpect = MockPexpect(0)
     mocker.patch(PATCH_CUBE.format("pexpect.spawn"), side_effect=mpexpect.spawn)
-    mocker.patch(PATCH_CUBE.format("list_files"), return_value="")
+    mocker.patch(PATCH_CUBE.format("storage_summary"), return_value="")
     spy = mocker.spy(medperf.entities.cube.pexpect, "spawn")
     task = "task"
     platform = config.platform
@@ -478,7 +592,7 @@ def test_cube_runs_command_with_extra_args(mocker, ui, comms, basic_body, no_loc
     # Arrange
     mpexpect = MockPexpect(0)
     spy = mocker.patch("pexpect.spawn", side_effect=mpexpect.spawn)
-    mocker.patch(PATCH_CUBE.format("list_files"), return_value="")
+    mocker.patch(PATCH_CUBE.format("storage_summary"), return_value="")
     task = "task"
     platform = config.platform
     expected_cmd = f'mlcube run --mlcube={CUBE_PATH} --task={task} --platform={platform} test="test"'
@@ -492,6 +606,119 @@ def test_cube_runs_command_with_extra_args(mocker, ui, comms, basic_body, no_loc
     spy.assert_any_call(expected_cmd, timeout=None)
 
 
+@pytest.mark.parametrize(
+    "cpus,memory,exp_limits",
+    [(4, None, "--cpus=4"), (None, 8, "--memory=8g"), (2, 16, "--cpus=2 --memory=16g")],
+)
+def test_cube_runs_command_with_resource_limits(
+    mocker, ui, comms, basic_body, no_local, cpus, memory, exp_limits
+):
+    # Arrange
+    mpexpect = MockPexpect(0)
+    spy = mocker.patch("pexpect.spawn", side_effect=mpexpect.spawn)
+    mocker.patch(PATCH_CUBE.format("storage_summary"), return_value="")
+    mocker.patch.object(config, "platform", "docker")
+    mocker.patch.object(config, "task_cpus", cpus)
+    mocker.patch.object(config, "task_memory", memory)
+    task = "task"
+    expected_cmd = (
+        f"mlcube run --mlcube={CUBE_PATH} --task={task} --platform=docker"
+        f' -Pdocker.cpu_args="{exp_limits}"'
+    )
+
+    # Act
+    uid = 1
+    cube = Cube.get(uid)
+    cube.run(ui, task)
+
+    # Assert
+    spy.assert_any_call(expected_cmd, timeout=None)
+
+
+def test_cube_ignores_resource_limits_on_other_platforms(
+    mocker, ui, comms, basic_body, no_local
+):
+    # Arrange
+    mpexpect = MockPexpect(0)
+    spy = mocker.patch("pexpect.spawn", side_effect=mpexpect.spawn)
+    mocker.patch(PATCH_CUBE.format("storage_summary"), return_value="")
+    mocker.patch.object(config, "platform", "singularity")
+    mocker.patch.object(config, "task_cpus", 4)
+    mocker.patch.object(config, "task_memory", 8)
+    task = "task"
+    expected_cmd = (
+        f"mlcube run --mlcube={CUBE_PATH} --task={task} --platform=singularity"
+    )
+
+    # Act
+    uid = 1
+    cube = Cube.get(uid)
+    cube.run(ui, task)
+
+    # Assert
+    spy.assert_any_call(expected_cmd, timeout=None)
+
+
+def test_cube_run_streams_output_to_log_file(mocker, ui, comms, basic_body, no_local):
+    # Arrange
+    mpexpect = MockPexpect(0)
+    mocker.patch("pexpect.spawn", side_effect=mpexpect.spawn)
+    mocker.patch(PATCH_CUBE.format("storage_summary"), return_value="")
+    spy = mocker.patch(PATCH_CUBE.format("combine_proc_sp_text"), return_value="")
+    log_file = "task.log"
+
+    # Act
+    uid = 1
+    cube = Cube.get(uid)
+    open_spy = mocker.patch("builtins.open", MagicMock())
+    cube.run(ui, "task", log_file=log_file)
+
+    # Assert
+    open_spy.assert_called_once_with(log_file, "a")
+    written = open_spy.return_value.__enter__.return_value.write.call_args[0][0]
+    assert written.startswith("$ mlcube run")
+    spy.assert_called_with(ANY, ui, log_file)
+
+
+def test_cube_run_profiles_task(mocker, ui, comms, basic_body, no_local):
+    # Arrange
+    profiler = Profiler()
+    mocker.patch.object(config, "profiler", profiler)
+    mpexpect = MockPexpect(0)
+    mocker.patch("pexpect.spawn", side_effect=mpexpect.spawn)
+    mocker.patch(PATCH_CUBE.format("storage_summary"), return_value="")
+
+    # Act
+    uid = 1
+    cube = Cube.get(uid)
+    cube.run(ui, "task")
+
+    # Assert
+    span = profiler.spans[-1]
+    assert (span.name, span.attrs) == ("mlcube task", {"cube": uid})
+    assert span.children_cpu_time is not None
+
+
+@pytest.mark.parametrize("level", [logging.DEBUG, logging.INFO])
+def test_cube_run_summarizes_storage_only_if_debugging(
+    mocker, ui, comms, basic_body, no_local, level
+):
+    # Arrange
+    mpexpect = MockPexpect(0)
+    mocker.patch("pexpect.spawn", side_effect=mpexpect.spawn)
+    spy = mocker.patch(PATCH_CUBE.format("storage_summary"), return_value="")
+    root = logging.getLogger()
+    mocker.patch.object(root, "isEnabledFor", side_effect=lambda lvl: lvl >= level)
+
+    # Act
+    uid = 1
+    cube = Cube.get(uid)
+    cube.run(ui, "task")
+
+    # Assert
+    assert spy.called == (level == logging.DEBUG)
+
+
 def test_run_stops_execution_if_child_fails(mocker, ui, comms, basic_body, no_local):
     # Arrange
     mpexpect = MockPexpect(1)
@@ -592,8 +819,7 @@ def test_local_cubes_validity_can_be_detected(
         # an outlier test parameters combination
         return
     cube_uid = str(cube_uid)
-    fs = iter([(".", (cube_uid,), ())])
-    mocker.patch("os.walk", return_value=fs)
+    config.catalog.add_cube(cube_uid)
     mocker.patch("builtins.open", mock_open())
     cube_meta = cube_metadata_generator(False, with_tarball, with_image)(cube_uid)
     cube_local_hashes = cube_local_hashes_generator(is_valid, with_tarball, with_image)
@@ -619,13 +845,14 @@ def test_get_cube_saves_cube_metadata(
     local_hashes = cube_local_hashes_generator(True, with_tarball, with_image)
 
     mocker.patch.object(comms, "get_cube_metadata", return_value=meta)
-    hashes_list = []
-    if with_tarball:
-        hashes_list.append(local_hashes[TARBALL_HASH])
-    if with_image:
-        hashes_list.append(local_hashes[IMG_HASH])
-
-    mocker.patch(PATCH_CUBE.format("get_file_sha1"), side_effect=hashes_list)
+    mocker.patch.object(
+        comms,
+        "get_cube_additional",
+        return_value=(TARBALL_PATH, local_hashes[TARBALL_HASH]),
+    )
+    mocker.patch.object(
+        comms, "get_cube_image", return_value=(IMG_PATH, local_hashes[IMG_HASH])
+    )
     spy = mocker.patch(PATCH_CUBE.format("save_cube_metadata"))
 
     # Act
@@ -670,3 +897,61 @@ def test_upload_returns_comms_generated_uid(mocker, comms, basic_body, no_local,
 
     # Assert
     assert uid == returned_uid
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {},
+        {"cube_path": "other_cube"},
+        {"params_path": "other_params"},
+        {"params_path": None},
+        {"additional_hash": "other_additional"},
+        {"image_tarball_hash": "other_image"},
+    ],
+)
+def test_fingerprint_changes_with_cube_contents(mocker, changes):
+    # Arrange
+    mocker.patch(PATCH_CUBE.format("get_file_sha1"), side_effect=lambda path: path)
+    args = {
+        "cube_path": "cube",
+        "params_path": "params",
+        "additional_hash": "additional",
+        "image_tarball_hash": "image",
+    }
+    base_cube = Cube(1, {"name": "name"}, **args)
+    cube = Cube(1, {"name": "name"}, **{**args, **changes})
+
+    # Act
+    fingerprint = cube.fingerprint()
+
+    # Assert
+    assert (fingerprint == base_cube.fingerprint()) == (changes == {})
+
+
+def test_fingerprint_is_the_same_for_downloaded_and_local_cubes(
+    mocker, ui, comms, params_body
+):
+    # Arrange
+    uid = "1"
+    server = REST("https://mock.url", ui)
+    mocker.patch(
+        "medperf.comms.rest.REST._REST__download",
+        side_effect=lambda url, filepath: (filepath, "hash"),
+    )
+    mocker.patch.object(comms, "get_cube", side_effect=server.get_cube)
+    mocker.patch.object(comms, "get_cube_params", side_effect=server.get_cube_params)
+    mocker.patch(PATCH_CUBE.format("get_file_sha1"), side_effect=lambda path: path)
+    downloaded_cube = Cube.get(uid)
+
+    local_hashes = {"additional_files_tarball_hash": "", "image_tarball_hash": ""}
+    mocker.patch("os.path.exists", return_value=True)
+    mocker.patch("builtins.open", mock_open())
+    mocker.patch("yaml.safe_load", side_effect=[params_body(uid), local_hashes])
+
+    # Act
+    local_cube = Cube.get(uid)
+
+    # Assert
+    assert local_cube is not downloaded_cube
+    assert local_cube.fingerprint() == downloaded_cube.fingerprint()
@@ -3,7 +3,6 @@ import pytest
 from unittest.mock import mock_open
 
 import medperf
-from medperf import utils
 from medperf.ui.interface import UI
 import medperf.config as config
 from medperf.entities.dataset import Dataset
@@ -23,7 +22,6 @@ REGISTRATION_MOCK = {
 }
 
 PATCH_DATASET = "medperf.entities.dataset.{}"
-TMP_PREFIX = config.tmp_prefix
 
 
 @pytest.fixture
@@ -42,9 +40,10 @@ def basic_arrange(mocker):
 
 
 @pytest.fixture
-def all_uids(mocker, basic_arrange, request):
+def all_uids(mocker, basic_arrange, catalog, request):
     uids = request.param
-    walk_out = iter([("", uids, [])])
+    for uid in uids:
+        catalog.add_dataset(uid)
 
     def mock_reg_file(ff):
         # Extract the uid of the opened registration file through the mocked object
@@ -59,36 +58,17 @@ def all_uids(mocker, basic_arrange, request):
         return reg
 
     mocker.patch(PATCH_DATASET.format("yaml.safe_load"), side_effect=mock_reg_file)
-    mocker.patch(PATCH_DATASET.format("os.walk"), return_value=walk_out)
-    mocker.patch(PATCH_DATASET.format("get_uids"), return_value=uids)
     return uids
 
 
 @pytest.mark.parametrize("all_uids", [[]], indirect=True)
-def test_all_looks_for_dsets_in_data_storage(mocker, ui, all_uids):
+def test_all_looks_for_dsets_in_catalog(mocker, ui, catalog, all_uids):
     # Arrange
-    walk_out = iter([("", [], [])])
-    spy = mocker.patch(PATCH_DATASET.format("os.walk"), return_value=walk_out)
+    spy = mocker.spy(catalog, "datasets")
 
     # Act
     Dataset.all()
 
-    # Assert
-    spy.assert_called_once_with(utils.storage_path(config.data_storage))
-
-
-def test_all_fails_if_cant_iterate_data_storage(mocker, ui):
-    # Arrange
-    walk_out = iter([])
-    mocker.patch(PATCH_DATASET.format("os.walk"), return_value=walk_out)
-    spy = mocker.patch(
-        PATCH_DATASET.format("pretty_error"), side_effect=lambda *args, **kwargs: exit()
-    )
-
-    # Act
-    with pytest.raises(SystemExit):
-        Dataset.all()
-
     # Assert
     spy.assert_called_once()
 
@@ -102,17 +82,7 @@ def test_all_returns_list_of_expected_size(mocker, ui, all_uids):
     assert len(dsets) == len(all_uids)
 
 
-@pytest.mark.parametrize("all_uids", [["1", "2", f"{TMP_PREFIX}3"]], indirect=True)
-def test_all_ignores_temporary_datasets(mocker, ui, all_uids):
-    # Act
-    dsets = Dataset.all()
-    uids = [dset.generated_uid for dset in dsets]
-
-    # Assert
-    assert f"{TMP_PREFIX}3" not in uids
-
-
-@pytest.mark.parametrize("all_uids", [["1", "2", f"{TMP_PREFIX}3"]], indirect=True)
+@pytest.mark.parametrize("all_uids", [["1", "2"]], indirect=True)
 def test_dataset_metadata_is_backwards_compatible(mocker, ui, all_uids):
     # Arrange
     uid = "1"
@@ -190,3 +160,51 @@ def test_upload_returns_uid_from_comms(mocker, all_uids, ui, comms_uid, comms):
 
     # Assert
     assert uid == comms_uid
+
+
+@pytest.mark.parametrize("all_uids", [["1", "2"]], indirect=True)
+@pytest.mark.parametrize("server_uid", [4, 63])
+def test_get_returns_local_dataset_found_in_catalog(
+    mocker, ui, comms, catalog, all_uids, server_uid
+):
+    # Arrange
+    config.comms = comms
+    catalog.add_dataset("2", server_uid)
+
+    # Act
+    dset = Dataset.get(server_uid)
+
+    # Assert
+    assert dset.generated_uid == "2"
+    comms.get_dataset.assert_not_called()
+
+
+@pytest.mark.parametrize("all_uids", [["1", "2"]], indirect=True)
+def test_get_retrieves_dataset_from_comms_if_not_in_catalog(
+    mocker, ui, comms, all_uids
+):
+    # Arrange
+    config.comms = comms
+    mocker.patch.object(comms, "get_dataset", return_value=REGISTRATION_MOCK)
+
+    # Act
+    Dataset.get(55)
+
+    # Assert
+    comms.get_dataset.assert_called_once_with(55)
+
+
+@pytest.mark.parametrize("all_uids", [["1"]], indirect=True)
+@pytest.mark.parametrize("server_uid", [None, 7])
+def test_set_registration_updates_catalog(mocker, ui, catalog, all_uids, server_uid):
+    # Arrange
+    mocker.patch(PATCH_DATASET.format("yaml.dump"))
+    dset = Dataset("1")
+    dset.uid = server_uid
+    spy = mocker.spy(catalog, "add_dataset")
+
+    # Act
+    dset.set_registration()
+
+    # Assert
+    spy.assert_called_once_with("1", server_uid)
@@ -63,9 +63,9 @@ def test_results_open_results_file_on_init(mocker, results_path):
     yaml_spy.assert_called_once()
 
 
-def test_all_gets_results_ids(mocker, ui):
+def test_all_gets_results_ids_from_catalog(mocker, ui, catalog):
     # Arrange
-    spy = mocker.patch(PATCH_RESULT.format("results_ids"), return_value=[])
+    spy = mocker.spy(catalog, "results")
 
     # Act
     Result.all()
@@ -75,13 +75,13 @@ def test_all_gets_results_ids(mocker, ui):
 
 
 def test_all_creates_result_objects_with_correct_info(
-    mocker, result, ui,
+    mocker, result, ui, catalog
 ):
     # Arrange
     mock_path = "results_filepath"
     result_ids = ("b_id", "m_id", "d_id")
     b_id, m_id, d_id = result_ids
-    mocker.patch(PATCH_RESULT.format("results_ids"), return_value=[result_ids])
+    catalog.add_result(b_id, m_id, d_id)
     spy = mocker.spy(Result, "__init__")
     mocker.patch("os.path.join", return_value=mock_path)
 
@@ -98,7 +98,6 @@ def test_get_retrieves_results_from_comms(mocker, comms, uid):
     uid = 0
     result_dict = {"benchmark": 0, "dataset": 0, "model": 0, "results": {}, "uid": uid}
     spy = mocker.patch.object(comms, "get_result", return_value=result_dict)
-    mocker.patch(PATCH_RESULT.format("Result.all"), return_value=[])
 
     # Act
     Result.get(uid)
@@ -107,6 +106,22 @@ def test_get_retrieves_results_from_comms(mocker, comms, uid):
     spy.assert_called_once_with(uid)
 
 
+@pytest.mark.parametrize("uid", [349, 2, 84])
+def test_get_returns_local_result_found_in_catalog(
+    mocker, result, comms, catalog, uid
+):
+    # Arrange
+    catalog.add_result("b_id", "m_id", "d_id", uid)
+    spy = mocker.spy(Result, "__init__")
+
+    # Act
+    Result.get(uid)
+
+    # Assert
+    spy.assert_called_once_with(ANY, "b_id", "d_id", "m_id")
+    comms.get_result.assert_not_called()
+
+
 def test_todict_returns_expected_keys(mocker, result):
     # Arrange
     mocker.patch("builtins.open", MagicMock())
@@ -128,6 +143,61 @@ def test_todict_returns_expected_keys(mocker, result):
     assert set(result_dict.keys()) == expected_keys
 
 
+def test_todict_includes_inputs_hash_in_metadata(mocker, catalog):
+    # Arrange
+    mocker.patch(PATCH_RESULT.format("Result.get_results"))
+    catalog.add_result(1, 1, 1, inputs_hash="inputs")
+    result = Result(1, 1, 1)
+
+    # Act
+    result_dict = result.todict()
+
+    # Assert
+    assert result_dict["metadata"] == {"inputs_hash": "inputs"}
+
+
+def test_results_read_inputs_hash_from_results_file(mocker, catalog):
+    # Arrange
+    mocker.patch("builtins.open", MagicMock())
+    mocker.patch("yaml.safe_load", return_value={"metric": 1, "inputs_hash": "inputs"})
+    catalog.add_result(1, 1, 1, inputs_hash="outdated")
+
+    # Act
+    result = Result(1, 1, 1)
+
+    # Assert
+    assert result.inputs_hash == "inputs"
+
+
+def test_todict_doesnt_include_inputs_hash_in_results(mocker):
+    # Arrange
+    mocker.patch("builtins.open", MagicMock())
+    mocker.patch("yaml.safe_load", return_value={"metric": 1, "inputs_hash": "inputs"})
+    result = Result(1, 1, 1)
+
+    # Act
+    result_dict = result.todict()
+
+    # Assert
+    assert result_dict["results"] == {"metric": 1}
+    assert result_dict["metadata"] == {"inputs_hash": "inputs"}
+
+
+def test_set_inputs_hash_stores_it_with_the_results(mocker, result, catalog):
+    # Arrange
+    mocker.patch("os.access", return_value=True)
+    mocker.patch("builtins.open", MagicMock())
+    spy = mocker.patch("yaml.dump")
+    result.results = {"metric": 1}
+
+    # Act
+    result.set_inputs_hash("inputs")
+
+    # Assert
+    spy.assert_called_once_with({"metric": 1, "inputs_hash": "inputs"}, ANY)
+    assert catalog.find_result(1, 1, 1)[1] == "inputs"
+
+
 def test_upload_calls_server_method(mocker, result, comms):
     # Arrange
     spy = mocker.patch.object(comms, "upload_results")
@@ -141,6 +211,54 @@ def test_upload_calls_server_method(mocker, result, comms):
     spy.assert_called_once()
 
 
+@pytest.mark.parametrize("batch_size,n_requests", [(1, 3), (2, 2), (100, 1)])
+def test_upload_all_uploads_in_batches(mocker, result, comms, batch_size, n_requests):
+    # Arrange
+    mocker.patch.object(config, "results_upload_batch_size", batch_size)
+    mocker.patch(PATCH_RESULT.format("Result.todict"), return_value={})
+    mocker.patch(PATCH_RESULT.format("Result.set_results"))
+    comms.upload_results_bulk.side_effect = lambda dicts: [
+        {"status": 201, "id": 1} for _ in dicts
+    ]
+
+    # Act
+    failed = Result.upload_all([result] * 3, comms)
+
+    # Assert
+    assert comms.upload_results_bulk.call_count == n_requests
+    assert failed == []
+
+
+def test_upload_all_stores_uids_of_created_results(mocker, result, comms):
+    # Arrange
+    mocker.patch(PATCH_RESULT.format("Result.todict"), return_value={})
+    spy = mocker.patch(PATCH_RESULT.format("Result.set_results"))
+    comms.upload_results_bulk.return_value = [{"status": 201, "id": 10}]
+    result.results = {}
+
+    # Act
+    Result.upload_all([result], comms)
+
+    # Assert
+    assert result.uid == 10
+    assert result.results["uid"] == 10
+    spy.assert_called_once()
+
+
+def test_upload_all_returns_rejected_results(mocker, result, comms):
+    # Arrange
+    mocker.patch(PATCH_RESULT.format("Result.todict"), return_value={})
+    spy = mocker.patch(PATCH_RESULT.format("Result.set_results"))
+    comms.upload_results_bulk.return_value = [{"status": 400, "errors": "errors"}]
+
+    # Act
+    failed = Result.upload_all([result], comms)
+
+    # Assert
+    assert failed == [(result, "errors")]
+    spy.assert_not_called()
+
+
 @pytest.mark.parametrize("write_access", [True, False])
 def test_set_results_writes_results_contents_to_file(mocker, result, write_access):
     # Arrange
@@ -173,3 +291,17 @@ def test_set_results_deletes_file_if_inaccessible(mocker, result, write_access):
         spy.assert_called_once_with(result.path)
     else:
         spy.assert_not_called()
+
+
+def test_set_results_updates_catalog(mocker, result, catalog):
+    # Arrange
+    mocker.patch("os.access", return_value=True)
+    mocker.patch("builtins.open", MagicMock())
+    mocker.patch("yaml.dump")
+    spy = mocker.spy(catalog, "add_result")
+
+    # Act
+    result.set_results()
+
+    # Assert
+    spy.assert_called_once_with(1, 1, 1, result.uid, result.inputs_hash)
@@ -1,3 +1,6 @@
+from pexpect.exceptions import EOF
+
+
 class MockChild:
     def __init__(self, exitstatus):
         self.exitstatus = exitstatus
@@ -5,6 +8,9 @@ class MockChild:
     def isalive(self):
         return False
 
+    def read_nonblocking(self, size=1, timeout=-1):
+        raise EOF("End of file")
+
     def close(self):
         pass
 
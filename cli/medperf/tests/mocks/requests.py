@@ -2,6 +2,7 @@ class MockResponse:
     def __init__(self, json_data, status_code):
         self.json_data = json_data
         self.status_code = status_code
+        self.headers = {}
 
     def json(self):
         return self.json_data
@@ -12,6 +13,14 @@ class MockResponse:
         text = "\n".join(strings)
         return text.encode()
 
+    def iter_content(self, chunk_size=1):
+        content = self.content
+        for i in range(0, len(content), chunk_size):
+            yield content[i:i + chunk_size]
+
+    def close(self):
+        pass
+
 
 def benchmark_body(benchmark_uid):
     return {
@@ -1,6 +1,24 @@
+from tarfile import TarInfo
+
+
 class MockTar:
+    def __init__(self, members=[]):
+        self.members = [TarInfo(name) for name in members]
+
+    def __iter__(self):
+        return iter(self.members)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
     def extractall(self, path):
         pass
 
+    def extract(self, member, path):
+        pass
+
     def close(self):
         pass
@@ -0,0 +1,231 @@
+import pytest
+
+from medperf.catalog import Catalog
+
+
+@pytest.fixture
+def catalog():
+    catalog = Catalog(":memory:")
+    yield catalog
+    catalog.close()
+
+
+def test_new_catalog_is_flagged_as_new(catalog):
+    # Assert
+    assert catalog.is_new
+
+
+@pytest.mark.parametrize("uids", [[], ["1"], ["3", "1", "test_2"]])
+def test_cubes_returns_added_cubes(catalog, uids):
+    # Arrange
+    for uid in uids:
+        catalog.add_cube(uid)
+
+    # Act
+    cubes = catalog.cubes()
+
+    # Assert
+    assert cubes == sorted(uids)
+
+
+def test_add_cube_ignores_duplicates(catalog):
+    # Act
+    catalog.add_cube(1)
+    catalog.add_cube("1")
+
+    # Assert
+    assert catalog.cubes() == ["1"]
+
+
+def test_remove_cube_removes_cube(catalog):
+    # Arrange
+    catalog.add_cube(1)
+    catalog.add_cube(2)
+
+    # Act
+    catalog.remove_cube(1)
+
+    # Assert
+    assert not catalog.has_cube(1)
+    assert catalog.has_cube(2)
+
+
+@pytest.mark.parametrize("uid", [1, "42"])
+def test_get_dataset_finds_dataset_by_server_uid(catalog, uid):
+    # Arrange
+    catalog.add_dataset("abc", uid)
+    catalog.add_dataset("def", 2000)
+
+    # Act
+    generated_uid = catalog.get_dataset(uid)
+
+    # Assert
+    assert generated_uid == "abc"
+
+
+def test_get_dataset_returns_none_if_not_found(catalog):
+    # Arrange
+    catalog.add_dataset("abc")
+
+    # Assert
+    assert catalog.get_dataset(1) is None
+
+
+def test_add_dataset_updates_server_uid(catalog):
+    # Arrange
+    catalog.add_dataset("abc")
+
+    # Act
+    catalog.add_dataset("abc", 5)
+
+    # Assert
+    assert catalog.datasets() == ["abc"]
+    assert catalog.get_dataset(5) == "abc"
+
+
+@pytest.mark.parametrize(
+    "prefix,exp_matches",
+    [
+        ("a", ["a1b2", "abc"]),
+        ("ab", ["abc"]),
+        ("test_", ["test_a"]),
+        ("test%", []),
+        ("z", []),
+        ("", ["a1b2", "abc", "b", "testXa", "test_a"]),
+    ],
+)
+def test_find_datasets_matches_generated_uid_prefix(catalog, prefix, exp_matches):
+    # Arrange
+    for generated_uid in ["abc", "a1b2", "b", "test_a", "testXa"]:
+        catalog.add_dataset(generated_uid)
+
+    # Act
+    matches = catalog.find_datasets(prefix)
+
+    # Assert
+    assert matches == exp_matches
+
+
+def test_remove_dataset_removes_dataset(catalog):
+    # Arrange
+    catalog.add_dataset("abc")
+
+    # Act
+    catalog.remove_dataset("abc")
+
+    # Assert
+    assert catalog.datasets() == []
+
+
+def test_get_result_finds_result_by_server_uid(catalog):
+    # Arrange
+    catalog.add_result(1, 2, 3, 10)
+    catalog.add_result(1, 2, 4)
+
+    # Act
+    ids = catalog.get_result(10)
+
+    # Assert
+    assert ids == ("1", "2", "3")
+
+
+def test_add_result_updates_server_uid(catalog):
+    # Arrange
+    catalog.add_result(1, 2, 3)
+
+    # Act
+    catalog.add_result(1, 2, 3, 10)
+
+    # Assert
+    assert catalog.results() == [("1", "2", "3")]
+    assert catalog.get_result(10) == ("1", "2", "3")
+
+
+def test_results_can_list_only_pending_results(catalog):
+    # Arrange
+    catalog.add_result(1, 2, 3, 10)
+    catalog.add_result(1, 2, 4)
+
+    # Act
+    results = catalog.results(pending=True)
+
+    # Assert
+    assert results == [("1", "2", "4")]
+
+
+def test_find_result_returns_uid_and_inputs(catalog):
+    # Arrange
+    catalog.add_result(1, 2, 3, 10, "inputs")
+
+    # Act
+    entry = catalog.find_result(1, 2, 3)
+
+    # Assert
+    assert entry == ("10", "inputs")
+    assert catalog.find_result(1, 2, 4) is None
+
+
+def test_add_result_keeps_inputs_hash_when_submitted(catalog):
+    # Arrange
+    catalog.add_result(1, 2, 3, inputs_hash="inputs")
+
+    # Act
+    catalog.add_result(1, 2, 3, 10)
+
+    # Assert
+    assert catalog.find_result(1, 2, 3) == ("10", "inputs")
+
+
+def test_add_result_resets_uid_when_recomputed(catalog):
+    # Arrange
+    catalog.add_result(1, 2, 3, 10, "inputs")
+
+    # Act
+    catalog.add_result(1, 2, 3, inputs_hash="new_inputs")
+
+    # Assert
+    assert catalog.find_result(1, 2, 3) == (None, "new_inputs")
+
+
+def test_clear_removes_every_entry(catalog):
+    # Arrange
+    catalog.add_cube(1)
+    catalog.add_dataset("abc", 1)
+    catalog.add_result(1, 2, 3, 1)
+    catalog.add_response("url", "etag", None, "{}")
+
+    # Act
+    catalog.clear()
+
+    # Assert
+    assert catalog.cubes() == []
+    assert catalog.datasets() == []
+    assert catalog.results() == []
+    assert catalog.get_response("url") is None
+
+
+def test_get_response_returns_stored_response(catalog):
+    # Arrange
+    catalog.add_response("url", "etag", "date", "{}")
+
+    # Act
+    response = catalog.get_response("url")
+
+    # Assert
+    assert response == ("etag", "date", "{}")
+
+
+def test_add_response_replaces_stored_response(catalog):
+    # Arrange
+    catalog.add_response("url", "etag", "date", "{}")
+
+    # Act
+    catalog.add_response("url", "new_etag", None, '{"id": 1}')
+
+    # Assert
+    assert catalog.get_response("url") == ("new_etag", None, '{"id": 1}')
+
+
+def test_get_response_returns_none_if_not_stored(catalog):
+    # Assert
+    assert catalog.get_response("url") is None
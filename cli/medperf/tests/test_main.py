@@ -0,0 +1,48 @@
+import sys
+import pytest
+import subprocess
+from pathlib import Path
+from typing import List
+
+import medperf
+
+CLI_PATH = Path(medperf.__file__).resolve().parents[1]
+HEAVY_MODULES = [
+    "requests",
+    "yaml",
+    "pexpect",
+    "tabulate",
+    "validators",
+    "yaspin",
+    "colorama",
+    "medperf.utils",
+    "medperf.comms",
+    "medperf.entities",
+]
+
+
+def imported_modules(module: str) -> List[str]:
+    """Imports a module in a new interpreter, and returns the names of every
+    module loaded by that interpreter
+    """
+    code = f"import sys, {module}; print('\\n'.join(sys.modules))"
+    cmd = [sys.executable, "-c", code]
+    proc = subprocess.run(cmd, cwd=CLI_PATH, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    return proc.stdout.splitlines()
+
+
+@pytest.fixture(scope="module")
+def startup_modules():
+    return imported_modules("medperf.__main__")
+
+
+def test_startup_imports_main(startup_modules):
+    # Assert
+    assert "medperf.__main__" in startup_modules
+
+
+@pytest.mark.parametrize("module", HEAVY_MODULES)
+def test_startup_doesnt_import_heavy_modules(startup_modules, module):
+    # Assert
+    assert module not in startup_modules
@@ -0,0 +1,129 @@
+import pytest
+from unittest.mock import MagicMock, mock_open
+
+from medperf import config
+from medperf import predictions
+
+PATCH_PREDS = "medperf.predictions.{}"
+PREDS_PATH = "/predictions/1/data_uid"
+FILES = {"pred.csv": "hash1", "sub/pred.npy": "hash2"}
+
+
+@pytest.fixture
+def folder(mocker):
+    walk = [(PREDS_PATH, ["sub"], ["pred.csv"]), (f"{PREDS_PATH}/sub", [], ["pred.npy"])]
+    mocker.patch("os.walk", return_value=walk)
+    mocker.patch("os.path.isdir", return_value=True)
+    return mocker.patch(
+        PATCH_PREDS.format("get_file_sha1"), side_effect=["hash1", "hash2"]
+    )
+
+
+@pytest.fixture
+def manifest(mocker):
+    def manifest_gen(contents):
+        mocker.patch("os.path.exists", return_value=contents is not None)
+        mocker.patch("builtins.open", mock_open())
+        mocker.patch(PATCH_PREDS.format("yaml.safe_load"), return_value=contents)
+
+    return manifest_gen
+
+
+def test_manifest_is_stored_next_to_predictions():
+    # Act
+    path = predictions.manifest_path(PREDS_PATH + "/")
+
+    # Assert
+    assert path == PREDS_PATH + config.predictions_manifest_suffix
+
+
+@pytest.mark.parametrize(
+    "model_fingerprint,data_uid", [("model", "data"), ("model2", "data"), ("model", "data2")]
+)
+def test_prediction_key_depends_on_model_and_dataset(model_fingerprint, data_uid):
+    # Arrange
+    base_key = predictions.prediction_key("model", "data")
+
+    # Act
+    key = predictions.prediction_key(model_fingerprint, data_uid)
+
+    # Assert
+    same_inputs = (model_fingerprint, data_uid) == ("model", "data")
+    assert (key == base_key) == same_inputs
+
+
+def test_hash_predictions_hashes_every_file(mocker, folder):
+    # Act
+    hashes = predictions.hash_predictions(PREDS_PATH)
+
+    # Assert
+    assert hashes == FILES
+
+
+def test_is_cached_true_if_manifest_matches(mocker, folder, manifest):
+    # Arrange
+    manifest({"key": "key", "files": FILES})
+
+    # Act & Assert
+    assert predictions.is_cached(PREDS_PATH, "key")
+
+
+def test_is_cached_false_without_manifest(mocker, folder, manifest):
+    # Arrange
+    manifest(None)
+
+    # Act & Assert
+    assert not predictions.is_cached(PREDS_PATH, "key")
+
+
+def test_is_cached_false_if_key_differs(mocker, folder, manifest):
+    # Arrange
+    manifest({"key": "other_key", "files": FILES})
+
+    # Act & Assert
+    assert not predictions.is_cached(PREDS_PATH, "key")
+    folder.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "files",
+    [
+        {"pred.csv": "hash1"},
+        {"pred.csv": "hash1", "sub/pred.npy": "modified"},
+        {"pred.csv": "hash1", "sub/pred.npy": "hash2", "missing.csv": "hash3"},
+    ],
+)
+def test_is_cached_false_if_files_changed(mocker, folder, manifest, files):
+    # Arrange
+    manifest({"key": "key", "files": files})
+
+    # Act & Assert
+    assert not predictions.is_cached(PREDS_PATH, "key")
+
+
+def test_save_manifest_writes_key_and_hashes(mocker, folder):
+    # Arrange
+    mocker.patch("builtins.open", MagicMock())
+    spy = mocker.patch(PATCH_PREDS.format("yaml.dump"))
+
+    # Act
+    predictions.save_manifest(PREDS_PATH, "key")
+
+    # Assert
+    spy.assert_called_once_with({"key": "key", "files": FILES}, mocker.ANY)
+
+
+@pytest.mark.parametrize("exists", [True, False])
+def test_invalidate_removes_manifest(mocker, exists):
+    # Arrange
+    mocker.patch("os.path.exists", return_value=exists)
+    spy = mocker.patch("os.remove")
+
+    # Act
+    predictions.invalidate(PREDS_PATH)
+
+    # Assert
+    if exists:
+        spy.assert_called_once_with(predictions.manifest_path(PREDS_PATH))
+    else:
+        spy.assert_not_called()
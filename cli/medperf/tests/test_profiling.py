@@ -0,0 +1,288 @@
+import json
+import pytest
+import threading
+from unittest.mock import MagicMock, mock_open
+
+from medperf import config
+from medperf import profiling
+from medperf.profiling import Profiler
+
+PATCH_PROFILING = "medperf.profiling.{}"
+
+
+@pytest.fixture
+def profiler(mocker):
+    profiler = Profiler("run")
+    mocker.patch.object(config, "profiler", profiler)
+    return profiler
+
+
+def usage(cpu_time):
+    usage = MagicMock()
+    usage.ru_utime = cpu_time / 2
+    usage.ru_stime = cpu_time / 2
+    return usage
+
+
+def test_span_records_wall_time(mocker, profiler):
+    # Arrange
+    mocker.patch("time.perf_counter", side_effect=[10, 12])
+
+    # Act
+    with profiler.span("stage"):
+        pass
+
+    # Assert
+    assert profiler.spans[0].wall_time == 2
+
+
+def test_span_records_name_and_attributes(mocker, profiler):
+    # Act
+    with profiler.span("stage", url="url"):
+        pass
+
+    # Assert
+    span = profiler.spans[0]
+    assert span.name == "stage"
+    assert span.attrs == {"url": "url"}
+
+
+def test_span_records_parent_of_nested_spans(mocker, profiler):
+    # Act
+    with profiler.span("outer"):
+        with profiler.span("inner"):
+            pass
+
+    # Assert
+    spans = {span.name: span for span in profiler.spans}
+    assert spans["inner"].parent == "outer"
+    assert spans["outer"].parent is None
+
+
+def test_span_is_recorded_on_errors(mocker, profiler):
+    # Act
+    with pytest.raises(RuntimeError):
+        with profiler.span("stage"):
+            raise RuntimeError()
+
+    # Assert
+    assert len(profiler.spans) == 1
+
+
+def test_span_adds_bytes_from_several_threads(mocker, profiler):
+    # Arrange
+    n_threads = 4
+
+    # Act
+    with profiler.span("stage") as span:
+        threads = [
+            threading.Thread(target=lambda: [span.add_bytes(1) for _ in range(1000)])
+            for _ in range(n_threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    # Assert
+    assert profiler.spans[0].bytes == n_threads * 1000
+
+
+def test_span_measures_children_cpu_time_if_requested(mocker, profiler):
+    # Arrange
+    mocker.patch(
+        PATCH_PROFILING.format("children_usage"), side_effect=[usage(1), usage(4)],
+    )
+
+    # Act
+    with profiler.span("stage", children=True):
+        pass
+
+    # Assert
+    span = profiler.spans[0]
+    assert span.children_cpu_time == 3
+
+
+def test_span_skips_children_usage_by_default(mocker, profiler):
+    # Arrange
+    spy = mocker.patch(PATCH_PROFILING.format("children_usage"))
+
+    # Act
+    with profiler.span("stage"):
+        pass
+
+    # Assert
+    spy.assert_not_called()
+    assert profiler.spans[0].children_cpu_time is None
+
+
+def test_module_span_uses_config_profiler(mocker, profiler):
+    # Act
+    with profiling.span("stage"):
+        pass
+
+    # Assert
+    assert [span.name for span in profiler.spans] == ["stage"]
+
+
+def test_module_span_works_without_profiler(mocker):
+    # Arrange
+    mocker.patch.object(config, "profiler", None)
+
+    # Act
+    with profiling.span("stage") as span:
+        span.add_bytes(10)
+
+    # Assert
+    assert span.bytes == 10
+
+
+def test_report_lists_spans_in_start_order(mocker, profiler):
+    # Arrange
+    mocker.patch("time.perf_counter", side_effect=[1, 2, 3, 4, 5])
+
+    # Act
+    with profiler.span("outer"):
+        with profiler.span("inner"):
+            pass
+    report = profiler.report()
+
+    # Assert
+    assert report["command"] == "run"
+    assert [span["name"] for span in report["spans"]] == ["outer", "inner"]
+
+
+def test_save_writes_report_as_json(mocker, profiler):
+    # Arrange
+    with profiler.span("stage"):
+        pass
+    m = mock_open()
+    mocker.patch("builtins.open", m)
+
+    # Act
+    profiler.save("report.json")
+
+    # Assert
+    m.assert_called_once_with("report.json", "w")
+    written = "".join(call.args[0] for call in m().write.call_args_list)
+    assert json.loads(written)["spans"][0]["name"] == "stage"
+
+
+def test_summary_aggregates_spans_by_name(mocker, profiler):
+    # Act
+    for _ in range(3):
+        with profiler.span("download") as span:
+            span.add_bytes(1024 ** 2)
+    summary = profiler.summary()
+
+    # Assert
+    row = [line for line in summary.splitlines() if line.startswith("download")]
+    assert len(row) == 1
+    assert row[0].split()[1:2] == ["3"]
+    assert "3.0" in row[0].split()
+
+
+def test_summary_adds_children_cpu_time(mocker, profiler):
+    # Arrange
+    mocker.patch(
+        PATCH_PROFILING.format("children_usage"),
+        side_effect=[usage(0), usage(1), usage(1), usage(3)],
+    )
+
+    # Act
+    for _ in range(2):
+        with profiler.span("mlcube infer", children=True):
+            pass
+    summary = profiler.summary()
+
+    # Assert
+    assert "Host child CPU time (s)" in summary
+    row = [line for line in summary.splitlines() if line.startswith("mlcube infer")]
+    assert row[0].split()[-1] == "3.00"
+
+
+@pytest.fixture
+def reports(mocker):
+    mocker.patch("os.makedirs")
+    return mocker.patch("os.listdir", return_value=[])
+
+
+def test_finish_stores_report_in_folder(mocker, profiler, ui, reports):
+    # Arrange
+    spy = mocker.patch.object(profiler, "save")
+
+    # Act
+    profiler.finish("/profiles")
+
+    # Assert
+    path = spy.call_args[0][0]
+    assert path.startswith("/profiles/")
+    assert path.endswith("_run.json")
+    ui.print.assert_not_called()
+
+
+def test_finish_prints_summary_if_ui_given(mocker, profiler, ui, reports):
+    # Arrange
+    mocker.patch.object(profiler, "save")
+    mocker.patch.object(profiler, "summary", return_value="summary")
+
+    # Act
+    profiler.finish("/profiles", ui)
+
+    # Assert
+    ui.print.assert_any_call("summary")
+
+
+def test_finish_ignores_storage_errors(mocker, profiler, ui, reports):
+    # Arrange
+    mocker.patch.object(profiler, "save", side_effect=OSError)
+
+    # Act
+    profiler.finish("/profiles", ui)
+
+    # Assert
+    assert ui.print.call_count == 1
+
+
+def test_finish_report_names_are_unique(mocker, ui, reports):
+    # Arrange
+    profilers = [Profiler("run"), Profiler("run")]
+    paths = []
+    for profiler in profilers:
+        mocker.patch.object(profiler, "started", profilers[0].started)
+        spy = mocker.patch.object(profiler, "save")
+        mocker.patch("os.getpid", return_value=len(paths))
+
+        # Act
+        profiler.finish("/profiles")
+        paths.append(spy.call_args[0][0])
+
+    # Assert
+    assert paths[0] != paths[1]
+
+
+def test_finish_removes_oldest_reports(mocker, profiler, reports):
+    # Arrange
+    mocker.patch.object(profiler, "save")
+    reports.return_value = ["3_run.json", "1_run.json", "2_run.json", "other.txt"]
+    spy = mocker.patch("os.remove")
+
+    # Act
+    profiler.finish("/profiles", keep=2)
+
+    # Assert
+    spy.assert_called_once_with("/profiles/1_run.json")
+
+
+def test_finish_keeps_reports_within_retention(mocker, profiler, reports):
+    # Arrange
+    mocker.patch.object(config, "profiles_retention", 5)
+    mocker.patch.object(profiler, "save")
+    reports.return_value = ["1_run.json", "2_run.json"]
+    spy = mocker.patch("os.remove")
+
+    # Act
+    profiler.finish("/profiles")
+
+    # Assert
+    spy.assert_not_called()
@@ -0,0 +1,263 @@
+import pytest
+import threading
+from unittest.mock import MagicMock
+
+from medperf import config
+from medperf.scheduler import TaskScheduler, TaskUI, task_slots
+
+PATCH_SCHEDULER = "medperf.scheduler.{}"
+GB = 1024 ** 3
+
+
+@pytest.fixture
+def limits(mocker):
+    def limits_gen(tasks=1, cpus=None, memory=None):
+        mocker.patch.object(config, "max_concurrent_tasks", tasks)
+        mocker.patch.object(config, "task_cpus", cpus)
+        mocker.patch.object(config, "task_memory", memory)
+
+    mocker.patch("os.cpu_count", return_value=64)
+    mocker.patch(PATCH_SCHEDULER.format("system_memory"), return_value=128 * GB)
+    return limits_gen
+
+
+@pytest.fixture
+def scheduler(mocker, ui):
+    mocker.patch("os.makedirs")
+
+    def scheduler_gen(slots=None):
+        return TaskScheduler(ui, slots)
+
+    return scheduler_gen
+
+
+@pytest.mark.parametrize(
+    "tasks,cpus,memory,exp_slots",
+    [
+        (1, None, None, 1),
+        (8, None, None, 8),
+        (32, 16, None, 4),
+        (32, 1.5, None, 32),
+        (32, None, 48, 2),
+        (32, 8, 32, 4),
+        (32, 128, None, 1),
+        (32, None, 256, 1),
+    ],
+)
+def test_task_slots_respects_limits(limits, tasks, cpus, memory, exp_slots):
+    # Arrange
+    limits(tasks, cpus, memory)
+
+    # Act
+    slots = task_slots()
+
+    # Assert
+    assert slots == exp_slots
+
+
+def test_task_slots_ignores_memory_if_unknown(mocker, limits):
+    # Arrange
+    limits(8, None, 256)
+    mocker.patch(PATCH_SCHEDULER.format("system_memory"), return_value=None)
+
+    # Act
+    slots = task_slots()
+
+    # Assert
+    assert slots == 8
+
+
+def test_scheduler_uses_task_slots_by_default(mocker, limits, scheduler):
+    # Arrange
+    limits(3)
+
+    # Act
+    sched = scheduler()
+
+    # Assert
+    assert sched.slots == 3
+
+
+def test_scheduler_creates_logs_folder(mocker, ui):
+    # Arrange
+    spy = mocker.patch("os.makedirs")
+
+    # Act
+    sched = TaskScheduler(ui, 1)
+
+    # Assert
+    spy.assert_called_once_with(sched.logs_path, exist_ok=True)
+
+
+def test_submit_calls_task_with_task_ui_and_log_file(mocker, scheduler):
+    # Arrange
+    fn = MagicMock(return_value="out")
+    sched = scheduler(1)
+
+    # Act
+    with sched:
+        task = sched.submit("name", fn, "arg", kwarg="kwarg")
+
+    # Assert
+    assert task.result() == "out"
+    args, kwargs = fn.call_args
+    assert isinstance(args[0], TaskUI)
+    assert args[0].name == "name"
+    assert args[1:] == ("arg",)
+    assert kwargs == {"log_file": sched.log_file("name"), "kwarg": "kwarg"}
+
+
+def test_run_executes_task_on_calling_thread(mocker, ui, scheduler):
+    # Arrange
+    threads = []
+    sched = scheduler(1)
+
+    def fn(task_ui, log_file):
+        threads.append(threading.current_thread())
+        task_ui.text = "progress"
+        return log_file
+
+    # Act
+    log_file = sched.run("name", fn)
+
+    # Assert
+    assert threads == [threading.current_thread()]
+    assert log_file == sched.log_file("name")
+    assert ui.text == "progress"
+
+
+def test_log_file_is_unique_per_task(mocker, scheduler):
+    # Arrange
+    sched = scheduler(1)
+
+    # Act
+    log_a = sched.log_file("a")
+    log_b = sched.log_file("b")
+
+    # Assert
+    assert log_a != log_b
+    assert log_a.startswith(sched.logs_path)
+
+
+def test_submit_propagates_task_errors(mocker, scheduler):
+    # Arrange
+    fn = MagicMock(side_effect=RuntimeError)
+    sched = scheduler(1)
+
+    # Act
+    with sched:
+        task = sched.submit("name", fn)
+
+    # Assert
+    with pytest.raises(RuntimeError):
+        task.result()
+
+
+@pytest.mark.parametrize("slots", [2, 4])
+def test_scheduler_runs_tasks_concurrently(mocker, scheduler, slots):
+    # Arrange
+    barrier = threading.Barrier(slots, timeout=5)
+    sched = scheduler(slots)
+
+    def fn(ui, log_file):
+        barrier.wait()
+
+    # Act
+    with sched:
+        tasks = [sched.submit(str(i), fn) for i in range(slots)]
+
+    # Assert
+    for task in tasks:
+        task.result()
+
+
+@pytest.mark.parametrize("slots", [1, 2, 3])
+def test_scheduler_respects_slots(mocker, scheduler, slots):
+    # Arrange
+    lock = threading.Lock()
+    running = []
+    max_running = []
+    sched = scheduler(slots)
+
+    def fn(ui, log_file):
+        with lock:
+            running.append(1)
+            max_running.append(len(running))
+        threading.Event().wait(0.01)
+        with lock:
+            running.pop()
+
+    # Act
+    with sched:
+        for i in range(slots * 3):
+            sched.submit(str(i), fn)
+
+    # Assert
+    assert max(max_running) <= slots
+
+
+def test_scheduler_cancels_pending_tasks_on_error(mocker, scheduler):
+    # Arrange
+    started = threading.Event()
+    release = threading.Event()
+    sched = scheduler(1)
+
+    def blocking(ui, log_file):
+        started.set()
+        release.wait(5)
+
+    pending = MagicMock()
+
+    # Act
+    with pytest.raises(KeyError):
+        with sched:
+            sched.submit("blocking", blocking)
+            sched.submit("pending", pending)
+            started.wait(5)
+            release.set()
+            raise KeyError()
+
+    # Assert
+    pending.assert_not_called()
+
+
+def test_task_ui_text_is_multiplexed(mocker, ui, scheduler):
+    # Arrange
+    sched = scheduler(1)
+    ui_a = TaskUI(sched, "a")
+    ui_b = TaskUI(sched, "b")
+
+    # Act
+    ui_a.text = "progress a"
+    ui_b.text = "progress b"
+
+    # Assert
+    assert ui.text == "progress a | progress b"
+    assert ui_a.text == "progress a"
+
+
+def test_update_removes_finished_tasks(mocker, ui, scheduler):
+    # Arrange
+    sched = scheduler(1)
+    sched.update("a", "progress a")
+    sched.update("b", "progress b")
+
+    # Act
+    sched.update("a", None)
+
+    # Assert
+    assert ui.text == "progress b"
+
+
+def test_task_ui_prefixes_messages(mocker, ui, scheduler):
+    # Arrange
+    sched = scheduler(1)
+    task_ui = TaskUI(sched, "name")
+
+    # Act
+    task_ui.print("msg")
+    task_ui.print_error("error")
+
+    # Assert
+    ui.print.assert_called_once_with("[name] msg")
+    ui.print_error.assert_called_once_with("[name] error")
@@ -1,12 +1,15 @@
 import os
 import pytest
+import threading
 import time_machine
 import datetime as dt
 from pathlib import Path
-from unittest.mock import MagicMock, mock_open, call, ANY
+from pexpect.exceptions import EOF, TIMEOUT
+from unittest.mock import MagicMock, mock_open, call
 
 from medperf import utils
 from medperf.ui.interface import UI
+from medperf.profiling import Profiler
 import medperf.config as config
 from medperf.tests.utils import cube_local_hashes_generator
 from medperf.tests.mocks import MockCube, MockTar
@@ -92,6 +95,51 @@ def test_get_file_sha1_calculates_hash(mocker, file_io):
     assert hash == expected_hash
 
 
+@pytest.mark.parametrize("chunk_size", [1, 4, 1024])
+def test_get_file_sha1_reports_progress_per_chunk(mocker, chunk_size):
+    # Arrange
+    contents = b"file\nwith\nmultilines\n"
+    mocker.patch("builtins.open", mock_open(read_data=contents))
+    mocker.patch.object(config, "hash_chunk_size", chunk_size)
+    progress = MagicMock()
+
+    # Act
+    hash = utils.get_file_sha1("", progress)
+
+    # Assert
+    assert hash == "a69ce122f95a94dc02485764d463b10545a558c8"
+    assert sum(call[0][0] for call in progress.call_args_list) == len(contents)
+    assert all(call[0][0] <= chunk_size for call in progress.call_args_list)
+
+
+def test_hash_progress_displays_bytes_and_speed(mocker, ui):
+    # Arrange
+    mocker.patch("time.monotonic", side_effect=[0, 2])
+    mocker.patch.object(config, "hash_progress_interval", 1)
+    progress = utils.hash_progress(ui, "Hashing")
+
+    # Act
+    progress(4 * 1024 ** 2)
+
+    # Assert
+    assert ui.text == "Hashing (4 MB, 2.0 MB/s)"
+
+
+def test_hash_progress_throttles_updates(mocker, ui):
+    # Arrange
+    ui.text = "initial"
+    mocker.patch("time.monotonic", side_effect=[0, 0.1, 0.2])
+    mocker.patch.object(config, "hash_progress_interval", 1)
+    progress = utils.hash_progress(ui, "Hashing")
+
+    # Act
+    progress(1)
+    progress(1)
+
+    # Assert
+    assert ui.text == "initial"
+
+
 @pytest.mark.parametrize(
     "existing_dirs",
     [config_dirs[0:i] + config_dirs[i + 1:] for i in range(len(config_dirs))],
@@ -248,9 +296,7 @@ def test_cube_validity_fails_when_invalid(mocker, ui, is_valid):
 @pytest.mark.parametrize("file", ["test.tar.bz", "path/to/file.tar.bz"])
 def test_untar_opens_specified_file(mocker, file):
     # Arrange
-    spy = mocker.patch("tarfile.open")
-    mocker.patch("tarfile.TarFile.extractall")
-    mocker.patch("tarfile.TarFile.close")
+    spy = mocker.patch("tarfile.open", return_value=MockTar())
     mocker.patch("os.remove")
 
     # Act
@@ -264,23 +310,22 @@ def test_untar_opens_specified_file(mocker, file):
 def test_untar_extracts_to_parent_directory(mocker, file):
     # Arrange
     parent_path = str(Path(file).parent)
-    mocker.patch("tarfile.open", return_value=MockTar())
-    spy = mocker.spy(MockTar, "extractall")
+    tar = MockTar()
+    mocker.patch("tarfile.open", return_value=tar)
+    spy = mocker.patch(patch_utils.format("extract_members"))
     mocker.patch("os.remove")
 
     # Act
     utils.untar(file)
 
     # Assert
-    spy.assert_called_once_with(ANY, parent_path)
+    spy.assert_called_once_with(tar, parent_path)
 
 
 @pytest.mark.parametrize("file", ["./test.tar.bz", "path/to/file.tar.bz"])
 def test_untar_removes_tarfile(mocker, file):
     # Arrange
-    mocker.patch("tarfile.open")
-    mocker.patch("tarfile.TarFile.extractall")
-    mocker.patch("tarfile.TarFile.close")
+    mocker.patch("tarfile.open", return_value=MockTar())
     spy = mocker.patch("os.remove")
 
     # Act
@@ -290,6 +335,37 @@ def test_untar_removes_tarfile(mocker, file):
     spy.assert_called_once_with(file)
 
 
+@pytest.mark.parametrize(
+    "members", [["mlcube.yaml"], ["workspace/", "workspace/params.yaml"]]
+)
+def test_extract_members_extracts_every_member(mocker, members):
+    # Arrange
+    tar = MockTar(members)
+    spy = mocker.spy(tar, "extract")
+    path = "path"
+    calls = [call(member, path) for member in tar.members]
+
+    # Act
+    utils.extract_members(tar, path)
+
+    # Assert
+    spy.assert_has_calls(calls)
+    assert spy.call_count == len(members)
+
+
+def test_extract_members_skips_appledouble_files(mocker):
+    # Arrange
+    members = ["._mlcube.yaml", "mlcube.yaml", "workspace/._params.yaml"]
+    tar = MockTar(members)
+    spy = mocker.spy(tar, "extract")
+
+    # Act
+    utils.extract_members(tar, "path")
+
+    # Assert
+    spy.assert_called_once_with(tar.members[1], "path")
+
+
 def test_approval_prompt_asks_for_user_input(mocker, ui):
     # Arrange
     spy = mocker.patch.object(ui, "prompt", return_value="y")
@@ -350,13 +426,116 @@ def test_dict_pretty_print_passes_clean_dict_to_yaml(mocker, ui, dict_with_nones
     spy.assert_called_once_with(exp_dict)
 
 
+@pytest.fixture
+def proc(mocker):
+    def proc_gen(chunks):
+        proc = MagicMock()
+        proc.read_nonblocking.side_effect = chunks + [EOF("")]
+        return proc
+
+    return proc_gen
+
+
+def test_combine_proc_sp_text_reads_in_chunks(mocker, ui, proc):
+    # Arrange
+    child = proc([b"line 1\nline 2\n"])
+
+    # Act
+    utils.combine_proc_sp_text(child, ui)
+
+    # Assert
+    child.read_nonblocking.assert_called_with(config.proc_read_size, timeout=-1)
+    assert child.read_nonblocking.call_count == 2
+
+
+def test_combine_proc_sp_text_returns_terminated_lines(mocker, ui, proc):
+    # Arrange
+    child = proc([b"first\npro", b"gress 50%\rprogress 100%\r", b"\nlast\n", b"end"])
+
+    # Act
+    out = utils.combine_proc_sp_text(child, ui)
+
+    # Assert
+    assert out == "first\n\nlast\nend"
+
+
+def test_combine_proc_sp_text_keeps_only_last_lines(mocker, ui, proc):
+    # Arrange
+    mocker.patch.object(config, "proc_output_tail", 2)
+    child = proc([b"1\n2\n3\n", b"4\n"])
+
+    # Act
+    out = utils.combine_proc_sp_text(child, ui)
+
+    # Assert
+    assert out == "3\n4\n"
+
+
+def test_combine_proc_sp_text_decodes_split_characters(mocker, ui, proc):
+    # Arrange
+    text = "caf\u00e9\n".encode("utf-8")
+    child = proc([text[:4], text[4:]])
+
+    # Act
+    out = utils.combine_proc_sp_text(child, ui)
+
+    # Assert
+    assert out == "caf\u00e9\n"
+
+
+def test_combine_proc_sp_text_streams_output_to_log_file(mocker, ui, proc):
+    # Arrange
+    child = proc([b"progress\r", b"done\n"])
+    spy = mocker.patch("builtins.open", MagicMock())
+
+    # Act
+    utils.combine_proc_sp_text(child, ui, "task.log")
+
+    # Assert
+    spy.assert_called_once_with("task.log", "a")
+    log = spy.return_value
+    log.write.assert_has_calls([call("progress\r"), call("done\n")])
+    log.close.assert_called_once()
+
+
+def test_combine_proc_sp_text_throttles_spinner_updates(mocker, ui, proc):
+    # Arrange
+    text = mocker.PropertyMock(return_value="static")
+    type(ui).text = text
+    mocker.patch("time.monotonic", side_effect=[10, 10.1, 10.2])
+    mocker.patch.object(config, "proc_refresh_interval", 1)
+    child = proc([b"a\n", b"b\n", b"c\n"])
+
+    # Act
+    utils.combine_proc_sp_text(child, ui)
+
+    # Assert
+    shown = [args[0] for args, _ in text.call_args_list if args]
+    assert len(shown) == 2
+    assert "a" in shown[0]
+    assert "c" in shown[1]
+
+
+def test_combine_proc_sp_text_fails_on_timeout(mocker, ui, proc):
+    # Arrange
+    child = proc([TIMEOUT("")])
+    spy = mocker.patch(patch_utils.format("pretty_error"), side_effect=SystemExit)
+
+    # Act
+    with pytest.raises(SystemExit):
+        utils.combine_proc_sp_text(child, ui)
+
+    # Assert
+    spy.assert_called_once()
+
+
 def test_get_folder_sha1_hashes_all_files_in_folder(mocker, filesystem):
     # Arrange
     fs = filesystem[0]
     files = filesystem[1]
     exp_calls = [call(file) for file in files]
     mocker.patch("os.walk", return_value=fs)
-    spy = mocker.patch(patch_utils.format("get_file_sha1"), side_effect=files)
+    spy = mocker.patch(patch_utils.format("get_file_sha1"), side_effect=lambda x: x)
 
     # Act
     utils.get_folder_sha1("test")
@@ -370,7 +549,7 @@ def test_get_folder_sha1_sorts_individual_hashes(mocker, filesystem):
     fs = filesystem[0]
     files = filesystem[1]
     mocker.patch("os.walk", return_value=fs)
-    mocker.patch(patch_utils.format("get_file_sha1"), side_effect=files)
+    mocker.patch(patch_utils.format("get_file_sha1"), side_effect=lambda x: x)
     spy = mocker.patch("builtins.sorted", side_effect=sorted)
 
     # Act
@@ -383,9 +562,8 @@ def test_get_folder_sha1_sorts_individual_hashes(mocker, filesystem):
 def test_get_folder_sha1_returns_expected_hash(mocker, filesystem):
     # Arrange
     fs = filesystem[0]
-    files = filesystem[1]
     mocker.patch("os.walk", return_value=fs)
-    mocker.patch(patch_utils.format("get_file_sha1"), side_effect=files)
+    mocker.patch(patch_utils.format("get_file_sha1"), side_effect=lambda x: x)
 
     # Act
     hash = utils.get_folder_sha1("test")
@@ -394,6 +572,310 @@ def test_get_folder_sha1_returns_expected_hash(mocker, filesystem):
     assert hash == "4bf17af7fa48c5b03a3315a1f2eb17a301ed883a"
 
 
+@pytest.mark.parametrize("workers", [1, 2, 8])
+def test_get_folder_sha1_is_independent_of_workers(mocker, filesystem, workers):
+    # Arrange
+    fs = filesystem[0]
+    mocker.patch("os.walk", return_value=fs)
+    mocker.patch(patch_utils.format("get_file_sha1"), side_effect=lambda x: x)
+
+    # Act
+    hash = utils.get_folder_sha1("test", workers=workers)
+
+    # Assert
+    assert hash == "4bf17af7fa48c5b03a3315a1f2eb17a301ed883a"
+
+
+def test_get_folder_sha1_hashes_files_concurrently(mocker, filesystem):
+    # Arrange
+    fs, files = filesystem
+    mocker.patch("os.walk", return_value=fs)
+    barrier = threading.Barrier(len(files), timeout=5)
+
+    def get_file_sha1(path):
+        barrier.wait()
+        return path
+
+    mocker.patch(patch_utils.format("get_file_sha1"), side_effect=get_file_sha1)
+
+    # Act
+    hash = utils.get_folder_sha1("test", workers=len(files))
+
+    # Assert
+    assert hash == "4bf17af7fa48c5b03a3315a1f2eb17a301ed883a"
+
+
+def test_get_folder_sha1_reports_progress_to_ui(mocker, filesystem, ui):
+    # Arrange
+    fs = filesystem[0]
+    mocker.patch("os.walk", return_value=fs)
+    mocker.patch.object(config, "hash_progress_interval", 0)
+
+    def get_file_sha1(path, progress):
+        progress(1024 ** 2)
+        return path
+
+    mocker.patch(patch_utils.format("get_file_sha1"), side_effect=get_file_sha1)
+
+    # Act
+    utils.get_folder_sha1("test", ui=ui, workers=1)
+
+    # Assert
+    assert ui.text.startswith("Hashing test (3 MB")
+
+
+def test_get_folder_sha1_profiles_hashed_bytes(mocker, filesystem):
+    # Arrange
+    profiler = Profiler()
+    mocker.patch.object(config, "profiler", profiler)
+    mocker.patch("os.walk", return_value=filesystem[0])
+
+    def get_file_sha1(path, progress):
+        progress(10)
+        return path
+
+    mocker.patch(patch_utils.format("get_file_sha1"), side_effect=get_file_sha1)
+
+    # Act
+    utils.get_folder_sha1("test", workers=1)
+
+    # Assert
+    span = profiler.spans[0]
+    assert (span.name, span.bytes) == ("hash", 30)
+
+
+@pytest.fixture
+def manifest_fs(mocker, filesystem):
+    fs, files = filesystem
+    mocker.patch("os.walk", return_value=fs)
+    stats = {
+        file: MagicMock(st_size=10 + idx, st_mtime_ns=0, st_ino=idx)
+        for idx, file in enumerate(files)
+    }
+    real_stat = os.stat
+
+    def stat(path, *args, **kwargs):
+        if path in stats:
+            return stats[path]
+        return real_stat(path, *args, **kwargs)
+
+    mocker.patch("os.stat", side_effect=stat)
+    save_spy = mocker.patch(patch_utils.format("save_hash_manifest"))
+    manifest = {
+        os.path.relpath(file, "/foo"): {
+            "size": 10 + idx,
+            "mtime_ns": 0,
+            "inode": idx,
+            "sha1": file,
+        }
+        for idx, file in enumerate(files)
+    }
+    return files, manifest, save_spy
+
+
+def test_get_folder_sha1_with_manifest_returns_same_hash(mocker, manifest_fs):
+    # Arrange
+    files, _, _ = manifest_fs
+    mocker.patch(patch_utils.format("load_hash_manifest"), return_value={})
+    mocker.patch(patch_utils.format("get_file_sha1"), side_effect=lambda x: x)
+
+    # Act
+    hash = utils.get_folder_sha1("/foo", "manifest")
+
+    # Assert
+    assert hash == "4bf17af7fa48c5b03a3315a1f2eb17a301ed883a"
+
+
+def test_get_folder_sha1_reuses_hashes_of_unchanged_files(mocker, manifest_fs):
+    # Arrange
+    files, manifest, _ = manifest_fs
+    mocker.patch(patch_utils.format("load_hash_manifest"), return_value=manifest)
+    spy = mocker.patch(patch_utils.format("get_file_sha1"))
+
+    # Act
+    hash = utils.get_folder_sha1("/foo", "manifest")
+
+    # Assert
+    spy.assert_not_called()
+    assert hash == "4bf17af7fa48c5b03a3315a1f2eb17a301ed883a"
+
+
+@pytest.mark.parametrize("field", ["size", "mtime_ns", "inode"])
+def test_get_folder_sha1_rehashes_changed_files(mocker, manifest_fs, field):
+    # Arrange
+    files, manifest, _ = manifest_fs
+    changed = os.path.relpath(files[1], "/foo")
+    manifest[changed][field] += 1
+    mocker.patch(patch_utils.format("load_hash_manifest"), return_value=manifest)
+    spy = mocker.patch(patch_utils.format("get_file_sha1"), return_value="new")
+
+    # Act
+    utils.get_folder_sha1("/foo", "manifest")
+
+    # Assert
+    spy.assert_called_once_with(files[1])
+
+
+def test_get_folder_sha1_saves_updated_manifest(mocker, manifest_fs):
+    # Arrange
+    files, manifest, save_spy = manifest_fs
+    stale_manifest = {**manifest, "removed": {"sha1": "removed"}}
+    mocker.patch(patch_utils.format("load_hash_manifest"), return_value=stale_manifest)
+    mocker.patch(patch_utils.format("get_file_sha1"))
+
+    # Act
+    utils.get_folder_sha1("/foo", "manifest")
+
+    # Assert
+    save_spy.assert_called_once_with("manifest", manifest)
+
+
+def test_load_hash_manifest_returns_empty_if_missing(mocker):
+    # Arrange
+    mocker.patch("os.path.exists", return_value=False)
+
+    # Act
+    manifest = utils.load_hash_manifest("manifest")
+
+    # Assert
+    assert manifest == {}
+
+
+def test_load_hash_manifest_ignores_corrupted_manifests(mocker):
+    # Arrange
+    mocker.patch("os.path.exists", return_value=True)
+    mocker.patch("builtins.open", mock_open(read_data="{corrupted"))
+
+    # Act
+    manifest = utils.load_hash_manifest("manifest")
+
+    # Assert
+    assert manifest == {}
+
+
+def test_save_hash_manifest_replaces_manifest_atomically(mocker):
+    # Arrange
+    mocker.patch("os.makedirs")
+    mocker.patch("builtins.open", mock_open())
+    spy = mocker.patch("os.replace")
+
+    # Act
+    utils.save_hash_manifest("/manifests/manifest.json", {})
+
+    # Assert
+    spy.assert_called_once_with(
+        "/manifests/manifest.json.tmp", "/manifests/manifest.json"
+    )
+
+
+def test_folder_manifest_path_is_unique_per_folder(mocker):
+    # Act
+    path_a = utils.folder_manifest_path("/data/a")
+    path_b = utils.folder_manifest_path("/data/b")
+
+    # Assert
+    manifests_path = utils.storage_path(config.hash_manifests_storage)
+    assert path_a != path_b
+    assert path_a.startswith(manifests_path)
+
+
+@pytest.fixture
+def storage_tree(mocker):
+    def tree_gen(tree):
+        """Mocks os.scandir over a nested dict, where files are given by their size
+        """
+
+        def entry(path, name, node):
+            entry = MagicMock()
+            entry.name = name
+            entry.path = os.path.join(path, name)
+            entry.is_dir.return_value = isinstance(node, dict)
+            entry.is_file.return_value = not isinstance(node, dict)
+            entry.stat.return_value.st_size = node
+            return entry
+
+        def scandir(path):
+            node = tree
+            for part in Path(path).relative_to("/storage").parts:
+                node = node[part]
+            entries = MagicMock()
+            entries.__enter__.return_value = entries
+            entries.__iter__.return_value = iter(
+                [entry(path, name, child) for name, child in node.items()]
+            )
+            return entries
+
+        return mocker.patch("os.scandir", side_effect=scandir)
+
+    return tree_gen
+
+
+def test_storage_summary_counts_files_and_size(mocker, storage_tree):
+    # Arrange
+    storage_tree({"data": {"a": 1024, "b": {"c": 1024}}, "cubes": {"d": 10}})
+
+    # Act
+    summary = utils.storage_summary("/storage", depth=1)
+
+    # Assert
+    assert summary.splitlines() == [
+        "storage/",
+        "    cubes/ 1 files, 10 B",
+        "    data/ 2 files, 2.0 KB",
+    ]
+
+
+@pytest.mark.parametrize("depth", [1, 2, 3])
+def test_storage_summary_respects_depth(mocker, storage_tree, depth):
+    # Arrange
+    storage_tree({"1": {"2": {"3": {"4": {"file": 1}}}}})
+
+    # Act
+    summary = utils.storage_summary("/storage", depth=depth)
+
+    # Assert
+    assert len(summary.splitlines()) == depth + 1
+
+
+def test_storage_summary_stops_counting_at_max_entries(mocker, storage_tree):
+    # Arrange
+    storage_tree({"data": {str(i): 1 for i in range(10)}})
+
+    # Act
+    summary = utils.storage_summary("/storage", depth=1, max_entries=5)
+
+    # Assert
+    assert "data/ 5+ files" in summary
+
+
+def test_storage_summary_limits_listed_folders(mocker, storage_tree):
+    # Arrange
+    mocker.patch.object(config, "storage_summary_max_folders", 2)
+    storage_tree({str(i): {} for i in range(5)})
+
+    # Act
+    summary = utils.storage_summary("/storage", depth=1)
+
+    # Assert
+    assert summary.splitlines()[1:] == [
+        "    0/ 0 files, 0 B",
+        "    1/ 0 files, 0 B",
+        "    ... 3 more folders",
+    ]
+
+
+@pytest.mark.parametrize(
+    "nbytes,exp_size",
+    [(0, "0 B"), (1023, "1023 B"), (1536, "1.5 KB"), (3 * 1024 ** 3, "3.0 GB")],
+)
+def test_format_size_uses_largest_unit(nbytes, exp_size):
+    # Act
+    size = utils.format_size(nbytes)
+
+    # Assert
+    assert size == exp_size
+
+
 @pytest.mark.parametrize("bmk", [1, 2])
 @pytest.mark.parametrize("model", [23, 84])
 @pytest.mark.parametrize("gen_uid", [43, 8])
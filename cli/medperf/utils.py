@@ -8,17 +8,24 @@ import random
 import hashlib
 import logging
 import tarfile
-from glob import glob
 import json
+import codecs
+import time
+import functools
+import itertools
+import threading
 from pathlib import Path
+from collections import deque
 from shutil import rmtree
 from pexpect import spawn
 from datetime import datetime
-from typing import List, Tuple
+from typing import Callable, Iterator, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from colorama import Fore, Style
-from pexpect.exceptions import TIMEOUT
+from pexpect.exceptions import EOF, TIMEOUT
 
 import medperf.config as config
+from medperf import profiling
 from medperf.ui.interface import UI
 
 
@@ -27,30 +34,63 @@ def storage_path(subpath: str):
     return os.path.join(config.storage, subpath)
 
 
-def get_file_sha1(path: str) -> str:
+def get_file_sha1(path: str, progress: Callable[[int], None] = None) -> str:
     """Calculates the sha1 hash for a given file.
 
     Args:
         path (str): Location of the file of interest.
+        progress (Callable[[int], None], optional): Called with the number of bytes
+            read after each chunk. Defaults to None.
 
     Returns:
         str: Calculated hash
     """
     logging.debug("Calculating SHA1 hash for file {}".format(path))
-    BUF_SIZE = 65536
     sha1 = hashlib.sha1()
     with open(path, "rb") as f:
         while True:
-            data = f.read(BUF_SIZE)
+            data = f.read(config.hash_chunk_size)
             if not data:
                 break
             sha1.update(data)
+            if progress is not None:
+                progress(len(data))
 
     sha_val = sha1.hexdigest()
     logging.debug(f"SHA1 hash for file {path}: {sha_val}")
     return sha_val
 
 
+def hash_progress(ui: UI, msg: str) -> Callable[[int], None]:
+    """Creates a progress callback for hashing functions that displays the
+    amount of bytes hashed and the hashing speed on the UI. The UI is refreshed
+    at most every `config.hash_progress_interval` seconds.
+
+    Args:
+        ui (UI): instance of an UI implementation
+        msg (str): message displayed before the progress
+
+    Returns:
+        Callable[[int], None]: thread-safe function to call with the bytes hashed
+    """
+    lock = threading.Lock()
+    start = time.monotonic()
+    state = {"bytes": 0, "last_update": start}
+
+    def progress(nbytes: int):
+        with lock:
+            state["bytes"] += nbytes
+            now = time.monotonic()
+            if now - state["last_update"] < config.hash_progress_interval:
+                return
+            state["last_update"] = now
+            mbytes = state["bytes"] / 1024 ** 2
+            rate = mbytes / max(now - start, 1e-6)
+            ui.text = f"{msg} ({mbytes:.0f} MB, {rate:.1f} MB/s)"
+
+    return progress
+
+
 def init_storage():
     """Builds the general medperf folder structure.
     """
@@ -112,6 +152,7 @@ def cleanup_dsets():
 
     for dset in clutter_dsets:
         logging.info(f"Removing clutter dataset: {dset}")
+        config.catalog.remove_dataset(dset)
         dset_path = os.path.join(dsets_path, dset)
         if os.path.exists(dset_path):
             try:
@@ -136,6 +177,7 @@ def cleanup_cubes():
 
     for cube in clutter_cubes:
         logging.info(f"Removing clutter cube: {cube}")
+        config.catalog.remove_cube(cube)
         cube_path = os.path.join(cubes_path, cube)
         if os.path.exists(cube_path):
             try:
@@ -273,21 +315,34 @@ def untar(filepath: str, remove: bool = True) -> str:
     """
     logging.info(f"Uncompressing tar.gz at {filepath}")
     addpath = str(Path(filepath).parent)
-    tar = tarfile.open(filepath)
-    tar.extractall(addpath)
-    tar.close()
-
-    # OS Specific issue: Mac Creates superfluous files with tarfile library
-    [
-        os.remove(spurious_file)
-        for spurious_file in glob(addpath + "/**/._*", recursive=True)
-    ]
+    with profiling.span("untar", path=filepath):
+        tar = tarfile.open(filepath)
+        extract_members(tar, addpath)
+        tar.close()
+
     if remove:
         logging.info(f"Deleting {filepath}")
         os.remove(filepath)
     return addpath
 
 
+def extract_members(tar: tarfile.TarFile, path: str):
+    """Extracts the members of a tarfile one at a time, as they are read.
+    This also works for tarfiles opened in stream mode ("r|*"), so extraction
+    can start before the whole archive is available.
+
+    Args:
+        tar (tarfile.TarFile): Opened tarfile to extract.
+        path (str): Location where the members will be extracted.
+    """
+    for member in tar:
+        # OS Specific issue: Mac adds superfluous AppleDouble files (._*)
+        if os.path.basename(member.name).startswith("._"):
+            logging.debug(f"Skipping {member.name}")
+            continue
+        tar.extract(member, path)
+
+
 def approval_prompt(msg: str, ui: "UI") -> bool:
     """Helper function for prompting the user for things they have to explicitly approve.
 
@@ -320,60 +375,142 @@ def dict_pretty_print(in_dict: dict, ui: "UI"):
     ui.print("=" * 20)
 
 
-def combine_proc_sp_text(proc: spawn, ui: "UI") -> str:
+class ProcOutput:
+    """Output of a process being displayed next to the spinner.
+    Output is split into lines, and the latest line is displayed next to the
+    spinner current text. Spinner updates are throttled to
+    config.proc_refresh_interval, so that chatty processes don't spend time
+    redrawing it. Only the last lines of the output are kept in memory.
+    """
+
+    def __init__(self, ui: "UI"):
+        self.ui = ui
+        self.static_text = ui.text
+        self.tail = deque(maxlen=config.proc_output_tail)
+        self.pending = ""
+        self.last_line = ""
+        self.shown_line = ""
+        self.last_update = 0
+
+    def add(self, text: str):
+        """Adds text read from the process
+
+        Args:
+            text (str): decoded output of the process
+        """
+        text = self.pending + text
+        lines = re.findall(r"[^\r\n]*(?:\r\n?|\n)", text)
+        # The rest of the text hasn't been terminated yet
+        terminated = sum(map(len, lines))
+        self.pending = text[terminated:][-config.proc_read_size:]
+        for line in lines:
+            if line.endswith("\n"):
+                self.tail.append(line)
+            if line.strip():
+                self.last_line = line.strip()
+
+        now = time.monotonic()
+        if now - self.last_update >= config.proc_refresh_interval:
+            self.last_update = now
+            self.show()
+
+    def show(self):
+        line = self.last_line
+        if line and line != self.shown_line:
+            self.shown_line = line
+            self.ui.text = f"{self.static_text} {Fore.WHITE}{Style.DIM}{line}{Style.RESET_ALL}"
+
+    def finish(self, text: str = "") -> str:
+        """Adds the last text read from the process, and displays its latest line
+
+        Args:
+            text (str, optional): remaining decoded output. Defaults to "".
+
+        Returns:
+            str: last non-carriage-return-ending lines of the output
+        """
+        self.pending += text
+        self.show()
+        if self.pending:
+            self.tail.append(self.pending)
+        return "".join(self.tail)
+
+
+def combine_proc_sp_text(proc: spawn, ui: "UI", log_file: str = None) -> str:
     """Combines the output of a process and the spinner.
-    Joins any string captured from the process with the
-    spinner current text. Any strings ending with any other
-    character from the subprocess will be returned later.
+    Output is read from the process in chunks and displayed through ProcOutput.
+    The whole output is streamed to the log file, while only its last lines
+    are kept in memory.
 
     Args:
         proc (spawn): a pexpect spawned child
         ui (UI): An instance of an UI implementation
+        log_file (str, optional): file where the output is appended. Defaults to None.
 
     Returns:
-        str: all non-carriage-return-ending string captured from proc
+        str: last non-carriage-return-ending lines captured from proc
     """
-    static_text = ui.text
-    proc_out = ""
-    while proc.isalive():
-        try:
-            line = byte = proc.read(1)
-        except TIMEOUT:
-            logging.info("Process timed out")
-            pretty_error("Process timed out", ui)
-
-        while byte and not re.match(b"[\r\n]", byte):
-            byte = proc.read(1)
-            line += byte
-        if not byte:
-            break
-        line = line.decode("utf-8", "ignore")
-        if line:
-            # add to proc_out list for logging
-            proc_out += line
-        ui.text = (
-            f"{static_text} {Fore.WHITE}{Style.DIM}{line.strip()}{Style.RESET_ALL}"
-        )
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    output = ProcOutput(ui)
+    log = open(log_file, "a") if log_file is not None else None
+    try:
+        while True:
+            try:
+                chunk = proc.read_nonblocking(config.proc_read_size, timeout=-1)
+            except EOF:
+                break
+            except TIMEOUT:
+                logging.info("Process timed out")
+                pretty_error("Process timed out", ui)
+
+            text = decoder.decode(chunk)
+            if log is not None:
+                log.write(text)
+            output.add(text)
+    finally:
+        if log is not None:
+            log.close()
 
-    return proc_out
+    return output.finish(decoder.decode(b"", final=True))
 
 
-def get_folder_sha1(path: str) -> str:
+def get_folder_sha1(
+    path: str, manifest_path: str = None, ui: UI = None, workers: int = None
+) -> str:
     """Generates a hash for all the contents of the folder. This procedure
     hashes all of the files in the folder, sorts them and then hashes that list.
+    Files are hashed concurrently by a pool of workers.
+
+    If a manifest path is provided, the hash of every file is stored in the manifest
+    along with its size, modification time and inode. Files whose stats match the
+    manifest are not read again, which makes re-hashing a folder incremental.
 
     Args:
         path (str): Folder to hash
+        manifest_path (str, optional): Location of the hash manifest of the folder. Defaults to None.
+        ui (UI, optional): UI where the hashing progress is displayed. Defaults to None.
+        workers (int, optional): Number of files hashed concurrently. Defaults to config.hash_workers.
 
     Returns:
         str: sha1 hash of the whole folder
     """
-    hashes = []
-    for root, _, files in os.walk(path, topdown=False):
-        for file in files:
-            logging.debug(f"Hashing file {file}")
-            filepath = os.path.join(root, file)
-            hashes.append(get_file_sha1(filepath))
+    if manifest_path is None:
+        hashes = []
+        pending = [(os.path.join(root, file), None) for root, file in walk_files(path)]
+    else:
+        manifest = load_hash_manifest(manifest_path)
+        hashes, pending, new_manifest = reuse_manifest_hashes(path, manifest)
+        logging.debug(f"Reused {len(hashes)} file hashes from {manifest_path}")
+
+    filepaths = [filepath for filepath, _ in pending]
+    file_hashes = hash_files(filepaths, path, ui, workers)
+    for (_, entry), file_hash in zip(pending, file_hashes):
+        if entry is not None:
+            entry["sha1"] = file_hash
+        hashes.append(file_hash)
+
+    if manifest_path is not None:
+        save_hash_manifest(manifest_path, new_manifest)
 
     hashes = sorted(hashes)
     sha1 = hashlib.sha1()
@@ -384,6 +521,131 @@ def get_folder_sha1(path: str) -> str:
     return hash_val
 
 
+def walk_files(path: str) -> Iterator[Tuple[str, str]]:
+    for root, _, files in os.walk(path, topdown=False):
+        for file in files:
+            yield root, file
+
+
+def reuse_manifest_hashes(path: str, manifest: dict) -> Tuple[List[str], list, dict]:
+    """Finds the files of a folder whose hashes can be reused from its manifest.
+    A hash is reused if the size, modification time and inode of the file
+    match its manifest entry.
+
+    Args:
+        path (str): Folder to hash
+        manifest (dict): Manifest of the folder from the last time it was hashed
+
+    Returns:
+        Tuple[List[str], list, dict]: reused hashes, path and new manifest entry
+            of every file that must be read, and the new manifest of the folder
+    """
+    new_manifest = {}
+    hashes = []
+    pending = []
+    for root, file in walk_files(path):
+        filepath = os.path.join(root, file)
+        relpath = os.path.relpath(filepath, path)
+        stat = os.stat(filepath)
+        entry = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "inode": stat.st_ino,
+        }
+        prev_entry = manifest.get(relpath, {})
+        new_manifest[relpath] = entry
+        if all(prev_entry.get(key) == val for key, val in entry.items()):
+            entry["sha1"] = prev_entry["sha1"]
+            hashes.append(entry["sha1"])
+        else:
+            pending.append((filepath, entry))
+    return hashes, pending, new_manifest
+
+
+def hash_files(
+    filepaths: List[str], path: str, ui: UI = None, workers: int = None
+) -> List[str]:
+    """Hashes files concurrently with a pool of workers
+
+    Args:
+        filepaths (List[str]): Files to hash
+        path (str): Folder the files belong to, used for reporting
+        ui (UI, optional): UI where the hashing progress is displayed. Defaults to None.
+        workers (int, optional): Number of files hashed concurrently. Defaults to config.hash_workers.
+
+    Returns:
+        List[str]: sha1 hash of each file, in the same order
+    """
+    with profiling.span("hash", path=path, files=len(filepaths)) as span:
+        callbacks = [span.add_bytes] if config.profiler is not None else []
+        if ui is not None:
+            callbacks.append(hash_progress(ui, f"Hashing {path}"))
+        hash_file = get_file_sha1
+        if callbacks:
+
+            def progress(nbytes: int):
+                for callback in callbacks:
+                    callback(nbytes)
+
+            hash_file = functools.partial(get_file_sha1, progress=progress)
+        workers = workers or config.hash_workers
+        if workers > 1 and len(filepaths) > 1:
+            # hashlib and file reads release the GIL, so threads run in parallel
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(hash_file, filepaths))
+        return [hash_file(filepath) for filepath in filepaths]
+
+
+def load_hash_manifest(manifest_path: str) -> dict:
+    """Loads the hash manifest of a folder
+
+    Args:
+        manifest_path (str): Location of the manifest
+
+    Returns:
+        dict: manifest entry of each file, by path relative to the folder.
+            Empty if the manifest doesn't exist or can't be read
+    """
+    if not os.path.exists(manifest_path):
+        return {}
+    try:
+        with open(manifest_path, "r") as f:
+            return json.load(f)
+    except ValueError:
+        logging.warning(f"Ignoring corrupted hash manifest {manifest_path}")
+        return {}
+
+
+def save_hash_manifest(manifest_path: str, manifest: dict):
+    """Stores the hash manifest of a folder
+
+    Args:
+        manifest_path (str): Location of the manifest
+        manifest (dict): manifest entry of each file, by path relative to the folder
+    """
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f)
+    # Replace atomically so that an interrupted write doesn't corrupt the manifest
+    os.replace(tmp_path, manifest_path)
+
+
+def folder_manifest_path(path: str) -> str:
+    """Location inside the storage of the hash manifest of a folder that
+    doesn't belong to medperf, such as the raw data of a dataset
+
+    Args:
+        path (str): Folder to hash
+
+    Returns:
+        str: path to the hash manifest
+    """
+    path_hash = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+    manifests_path = storage_path(config.hash_manifests_storage)
+    return os.path.join(manifests_path, f"{path_hash}.json")
+
+
 def results_path(benchmark_uid, model_uid, data_uid):
     out_path = storage_path(config.results_storage)
     bmark_uid = str(benchmark_uid)
@@ -425,18 +687,103 @@ def setup_logger(logger, log_lvl):
     logger.addHandler(fh)
 
 
-def list_files(startpath):
-    tree_str = ""
-    for root, dirs, files in os.walk(startpath):
-        level = root.replace(startpath, "").count(os.sep)
-        indent = " " * 4 * (level)
+def storage_summary(startpath: str, depth: int = None, max_entries: int = None) -> str:
+    """Summarizes the contents of a folder, listing the number of files and total
+    size inside each of its subfolders, down to the given depth. Counting stops
+    after max_entries entries per subfolder, so the summary is cheap to compute
+    even for folders with millions of files.
 
-        tree_str += "{}{}/\n".format(indent, os.path.basename(root))
-        subindent = " " * 4 * (level + 1)
-        for f in files:
-            tree_str += "{}{}\n".format(subindent, f)
+    Args:
+        startpath (str): Folder to summarize
+        depth (int, optional): Subfolder levels to list. Defaults to config.storage_summary_depth.
+        max_entries (int, optional): Entries counted per subfolder. Defaults to config.storage_summary_max_entries.
 
-    return tree_str
+    Returns:
+        str: summary of the folder, one line per subfolder
+    """
+    depth = config.storage_summary_depth if depth is None else depth
+    if max_entries is None:
+        max_entries = config.storage_summary_max_entries
+    lines = [f"{os.path.basename(startpath)}/"]
+
+    def summarize(path: str, level: int):
+        try:
+            with os.scandir(path) as entries:
+                entries = list(itertools.islice(entries, max_entries))
+        except OSError:
+            return
+        folders = [entry for entry in entries if entry.is_dir(follow_symlinks=False)]
+        folders = sorted(folders, key=lambda entry: entry.name)
+        indent = " " * 4 * level
+        for entry in folders[: config.storage_summary_max_folders]:
+            n_files, size, complete = count_files(entry.path, max_entries)
+            n_files = f"{n_files}" if complete else f"{n_files}+"
+            lines.append(f"{indent}{entry.name}/ {n_files} files, {format_size(size)}")
+            if level < depth:
+                summarize(entry.path, level + 1)
+        hidden = max(len(folders) - config.storage_summary_max_folders, 0)
+        # Folders beyond max_entries were not listed at all
+        truncated = "+" if len(entries) == max_entries else ""
+        if hidden or truncated:
+            lines.append(f"{indent}... {hidden}{truncated} more folders")
+
+    summarize(startpath, 1)
+    return "\n".join(lines)
+
+
+def count_files(path: str, max_entries: int) -> Tuple[int, int, bool]:
+    """Counts the files inside a folder and its subfolders
+
+    Args:
+        path (str): Folder to count
+        max_entries (int): Maximum number of entries to visit
+
+    Returns:
+        Tuple[int, int, bool]: number of files found, their total size in bytes
+            and wether every entry was visited
+    """
+    n_files = 0
+    size = 0
+    visited = 0
+    folders = [path]
+    while folders:
+        try:
+            entries = os.scandir(folders.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if visited >= max_entries:
+                    return n_files, size, False
+                visited += 1
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        folders.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        n_files += 1
+                        size += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+    return n_files, size, True
+
+
+def format_size(nbytes: int) -> str:
+    """Formats a size in bytes with the largest fitting unit
+
+    Args:
+        nbytes (int): size in bytes
+
+    Returns:
+        str: human readable size
+    """
+    size = float(nbytes)
+    for unit in ["B", "KB", "MB", "GB", "TB"]:
+        if size < 1024 or unit == "TB":
+            break
+        size /= 1024
+    if unit == "B":
+        return f"{int(size)} B"
+    return f"{size:.1f} {unit}"
 
 
 def save_cube_metadata(meta, local_hashes):
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class BenchmarkConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "benchmark"
+
+    def ready(self):
+        from utils.caching import invalidate_representation
+        from .models import Benchmark
+
+        post_save.connect(invalidate_representation, sender=Benchmark)
+        post_delete.connect(invalidate_representation, sender=Benchmark)
@@ -1,27 +1,33 @@
 from rest_framework.permissions import BasePermission
+from utils.permissions import cached_object, is_owner
 from .models import Benchmark
 
 
+def get_benchmark(request, pk):
+    """Retrieves a benchmark once per request, so that the view reuses the
+    benchmark fetched by its permissions
+
+    Args:
+        request: request being handled
+        pk: primary key of the benchmark
+
+    Returns:
+        Benchmark: the benchmark, or None if it doesn't exist
+    """
+    return cached_object(request, Benchmark.objects.all(), pk)
+
+
 class IsAdmin(BasePermission):
     def has_permission(self, request, view):
         return request.user.is_superuser
 
 
 class IsBenchmarkOwner(BasePermission):
-    def get_object(self, pk):
-        try:
-            return Benchmark.objects.get(pk=pk)
-        except Benchmark.DoesNotExist:
-            return None
-
     def has_permission(self, request, view):
         pk = view.kwargs.get("pk", None)
         if not pk:
             return False
-        benchmark = self.get_object(pk)
+        benchmark = get_benchmark(request, pk)
         if not benchmark:
             return False
-        if benchmark.owner.id == request.user.id:
-            return True
-        else:
-            return False
+        return is_owner(request, benchmark.owner_id)
@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from django.utils import timezone
+from utils.serializers import SparseFieldsMixin
 from .models import Benchmark
 
 
-class BenchmarkSerializer(serializers.ModelSerializer):
+class BenchmarkSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Benchmark
         fields = "__all__"
@@ -0,0 +1,132 @@
+from django.core.cache import cache
+from rest_framework import status
+
+from medperf.tests import ListQueriesTest
+from result.models import ModelResult
+from utils.caching import representation_key
+
+
+class BenchmarkListQueriesTest(ListQueriesTest):
+    """Test module for the number of queries run by benchmark list APIs"""
+
+    def test_list_benchmarks(self):
+        self.assertListNumQueries(2, "/benchmarks/")
+
+    def test_list_benchmark_models(self):
+        url = "/benchmarks/{0}/models/".format(self.benchmark.id)
+        self.assertListNumQueries(3, url)
+
+    def test_list_benchmark_datasets(self):
+        url = "/benchmarks/{0}/datasets/".format(self.benchmark.id)
+        self.assertListNumQueries(3, url)
+
+    def test_list_benchmark_results(self):
+        url = "/benchmarks/{0}/results/".format(self.benchmark.id)
+        self.assertListNumQueries(3, url)
+
+    def test_list_benchmark_results_forbidden(self):
+        self.add_entries()
+        self.authenticate_other_user()
+        url = "/benchmarks/{0}/results/".format(self.benchmark.id)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class BenchmarkConditionalGetTest(ListQueriesTest):
+    """Test module for conditional requests on benchmark APIs"""
+
+    def test_detail_has_validators(self):
+        response = self.client.get("/benchmarks/{0}/".format(self.benchmark.id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", response)
+
+    def test_detail_not_modified_if_etag_matches(self):
+        url = "/benchmarks/{0}/".format(self.benchmark.id)
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_detail_modified_after_update(self):
+        url = "/benchmarks/{0}/".format(self.benchmark.id)
+        etag = self.client.get(url)["ETag"]
+        self.benchmark.description = "updated"
+        self.benchmark.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["description"], "updated")
+
+    def test_cached_representation_dropped_on_save_and_delete(self):
+        key = representation_key(self.benchmark)
+        cache.set(key, "cached")
+        self.benchmark.save()
+        self.assertIsNone(cache.get(key))
+
+        cache.set(key, "cached")
+        self.benchmark.delete()
+        self.assertIsNone(cache.get(key))
+
+    def test_list_not_modified_if_etag_matches(self):
+        etag = self.client.get("/benchmarks/")["ETag"]
+
+        response = self.client.get("/benchmarks/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_modified_after_new_entry(self):
+        etag = self.client.get("/benchmarks/")["ETag"]
+        self.create_benchmark()
+
+        response = self.client.get("/benchmarks/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class BenchmarkLeaderboardTest(ListQueriesTest):
+    """Test module for the leaderboard of a benchmark"""
+
+    def setUp(self):
+        super(BenchmarkLeaderboardTest, self).setUp()
+        self.add_entries(n_entries=2)
+        for idx, result in enumerate(ModelResult.objects.all()):
+            result.results = {"AUC": idx / 10, "F1": 0.5}
+            result.save()
+        self.url = "/benchmarks/{0}/leaderboard/".format(self.benchmark.id)
+
+    def test_leaderboard_lists_metrics_of_each_model(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = response.data["results"]
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(
+            set(rows[0]), {"model", "approval_status", "metric", "count", "mean", "min", "max"}
+        )
+
+    def test_leaderboard_filters_metrics(self):
+        response = self.client.get(self.url + "?metrics=AUC")
+
+        rows = response.data["results"]
+        self.assertEqual({row["metric"] for row in rows}, {"AUC"})
+        self.assertEqual(sorted(row["mean"] for row in rows), [0.0, 0.1])
+
+    def test_leaderboard_filters_approval_status(self):
+        response = self.client.get(self.url + "?approval_status=APPROVED")
+
+        self.assertEqual(response.data["results"], [])
+
+    def test_leaderboard_is_restricted_to_benchmark_owner(self):
+        self.authenticate_other_user()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -1,14 +1,18 @@
+from mlcube.models import MlCube
 from mlcube.serializers import MlCubeSerializer
+from dataset.models import Dataset
 from dataset.serializers import DatasetSerializer
-from result.serializers import ModelResultSerializer
+from result.models import ModelResultSummary
+from result.serializers import ModelResultSerializer, ModelResultSummarySerializer
 from django.http import Http404
 from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 from rest_framework import status
+from utils.caching import conditional_detail_response
 
 from .models import Benchmark
 from .serializers import BenchmarkSerializer, BenchmarkApprovalSerializer
-from .permissions import IsAdmin, IsBenchmarkOwner
+from .permissions import IsAdmin, IsBenchmarkOwner, get_benchmark
 
 
 class BenchmarkList(GenericAPIView):
@@ -19,9 +23,10 @@ class BenchmarkList(GenericAPIView):
         """
         List all benchmarks
         """
-        benchmarks = Benchmark.objects.all()
-        serializer = BenchmarkSerializer(benchmarks, many=True)
-        return Response(serializer.data)
+        benchmarks = self.filter_queryset(Benchmark.objects.all())
+        page = self.paginate_queryset(benchmarks)
+        serializer = BenchmarkSerializer(page, many=True, context={"request": request})
+        return self.get_paginated_response(serializer.data)
 
     def post(self, request, format=None):
         """
@@ -51,10 +56,11 @@ class BenchmarkModelList(GenericAPIView):
         Retrieve models associated with a benchmark instance.
         """
         benchmark = self.get_object(pk)
-        modelgroups = benchmark.benchmarkmodel_set.all()
-        models = [gp.model_mlcube for gp in modelgroups]
-        serializer = MlCubeSerializer(models, many=True)
-        return Response(serializer.data)
+        models = MlCube.objects.filter(benchmarkmodel__benchmark=benchmark).distinct()
+        models = self.filter_queryset(models)
+        page = self.paginate_queryset(models)
+        serializer = MlCubeSerializer(page, many=True, context={"request": request})
+        return self.get_paginated_response(serializer.data)
 
 
 class BenchmarkDatasetList(GenericAPIView):
@@ -72,10 +78,13 @@ class BenchmarkDatasetList(GenericAPIView):
         Retrieve datasets associated with a benchmark instance.
         """
         benchmark = self.get_object(pk)
-        datasetgroups = benchmark.benchmarkdataset_set.all()
-        datasets = [gp.dataset for gp in datasetgroups]
-        serializer = DatasetSerializer(datasets, many=True)
-        return Response(serializer.data)
+        datasets = Dataset.objects.filter(
+            benchmarkdataset__benchmark=benchmark
+        ).distinct()
+        datasets = self.filter_queryset(datasets)
+        page = self.paginate_queryset(datasets)
+        serializer = DatasetSerializer(page, many=True, context={"request": request})
+        return self.get_paginated_response(serializer.data)
 
 
 class BenchmarkResultList(GenericAPIView):
@@ -84,19 +93,47 @@ class BenchmarkResultList(GenericAPIView):
     queryset = ""
 
     def get_object(self, pk):
-        try:
-            return Benchmark.objects.get(pk=pk)
-        except Benchmark.DoesNotExist:
+        benchmark = get_benchmark(self.request, pk)
+        if benchmark is None:
             raise Http404
+        return benchmark
 
     def get(self, request, pk, format=None):
         """
         Retrieve results associated with a benchmark instance.
         """
         benchmark = self.get_object(pk)
-        results = benchmark.modelresult_set.all()
-        serializer = ModelResultSerializer(results, many=True)
-        return Response(serializer.data)
+        results = self.filter_queryset(benchmark.modelresult_set.all())
+        page = self.paginate_queryset(results)
+        serializer = ModelResultSerializer(page, many=True, context={"request": request})
+        return self.get_paginated_response(serializer.data)
+
+
+class BenchmarkLeaderboard(GenericAPIView):
+    permission_classes = [IsAdmin | IsBenchmarkOwner]
+    serializer_class = ModelResultSummarySerializer
+    queryset = ""
+
+    def get_object(self, pk):
+        benchmark = get_benchmark(self.request, pk)
+        if benchmark is None:
+            raise Http404
+        return benchmark
+
+    def get(self, request, pk, format=None):
+        """
+        Retrieve the aggregated metrics of each model in a benchmark, per approval
+        status. Metrics can be selected with a comma-separated `metrics` parameter.
+        """
+        benchmark = self.get_object(pk)
+        summaries = ModelResultSummary.objects.filter(benchmark=benchmark)
+        metrics = request.query_params.get("metrics")
+        if metrics:
+            summaries = summaries.filter(metric__in=metrics.split(","))
+        summaries = self.filter_queryset(summaries)
+        page = self.paginate_queryset(summaries)
+        serializer = ModelResultSummarySerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
 
 class BenchmarkDetail(GenericAPIView):
@@ -111,18 +148,17 @@ class BenchmarkDetail(GenericAPIView):
         return super(self.__class__, self).get_permissions()
 
     def get_object(self, pk):
-        try:
-            return Benchmark.objects.get(pk=pk)
-        except Benchmark.DoesNotExist:
+        benchmark = get_benchmark(self.request, pk)
+        if benchmark is None:
             raise Http404
+        return benchmark
 
     def get(self, request, pk, format=None):
         """
         Retrieve a benchmark instance.
         """
         benchmark = self.get_object(pk)
-        serializer = BenchmarkSerializer(benchmark)
-        return Response(serializer.data)
+        return conditional_detail_response(request, benchmark, BenchmarkSerializer)
 
     def put(self, request, pk, format=None):
         """
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.15 on 2026-10-17 06:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarkdataset', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='benchmarkdataset',
+            index=models.Index(fields=['benchmark', 'dataset', 'created_at'], name='benchmarkdataset_latest_idx'),
+        ),
+    ]
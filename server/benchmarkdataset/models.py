@@ -20,3 +20,10 @@ class BenchmarkDataset(models.Model):
 
     class Meta:
         ordering = ["modified_at"]
+        indexes = [
+            # Latest association between a benchmark and a dataset
+            models.Index(
+                fields=["benchmark", "dataset", "created_at"],
+                name="benchmarkdataset_latest_idx",
+            ),
+        ]
@@ -1,6 +1,7 @@
 from rest_framework.permissions import BasePermission
 from benchmark.models import Benchmark
 from dataset.models import Dataset
+from utils.permissions import is_owner, resolve_owners
 
 
 class IsAdmin(BasePermission):
@@ -8,47 +9,26 @@ class IsAdmin(BasePermission):
         return request.user.is_superuser
 
 
-class IsDatasetOwner(BasePermission):
-    def get_object(self, pk):
-        try:
-            return Dataset.objects.get(pk=pk)
-        except Dataset.DoesNotExist:
-            raise None
+def association_owners(request, view):
+    """Finds the owners of the benchmark and dataset of an association"""
+    if request.method == "POST":
+        benchmark_pk = request.data.get("benchmark", None)
+        dataset_pk = request.data.get("dataset", None)
+    else:
+        benchmark_pk = view.kwargs.get("bid", None)
+        dataset_pk = view.kwargs.get("pk", None)
+    return resolve_owners(
+        request, benchmark=(Benchmark, benchmark_pk), dataset=(Dataset, dataset_pk)
+    )
+
 
+class IsDatasetOwner(BasePermission):
     def has_permission(self, request, view):
-        if request.method == "POST":
-            pk = request.data.get("dataset", None)
-        else:
-            pk = view.kwargs.get("pk", None)
-        if not pk:
-            return False
-        dataset = self.get_object(pk)
-        if not dataset:
-            return False
-        if dataset.owner.id == request.user.id:
-            return True
-        else:
-            return False
+        owners = association_owners(request, view)
+        return is_owner(request, owners.get("dataset", None))
 
 
 class IsBenchmarkOwner(BasePermission):
-    def get_object(self, pk):
-        try:
-            return Benchmark.objects.get(pk=pk)
-        except Benchmark.DoesNotExist:
-            raise None
-
     def has_permission(self, request, view):
-        if request.method == "POST":
-            pk = request.data.get("benchmark", None)
-        else:
-            pk = view.kwargs.get("bid", None)
-        if not pk:
-            return False
-        benchmark = self.get_object(pk)
-        if not benchmark:
-            return False
-        if benchmark.owner.id == request.user.id:
-            return True
-        else:
-            return False
+        owners = association_owners(request, view)
+        return is_owner(request, owners.get("benchmark", None))
@@ -2,11 +2,12 @@ from rest_framework import serializers
 from django.utils import timezone
 from benchmark.models import Benchmark
 from dataset.models import Dataset
+from utils.serializers import SparseFieldsMixin
 
 from .models import BenchmarkDataset
 
 
-class BenchmarkDatasetListSerializer(serializers.ModelSerializer):
+class BenchmarkDatasetListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = BenchmarkDataset
         read_only_fields = ["initiated_by", "approved_at"]
@@ -0,0 +1,82 @@
+from unittest import skipUnless
+from django.contrib.auth.models import User
+from django.db import connection
+from rest_framework import status
+
+from dataset.models import Dataset
+from medperf.tests import ListQueriesTest
+from .models import BenchmarkDataset
+
+
+@skipUnless(connection.vendor == "postgresql", "Query plans are checked on PostgreSQL")
+class BenchmarkDatasetIndexTest(ListQueriesTest):
+    """Test module for the indexes of benchmark dataset associations"""
+
+    def test_latest_association_uses_index(self):
+        self.add_entries()
+        dataset = BenchmarkDataset.objects.first().dataset
+        queryset = BenchmarkDataset.objects.filter(
+            benchmark__id=self.benchmark.id, dataset__id=dataset.id
+        ).order_by("-created_at")[:1]
+        self.assertUsesIndex(queryset, "benchmarkdataset_latest_idx")
+
+
+class BenchmarkDatasetQueriesTest(ListQueriesTest):
+    """Test module for the number of queries run by dataset association APIs"""
+
+    def setUp(self):
+        super(BenchmarkDatasetQueriesTest, self).setUp()
+        self.add_entries(n_entries=1)
+        dataset = BenchmarkDataset.objects.first().dataset_id
+        self.url = "/datasets/{0}/benchmarks/{1}/".format(dataset, self.benchmark.id)
+
+    def test_get_association_as_dataset_owner(self):
+        benchmark_owner = User.objects.create_user(username="benchmark_owner")
+        self.benchmark.owner = benchmark_owner
+        self.benchmark.save()
+
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_association_as_benchmark_owner(self):
+        other = User.objects.create_user(username="dataset_owner")
+        Dataset.objects.update(owner=other)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_association_forbidden(self):
+        self.authenticate_other_user()
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class BenchmarkDatasetAnonymousTest(ListQueriesTest):
+    """Test module for requests without credentials to association APIs"""
+
+    def setUp(self):
+        super(BenchmarkDatasetAnonymousTest, self).setUp()
+        self.add_entries(n_entries=1)
+        self.dataset = BenchmarkDataset.objects.first().dataset_id
+
+    def test_post_association(self):
+        self.assertAnonymousRejected("post", "/datasets/benchmarks/", {})
+        data = {"dataset": self.dataset, "benchmark": self.benchmark.id}
+        self.assertAnonymousRejected("post", "/datasets/benchmarks/", data)
+
+    def test_association_approval(self):
+        urls = [
+            "/datasets/{0}/benchmarks/{1}/".format(self.dataset, self.benchmark.id),
+            "/datasets/999/benchmarks/999/",
+        ]
+        for url in urls:
+            for method in ["get", "put", "delete"]:
+                self.assertAnonymousRejected(method, url)
+
+    def test_list_associations(self):
+        url = "/datasets/{0}/benchmarks/".format(self.dataset)
+        self.assertAnonymousRejected("get", url)
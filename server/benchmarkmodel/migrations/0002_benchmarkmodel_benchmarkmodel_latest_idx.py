@@ -0,0 +1,17 @@
+# Generated by Django 3.2.15 on 2026-10-17 06:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarkmodel', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='benchmarkmodel',
+            index=models.Index(fields=['benchmark', 'model_mlcube', 'created_at'], name='benchmarkmodel_latest_idx'),
+        ),
+    ]
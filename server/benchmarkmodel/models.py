@@ -21,3 +21,10 @@ class BenchmarkModel(models.Model):
 
     class Meta:
         ordering = ["modified_at"]
+        indexes = [
+            # Latest association between a benchmark and a model
+            models.Index(
+                fields=["benchmark", "model_mlcube", "created_at"],
+                name="benchmarkmodel_latest_idx",
+            ),
+        ]
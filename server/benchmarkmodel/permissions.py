@@ -1,6 +1,7 @@
 from rest_framework.permissions import BasePermission
 from benchmark.models import Benchmark
 from mlcube.models import MlCube
+from utils.permissions import is_owner, resolve_owners
 
 
 class IsAdmin(BasePermission):
@@ -8,47 +9,26 @@ class IsAdmin(BasePermission):
         return request.user.is_superuser
 
 
-class IsMlCubeOwner(BasePermission):
-    def get_object(self, pk):
-        try:
-            return MlCube.objects.get(pk=pk)
-        except MlCube.DoesNotExist:
-            raise None
+def association_owners(request, view):
+    """Finds the owners of the benchmark and mlcube of an association"""
+    if request.method == "POST":
+        benchmark_pk = request.data.get("benchmark", None)
+        mlcube_pk = request.data.get("model_mlcube", None)
+    else:
+        benchmark_pk = view.kwargs.get("bid", None)
+        mlcube_pk = view.kwargs.get("pk", None)
+    return resolve_owners(
+        request, benchmark=(Benchmark, benchmark_pk), mlcube=(MlCube, mlcube_pk)
+    )
+
 
+class IsMlCubeOwner(BasePermission):
     def has_permission(self, request, view):
-        if request.method == "POST":
-            pk = request.data.get("model_mlcube", None)
-        else:
-            pk = view.kwargs.get("pk", None)
-        if not pk:
-            return False
-        mlcube = self.get_object(pk)
-        if not mlcube:
-            return False
-        if mlcube.owner.id == request.user.id:
-            return True
-        else:
-            return False
+        owners = association_owners(request, view)
+        return is_owner(request, owners.get("mlcube", None))
 
 
 class IsBenchmarkOwner(BasePermission):
-    def get_object(self, pk):
-        try:
-            return Benchmark.objects.get(pk=pk)
-        except Benchmark.DoesNotExist:
-            raise None
-
     def has_permission(self, request, view):
-        if request.method == "POST":
-            pk = request.data.get("benchmark", None)
-        else:
-            pk = view.kwargs.get("bid", None)
-        if not pk:
-            return False
-        benchmark = self.get_object(pk)
-        if not benchmark:
-            return False
-        if benchmark.owner.id == request.user.id:
-            return True
-        else:
-            return False
+        owners = association_owners(request, view)
+        return is_owner(request, owners.get("benchmark", None))
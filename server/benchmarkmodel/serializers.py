@@ -2,11 +2,12 @@ from rest_framework import serializers
 from django.utils import timezone
 from benchmark.models import Benchmark
 from mlcube.models import MlCube
+from utils.serializers import SparseFieldsMixin
 
 from .models import BenchmarkModel
 
 
-class BenchmarkModelListSerializer(serializers.ModelSerializer):
+class BenchmarkModelListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = BenchmarkModel
         read_only_fields = ["initiated_by", "approved_at"]
@@ -0,0 +1,82 @@
+from unittest import skipUnless
+from django.contrib.auth.models import User
+from django.db import connection
+from rest_framework import status
+
+from mlcube.models import MlCube
+from medperf.tests import ListQueriesTest
+from .models import BenchmarkModel
+
+
+@skipUnless(connection.vendor == "postgresql", "Query plans are checked on PostgreSQL")
+class BenchmarkModelIndexTest(ListQueriesTest):
+    """Test module for the indexes of benchmark model associations"""
+
+    def test_latest_association_uses_index(self):
+        self.add_entries()
+        mlcube = BenchmarkModel.objects.first().model_mlcube
+        queryset = BenchmarkModel.objects.filter(
+            benchmark__id=self.benchmark.id, model_mlcube__id=mlcube.id
+        ).order_by("-created_at")[:1]
+        self.assertUsesIndex(queryset, "benchmarkmodel_latest_idx")
+
+
+class BenchmarkModelQueriesTest(ListQueriesTest):
+    """Test module for the number of queries run by mlcube association APIs"""
+
+    def setUp(self):
+        super(BenchmarkModelQueriesTest, self).setUp()
+        self.add_entries(n_entries=1)
+        model_mlcube = BenchmarkModel.objects.first().model_mlcube_id
+        self.url = "/mlcubes/{0}/benchmarks/{1}/".format(model_mlcube, self.benchmark.id)
+
+    def test_get_association_as_mlcube_owner(self):
+        benchmark_owner = User.objects.create_user(username="benchmark_owner")
+        self.benchmark.owner = benchmark_owner
+        self.benchmark.save()
+
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_association_as_benchmark_owner(self):
+        other = User.objects.create_user(username="mlcube_owner")
+        MlCube.objects.update(owner=other)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_association_forbidden(self):
+        self.authenticate_other_user()
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class BenchmarkModelAnonymousTest(ListQueriesTest):
+    """Test module for requests without credentials to association APIs"""
+
+    def setUp(self):
+        super(BenchmarkModelAnonymousTest, self).setUp()
+        self.add_entries(n_entries=1)
+        self.model_mlcube = BenchmarkModel.objects.first().model_mlcube_id
+
+    def test_post_association(self):
+        self.assertAnonymousRejected("post", "/mlcubes/benchmarks/", {})
+        data = {"model_mlcube": self.model_mlcube, "benchmark": self.benchmark.id}
+        self.assertAnonymousRejected("post", "/mlcubes/benchmarks/", data)
+
+    def test_association_approval(self):
+        urls = [
+            "/mlcubes/{0}/benchmarks/{1}/".format(self.model_mlcube, self.benchmark.id),
+            "/mlcubes/999/benchmarks/999/",
+        ]
+        for url in urls:
+            for method in ["get", "put", "delete"]:
+                self.assertAnonymousRejected(method, url)
+
+    def test_list_associations(self):
+        url = "/mlcubes/{0}/benchmarks/".format(self.model_mlcube)
+        self.assertAnonymousRejected("get", url)
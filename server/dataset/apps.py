@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class DatasetConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "dataset"
+
+    def ready(self):
+        from utils.caching import invalidate_representation
+        from .models import Dataset
+
+        post_save.connect(invalidate_representation, sender=Dataset)
+        post_delete.connect(invalidate_representation, sender=Dataset)
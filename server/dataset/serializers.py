@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from utils.serializers import SparseFieldsMixin
 from .models import Dataset
 
 
-class DatasetSerializer(serializers.ModelSerializer):
+class DatasetSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Dataset
         fields = "__all__"
@@ -76,7 +76,7 @@ class DatasetTest(MedPerfTest):
 
         response = self.client.get("/datasets/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
         newtestdataset = {
             "name": "newdataset",
@@ -131,5 +131,67 @@ class DatasetTest(MedPerfTest):
         response = self.client.post("/datasets/", testdataset, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def create_datasets(self, n_datasets, **kwargs):
+        for idx in range(n_datasets):
+            testdataset = {
+                "name": "dataset",
+                "input_data_hash": "string",
+                "generated_uid": "uid{0}".format(idx),
+                "split_seed": 0,
+                "data_preparation_mlcube": self.data_preproc_mlcube_id,
+                **kwargs,
+            }
+            response = self.client.post("/datasets/", testdataset, format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_list_is_paginated(self):
+        self.create_datasets(5)
+
+        ids = []
+        url = "/datasets/?limit=2"
+        while url is not None:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            ids += [dataset["id"] for dataset in response.data["results"]]
+            url = response.data["next"]
+
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(ids, sorted(set(ids)))
+
+    def test_list_filters_by_query_params(self):
+        self.create_datasets(2)
+        response = self.client.get("/datasets/")
+        first_id = response.data["results"][0]["id"]
+        self.client.put(
+            "/datasets/{0}/".format(first_id), {"state": "OPERATION"}, format="json"
+        )
+
+        response = self.client.get("/datasets/?state=OPERATION")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([d["id"] for d in response.data["results"]], [first_id])
+
+        response = self.client.get("/me/datasets/?state=OPERATION")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([d["id"] for d in response.data["results"]], [first_id])
+
+        response = self.client.get("/datasets/?created_after=2000-01-01")
+        self.assertEqual(len(response.data["results"]), 2)
+        response = self.client.get("/datasets/?created_before=2000-01-01T00:00:00Z")
+        self.assertEqual(len(response.data["results"]), 0)
+
+    def test_list_rejects_invalid_filters(self):
+        response = self.client.get("/datasets/?created_after=yesterday")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get("/me/results/?benchmark=abc")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_returns_selected_fields(self):
+        self.create_datasets(1)
+
+        response = self.client.get("/datasets/?fields=id,name")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data["results"][0]), {"id", "name"})
+
     def test_optional_fields(self):
         pass
@@ -2,6 +2,7 @@ from django.http import Http404
 from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 from rest_framework import status
+from utils.caching import conditional_detail_response
 
 from .models import Dataset
 from .permissions import IsAdmin, IsDatasetOwner
@@ -16,9 +17,10 @@ class DatasetList(GenericAPIView):
         """
         List all datasets
         """
-        datasets = Dataset.objects.all()
-        serializer = DatasetSerializer(datasets, many=True)
-        return Response(serializer.data)
+        datasets = self.filter_queryset(Dataset.objects.all())
+        page = self.paginate_queryset(datasets)
+        serializer = DatasetSerializer(page, many=True, context={"request": request})
+        return self.get_paginated_response(serializer.data)
 
     def post(self, request, format=None):
         """
@@ -53,8 +55,7 @@ class DatasetDetail(GenericAPIView):
         Retrieve a dataset instance.
         """
         dataset = self.get_object(pk)
-        serializer = DatasetDetailSerializer(dataset)
-        return Response(serializer.data)
+        return conditional_detail_response(request, dataset, DatasetDetailSerializer)
 
     def put(self, request, pk, format=None):
         """
@@ -98,6 +98,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # Adds ETags to GET responses and answers If-None-Match with 304
+    "django.middleware.http.ConditionalGetMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -133,6 +135,10 @@ WSGI_APPLICATION = "medperf.wsgi.application"
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 DATABASES = {"default": env.db()}
 
+# Cache of serialized entities. Entries are checked against the entity
+# modification time, so a cache per process is still consistent
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
 # Deploy using python manage.py runserver_plus or via docker.
 # Refer .github/workflows/local-ci.yml, .github/workflows/docker-ci.yml
 if DEPLOY_ENV == "local":
@@ -214,6 +220,9 @@ REST_FRAMEWORK = {
         "rest_framework.authentication.TokenAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.IsAuthenticated"],
+    "DEFAULT_PAGINATION_CLASS": "utils.pagination.MedPerfCursorPagination",
+    "DEFAULT_FILTER_BACKENDS": ["utils.filters.QueryParamsFilter"],
+    "PAGE_SIZE": 100,
 }
 
 SWAGGER_SETTINGS = {
@@ -1,5 +1,17 @@
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
 from django.test import override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from benchmark.models import Benchmark
+from benchmarkdataset.models import BenchmarkDataset
+from benchmarkmodel.models import BenchmarkModel
+from dataset.models import Dataset
+from mlcube.models import MlCube
+from result.models import ModelResult
 
 
 class MedPerfTest(TestCase):
@@ -10,3 +22,107 @@ class MedPerfTest(TestCase):
         settings_manager = override_settings(SECURE_SSL_REDIRECT=False)
         settings_manager.enable()
         self.addCleanup(settings_manager.disable)
+
+    def assertUsesIndex(self, queryset, index_name):
+        """Asserts that PostgreSQL plans to run `queryset` through an index.
+        Sequential scans are disabled for the test transaction, so that the
+        planner doesn't skip indexes on small test tables
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        self.assertIn(index_name, queryset.explain())
+
+
+class ListQueriesTest(MedPerfTest):
+    """Base module for checking the number of queries run by list APIs.
+    Entries are created directly through the models, all owned by the
+    authenticated user.
+    """
+
+    def setUp(self):
+        super(ListQueriesTest, self).setUp()
+
+        self.user = User.objects.create_user(username="owner", password="owner")
+        token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+        self.n_entries = 0
+        self.benchmark = self.create_benchmark()
+
+    def authenticate_other_user(self):
+        """Sends the following requests as a user that owns nothing"""
+        other = User.objects.create_user(username="other", password="other")
+        token = Token.objects.create(user=other)
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+        return other
+
+    def create_mlcube(self):
+        self.n_entries += 1
+        return MlCube.objects.create(
+            name="mlcube{0}".format(self.n_entries),
+            git_mlcube_url="url{0}".format(self.n_entries),
+            git_parameters_url="url",
+            owner=self.user,
+        )
+
+    def create_benchmark(self):
+        mlcube = self.create_mlcube()
+        return Benchmark.objects.create(
+            name="benchmark{0}".format(self.n_entries),
+            owner=self.user,
+            demo_dataset_tarball_hash="hash",
+            demo_dataset_generated_uid="uid",
+            data_preparation_mlcube=mlcube,
+            reference_model_mlcube=mlcube,
+            data_evaluator_mlcube=mlcube,
+        )
+
+    def add_entries(self, n_entries=5):
+        """Adds entries of every kind, associated with the test benchmark"""
+        for _ in range(n_entries):
+            self.create_benchmark()
+            model = self.create_mlcube()
+            dataset = Dataset.objects.create(
+                name="dataset",
+                owner=self.user,
+                input_data_hash="hash",
+                generated_uid="uid{0}".format(self.n_entries),
+                split_seed=0,
+                data_preparation_mlcube=model,
+            )
+            BenchmarkModel.objects.create(
+                model_mlcube=model,
+                benchmark=self.benchmark,
+                initiated_by=self.user,
+                results={},
+            )
+            BenchmarkDataset.objects.create(
+                dataset=dataset, benchmark=self.benchmark, initiated_by=self.user
+            )
+            ModelResult.objects.create(
+                owner=self.user,
+                benchmark=self.benchmark,
+                model=model,
+                dataset=dataset,
+                results={},
+            )
+
+    def assertAnonymousRejected(self, method, url, data=None):
+        """Asserts that `url` rejects requests without credentials"""
+        client = APIClient()
+        response = getattr(client, method)(url, data, format="json")
+        self.assertIn(
+            response.status_code,
+            [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN],
+        )
+
+    def assertListNumQueries(self, num, url):
+        """Asserts that listing `url` runs `num` queries, and keeps doing so
+        after more entries are added
+        """
+        for _ in range(2):
+            self.add_entries()
+            with self.assertNumQueries(num):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response.data["results"])
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class MlcubeConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "mlcube"
+
+    def ready(self):
+        from utils.caching import invalidate_representation
+        from .models import MlCube
+
+        post_save.connect(invalidate_representation, sender=MlCube)
+        post_delete.connect(invalidate_representation, sender=MlCube)
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from utils.serializers import SparseFieldsMixin
 from .models import MlCube
 
 
-class MlCubeSerializer(serializers.ModelSerializer):
+class MlCubeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = MlCube
         fields = "__all__"
@@ -62,7 +62,7 @@ class MlCubeTest(MedPerfTest):
 
         response = self.client.get("/mlcubes/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
         newmlcube = {
             "name": "newtestmlcube",
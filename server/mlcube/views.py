@@ -2,6 +2,7 @@ from django.http import Http404
 from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 from rest_framework import status
+from utils.caching import conditional_detail_response
 from .models import MlCube
 from .serializers import MlCubeSerializer, MlCubeDetailSerializer
 
@@ -16,9 +17,10 @@ class MlCubeList(GenericAPIView):
         """
         List all mlcubes
         """
-        mlcubes = MlCube.objects.all()
-        serializer = MlCubeSerializer(mlcubes, many=True)
-        return Response(serializer.data)
+        mlcubes = self.filter_queryset(MlCube.objects.all())
+        page = self.paginate_queryset(mlcubes)
+        serializer = MlCubeSerializer(page, many=True, context={"request": request})
+        return self.get_paginated_response(serializer.data)
 
     def post(self, request, format=None):
         """
@@ -53,8 +55,7 @@ class MlCubeDetail(GenericAPIView):
         Retrieve a mlcube instance.
         """
         mlcube = self.get_object(pk)
-        serializer = MlCubeDetailSerializer(mlcube)
-        return Response(serializer.data)
+        return conditional_detail_response(request, mlcube, MlCubeDetailSerializer)
 
     def put(self, request, pk, format=None):
         """
@@ -1,6 +1,18 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save, pre_save
 
 
 class ResultConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "result"
+
+    def ready(self):
+        from utils.caching import invalidate_representation
+        from .models import ModelResult
+        from .signals import refresh_result_summary, track_previous_group
+
+        pre_save.connect(track_previous_group, sender=ModelResult)
+        post_save.connect(refresh_result_summary, sender=ModelResult)
+        post_delete.connect(refresh_result_summary, sender=ModelResult)
+        post_save.connect(invalidate_representation, sender=ModelResult)
+        post_delete.connect(invalidate_representation, sender=ModelResult)
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.15 on 2026-10-17 06:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('result', '0002_alter_modelresult_unique_together'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='modelresult',
+            index=models.Index(fields=['benchmark', 'model', 'dataset'], name='result_execution_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='modelresult',
+            index=models.Index(fields=['approval_status'], name='result_approval_idx'),
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 3.2.15 on 2026-10-17 06:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# The backfill is kept independent from result.summary, so that later
+# changes to the live refresh don't alter this migration
+SUMMARY_SQL = """
+    INSERT INTO {summary} (
+        benchmark_id, model_id, approval_status, metric, count, mean, min, max
+    )
+    SELECT r.benchmark_id, r.model_id, r.approval_status, m.key,
+        COUNT(*), AVG(m.value::text::float8),
+        MIN(m.value::text::float8), MAX(m.value::text::float8)
+    FROM {results} r, jsonb_each(
+        CASE WHEN jsonb_typeof(r.results) = 'object' THEN r.results ELSE '{{}}'::jsonb END
+    ) m
+    WHERE jsonb_typeof(m.value) = 'number'
+    GROUP BY r.benchmark_id, r.model_id, r.approval_status, m.key
+"""
+
+
+def aggregate_in_python(ModelResult, ModelResultSummary, db):
+    aggregates = {}
+    results = ModelResult.objects.using(db).values_list(
+        "benchmark_id", "model_id", "approval_status", "results"
+    )
+    for benchmark_id, model_id, approval_status, metrics in results.iterator():
+        if not isinstance(metrics, dict):
+            continue
+        for metric, value in metrics.items():
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            key = (benchmark_id, model_id, approval_status, metric)
+            aggregates.setdefault(key, []).append(value)
+
+    ModelResultSummary.objects.using(db).bulk_create(
+        ModelResultSummary(
+            benchmark_id=benchmark_id,
+            model_id=model_id,
+            approval_status=approval_status,
+            metric=metric,
+            count=len(values),
+            mean=sum(values) / len(values),
+            min=min(values),
+            max=max(values),
+        )
+        for (benchmark_id, model_id, approval_status, metric), values in aggregates.items()
+    )
+
+
+def summarize_results(apps, schema_editor):
+    ModelResult = apps.get_model("result", "ModelResult")
+    ModelResultSummary = apps.get_model("result", "ModelResultSummary")
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        aggregate_in_python(ModelResult, ModelResultSummary, connection.alias)
+        return
+    sql = SUMMARY_SQL.format(
+        summary=ModelResultSummary._meta.db_table, results=ModelResult._meta.db_table
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmark', '0002_alter_benchmark_demo_dataset_tarball_url'),
+        ('mlcube', '0002_auto_20220624_0853'),
+        ('result', '0003_modelresult_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModelResultSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('approval_status', models.CharField(choices=[('PENDING', 'PENDING'), ('APPROVED', 'APPROVED'), ('REJECTED', 'REJECTED')], max_length=100)),
+                ('metric', models.CharField(max_length=256)),
+                ('count', models.IntegerField()),
+                ('mean', models.FloatField()),
+                ('min', models.FloatField()),
+                ('max', models.FloatField()),
+                ('benchmark', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='benchmark.benchmark')),
+                ('model', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='mlcube.mlcube')),
+            ],
+            options={
+                'ordering': ['model', 'approval_status', 'metric'],
+                'unique_together': {('benchmark', 'model', 'approval_status', 'metric')},
+            },
+        ),
+        migrations.RunPython(summarize_results, migrations.RunPython.noop),
+    ]
@@ -28,3 +28,30 @@ class ModelResult(models.Model):
 
     class Meta:
         ordering = ["modified_at"]
+        indexes = [
+            models.Index(
+                fields=["benchmark", "model", "dataset"], name="result_execution_idx"
+            ),
+            models.Index(fields=["approval_status"], name="result_approval_idx"),
+        ]
+
+
+class ModelResultSummary(models.Model):
+    """Aggregates of each numeric metric in the results of a model on a
+    benchmark, per approval status. Refreshed whenever a result is written.
+    """
+
+    benchmark = models.ForeignKey("benchmark.Benchmark", on_delete=models.CASCADE)
+    model = models.ForeignKey("mlcube.MlCube", on_delete=models.CASCADE)
+    approval_status = models.CharField(
+        choices=ModelResult.MODEL_RESULT_STATUS, max_length=100
+    )
+    metric = models.CharField(max_length=256)
+    count = models.IntegerField()
+    mean = models.FloatField()
+    min = models.FloatField()
+    max = models.FloatField()
+
+    class Meta:
+        unique_together = (("benchmark", "model", "approval_status", "metric"),)
+        ordering = ["model", "approval_status", "metric"]
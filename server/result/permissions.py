@@ -1,93 +1,64 @@
+from django.db.models import F
 from rest_framework.permissions import BasePermission
-from benchmark.models import Benchmark
 from dataset.models import Dataset
+from utils.permissions import cached_object, is_owner, resolve_owners
 from .models import ModelResult
 
 
+def get_result(request, pk):
+    """Retrieves a result along with the owners of its dataset and benchmark.
+    The result is cached on the request, so that the view reuses it
+
+    Args:
+        request: request being handled
+        pk: primary key of the result
+
+    Returns:
+        ModelResult: result with `dataset_owner` and `benchmark_owner` ids. None if it doesn't exist
+    """
+    queryset = ModelResult.objects.annotate(
+        dataset_owner=F("dataset__owner"), benchmark_owner=F("benchmark__owner")
+    )
+    return cached_object(request, queryset, pk)
+
+
 class IsAdmin(BasePermission):
     def has_permission(self, request, view):
         return request.user.is_superuser
 
 
 class IsResultOwner(BasePermission):
-    def get_object(self, pk):
-        try:
-            return ModelResult.objects.get(pk=pk)
-        except ModelResult.DoesNotExist:
-            return None
-
     def has_permission(self, request, view):
         pk = view.kwargs.get("pk", None)
         if not pk:
             return False
-        result = self.get_object(pk)
+        result = get_result(request, pk)
         if not result:
             return False
-        if result.owner.id == request.user.id:
-            return True
-        else:
-            return False
+        return is_owner(request, result.owner_id)
 
 
 class IsDatasetOwner(BasePermission):
-    def get_result_object(self, pk):
-        try:
-            return ModelResult.objects.get(pk=pk)
-        except ModelResult.DoesNotExist:
-            raise None
-
-    def get_dataset_object(self, pk):
-        try:
-            return Dataset.objects.get(pk=pk)
-        except Dataset.DoesNotExist:
-            raise None
-
     def has_permission(self, request, view):
         if request.method == "POST":
             pk = request.data.get("dataset", None)
-        else:
-            result_pk = view.kwargs.get("pk", None)
-            result = get_result_object(result_pk)
-            if not result:
-                return False
-            pk = result.dataset
+            owners = resolve_owners(request, dataset=(Dataset, pk))
+            return is_owner(request, owners.get("dataset", None))
+        pk = view.kwargs.get("pk", None)
         if not pk:
             return False
-        dataset = self.get_dataset_object(pk)
-        if not dataset:
-            return False
-        if dataset.owner.id == request.user.id:
-            return True
-        else:
+        result = get_result(request, pk)
+        if not result:
             return False
+        return is_owner(request, result.dataset_owner)
 
 
 class IsBenchmarkOwner(BasePermission):
-    def get_result_object(self, pk):
-        try:
-            return ModelResult.objects.get(pk=pk)
-        except ModelResult.DoesNotExist:
-            raise None
-
-    def get_benchmark_object(self, pk):
-        try:
-            return Benchmark.objects.get(pk=pk)
-        except Benchmark.DoesNotExist:
-            raise None
-
     def has_permission(self, request, view):
-        if request.method == "GET":
-            result_pk = view.kwargs.get("pk", None)
-            result = get_result_object(result_pk)
-            if not result:
-                return False
-            pk = result.benchmark
-        if not pk:
-            return False
-        benchmark = self.get_benchmark_object(pk)
-        if not benchmark:
+        pk = view.kwargs.get("pk", None)
+        if request.method != "GET" or not pk:
             return False
-        if benchmark.owner.id == request.user.id:
-            return True
-        else:
+        result = get_result(request, pk)
+        if not result:
             return False
+        return is_owner(request, result.benchmark_owner)
@@ -1,29 +1,40 @@
 from rest_framework import serializers
 from benchmarkdataset.models import BenchmarkDataset
 from benchmarkmodel.models import BenchmarkModel
+from utils.serializers import SparseFieldsMixin
 
-from .models import ModelResult
+from .models import ModelResult, ModelResultSummary
 
 
-class ModelResultSerializer(serializers.ModelSerializer):
+class ModelResultSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ModelResult
         fields = "__all__"
         read_only_fields = ["owner", "approved_at", "approval_status"]
 
+    def latest_association(self, model, **filters):
+        """Returns the latest association matching the filters. Lookups are
+        memoized in the `associations` context entry, if given, so that
+        serializers validating many results share them.
+        """
+        associations = self.context.get("associations", None)
+        key = (model, tuple(sorted(filters.items())))
+        if associations is not None and key in associations:
+            return associations[key]
+        association = model.objects.filter(**filters).order_by("-created_at").first()
+        if associations is not None:
+            associations[key] = association
+        return association
+
     def validate(self, data):
         benchmark = data["benchmark"]
         mlcube = data["model"]
         dataset = data["dataset"]
-        is_reference_model = benchmark.reference_model_mlcube.id == mlcube.id
-        last_benchmarkmodel = (
-            BenchmarkModel.objects.filter(
-                benchmark__id=benchmark.id, model_mlcube__id=mlcube.id
-            )
-            .order_by("-created_at")
-            .first()
-        )
+        is_reference_model = benchmark.reference_model_mlcube_id == mlcube.id
         if not is_reference_model:
+            last_benchmarkmodel = self.latest_association(
+                BenchmarkModel, benchmark__id=benchmark.id, model_mlcube__id=mlcube.id
+            )
             if not last_benchmarkmodel:
                 raise serializers.ValidationError(
                     "Mlcube must be associated to the benchmark"
@@ -34,12 +45,8 @@ class ModelResultSerializer(serializers.ModelSerializer):
                         "Mlcube-Benchmark association must be approved"
                     )
 
-        last_benchmarkdataset = (
-            BenchmarkDataset.objects.filter(
-                benchmark__id=benchmark.id, dataset__id=dataset.id
-            )
-            .order_by("-created_at")
-            .first()
+        last_benchmarkdataset = self.latest_association(
+            BenchmarkDataset, benchmark__id=benchmark.id, dataset__id=dataset.id
         )
         if not last_benchmarkdataset:
             raise serializers.ValidationError(
@@ -51,3 +58,9 @@ class ModelResultSerializer(serializers.ModelSerializer):
                     "Dataset-Benchmark association must be approved"
                 )
         return data
+
+
+class ModelResultSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ModelResultSummary
+        exclude = ["id", "benchmark"]
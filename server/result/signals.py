@@ -0,0 +1,25 @@
+from .models import ModelResult
+from .summary import refresh_summary
+
+
+def track_previous_group(sender, instance, **kwargs):
+    """Remembers the benchmark and model of a result being updated, in case
+    they change and the previous summary has to be refreshed too
+    """
+    instance._previous_group = None
+    if instance.pk is None:
+        return
+    previous = (
+        ModelResult.objects.filter(pk=instance.pk)
+        .values_list("benchmark_id", "model_id")
+        .first()
+    )
+    instance._previous_group = previous
+
+
+def refresh_result_summary(sender, instance, **kwargs):
+    group = (instance.benchmark_id, instance.model_id)
+    previous = getattr(instance, "_previous_group", None)
+    if previous is not None and previous != group:
+        refresh_summary(*previous)
+    refresh_summary(*group)
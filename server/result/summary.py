@@ -0,0 +1,91 @@
+from django.db import connections, transaction
+
+
+SUMMARY_SQL = """
+    INSERT INTO {summary} (
+        benchmark_id, model_id, approval_status, metric, count, mean, min, max
+    )
+    SELECT r.benchmark_id, r.model_id, r.approval_status, m.key,
+        COUNT(*), AVG(m.value::text::float8),
+        MIN(m.value::text::float8), MAX(m.value::text::float8)
+    FROM {results} r, jsonb_each(
+        CASE WHEN jsonb_typeof(r.results) = 'object' THEN r.results ELSE '{{}}'::jsonb END
+    ) m
+    WHERE r.benchmark_id = %s AND r.model_id = %s AND jsonb_typeof(m.value) = 'number'
+    GROUP BY r.benchmark_id, r.model_id, r.approval_status, m.key
+"""
+
+
+def is_metric(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def aggregate_in_python(result_model, summary_model, benchmark_id, model_id):
+    """Aggregates the results of a model on databases without JSONB support"""
+    aggregates = {}
+    results = result_model.objects.filter(benchmark_id=benchmark_id, model_id=model_id)
+    for approval_status, metrics in results.values_list("approval_status", "results"):
+        if not isinstance(metrics, dict):
+            continue
+        for metric, value in metrics.items():
+            if not is_metric(value):
+                continue
+            values = aggregates.setdefault((approval_status, metric), [])
+            values.append(value)
+
+    summary_model.objects.bulk_create(
+        summary_model(
+            benchmark_id=benchmark_id,
+            model_id=model_id,
+            approval_status=approval_status,
+            metric=metric,
+            count=len(values),
+            mean=sum(values) / len(values),
+            min=min(values),
+            max=max(values),
+        )
+        for (approval_status, metric), values in aggregates.items()
+    )
+
+
+def refresh_group_summary(result_model, summary_model, benchmark_id, model_id):
+    """Recomputes the summary of the results of a model on a benchmark.
+    The benchmark row is locked while refreshing, so that concurrent refreshes
+    of the same benchmark don't insert the same summary rows.
+
+    Args:
+        result_model: ModelResult model
+        summary_model: ModelResultSummary model
+        benchmark_id: id of the benchmark
+        model_id: id of the model mlcube
+    """
+    db = result_model.objects.db
+    benchmark_model = result_model._meta.get_field("benchmark").related_model
+    with transaction.atomic(using=db):
+        # NO KEY UPDATE doesn't conflict with the key share locks taken by
+        # inserting results of the benchmark
+        benchmark = benchmark_model.objects.select_for_update(no_key=True)
+        list(benchmark.filter(pk=benchmark_id).values_list("pk"))
+        summary_model.objects.filter(
+            benchmark_id=benchmark_id, model_id=model_id
+        ).delete()
+        if connections[db].vendor != "postgresql":
+            aggregate_in_python(result_model, summary_model, benchmark_id, model_id)
+            return
+        sql = SUMMARY_SQL.format(
+            summary=summary_model._meta.db_table, results=result_model._meta.db_table
+        )
+        with connections[db].cursor() as cursor:
+            cursor.execute(sql, [benchmark_id, model_id])
+
+
+def refresh_summary(benchmark_id, model_id):
+    """Recomputes the summary of the results of a model on a benchmark
+
+    Args:
+        benchmark_id: id of the benchmark
+        model_id: id of the model mlcube
+    """
+    from .models import ModelResult, ModelResultSummary
+
+    refresh_group_summary(ModelResult, ModelResultSummary, benchmark_id, model_id)
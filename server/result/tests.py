@@ -0,0 +1,317 @@
+from importlib import import_module
+from types import SimpleNamespace
+from unittest import skipUnless
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from benchmarkdataset.models import BenchmarkDataset
+from benchmarkmodel.models import BenchmarkModel
+from dataset.models import Dataset
+from medperf.tests import ListQueriesTest
+from .models import ModelResult, ModelResultSummary
+from .summary import refresh_summary
+from .views import ModelResultBulk
+
+
+@skipUnless(connection.vendor == "postgresql", "Query plans are checked on PostgreSQL")
+class ModelResultIndexTest(ListQueriesTest):
+    """Test module for the indexes of results"""
+
+    def test_execution_lookup_uses_index(self):
+        self.add_entries()
+        result = ModelResult.objects.first()
+        queryset = ModelResult.objects.filter(
+            benchmark=result.benchmark, model=result.model, dataset=result.dataset
+        )
+        self.assertUsesIndex(queryset, "result_execution_idx")
+
+    def test_approval_status_lookup_uses_index(self):
+        self.add_entries()
+        queryset = ModelResult.objects.filter(approval_status="APPROVED")
+        self.assertUsesIndex(queryset, "result_approval_idx")
+
+
+class ModelResultSummaryTest(ListQueriesTest):
+    """Test module for the summary of results"""
+
+    def setUp(self):
+        super(ModelResultSummaryTest, self).setUp()
+        self.add_entries(n_entries=1)
+        self.result = ModelResult.objects.first()
+
+    def create_result(self, results, approval_status="PENDING"):
+        return ModelResult.objects.create(
+            owner=self.user,
+            benchmark=self.result.benchmark,
+            model=self.result.model,
+            dataset=self.result.dataset,
+            results=results,
+            approval_status=approval_status,
+        )
+
+    def summary(self):
+        return {
+            (s.approval_status, s.metric): (s.count, s.mean, s.min, s.max)
+            for s in ModelResultSummary.objects.all()
+        }
+
+    def test_summary_aggregates_numeric_metrics(self):
+        self.create_result({"AUC": 0.5, "F1": 1, "name": "text", "valid": True})
+        self.create_result({"AUC": 0.7, "per_class": {"a": 1}})
+
+        self.assertEqual(
+            self.summary(),
+            {("PENDING", "AUC"): (2, 0.6, 0.5, 0.7), ("PENDING", "F1"): (1, 1, 1, 1)},
+        )
+
+    def test_summary_is_split_by_approval_status(self):
+        self.create_result({"AUC": 0.5})
+        self.create_result({"AUC": 0.7}, approval_status="APPROVED")
+
+        self.assertEqual(
+            self.summary(),
+            {("PENDING", "AUC"): (1, 0.5, 0.5, 0.5), ("APPROVED", "AUC"): (1, 0.7, 0.7, 0.7)},
+        )
+
+    def test_summary_is_refreshed_on_update(self):
+        result = self.create_result({"AUC": 0.5})
+        result.approval_status = "APPROVED"
+        result.save()
+
+        self.assertEqual(self.summary(), {("APPROVED", "AUC"): (1, 0.5, 0.5, 0.5)})
+
+    def test_summary_is_refreshed_on_delete(self):
+        self.create_result({"AUC": 0.5})
+        result = self.create_result({"AUC": 0.7})
+        result.delete()
+
+        self.assertEqual(self.summary(), {("PENDING", "AUC"): (1, 0.5, 0.5, 0.5)})
+
+    def test_summary_ignores_results_that_are_not_objects(self):
+        self.create_result({"AUC": 0.5})
+        self.create_result([0.7])
+        self.create_result(0.9)
+
+        self.assertEqual(self.summary(), {("PENDING", "AUC"): (1, 0.5, 0.5, 0.5)})
+
+    def test_posted_results_that_are_not_objects_are_stored(self):
+        BenchmarkModel.objects.update(approval_status="APPROVED")
+        BenchmarkDataset.objects.update(approval_status="APPROVED")
+        data = {
+            "benchmark": self.result.benchmark_id,
+            "model": self.result.model_id,
+            "dataset": self.result.dataset_id,
+            "results": [0.7],
+        }
+
+        response = self.client.post("/results/", data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    @skipUnless(connection.vendor == "postgresql", "Row locks are checked on PostgreSQL")
+    def test_summary_refresh_locks_benchmark(self):
+        with CaptureQueriesContext(connection) as queries:
+            refresh_summary(self.result.benchmark_id, self.result.model_id)
+
+        self.assertTrue(any("FOR NO KEY UPDATE" in query["sql"] for query in queries))
+
+    def test_summary_follows_results_moved_to_another_model(self):
+        result = self.create_result({"AUC": 0.5})
+        result.model = self.create_mlcube()
+        result.save()
+
+        summary = ModelResultSummary.objects.get()
+        self.assertEqual(summary.model_id, result.model_id)
+
+    def test_migration_backfills_summary(self):
+        self.create_result({"AUC": 0.5, "name": "text"})
+        self.create_result({"AUC": 0.7}, approval_status="APPROVED")
+        self.create_result([0.9])
+        other_model = self.create_result({"AUC": 0.9}, approval_status="APPROVED")
+        other_model.model = self.create_mlcube()
+        other_model.save()
+        expected = {
+            (s.model_id, s.approval_status, s.metric): (s.count, s.mean, s.min, s.max)
+            for s in ModelResultSummary.objects.all()
+        }
+        ModelResultSummary.objects.all().delete()
+        migration = import_module("result.migrations.0004_modelresultsummary")
+
+        migration.summarize_results(apps, SimpleNamespace(connection=connection))
+
+        summary = {
+            (s.model_id, s.approval_status, s.metric): (s.count, s.mean, s.min, s.max)
+            for s in ModelResultSummary.objects.all()
+        }
+        self.assertEqual(len(summary), 3)
+        self.assertEqual(summary, expected)
+
+
+class ModelResultBulkTest(ListQueriesTest):
+    """Test module for uploading several results at once"""
+
+    url = "/results/bulk/"
+
+    def setUp(self):
+        super(ModelResultBulkTest, self).setUp()
+        self.add_entries(n_entries=2)
+        BenchmarkModel.objects.update(approval_status="APPROVED")
+        BenchmarkDataset.objects.update(approval_status="APPROVED")
+        self.results = [
+            {
+                "benchmark": result.benchmark_id,
+                "model": result.model_id,
+                "dataset": result.dataset_id,
+                "results": {"AUC": 0.5},
+            }
+            for result in ModelResult.objects.all()
+        ]
+
+    def test_creates_every_result(self):
+        response = self.client.post(self.url, self.results, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        ids = [item["id"] for item in response.data]
+        self.assertEqual(ModelResult.objects.filter(pk__in=ids).count(), 2)
+        self.assertTrue(all(item["status"] == 201 for item in response.data))
+
+    def test_reports_status_of_each_result(self):
+        other_user = User.objects.create_user(username="other", password="other")
+        Dataset.objects.filter(pk=self.results[0]["dataset"]).update(owner=other_user)
+        invalid = {**self.results[1], "model": self.benchmark.data_evaluator_mlcube_id + 1000}
+
+        response = self.client.post(
+            self.url, self.results + [invalid, "invalid"], format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        statuses = [item["status"] for item in response.data]
+        self.assertEqual(statuses, [403, 201, 400, 400])
+        self.assertEqual(ModelResult.objects.filter(results={"AUC": 0.5}).count(), 1)
+
+    def test_rejects_unassociated_results(self):
+        BenchmarkDataset.objects.update(approval_status="PENDING")
+
+        response = self.client.post(self.url, self.results, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([item["status"] for item in response.data], [400, 400])
+
+    def test_refreshes_summary(self):
+        self.client.post(self.url, self.results, format="json")
+
+        metrics = ModelResultSummary.objects.values_list("metric", "count")
+        self.assertEqual(sorted(metrics), [("AUC", 1), ("AUC", 1)])
+
+    def test_checks_each_dataset_once(self):
+        results = self.results * 3
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.url, results, format="json")
+
+        def queries_on(model, condition=""):
+            table = '"{0}"'.format(model._meta.db_table)
+            return [
+                query["sql"]
+                for query in queries
+                if "FROM " + table in query["sql"] and condition in query["sql"]
+            ]
+
+        self.assertEqual(len(queries_on(Dataset, '."owner_id" =')), 1)
+        self.assertEqual(len(queries_on(BenchmarkDataset)), 2)
+
+    def test_rejects_non_list(self):
+        response = self.client.post(self.url, self.results[0], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rejects_too_many_results(self):
+        results = self.results * (ModelResultBulk.max_results // 2 + 1)
+
+        response = self.client.post(self.url, results, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(ModelResult.objects.count(), 2)
+
+
+class ModelResultQueriesTest(ListQueriesTest):
+    """Test module for the number of queries run by result APIs"""
+
+    def setUp(self):
+        super(ModelResultQueriesTest, self).setUp()
+        self.add_entries(n_entries=1)
+        self.result = ModelResult.objects.first()
+        self.url = "/results/{0}/".format(self.result.id)
+
+    def test_get_result_as_dataset_owner(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_result_as_benchmark_owner(self):
+        other = User.objects.create_user(username="dataset_owner")
+        Dataset.objects.update(owner=other)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_result_forbidden(self):
+        self.authenticate_other_user()
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_get_missing_result_forbidden(self):
+        response = self.client.get("/results/0/")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_post_result_checks_dataset_owner(self):
+        self.authenticate_other_user()
+        data = {
+            "benchmark": self.result.benchmark_id,
+            "model": self.result.model_id,
+            "dataset": self.result.dataset_id,
+            "results": {},
+        }
+
+        with self.assertNumQueries(2):
+            response = self.client.post("/results/", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ModelResultAnonymousTest(ListQueriesTest):
+    """Test module for requests without credentials to result APIs"""
+
+    def setUp(self):
+        super(ModelResultAnonymousTest, self).setUp()
+        self.add_entries(n_entries=1)
+        self.result = ModelResult.objects.first()
+
+    def test_results(self):
+        data = {
+            "benchmark": self.result.benchmark_id,
+            "model": self.result.model_id,
+            "dataset": self.result.dataset_id,
+            "results": {},
+        }
+        self.assertAnonymousRejected("get", "/results/")
+        self.assertAnonymousRejected("post", "/results/", {})
+        self.assertAnonymousRejected("post", "/results/", data)
+        self.assertAnonymousRejected("post", "/results/bulk/", [data])
+
+    def test_result_detail(self):
+        urls = ["/results/{0}/".format(self.result.id), "/results/999/"]
+        for url in urls:
+            for method in ["get", "put", "delete"]:
+                self.assertAnonymousRejected(method, url)
+
+    def test_benchmark_results(self):
+        for pk in [self.benchmark.id, 999]:
+            self.assertAnonymousRejected("get", "/benchmarks/{0}/results/".format(pk))
+            self.assertAnonymousRejected("get", "/benchmarks/{0}/leaderboard/".format(pk))
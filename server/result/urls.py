@@ -4,5 +4,6 @@ from . import views
 
 urlpatterns = [
     path("", views.ModelResultList.as_view()),
+    path("bulk/", views.ModelResultBulk.as_view()),
     path("<int:pk>/", views.ModelResultDetail.as_view()),
 ]
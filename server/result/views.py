@@ -1,10 +1,20 @@
+from django.db import connection, transaction
 from django.http import Http404
 from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 from rest_framework import status
+from dataset.models import Dataset
+from utils.caching import conditional_detail_response
 from .models import ModelResult
 from .serializers import ModelResultSerializer
-from .permissions import IsAdmin, IsBenchmarkOwner, IsDatasetOwner, IsResultOwner
+from .summary import refresh_summary
+from .permissions import (
+    IsAdmin,
+    IsBenchmarkOwner,
+    IsDatasetOwner,
+    IsResultOwner,
+    get_result,
+)
 
 
 class ModelResultList(GenericAPIView):
@@ -22,9 +32,10 @@ class ModelResultList(GenericAPIView):
         """
         List all results
         """
-        modelresults = ModelResult.objects.all()
-        serializer = ModelResultSerializer(modelresults, many=True)
-        return Response(serializer.data)
+        modelresults = self.filter_queryset(ModelResult.objects.all())
+        page = self.paginate_queryset(modelresults)
+        serializer = ModelResultSerializer(page, many=True, context={"request": request})
+        return self.get_paginated_response(serializer.data)
 
     def post(self, request, format=None):
         """
@@ -37,6 +48,86 @@ class ModelResultList(GenericAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+def dataset_id(item):
+    try:
+        return int(item["dataset"])
+    except (TypeError, KeyError, ValueError):
+        return None
+
+
+class ModelResultBulk(GenericAPIView):
+    serializer_class = ModelResultSerializer
+    queryset = ""
+    max_results = 1000
+
+    def owned_datasets(self, user, items):
+        """Returns the ids of the datasets referenced by the items that are
+        owned by the user, with a single query
+        """
+        ids = {dataset_id(item) for item in items} - {None}
+        datasets = Dataset.objects.filter(pk__in=ids, owner=user)
+        return set(datasets.values_list("id", flat=True))
+
+    def create_results(self, results):
+        """Inserts the results in the current transaction. Databases that
+        can't return the ids of bulk inserts save each result instead.
+        """
+        if not connection.features.can_return_rows_from_bulk_insert:
+            for result in results:
+                result.save()
+            return
+        ModelResult.objects.bulk_create(results)
+        # bulk_create doesn't send signals, refresh the summaries once per group
+        groups = {(result.benchmark_id, result.model_id) for result in results}
+        for group in groups:
+            refresh_summary(*group)
+
+    def post(self, request, format=None):
+        """
+        Creates several results at once. Each result is reported with its own status
+        """
+        items = request.data
+        if not isinstance(items, list):
+            return Response(
+                {"detail": "Expected a list of results"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.max_results:
+            return Response(
+                {"detail": f"At most {self.max_results} results can be uploaded at once"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not request.user.is_superuser:
+            allowed = self.owned_datasets(request.user, items)
+        context = {"request": request, "associations": {}}
+        statuses = []
+        valid = []
+        for item in items:
+            dataset = dataset_id(item)
+            if not request.user.is_superuser and dataset is not None and dataset not in allowed:
+                errors = {"detail": "You do not own the dataset of this result"}
+                statuses.append({"status": status.HTTP_403_FORBIDDEN, "errors": errors})
+                continue
+            serializer = ModelResultSerializer(data=item, context=context)
+            if not serializer.is_valid():
+                errors = serializer.errors
+                statuses.append({"status": status.HTTP_400_BAD_REQUEST, "errors": errors})
+                continue
+            result = ModelResult(owner=request.user, **serializer.validated_data)
+            valid.append((len(statuses), result))
+            statuses.append(None)
+
+        with transaction.atomic():
+            self.create_results([result for _, result in valid])
+        for idx, result in valid:
+            statuses[idx] = {"status": status.HTTP_201_CREATED, "id": result.id}
+
+        created = len(valid) == len(items)
+        response_status = status.HTTP_201_CREATED if created else status.HTTP_207_MULTI_STATUS
+        return Response(statuses, status=response_status)
+
+
 class ModelResultDetail(GenericAPIView):
     serializer_class = ModelResultSerializer
     queryset = ""
@@ -49,18 +140,17 @@ class ModelResultDetail(GenericAPIView):
         return super(self.__class__, self).get_permissions()
 
     def get_object(self, pk):
-        try:
-            return ModelResult.objects.get(pk=pk)
-        except ModelResult.DoesNotExist:
+        modelresult = get_result(self.request, pk)
+        if modelresult is None:
             raise Http404
+        return modelresult
 
     def get(self, request, pk, format=None):
         """
         Retrieve a result instance.
         """
         modelresult = self.get_object(pk)
-        serializer = ModelResultSerializer(modelresult)
-        return Response(serializer.data)
+        return conditional_detail_response(request, modelresult, ModelResultSerializer)
 
     def put(self, request, pk, format=None):
         """
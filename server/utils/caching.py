@@ -0,0 +1,64 @@
+import hashlib
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+def representation_key(instance) -> str:
+    return "representation:{0}:{1}".format(instance._meta.label_lower, instance.pk)
+
+
+def instance_etag(instance, serializer_class) -> str:
+    """Strong ETag of an instance, which changes whenever the instance is saved"""
+    version = "{0}:{1}:{2}".format(
+        representation_key(instance),
+        serializer_class.__name__,
+        instance.modified_at.isoformat(),
+    )
+    return quote_etag(hashlib.sha1(version.encode()).hexdigest())
+
+
+def cached_representation(instance, serializer_class) -> dict:
+    """Serializes an instance, reusing the cached representation of the same
+    version of the instance if there is one
+    """
+    key = representation_key(instance)
+    version = (serializer_class.__name__, instance.modified_at)
+    cached = cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    data = dict(serializer_class(instance).data)
+    cache.set(key, (version, data))
+    return data
+
+
+def conditional_detail_response(request, instance, serializer_class):
+    """Builds the response to a GET request on an instance. Responds with
+    304 Not Modified if the client already has the current version
+
+    Args:
+        request: request being answered
+        instance: retrieved model instance, with a `modified_at` field
+        serializer_class: serializer of the instance
+
+    Returns:
+        Response with the instance, or empty 304 response
+    """
+    etag = instance_etag(instance, serializer_class)
+    last_modified = int(instance.modified_at.timestamp())
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        response = Response(cached_representation(instance, serializer_class))
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+def invalidate_representation(sender, instance, **kwargs):
+    """Drops the cached representation of a saved or deleted instance.
+    Connected to the signals of each cached model by its app config
+    """
+    cache.delete(representation_key(instance))
@@ -0,0 +1,62 @@
+from datetime import datetime, time
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+class QueryParamsFilter(BaseFilterBackend):
+    """Filters list endpoints through query parameters. Each parameter is only
+    applied if the listed model has the corresponding field.
+
+    Supported parameters:
+        benchmark, model, dataset: id of the related entity
+        approval_status, state: exact value
+        created_after, created_before: ISO 8601 date or datetime range
+    """
+
+    # Query parameter -> candidate model fields, in order of preference
+    exact_filters = {
+        "benchmark": ["benchmark"],
+        "model": ["model", "model_mlcube"],
+        "dataset": ["dataset"],
+        "approval_status": ["approval_status"],
+        "state": ["state"],
+    }
+    range_filters = {
+        "created_after": "created_at__gte",
+        "created_before": "created_at__lte",
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        fields = {field.name for field in queryset.model._meta.get_fields()}
+        filters = {}
+        for param, candidates in self.exact_filters.items():
+            value = request.query_params.get(param)
+            field = next((name for name in candidates if name in fields), None)
+            if value is None or field is None:
+                continue
+            filters[field] = value
+        for param, lookup in self.range_filters.items():
+            value = request.query_params.get(param)
+            if value is None or "created_at" not in fields:
+                continue
+            filters[lookup] = self.parse_date(param, value)
+
+        try:
+            return queryset.filter(**filters)
+        except (ValueError, TypeError):
+            raise ValidationError("Invalid filter value")
+
+    def parse_date(self, param, value):
+        try:
+            date = parse_datetime(value)
+            if date is None and parse_date(value) is not None:
+                date = datetime.combine(parse_date(value), time.min)
+        except ValueError:
+            date = None
+        if date is None:
+            raise ValidationError({param: "Expected an ISO 8601 date or datetime"})
+        if timezone.is_naive(date):
+            date = timezone.make_aware(date)
+        return date
@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class MedPerfCursorPagination(CursorPagination):
+    """Cursor pagination shared by every list endpoint. Entries are ordered by
+    id, which never changes, so pages stay consistent while entries are added
+    or updated. Clients can set the page size through the `limit` parameter.
+    """
+
+    ordering = "id"
+    page_size_query_param = "limit"
+    max_page_size = 1000
@@ -0,0 +1,81 @@
+from django.core.exceptions import ValidationError
+from django.db.models import CharField, Value
+
+
+def is_owner(request, owner_id) -> bool:
+    """Checks that the authenticated user of the request is the given owner.
+    Anonymous users and missing owners are never considered owners.
+    """
+    if not request.user.is_authenticated or owner_id is None:
+        return False
+    return owner_id == request.user.id
+
+
+def request_cache(request, name: str) -> dict:
+    """Returns a dictionary stored on the request, so that the permissions
+    and the view handling a request can share what they retrieved
+    """
+    caches = getattr(request, "_medperf_cache", None)
+    if caches is None:
+        caches = {}
+        request._medperf_cache = caches
+    return caches.setdefault(name, {})
+
+
+def cached_object(request, queryset, pk):
+    """Retrieves an object once per request. Permissions and views that need
+    the same object must use the same queryset, as the first one is reused
+
+    Args:
+        request: request being handled
+        queryset: queryset the object is retrieved from
+        pk: primary key of the object
+
+    Returns:
+        The object, or None if it doesn't exist
+    """
+    objects = request_cache(request, "objects")
+    key = (queryset.model._meta.label_lower, str(pk))
+    if key not in objects:
+        objects[key] = queryset.filter(pk=pk).first()
+    return objects[key]
+
+
+def resolve_owners(request, **objects) -> dict:
+    """Finds the owners of several objects with a single query. The owners
+    are cached on the request, so that combined permissions share them
+
+    Args:
+        request: request being handled
+        objects: model and primary key of each object, by name. Objects
+            without a valid primary key are ignored
+
+    Returns:
+        dict: id of the owner of each existing object, by name
+    """
+    lookups = []
+    for name, (model, pk) in sorted(objects.items()):
+        try:
+            pk = model._meta.pk.to_python(pk)
+        except ValidationError:
+            continue
+        if pk is not None:
+            lookups.append((name, model, pk))
+
+    owners = request_cache(request, "owners")
+    key = tuple((name, model._meta.label_lower, pk) for name, model, pk in lookups)
+    if key in owners:
+        return owners[key]
+
+    querysets = [
+        model.objects.filter(pk=pk)
+        .annotate(owned_object=Value(name, output_field=CharField()))
+        .values_list("owned_object", "owner_id")
+        .order_by()
+        for name, model, pk in lookups
+    ]
+    found = {}
+    if querysets:
+        found = dict(querysets[0].union(*querysets[1:]))
+    owners[key] = found
+    return found
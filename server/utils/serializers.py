@@ -0,0 +1,16 @@
+class SparseFieldsMixin:
+    """Serializer mixin that only outputs the fields listed in the `fields`
+    query parameter of GET requests, e.g. `?fields=id,name`
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or request.method != "GET":
+            return
+        fields = request.query_params.get("fields")
+        if not fields:
+            return
+        requested = set(fields.split(","))
+        for name in set(self.fields) - requested:
+            self.fields.pop(name)
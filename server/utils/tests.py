@@ -0,0 +1,25 @@
+from medperf.tests import ListQueriesTest
+
+
+class UserListQueriesTest(ListQueriesTest):
+    """Test module for the number of queries run by the APIs listing
+    the assets of the current user
+    """
+
+    def test_list_user_benchmarks(self):
+        self.assertListNumQueries(2, "/me/benchmarks/")
+
+    def test_list_user_mlcubes(self):
+        self.assertListNumQueries(2, "/me/mlcubes/")
+
+    def test_list_user_datasets(self):
+        self.assertListNumQueries(2, "/me/datasets/")
+
+    def test_list_user_results(self):
+        self.assertListNumQueries(2, "/me/results/")
+
+    def test_list_user_dataset_associations(self):
+        self.assertListNumQueries(2, "/me/datasets/associations/")
+
+    def test_list_user_mlcube_associations(self):
+        self.assertListNumQueries(2, "/me/mlcubes/associations/")
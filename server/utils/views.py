@@ -64,9 +64,10 @@ class BenchmarkList(GenericAPIView):
         """
         Retrieve all benchmarks owned by the current user
         """
-        user = self.get_object(request.user.id)
-        serializer = BenchmarkSerializer(user, many=True)
-        return Response(serializer.data)
+        benchmarks = self.filter_queryset(self.get_object(request.user.id))
+        page = self.paginate_queryset(benchmarks)
+        serializer = BenchmarkSerializer(page, many=True, context={"request": request})
+        return self.get_paginated_response(serializer.data)
 
 
 class MlCubeList(GenericAPIView):
@@ -83,9 +84,10 @@ class MlCubeList(GenericAPIView):
         """
         Retrieve all mlcubes associated with the current user
         """
-        mlcubes = self.get_object(request.user.id)
-        serializer = MlCubeSerializer(mlcubes, many=True)
-        return Response(serializer.data)
+        mlcubes = self.filter_queryset(self.get_object(request.user.id))
+        page = self.paginate_queryset(mlcubes)
+        serializer = MlCubeSerializer(page, many=True, context={"request": request})
+        return self.get_paginated_response(serializer.data)
 
 
 class DatasetList(GenericAPIView):
@@ -102,9 +104,10 @@ class DatasetList(GenericAPIView):
         """
         Retrieve all datasets associated with the current user
         """
-        datasets = self.get_object(request.user.id)
-        serializer = DatasetSerializer(datasets, many=True)
-        return Response(serializer.data)
+        datasets = self.filter_queryset(self.get_object(request.user.id))
+        page = self.paginate_queryset(datasets)
+        serializer = DatasetSerializer(page, many=True, context={"request": request})
+        return self.get_paginated_response(serializer.data)
 
 
 class ModelResultList(GenericAPIView):
@@ -121,9 +124,10 @@ class ModelResultList(GenericAPIView):
         """
         Retrieve all results associated with the current user
         """
-        results = self.get_object(request.user.id)
-        serializer = ModelResultSerializer(results, many=True)
-        return Response(serializer.data)
+        results = self.filter_queryset(self.get_object(request.user.id))
+        page = self.paginate_queryset(results)
+        serializer = ModelResultSerializer(page, many=True, context={"request": request})
+        return self.get_paginated_response(serializer.data)
 
 
 class DatasetAssociationList(GenericAPIView):
@@ -132,8 +136,12 @@ class DatasetAssociationList(GenericAPIView):
 
     def get_object(self, pk):
         try:
+            # Subqueries on the owned assets avoid joining every association
+            # with both its dataset and benchmark before filtering
+            datasets = Dataset.objects.filter(owner__id=pk).values("id")
+            benchmarks = Benchmark.objects.filter(owner__id=pk).values("id")
             return BenchmarkDataset.objects.filter(
-                Q(dataset__owner__id=pk) | Q(benchmark__owner__id=pk)
+                Q(dataset__in=datasets) | Q(benchmark__in=benchmarks)
             )
         except BenchmarkDataset.DoesNotExist:
             raise Http404
@@ -142,9 +150,10 @@ class DatasetAssociationList(GenericAPIView):
         """
         Retrieve all dataset associations involving an asset of mine
         """
-        benchmarkdatasets = self.get_object(request.user.id)
-        serializer = BenchmarkDatasetListSerializer(benchmarkdatasets, many=True)
-        return Response(serializer.data)
+        benchmarkdatasets = self.filter_queryset(self.get_object(request.user.id))
+        page = self.paginate_queryset(benchmarkdatasets)
+        serializer = BenchmarkDatasetListSerializer(page, many=True, context={"request": request})
+        return self.get_paginated_response(serializer.data)
 
 
 class MlCubeAssociationList(GenericAPIView):
@@ -153,8 +162,10 @@ class MlCubeAssociationList(GenericAPIView):
 
     def get_object(self, pk):
         try:
+            mlcubes = MlCube.objects.filter(owner__id=pk).values("id")
+            benchmarks = Benchmark.objects.filter(owner__id=pk).values("id")
             return BenchmarkModel.objects.filter(
-                Q(model_mlcube__owner__id=pk) | Q(benchmark__owner__id=pk)
+                Q(model_mlcube__in=mlcubes) | Q(benchmark__in=benchmarks)
             )
         except BenchmarkModel.DoesNotExist:
             raise Http404
@@ -163,6 +174,7 @@ class MlCubeAssociationList(GenericAPIView):
         """
         Retrieve all mlcube associations involving an asset of mine
         """
-        benchmarkmodels = self.get_object(request.user.id)
-        serializer = BenchmarkModelListSerializer(benchmarkmodels, many=True)
-        return Response(serializer.data)
+        benchmarkmodels = self.filter_queryset(self.get_object(request.user.id))
+        page = self.paginate_queryset(benchmarkmodels)
+        serializer = BenchmarkModelListSerializer(page, many=True, context={"request": request})
+        return self.get_paginated_response(serializer.data)